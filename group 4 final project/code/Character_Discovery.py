@@ -1,49 +1,63 @@
+import argparse
+import os
 import pandas as pd
-import jieba.posseg as pseg  # 导入词性标注模块
-from collections import Counter
-from tqdm import tqdm
-
-print("开始 [阶段二：自动人物发现]...")
-print("这将花费几分钟时间，Jieba 正在分析全文...")
-
-# --- 1. 加载数据 ---
-# 我们使用段落数据，处理速度更快，且上下文更完整
-try:
-    df = pd.read_csv("out/fengshen_paragraphs.csv")
-except FileNotFoundError:
-    print("错误：未在 'out' 文件夹中找到 fengshen_paragraphs.csv")
-    exit()
-
-print(f"数据加载完毕，共 {len(df)} 个段落。")
-
-# --- 2. 自动提取人名 (nr) ---
-# 'nr' 是 Jieba 词库中“人名”的标记
-potential_names = Counter()
-
-# 使用 tqdm 显示进度条
-for text in tqdm(df['text'], desc="分析段落"):
-    if not isinstance(text, str):
-        continue
-
-    # 进行词性标注
-    words = pseg.cut(text)
-
-    # 提取所有被标记为 'nr' (人名) 且长度大于1的词
-    for word, flag in words:
-        if flag == 'nr' and len(word) > 1:
-            potential_names[word] += 1
-
-print("人物提取完成。")
-
-# --- 3. 保存为 CSV ---
-# 转换为 DataFrame
-names_df = pd.DataFrame(potential_names.most_common(),
-                        columns=['Potential_Name', 'Frequency'])
-
-# 保存
-output_file = 'out/potential_characters_freq.csv'
-names_df.to_csv(output_file, index=False, encoding='utf-8-sig')
-
-print(f"--- [阶段二：自动人物发现] 已完成 ---")
-print(f"已保存潜在人物列表：{output_file}")
-print(f"\n[下一步行动]：请手动打开 {output_file} 文件进行清理。")
+
+from fengshen_metrics import add_metrics_args, configure_from_args, span
+from fengshen_token_corpus import load_token_corpus  # 词编号语料（共享分词层结果编码为内存映射整数数组）
+
+
+def main():
+    ap = argparse.ArgumentParser(description="阶段二：自动人物发现")
+    ap.add_argument("--workers", type=int, default=1,
+                    help=f"分词进程数（按回目并行，结果与单进程一致）；本机 {os.cpu_count()} 核")
+    add_metrics_args(ap)
+    args = ap.parse_args()
+    configure_from_args(args)
+    with span("character_discovery", workers=args.workers):
+        discover(args)
+
+
+def discover(args):
+
+    print("开始 [阶段二：自动人物发现]...")
+    print("首次运行需要 Jieba 分析全文（几分钟）；之后只对新增/修改的段落分词。")
+
+    # --- 1. 加载数据 ---
+    # 我们使用段落数据，处理速度更快，且上下文更完整
+    # 词性标注结果来自共享分词层（--workers > 1 时按回目并行分词），编码成词编号数组后按需映射
+    try:
+        with span("segment", workers=args.workers) as s:
+            tokens = load_token_corpus("out/fengshen_paragraphs.csv", workers=args.workers, verbose=True)
+            s.count("paragraphs", len(tokens.para_offsets) - 1)
+            s.count("tokens", tokens.n_tokens)
+    except FileNotFoundError:
+        print("错误：未在 'out' 文件夹中找到 fengshen_paragraphs.csv")
+        exit()
+
+    print(f"数据加载完毕，共 {len(tokens.para_offsets) - 1} 个段落，{tokens.n_tokens:,} 个词。")
+
+    # --- 2. 自动提取人名 (nr) ---
+    # 'nr' 是 Jieba 词库中“人名”的标记；提取所有被标记为 'nr' 且长度大于1的词
+    # 词表上先筛长度、词位置上再查词性，计数是一次 np.bincount
+    is_name = tokens.token_mask(pos=['nr'], vocab=tokens.vocab_mask(predicate=lambda w: len(w) > 1))
+    potential_names = tokens.most_common(is_name)
+
+    print("人物提取完成。")
+
+    # --- 3. 保存为 CSV ---
+    # 转换为 DataFrame
+    names_df = pd.DataFrame(potential_names,
+                            columns=['Potential_Name', 'Frequency'])
+
+    # 保存
+    output_file = 'out/potential_characters_freq.csv'
+    names_df.to_csv(output_file, index=False, encoding='utf-8-sig')
+
+    print(f"--- [阶段二：自动人物发现] 已完成 ---")
+    print(f"已保存潜在人物列表：{output_file}")
+    print(f"\n[下一步行动]：请手动打开 {output_file} 文件进行清理。")
+
+
+# 进程池在 Windows 上以 spawn 方式启动，必须有 main 保护
+if __name__ == "__main__":
+    main()
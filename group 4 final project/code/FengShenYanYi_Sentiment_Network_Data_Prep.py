@@ -1,139 +1,252 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-from snownlp import SnowNLP
-from opencc import OpenCC
-from collections import defaultdict
-import itertools
+import argparse
 import os
 import time
 
+from fengshen_alias_matcher import AliasMatcher, alias_table_from_df
+from fengshen_cooccurrence import DEFAULT_GRANULARITIES, Incidence, write_granularity_edges
+from fengshen_corpus import read_table
+from fengshen_metrics import add_metrics_args, configure_from_args, span
+from fengshen_normalized_text import normalize_alias_table, normalize_texts
+from fengshen_sentiment import cached_scores, score_texts
+
 # --- 0. 定义文件路径 ---
 # (!!!) 【修改点】: 我们在这里统一定义路径
 out_dir = 'out'
-sentences_file_path = os.path.join(out_dir, 'fengshen_sentences.csv')
+sentences_file_path = os.path.join(out_dir, 'fengshen_sentences.csv')  # 可选：缺失时由段落按同一规则断句
+paragraphs_file_path = os.path.join(out_dir, 'fengshen_paragraphs.csv')
 whitelist_file_path = os.path.join(out_dir, 'OPTIMIZED_CHARACTER_WHITELIST.csv')  # <--- 指向 out 文件夹
+sentiment_store_path = os.path.join(out_dir, 'fengshen_sentiment.sqlite')  # 情感分数缓存 / 断点
+normalized_store_path = os.path.join(out_dir, 'fengshen_normalized.sqlite')  # 繁简转换缓存
+cooccurrence_path = os.path.join(out_dir, 'fengshen_cooccurrence.npz')  # 逐回共现张量
+incidence_path = os.path.join(out_dir, 'fengshen_incidence.npz')  # 句子 × 人物关联矩阵（换窗口大小时不必重扫）
+
+# 固定样例（简体视图上的句子）与期望边权，--self-test 用来核对网络代码：
+# 姜子牙 不再额外触发 子牙，崇侯虎 内部的 侯虎 不单独命中；别名 子牙 归并到 姜子牙
+SELF_TEST_ALIASES = {"姜子牙": "姜子牙", "子牙": "姜子牙", "崇侯虎": "崇侯虎", "侯虎": "侯虎", "黃飛虎": "黃飛虎"}
+SELF_TEST_SENTENCES = [
+    (1, "姜子牙与黄飞虎同行"),
+    (1, "子牙曰：北伯侯崇侯虎来也"),
+    (2, "侯虎大怒，子牙不语"),
+    (2, "姜子牙谓黄飞虎曰"),
+    (2, "崇侯虎独坐"),
+]
+SELF_TEST_EDGES = {
+    ("姜子牙", "黃飛虎"): 2,
+    ("姜子牙", "崇侯虎"): 1,
+    ("侯虎", "姜子牙"): 1,
+}
+
+
+def build_matcher(alias_table):
+    """白名单的别名有繁有简（楊戩 / 杨戬），统一转成简体后只编译一次自动机；命中仍解析为白名单里的规范人名。"""
+    return AliasMatcher(normalize_alias_table(alias_table))
+
+
+def self_test():
+    """用固定样例跑一遍 Part B 的共现计算，逐条核对边权；全部一致返回 True。"""
+    matcher = build_matcher(SELF_TEST_ALIASES)
+    chapters, texts = zip(*SELF_TEST_SENTENCES)
+    incidence = Incidence.from_texts(chapters, texts, matcher)
+    expected = {frozenset(pair): weight for pair, weight in SELF_TEST_EDGES.items()}
+    ok = True
+    for label, edges_df in (("tensor", incidence.tensor().edges()), ("sentence", incidence.edges("sentence"))):
+        got = {frozenset((s, t)): int(w) for s, t, w in edges_df[['Source', 'Target', 'Weight']].itertuples(index=False)}
+        for pair in sorted(set(expected) | set(got), key=sorted):
+            match = got.get(pair) == expected.get(pair)
+            ok &= match
+            print(f"{'OK ' if match else 'ERR'} [{label}] {' - '.join(sorted(pair))}: "
+                  f"期望 {expected.get(pair, 0)}，实得 {got.get(pair, 0)}")
+    print("✅ 固定样例边权全部一致" if ok else "❌ 固定样例边权不一致")
+    return ok
 
-# --- 检查输入文件 ---
-required_files = [sentences_file_path, whitelist_file_path]
-if not all(os.path.exists(f) for f in required_files):
-    print("错误：缺少必要的输入文件。")
-    print(f"请确保 '{sentences_file_path}'")
-    print(f"和 '{whitelist_file_path}'")
-    print(f"都存在于 '{out_dir}' 文件夹中，且该文件夹与此脚本在同一目录。")
-    exit()
-
-# --- 配置 Matplotlib 中文字体 ---
-plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
-plt.rcParams['axes.unicode_minus'] = False
-
-print("--- [项目优化版] ---")
 
 # ==================================================
 # PART A: 情感分析 (原阶段一)
 # ==================================================
-print("\n开始 [Part A: 情感分析]...")
-
-# 初始化繁简转换器
-cc = OpenCC('t2s')  # 繁体 -> 简体
-
-print(f"正在加载 {sentences_file_path}...")
-# (!!!) 【修改点】: 使用定义好的路径变量
-df_sent = pd.read_csv(sentences_file_path)
-print(f"已加载 {len(df_sent)} 条句子。")
-
-print("正在将繁体文本转换为简体 (SNOWNLP需要)...")
-start_time = time.time()
-df_sent['text_simplified'] = df_sent['text'].apply(
-    lambda x: cc.convert(x) if isinstance(x, str) else ""
-)
-print(f"繁简转换完成，耗时: {time.time() - start_time:.2f} 秒")
+def run_sentiment(df_sent, workers=1):
+    print("\n开始 [Part A: 情感分析]...")
+
+    # 批量打分：预编译模型 + 按句去重 + 分块落盘（中断后重跑从断点继续）
+    print("正在计算每句话的情感分数...")
+    start_time = time.time()
+    with span("sentiment", workers=workers) as s:
+        df_sent['sentiment'] = score_texts(df_sent['text_simplified'], workers=workers,
+                                           store_path=sentiment_store_path)
+        s.count("sentences", len(df_sent))
+    print(f"情感分数计算完成，耗时: {time.time() - start_time:.2f} 秒")
+
+    # 绘图与保存
+    chapter_sentiment = df_sent.groupby('chapter_no')['sentiment'].mean()
+    plt.figure(figsize=(15, 7))
+    book = df_sent['book'].iloc[0] if 'book' in df_sent.columns and len(df_sent) else '封神演義'
+    chapter_sentiment.plot(kind='line', grid=True, title=f'《{book}》逐章情感均值曲線')
+    plt.xlabel('章節編號 (Chapter No)')
+    plt.ylabel('情感均值 (0=消極, 1=積極)')
+    plt.ylim(0, 1)
+    plt.tight_layout()
+    plt.savefig('sentiment_per_chapter.png')
+
+    print("已保存情感分析图： sentiment_per_chapter.png")
+    print("--- [Part A] 完成 ---")
 
 
-def get_sentiment(text):
-    try:
-        if not isinstance(text, str) or not text.strip(): return 0.5
-        return SnowNLP(text).sentiments
-    except Exception:
-        return 0.5
-
-
-print("正在计算每句话的情感分数...")
-start_time = time.time()
-df_sent['sentiment'] = df_sent['text_simplified'].apply(get_sentiment)
-print(f"情感分数计算完成，耗时: {time.time() - start_time:.2f} 秒")
-
-# 绘图与保存
-chapter_sentiment = df_sent.groupby('chapter_no')['sentiment'].mean()
-plt.figure(figsize=(15, 7))
-chapter_sentiment.plot(kind='line', grid=True, title='《封神演義》逐章情感均值曲線')
-plt.xlabel('章節編號 (Chapter No)')
-plt.ylabel('情感均值 (0=消極, 1=積極)')
-plt.ylim(0, 1)
-plt.tight_layout()
-plt.savefig('sentiment_per_chapter.png')
-
-print("已保存情感分析图： sentiment_per_chapter.png")
-print("--- [Part A] 完成 ---")
-
 # ==================================================
 # PART B: 网络数据准备 (修改后的阶段四)
 # ==================================================
-print("\n开始 [Part B: 人物网络数据准备]...")
-
-# (!!!) 【已修复】: 填入我们检测到的正确参数
-whitelist_encoding = 'utf-8'
-whitelist_separator = ','
-
-# --- 1. 加载你的人物白名单 ---
-print(f"正在加载 {whitelist_file_path} (编码: {whitelist_encoding}, 分隔符: '{whitelist_separator}')...")
-try:
-    # (!!!) 【修改点】: 使用定义好的路径变量
-    df_whitelist = pd.read_csv(
-        whitelist_file_path,
-        sep=whitelist_separator,
-        encoding=whitelist_encoding
-    )
-    # 从第一列读取所有人物名称
-    CHARACTER_LIST = df_whitelist.iloc[:, 0].dropna().astype(str).tolist()
-    print(f"成功加载人物白名单，共 {len(CHARACTER_LIST)} 个人物。")
-    print(f"名单前5位: {CHARACTER_LIST[:5]}")
-
-except Exception as e:
-    print(f"读取白名单时出错: {e}")
-    print("请确保文件未被其他程序占用。")
-    exit()
-
-# --- 2. 准备 Gephi 节点文件 (Nodes) ---
-nodes_df = pd.DataFrame(CHARACTER_LIST, columns=["Id"])
-nodes_df["Label"] = nodes_df["Id"]
-nodes_df.to_csv("fengshen_nodes.csv", index=False, encoding="utf-8-sig")
-print(f"已保存人物节点文件： fengshen_nodes.csv")
-
-# --- 3. 准备 Gephi 边文件 (Edges) ---
-edge_weights = defaultdict(int)
-
-print("正在计算人物共现（边）...")
-for sentence in df_sent['text']:
-    if not isinstance(sentence, str):
-        continue
-
-    chars_in_sentence = set()
-    for char_name in CHARACTER_LIST:
-        if char_name in sentence:  # 繁体 vs 繁体
-            chars_in_sentence.add(char_name)
-
-    if len(chars_in_sentence) >= 2:
-        for char_a, char_b in itertools.combinations(sorted(list(chars_in_sentence)), 2):
-            edge_weights[(char_a, char_b)] += 1
-
-edges_list = []
-for (source, target), weight in edge_weights.items():
-    edges_list.append([source, target, weight])
-
-edges_df = pd.DataFrame(edges_list, columns=["Source", "Target", "Weight"])
-edges_df.to_csv("fengshen_edges.csv", index=False, encoding="utf-8-sig")
-
-print(f"已保存人物关系文件： fengshen_edges.csv (共 {len(edges_df)} 条关系)")
-print("--- [Part B] 完成 ---")
-
-print("\n--- [所有 Python 分析已全部完成] ---")
+def run_network(df_sent, granularities=DEFAULT_GRANULARITIES):
+    print("\n开始 [Part B: 人物网络数据准备]...")
+
+    # (!!!) 【已修复】: 填入我们检测到的正确参数
+    whitelist_encoding = 'utf-8'
+    whitelist_separator = ','
+
+    # --- 1. 加载你的人物白名单 ---
+    print(f"正在加载 {whitelist_file_path} (编码: {whitelist_encoding}, 分隔符: '{whitelist_separator}')...")
+    try:
+        # (!!!) 【修改点】: 使用定义好的路径变量
+        df_whitelist = pd.read_csv(
+            whitelist_file_path,
+            sep=whitelist_separator,
+            encoding=whitelist_encoding
+        )
+        # 从第一列读取所有人物名称
+        CHARACTER_LIST = df_whitelist.iloc[:, 0].dropna().astype(str).tolist()
+        print(f"成功加载人物白名单，共 {len(CHARACTER_LIST)} 个人物。")
+        print(f"名单前5位: {CHARACTER_LIST[:5]}")
+        # 别名（variant_1..variant_5）统一归并到规范人名，在简体视图上编译一次自动机
+        ALIAS_TABLE = alias_table_from_df(df_whitelist)
+        matcher = build_matcher(ALIAS_TABLE)
+        print(f"已编译别名自动机，共 {len(ALIAS_TABLE)} 个名称/别名。")
+
+    except Exception as e:
+        print(f"读取白名单时出错: {e}")
+        print("请确保文件未被其他程序占用。")
+        exit()
+
+    # --- 2. 准备 Gephi 节点文件 (Nodes) ---
+    nodes_df = pd.DataFrame(CHARACTER_LIST, columns=["Id"])
+    nodes_df["Label"] = nodes_df["Id"]
+
+    # --- 3. 准备 Gephi 边文件 (Edges) ---
+    print("正在计算人物共现（边）...")
+    start_time = time.time()
+    # 单次扫描（最长匹配优先）得到 句子 × 人物 关联矩阵 X；共现全部由 XᵀX 算出：
+    # 逐回张量（之后任意回目区间都可直接查询），以及句 / 段 / 滑动窗口各粒度的全书边表
+    with span("cooccurrence", names=len(CHARACTER_LIST)) as s:
+        incidence = Incidence.from_texts(df_sent['chapter_no'], df_sent['text_simplified'], matcher,
+                                         para_nos=df_sent['para_index'] if 'para_index' in df_sent.columns else None)
+        tensor = incidence.tensor()
+        s.count("sentences", len(df_sent))
+        s.set(chapters=len(tensor.chapters), mentions=int(incidence.matrix.nnz))
+    with span("export"):
+        tensor.save(cooccurrence_path)
+        incidence.save(incidence_path)
+        tensor.write_gexf("fengshen_dynamic.gexf")
+
+    print(f"共现计算完成，耗时: {time.time() - start_time:.2f} 秒")
+    print(f"已保存逐回共现张量： {cooccurrence_path}，动态网络： fengshen_dynamic.gexf")
+
+    # --- 4. 情感并入网络 ---
+    # 复用 Part A 的逐句分数（只跑 Part B 时从情感缓存读取，不重新打分），经关联矩阵一次汇总到人物与关系上：
+    # 均值 / 方差 / 句数，以及带符号权重 SignedWeight = Σ(2·分数 - 1)（正为整体积极，负为整体消极）
+    with span("edges") as s:
+        if 'sentiment' in df_sent.columns:
+            scores = df_sent['sentiment'].to_numpy(dtype=float)
+        else:
+            scores = cached_scores(df_sent['text_simplified'], store_path=sentiment_store_path)
+        scored = int(np.count_nonzero(~np.isnan(scores)))
+        edges_df = tensor.edges()
+        stats = incidence.edge_sentiment(scores, edges_df['Source'], edges_df['Target'])
+        edges_df['SignedWeight'] = stats['signed'].round(3)
+        edges_df['Sentiment'] = stats['mean'].round(4)
+        edges_df['SentimentVar'] = stats['var'].round(4)
+        edges_df['SentimentCount'] = stats['count']
+        edges_df.to_csv("fengshen_edges.csv", index=False, encoding="utf-8-sig")
+        stats = incidence.node_sentiment(scores)
+        rows = nodes_df['Id'].map(incidence.index)
+        known = rows.notna().to_numpy()
+        rows = rows.fillna(0).astype(int).to_numpy()
+        nodes_df['Sentiment'] = np.where(known, stats['mean'][rows], np.nan).round(4)
+        nodes_df['SentimentVar'] = np.where(known, stats['var'][rows], np.nan).round(4)
+        nodes_df['SentimentCount'] = np.where(known, stats['count'][rows], 0)
+        nodes_df.to_csv("fengshen_nodes.csv", index=False, encoding="utf-8-sig")
+        s.set(edges=len(edges_df), scored_sentences=scored)
+
+    if scored < len(df_sent):
+        print(f"注意：{len(df_sent) - scored} / {len(df_sent)} 句还没有情感分数（先运行 Part A），未计入情感统计")
+    print(f"已保存人物节点文件： fengshen_nodes.csv")
+    print(f"已保存人物关系文件： fengshen_edges.csv (共 {len(edges_df)} 条关系，含情感均值 / 方差 / 带符号权重)")
+
+    if granularities:
+        print("各粒度共现边表：")
+        with span("granularity", granularities=list(granularities)):
+            write_granularity_edges(incidence, granularities, out_dir)
+    print("--- [Part B] 完成 ---")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='情感分析 + 人物网络数据准备')
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f'情感打分进程数；本机 {os.cpu_count()} 核')
+    parser.add_argument('--part', choices=['all', 'sentiment', 'network'], default='all',
+                        help='只运行 Part A（sentiment）或 Part B（network）；默认全部')
+    parser.add_argument('--granularity', nargs='*', default=DEFAULT_GRANULARITIES,
+                        help='另外导出的共现粒度：sentence / paragraph / window<k>（k 句滑动窗口），'
+                             '写入 out/fengshen_edges_<粒度>.csv；不给值则不导出')
+    parser.add_argument('--self-test', action='store_true',
+                        help='只用内置固定样例核对共现边权（长名优先、别名归并），不读取 out/ 数据')
+    add_metrics_args(parser)
+    args = parser.parse_args()
+    if args.self_test:
+        raise SystemExit(0 if self_test() else 1)
+    configure_from_args(args)
+    with span("sentiment_network", part=args.part, workers=args.workers):
+        run(args)
+
+
+def run(args):
+    # --- 检查输入文件 ---
+    required_files = [paragraphs_file_path] + ([whitelist_file_path] if args.part != 'sentiment' else [])
+    if not all(os.path.exists(f) for f in required_files):
+        print("错误：缺少必要的输入文件。")
+        print(f"请确保 '{paragraphs_file_path}'")
+        print(f"和 '{whitelist_file_path}'")
+        print(f"都存在于 '{out_dir}' 文件夹中，且该文件夹与此脚本在同一目录。")
+        exit()
+
+    # --- 配置 Matplotlib 中文字体 ---
+    plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
+    plt.rcParams['axes.unicode_minus'] = False
+
+    print("--- [项目优化版] ---")
+
+    print(f"正在加载 {sentences_file_path}...")
+    # (!!!) 【修改点】: 使用定义好的路径变量；句子来自紧凑语料层（段落缓冲上的切片）
+    with span("load") as s:
+        df_sent = read_table(sentences_file_path, columns=['book', 'chapter_no', 'para_index', 'text'])
+        s.count("sentences", len(df_sent))
+    print(f"已加载 {len(df_sent)} 条句子。")
+
+    # 简体视图来自规范化文本层：按回成批转换并缓存，重跑时直接读库 (SNOWNLP 与别名匹配都需要)
+    start_time = time.time()
+    with span("normalize") as s:
+        df_sent['text_simplified'] = normalize_texts(df_sent['text'], groups=df_sent['chapter_no'],
+                                                     store_path=normalized_store_path)
+        s.count("sentences", len(df_sent))
+    print(f"繁简视图就绪，耗时: {time.time() - start_time:.2f} 秒")
+
+    if args.part in ('all', 'sentiment'):
+        run_sentiment(df_sent, workers=args.workers)
+    if args.part in ('all', 'network'):
+        with span("network"):
+            run_network(df_sent, args.granularity)
+
+    print("\n--- [所有 Python 分析已全部完成] ---")
+
+
+# 进程池在 Windows 上以 spawn 方式启动，必须有 main 保护
+if __name__ == "__main__":
+    main()
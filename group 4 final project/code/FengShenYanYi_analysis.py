@@ -1,9 +1,17 @@
+import numpy as np
 import pandas as pd
 import jieba
 import jieba.posseg as pseg
+from tqdm import tqdm
 import re
-from collections import Counter
 import logging
+import argparse
+import os
+
+from fengshen_metrics import add_metrics_args, configure_from_args, span
+from fengshen_segmentation import DEFAULT_STORE, Segmenter, split_units
+from fengshen_token_corpus import load_token_corpus
+from fengshen_word_counter import WordCounter, make_counter
 
 
 # --- 用户提示 ---
@@ -11,41 +19,62 @@ import logging
 # pip install pandas jieba
 # -----------------
 
-def process_fengshen(csv_file_path, report_file_path, frequency_csv_path):
+def iter_text_chunks(csv_paths, chunk_rows=10):
+    """逐块读取 full_text 列（每块 chunk_rows 回），返回非空文本列表；不把整部书读进一个字符串。"""
+    for path in csv_paths:
+        for chunk in pd.read_csv(path, usecols=['full_text'], chunksize=chunk_rows):
+            yield chunk['full_text'].dropna().astype(str).tolist()
+
+
+def process_fengshen(csv_file_path, report_file_path, frequency_csv_path, segment_store_path=DEFAULT_STORE,
+                     workers=1, counter=None, chunk_rows=10, token_corpus=None):
+    """csv_file_path 可以是多个文件（多部书合并统计）；counter 缺省为精确计数，
+    也可传入 HeavyHitters（Count-Min Sketch），词表再大内存也不随之增长。
+    token_corpus（TokenCorpus，应为 mode='cut' 编译的）给出时词频直接由词编号数组计数，不再逐块读取分词结果。"""
 
     jieba.setLogLevel(logging.INFO)
+    csv_paths = [csv_file_path] if isinstance(csv_file_path, str) else list(csv_file_path)
+    counter = counter if counter is not None else WordCounter()
 
     # 使用 'w' (写入) 模式和 'utf-8' 编码打开报告文件
     # with 语句将确保文件在完成后被正确关闭
     with open(report_file_path, 'w', encoding='utf-8') as report_file:
 
-        report_file.write(f"--- 步骤 1: 开始加载数据 '{csv_file_path}' ---\n")
+        report_file.write(f"--- 步骤 1: 开始加载数据 '{', '.join(csv_paths)}' ---\n")
         try:
-            # 1. 读取CSV文件
-            df = pd.read_csv(csv_file_path)
+            # 1. 先只读表头；正文之后按块流式读取
+            columns = [pd.read_csv(path, nrows=0).columns for path in csv_paths]
             report_file.write("CSV文件加载成功。\n")
 
             # 2. 检查 'full_text' 列
-            if 'full_text' not in df.columns:
+            if not all('full_text' in c for c in columns):
                 error_msg = "错误：CSV文件中未找到 'full_text' 列。请检查文件。\n"
                 report_file.write(error_msg)
                 print(error_msg)  # 也在控制台打印错误
                 return
 
-            # 3. 合并所有文本
+            # 3. 流式统计文本：总字符数与原先 ' '.join(全部文本) 的长度一致，示例原文取其前 200 字
             report_file.write("正在合并所有文本...\n")
-            all_text = ' '.join(df['full_text'].dropna().astype(str))
-
-            if not all_text.strip():
+            n_texts, n_chars, n_chunks, sample, has_text = 0, 0, 0, '', False
+            for texts in iter_text_chunks(csv_paths, chunk_rows):
+                n_chunks += 1
+                for text in texts:
+                    if len(sample) < 200:
+                        sample += (' ' if n_texts else '') + text
+                    n_chars += len(text) + (1 if n_texts else 0)
+                    n_texts += 1
+                    has_text = has_text or bool(text.strip())
+
+            if not has_text:
                 error_msg = "错误：'full_text' 列为空或只包含无效数据。\n"
                 report_file.write(error_msg)
                 print(error_msg)  # 也在控制台打印错误
                 return
 
-            report_file.write(f"数据加载完毕，总字符数 (含空格): {len(all_text)}\n")
+            report_file.write(f"数据加载完毕，总字符数 (含空格): {n_chars}\n")
 
         except FileNotFoundError:
-            error_msg = f"错误：文件未找到 '{csv_file_path}'。请确保文件路径正确。\n"
+            error_msg = f"错误：文件未找到 '{', '.join(csv_paths)}'。请确保文件路径正确。\n"
             report_file.write(error_msg)
             print(error_msg)
             return
@@ -59,7 +88,7 @@ def process_fengshen(csv_file_path, report_file_path, frequency_csv_path):
         # --- 步骤 2: 中文分词与词性标注 (Preprocessing & POS Tagging) 示例 ---
         # -------------------------------------------------
         report_file.write("\n--- 步骤 2: 词性标注 (POS Tagging) 示例 ---\n")
-        sample_text = all_text[:200]
+        sample_text = sample[:200]
         report_file.write(f"示例原文 (Sample Text):\n{sample_text}\n\n")
         report_file.write("词性标注结果 (格式: 词/词性):\n")
         try:
@@ -74,26 +103,52 @@ def process_fengshen(csv_file_path, report_file_path, frequency_csv_path):
         # -------------------------------------------------
         report_file.write("\n--- 步骤 3: 词频统计 (Word Frequency) ---\n")
         try:
-            # 1. 移除标点符号
+            # 1. 使用共享分词层（按段落缓存，只对新段落分词）；逐块分词、逐块计数，用完即丢
+            #    分词方式为 jieba.cut（mode='cut'），与原先整本 jieba.cut 的词频逐词一致；不用词性标注的结果
+            report_file.write("正在读取共享分词结果 (首次运行需要Jieba分词，可能需要一点时间)...\n")
+            # 2. 移除标点符号：只保留由中文、字母、数字组成的词
             report_file.write("正在移除所有标点符号...\n")
-            punctuation_pattern = r'[^\u4e00-\u9fa5a-zA-Z0-9]'
-            cleaned_text = re.sub(punctuation_pattern, " ", all_text)
-
-            # 2. 使用Jieba分词
-            report_file.write("正在使用Jieba分词 (全文本，可能需要一点时间)...\n")
-            words = jieba.cut(cleaned_text)
-
-            # 3. 过滤词语
-            filtered_words = [word.strip() for word in words if word.strip()]
-            report_file.write(f"分词完毕。总词数 (已去标点和空格): {len(filtered_words)}\n")
+            word_pattern = re.compile(r'[\u4e00-\u9fa5a-zA-Z0-9]+')
+
+            # 3. 过滤词语并按块累加：每块先得到部分计数，再并入总计数（同频词的先后与一次性统计相同）
+            with span("segment", workers=workers) as s:
+                if token_corpus is not None:
+                    # 词编号语料：标点过滤是词表上的一次查表，计数是一次 np.bincount
+                    # （词编号已按频次降序、同频按首次出现排列，按编号顺序并入即与逐词计数一致）
+                    keep = token_corpus.vocab_mask(predicate=word_pattern.fullmatch)
+                    freq = token_corpus.frequencies()
+                    ids = np.flatnonzero(keep & (freq > 0)).tolist()
+                    counter.update_counts({token_corpus.words[i]: int(freq[i]) for i in ids})
+                    s.count("paragraphs", len(token_corpus.para_offsets) - 1)
+                    s.count("tokens", token_corpus.n_tokens)
+                # 缓存库连接、词典指纹、分词器 / 进程池在各块之间共用
+                segmenter = Segmenter(store_path=segment_store_path, workers=workers, mode='cut') \
+                    if token_corpus is None else None
+                chunks = () if segmenter is None else tqdm(iter_text_chunks(csv_paths, chunk_rows),
+                                                           total=n_chunks, desc="分词计数")
+                try:
+                    for texts in chunks:
+                        units = split_units(texts)
+                        segments = segmenter.segment(units, verbose=False)
+                        counter.update(word for words in segments for word, _ in words if word_pattern.fullmatch(word))
+                        s.count("paragraphs", len(units))
+                        s.count("chars", sum(len(u) for u in units))
+                        s.count("tokens", sum(len(words) for words in segments))
+                finally:
+                    if segmenter is not None:
+                        segmenter.close()
+                s.set(vocabulary=len(counter), counter_mb=round(counter.nbytes() / 2 ** 20, 1))
+            report_file.write(f"分词完毕。总词数 (已去标点和空格): {counter.total}\n")
 
             # 4. 统计词频
             report_file.write("正在统计词频...\n")
-            word_counts = Counter(filtered_words)
+            if not counter.exact:
+                report_file.write(f"（Count-Min Sketch 估计值：只保留估计次数最高的 {counter.capacity} 个词，"
+                                  f"每个估计最多高估约 {counter.sketch.error_bound():.0f} 次）\n")
 
-            # 5. 将 Top 50 写入报告文件
+            # 5. 将 Top 50 写入报告文件（有界堆取前 50）
             report_file.write("\n--- 频率最高的前50个词 (Top 50 Words) ---\n")
-            for word, count in word_counts.most_common(50):
+            for word, count in counter.top(50):
                 report_file.write(f"{word}: {count}\n")
 
             # -------------------------------------------------
@@ -102,8 +157,8 @@ def process_fengshen(csv_file_path, report_file_path, frequency_csv_path):
             report_file.write(f"\n--- 步骤 4: 保存完整词频列表 ---\n")
             report_file.write(f"正在将所有词频保存到: {frequency_csv_path}\n")
 
-            # 1. 获取完整的排序列表
-            full_sorted_list = word_counts.most_common()
+            # 1. 获取完整的排序列表（sketch 模式下为候选表）
+            full_sorted_list = counter.items()
 
             # 2. 转换为 Pandas DataFrame
             df_freq = pd.DataFrame(full_sorted_list, columns=['Word', 'Frequency'])
@@ -113,6 +168,7 @@ def process_fengshen(csv_file_path, report_file_path, frequency_csv_path):
             df_freq.to_csv(frequency_csv_path, index=False, encoding='utf-8-sig')
 
             report_file.write("完整词频列表保存成功。\n")
+            print(f"词表 {len(counter):,} 个词，计数结构约 {counter.nbytes() / 2 ** 20:.1f} MB")
 
         except Exception as e:
             error_msg = f"词频统计或保存过程中出错: {e}\n"
@@ -124,18 +180,41 @@ def process_fengshen(csv_file_path, report_file_path, frequency_csv_path):
 
 # --- 主程序入口 ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='封神演义词频统计')
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f'分词进程数（结果与单进程一致）；本机 {os.cpu_count()} 核')
     # 1. 输入文件 (使用 r'' 原始字符串来处理 Windows 路径)
-    csv_file_path = r'/CBS_5501_Final_project_WuShenyu_25114053g/fengshen_fulltext.csv'
-
+    parser.add_argument('--input', nargs='+', default=[r'/CBS_5501_Final_project_WuShenyu_25114053g/fengshen_fulltext.csv'],
+                        help='全文CSV（包含 full_text 列）；可给多个（多部书合并统计）')
     # 2. 输出文件 (将保存在与脚本相同的目录中)
-    report_file_path = 'out/fengshen_analysis_report.txt'
-    frequency_csv_path = 'out/fengshen_word_frequency.csv'
-
-    print(f"开始处理: {csv_file_path}...")
+    parser.add_argument('--report', default='out/fengshen_analysis_report.txt', help='分析报告路径')
+    parser.add_argument('--freq-csv', default='out/fengshen_word_frequency.csv', help='完整词频CSV路径')
+    # 3. 计数方式：exact=精确词频；sketch=Count-Min Sketch + 高频词候选表（词表放不进内存的多书语料）
+    parser.add_argument('--mode', choices=['exact', 'sketch'], default='exact', help='计数方式（默认精确）')
+    parser.add_argument('--sketch-width', type=int, default=2 ** 20, help='sketch 每行格数（越大误差越小）')
+    parser.add_argument('--sketch-depth', type=int, default=4, help='sketch 行数（越多越不容易高估）')
+    parser.add_argument('--capacity', type=int, default=5000, help='sketch 模式保留的高频词个数（写入词频CSV）')
+    parser.add_argument('--chunk-rows', type=int, default=10, help='每块读取的回数（流式处理）')
+    # 4. 词编号语料：给出段落CSV时词频由内存映射的词编号数组计数（与全文CSV同一份语料）
+    parser.add_argument('--tokens', default=None, help='段落CSV（如 out/fengshen_paragraphs.csv），用词编号语料计数')
+    add_metrics_args(parser)
+    args = parser.parse_args()
+    configure_from_args(args)
+
+    csv_file_path = args.input[0] if len(args.input) == 1 else args.input
+    report_file_path = args.report
+    frequency_csv_path = args.freq_csv
+
+    print(f"开始处理: {', '.join(args.input)}...")
     print("分析报告、词性标注示例和Top-50词频将被保存到: " + report_file_path)
     print("完整的词频列表将被保存到: " + frequency_csv_path)
 
     # 执行主函数
-    process_fengshen(csv_file_path, report_file_path, frequency_csv_path)
+    with span("word_frequency", input=csv_file_path):
+        counter = make_counter(args.mode, args.sketch_width, args.sketch_depth, args.capacity)
+        token_corpus = (load_token_corpus(args.tokens, workers=args.workers, verbose=True, mode='cut')
+                        if args.tokens else None)
+        process_fengshen(csv_file_path, report_file_path, frequency_csv_path, workers=args.workers,
+                         counter=counter, chunk_rows=args.chunk_rows, token_corpus=token_corpus)
 
     print("处理完成。请检查输出文件。")
\ No newline at end of file
@@ -13,18 +13,28 @@ CText《封神演义》抓取器 v1.2
   python scrape_fengshen_ctext.py --chapters 1-50 --outdir ./out --remap gb --delay 1.0
   python scrape_fengshen_ctext.py --chapters 51-100 --outdir ./out --remap gb --delay 1.0
   # 或一次 1-100，限流后重跑自动续传
+  # 并发模式：共享令牌桶限流 + keep-alive 连接池，遇限流自动降速退避
+  python scrape_fengshen_ctext.py --chapters 1-100 --outdir ./out --remap gb --concurrency 6 --rate 2
+  # SQLite 事务存储：每回段落/句子/manifest 同一事务提交，结束时导出原 CSV 布局
+  python scrape_fengshen_ctext.py --chapters 1-100 --outdir ./out --store sqlite
+  # 其他登记在 data/books.json 的书：回目范围、URL、book 列都取自登记表
+  python scrape_fengshen_ctext.py --book xiyouji --outdir ./books/xiyouji/out
 """
 import argparse, os, time, re, sys, json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 import requests
-import pandas as pd
 from tqdm import tqdm
 
+from fengshen_books import DEFAULT_BOOK, DEFAULT_REGISTRY, get_book
+from fengshen_chapter_store import open_store
+from fengshen_metrics import add_metrics_args, configure_from_args, count, event, span
+from fengshen_response_cache import CacheMiss, ResponseCache
+
 # ---- ctext 库 ----
 try:
     from ctext import (
-        setlanguage, setremap, readlink,
+        setapikey, setlanguage, setremap, readlink,
         gettextasobject, gettextasparagraphlist
     )
 except Exception as e:
@@ -34,12 +44,21 @@ except Exception as e:
 # 【修改点 1】: 将 URL 目标从 xiyouji 切换到 fengshen-yanyi
 # 注意：使用 /1/zh, /2/zh... 这种数字索引路径，以匹配脚本的数字迭代逻辑
 CH_URL = "https://ctext.org/fengshen-yanyi/{n}/zh"
+BOOK_NAME = "封神演義"  # 写入 book 列；--book 时由登记表覆盖（连同 CH_URL）
 
 SPLIT_PAT = re.compile(r"(?<=[。！？!?；;])")
 
-def parse_range(spec: str) -> List[int]:
+LANGUAGE = "zh"
+# 响应缓存（main 中按参数初始化）；键中带 language/remap，切换 --remap 不会读到旧结果
+RESPONSE_CACHE: Optional[ResponseCache] = None
+REMAP = ""
+
+def cache_key(kind: str, ref: str) -> tuple:
+    return (kind, ref, LANGUAGE, REMAP)
+
+def parse_range(spec: str, first: int = 1, last: int = 100) -> List[int]:
     if not spec:
-        return list(range(1, 101))
+        return list(range(first, last + 1))
     nums: List[int] = []
     for part in [p.strip() for p in spec.split(",") if p.strip()]:
         if "-" in part:
@@ -52,9 +71,16 @@ def parse_range(spec: str) -> List[int]:
     return sorted(set(nums))
 
 def resolve_urn(url: str, delay: float) -> str:
+    """URL -> URN；有缓存时先查缓存。"""
+    if RESPONSE_CACHE is None:
+        return _resolve_urn_network(url, delay)
+    return RESPONSE_CACHE.get_or_fetch(cache_key("readlink", url), lambda: _resolve_urn_network(url, delay))
+
+def _resolve_urn_network(url: str, delay: float) -> str:
     """URL -> URN；兼容 readlink 返回 dict/str，失败则 API 兜底。"""
     last_err = None
     try:
+        count("api_calls")
         res = readlink(url)
         if isinstance(res, dict):
             urn = res.get("urn") or res.get("textRef") or res.get("link")
@@ -69,6 +95,7 @@ def resolve_urn(url: str, delay: float) -> str:
         last_err = e
     # 兜底：API
     try:
+        count("api_calls")
         r = requests.get("https://api.ctext.org/readlink", params={"url": url}, timeout=15)
         r.raise_for_status()
         j = r.json() if "application/json" in r.headers.get("content-type", "") else json.loads(r.text)
@@ -82,27 +109,41 @@ def resolve_urn(url: str, delay: float) -> str:
     except Exception as e2:
         raise RuntimeError(f"resolve_urn 失败：readlink_err={last_err} ; api_err={e2}")
 
+def fetch_payload(n: int, urn: str) -> Dict[str, Any]:
+    """原始章节内容 {'title','paragraphs'}（未清洗）。"""
+    # 先拿结构化（可取标题），失败就直接取段落
+    try:
+        count("api_calls")
+        data = gettextasobject(urn)
+        title = data.get("title") or f"第{n}回"
+        paragraphs = data.get("fulltext") or []
+        if not paragraphs:
+            count("api_calls")
+            paragraphs = gettextasparagraphlist(urn) or []
+    except Exception:
+        title = f"第{n}回"
+        count("api_calls")
+        paragraphs = gettextasparagraphlist(urn) or []
+    return {"title": title, "paragraphs": list(paragraphs)}
+
 def fetch_chapter(n: int, delay: float = 0.8, retries: int = 1) -> Dict[str, Any]:
     """返回 {'chapter_no','chapter_title','urn','paragraphs','source_url'}"""
     url = CH_URL.format(n=n)
     last_err = None
     for attempt in range(retries + 1):
         try:
+            misses = RESPONSE_CACHE.misses if RESPONSE_CACHE else None
             urn = resolve_urn(url, delay)
-            # 先拿结构化（可取标题），失败就直接取段落
-            try:
-                data = gettextasobject(urn)
-                title = data.get("title") or f"第{n}回"
-                paragraphs = data.get("fulltext") or []
-                if not paragraphs:
-                    paragraphs = gettextasparagraphlist(urn) or []
-            except Exception:
-                title = f"第{n}回"
-                paragraphs = gettextasparagraphlist(urn) or []
-            paragraphs = [p.strip() for p in paragraphs if p and str(p).strip()]
+            if RESPONSE_CACHE is None:
+                payload = fetch_payload(n, urn)
+            else:
+                payload = RESPONSE_CACHE.get_or_fetch(cache_key("chapter", urn), lambda: fetch_payload(n, urn))
+            title = payload["title"]
+            paragraphs = [p.strip() for p in payload["paragraphs"] if p and str(p).strip()]
             if not paragraphs:
                 raise ValueError("空章节或未取到段落")
-            time.sleep(delay)
+            if misses is None or RESPONSE_CACHE.misses != misses:
+                time.sleep(delay)  # 全部命中缓存时无需限速
             return {
                 "chapter_no": n,
                 "chapter_title": title,
@@ -110,12 +151,15 @@ def fetch_chapter(n: int, delay: float = 0.8, retries: int = 1) -> Dict[str, Any
                 "paragraphs": paragraphs,
                 "source_url": url,
             }
+        except CacheMiss:
+            raise
         except Exception as e:
             last_err = e
             msg = str(e)
             # 硬性限流就不再重试，交给上层处理
             if "ERR_REQUEST_LIMIT" in msg or "达到请求限制" in msg:
                 raise
+            event("retry", chapter_no=n, attempt=attempt + 1, error=msg[:200])
             time.sleep(delay * (attempt + 1))
     raise RuntimeError(f"抓取第 {n} 回失败：{last_err}")
 
@@ -126,7 +170,7 @@ def to_paragraph_rows(item: Dict[str, Any]) -> List[Dict[str, Any]]:
     rows = []
     for idx, para in enumerate(item["paragraphs"], start=1):
         rows.append({
-            "book": "封神演義", # 【修改点 2】
+            "book": BOOK_NAME, # 【修改点 2】
             "chapter_no": item["chapter_no"],
             "chapter_title": item["chapter_title"],
             "para_index": idx,
@@ -142,7 +186,7 @@ def to_sentence_rows(item: Dict[str, Any]) -> List[Dict[str, Any]]:
     for pidx, para in enumerate(item["paragraphs"], start=1):
         for s in split_sentences(para):
             rows.append({
-                "book": "封神演義", # 【修改点 3】
+                "book": BOOK_NAME, # 【修改点 3】
                 "chapter_no": item["chapter_no"],
                 "chapter_title": item["chapter_title"],
                 "para_index": pidx,
@@ -154,46 +198,104 @@ def to_sentence_rows(item: Dict[str, Any]) -> List[Dict[str, Any]]:
             sidx += 1
     return rows
 
-def append_csv(path: str, rows: List[Dict[str, Any]]):
-    df = pd.DataFrame(rows)
-    file_exists = os.path.exists(path)
-    df.to_csv(path, mode="a" if file_exists else "w", index=False, encoding="utf-8-sig", header=not file_exists)
+def save_chapter(item: Dict[str, Any], store):
+    """写入一回的段落/句子行并更新 manifest（由存储后端保证原子性）。"""
+    store.write_chapter(item["chapter_no"], to_paragraph_rows(item), to_sentence_rows(item))
+
+def finish_store(store, args):
+    """收尾：sqlite 后端先把已抓取的回目导出为 CSV，再关闭存储。提前结束（额度 / 中断）时同样执行。"""
+    if args.store == "sqlite":
+        for path in store.export_csv():
+            print(f"已导出 CSV：{path}")
+    store.close()
+
+def run_concurrent(to_fetch: List[int], args, store) -> bool:
+    """并发抓取；按回目顺序落盘。返回 False 表示额度耗尽提前结束。"""
+    from fengshen_async_fetch import fetch_chapters_concurrently
 
-def load_manifest(mpath: str) -> Dict[str, Any]:
-    if os.path.exists(mpath):
-        with open(mpath, "r", encoding="utf-8") as f:
-            try:
-                return json.load(f)
-            except Exception:
-                pass
-    return {"fetched": [], "para_rows": 0, "sent_rows": 0}
+    pbar = tqdm(total=len(to_fetch), desc=f"Fetching chapters (x{args.concurrency})")
 
-def save_manifest(mpath: str, man: Dict[str, Any]):
-    with open(mpath, "w", encoding="utf-8") as f:
-        json.dump(man, f, ensure_ascii=False, indent=2)
+    def on_chapter(item):
+        save_chapter(item, store)
+        count("chapters")
+        count("paragraphs", len(item["paragraphs"]))
+        pbar.update(1)
+
+    def on_error(n, e):
+        store.checkpoint()
+        event("chapter_failed", chapter_no=n, error=str(e)[:200])
+        print(f"\n[警告] 第 {n} 回失败：{e}（已保存进度，继续下一回）")
+        pbar.update(1)
+
+    try:
+        stats = fetch_chapters_concurrently(
+            to_fetch, CH_URL, on_chapter, on_error,
+            api_base=args.api_base, remap=args.remap, concurrency=args.concurrency,
+            rate=args.rate, burst=args.burst, cache=RESPONSE_CACHE, language=LANGUAGE, apikey=args.apikey,
+        )
+    finally:
+        pbar.close()
+    count("api_calls", stats["api_calls"])
+    if stats["limit_hits"]:
+        event("rate_limited", hits=stats["limit_hits"])
+    print(f"[并发统计] API 调用 {stats['api_calls']} 次，耗时 {stats['elapsed']:.1f} 秒，"
+          f"约 {stats['api_calls'] / max(stats['elapsed'], 1e-9):.2f} 次/秒；限流 {stats['limit_hits']} 次")
+    return stats["completed"]
 
 def main():
     # 【修改点 4】: 更新脚本描述
     ap = argparse.ArgumentParser(description="CText《封神演义》抓取（断点续传版 v1.2）")
-    ap.add_argument("--chapters", type=str, default="", help="回目选择，如 '1-20,59,72-74'；默认 1-100")
+    ap.add_argument("--book", type=str, default=DEFAULT_BOOK, help="书目 slug（见 data/books.json）；默认封神演义")
+    ap.add_argument("--registry", type=str, default=DEFAULT_REGISTRY, help="书目登记表（JSON）")
+    ap.add_argument("--chapters", type=str, default="", help="回目选择，如 '1-20,59,72-74'；默认登记表中的全部回目")
     ap.add_argument("--outdir", type=str, default="./out", help="输出目录")
     ap.add_argument("--delay", type=float, default=0.8, help="API 调用间隔秒")
     ap.add_argument("--remap", type=str, default="", help="字符映射：留空=繁体，'gb'=简体")
+    ap.add_argument("--concurrency", type=int, default=1, help="并发抓取数；1=原顺序模式")
+    ap.add_argument("--rate", type=float, default=2.0, help="并发模式：共享令牌桶稳态速率（次/秒）")
+    ap.add_argument("--burst", type=int, default=2, help="并发模式：令牌桶容量（允许的突发请求数）")
+    ap.add_argument("--store", type=str, default="csv", choices=["csv", "sqlite"],
+                    help="存储后端：csv=原布局；sqlite=每回一个事务，结束时导出 CSV")
+    ap.add_argument("--cache-dir", type=str, default="", help="响应缓存目录；默认 <outdir>/ctext_cache")
+    ap.add_argument("--no-cache", action="store_true", help="禁用响应缓存")
+    ap.add_argument("--cache-ttl-days", type=float, default=90, help="缓存有效期（天）；0=永不过期")
+    ap.add_argument("--cache-max-mb", type=float, default=500, help="缓存大小上限（MB）；0=不限")
+    ap.add_argument("--offline", action="store_true", help="只用缓存，不访问网络（未命中即跳过该回）")
+    ap.add_argument("--rebuild", action="store_true", help="忽略 manifest，重新生成所选回目的段落/句子行（配合缓存不耗额度）")
+    ap.add_argument("--api-base", type=str, default="https://api.ctext.org", help="并发模式：API 根地址（可指向本地桩服务）")
+    ap.add_argument("--apikey", type=str, default=os.environ.get("CTEXT_APIKEY", ""),
+                    help="CText API key（默认取环境变量 CTEXT_APIKEY；留空=匿名额度）")
+    add_metrics_args(ap)
     args = ap.parse_args()
+    configure_from_args(args)
 
+    global RESPONSE_CACHE, REMAP, CH_URL, BOOK_NAME
+    try:
+        book = get_book(args.book, args.registry)
+    except ValueError as e:
+        ap.error(str(e))
+    CH_URL, BOOK_NAME = book.ch_url, book.name
     os.makedirs(args.outdir, exist_ok=True)
-    # 【修改点 5】: 更新输出文件名
-    para_path = os.path.join(args.outdir, "fengshen_paragraphs.csv")
-    sent_path = os.path.join(args.outdir, "fengshen_sentences.csv")
-    man_path  = os.path.join(args.outdir, "manifest.json")
+    if args.offline and args.no_cache:
+        ap.error("--offline 需要启用缓存")
+    if not args.no_cache:
+        RESPONSE_CACHE = ResponseCache(args.cache_dir or os.path.join(args.outdir, "ctext_cache"),
+                                       ttl_days=args.cache_ttl_days, max_mb=args.cache_max_mb,
+                                       offline=args.offline)
+    REMAP = args.remap
+    # 【修改点 5】: 输出文件名见 fengshen_chapter_store（fengshen_paragraphs.csv / fengshen_sentences.csv）
+    store = open_store(args.store, args.outdir)
 
-    setlanguage("zh")
+    setlanguage(LANGUAGE)
+    if args.apikey:
+        setapikey(args.apikey)
     if args.remap:
         setremap(args.remap)  # 'gb' -> 简体
 
-    requested = parse_range(args.chapters)
-    man = load_manifest(man_path)
-    fetched_set = set(man.get("fetched", []))  # 兼容历史旧格式
+    requested = parse_range(args.chapters, book.first, book.last)
+    fetched_set = store.fetched
+    if args.rebuild:
+        store.drop_chapters(requested)  # 先删旧行，避免重复
     to_fetch = [n for n in requested if n not in fetched_set]
 
     if len(requested) > 10:
@@ -203,39 +305,49 @@ def main():
     done_preview = sorted(fetched_set)[:10]
     print(f"已完成回目（跳过）：{done_preview if done_preview else []}")
 
-    try:
-        for n in tqdm(to_fetch, desc="Fetching chapters"):
-            try:
-                item = fetch_chapter(n, delay=args.delay)
-                para_rows = to_paragraph_rows(item)
-                sent_rows = to_sentence_rows(item)
-                append_csv(para_path, para_rows)
-                append_csv(sent_path, sent_rows)
-
-                # --- 更新 manifest（注意：list<->set 合法化） ---
-                fetched_set.add(n)
-                man["fetched"] = sorted(fetched_set)
-                man["para_rows"] = int(man.get("para_rows", 0)) + len(para_rows)
-                man["sent_rows"] = int(man.get("sent_rows", 0)) + len(sent_rows)
-                save_manifest(man_path, man)
-
-            except Exception as e:
-                msg = str(e)
-                save_manifest(man_path, man)
-                if "ERR_REQUEST_LIMIT" in msg or "达到请求限制" in msg:
+    with span("scrape", book=book.slug, requested=len(requested), to_fetch=len(to_fetch), concurrency=args.concurrency,
+              cache=RESPONSE_CACHE is not None) as root:
+        try:
+            if args.concurrency > 1:
+                if not run_concurrent(to_fetch, args, store):
+                    finish_store(store, args)
                     print("\n[额度限制] 达到请求上限，已保存进度（manifest.json / CSV）。下次重跑会自动续传剩余回目。")
                     return
-                else:
-                    print(f"\n[警告] 第 {n} 回失败：{msg}（已保存进度，继续下一回）")
-                    # 继续尝试后续回目；如需严格终止，可改为 raise
-                    continue
+                to_fetch = []
+
+            for n in tqdm(to_fetch, desc="Fetching chapters"):
+                try:
+                    with span("chapter", chapter_no=n) as s:
+                        item = fetch_chapter(n, delay=args.delay)
+                        save_chapter(item, store)
+                        s.count("paragraphs", len(item["paragraphs"]))
+                    root.count("chapters")
+                    root.count("paragraphs", len(item["paragraphs"]))
+                    root.count("api_calls", s.counters.get("api_calls", 0))
+
+                except Exception as e:
+                    msg = str(e)
+                    store.checkpoint()
+                    if "ERR_REQUEST_LIMIT" in msg or "达到请求限制" in msg:
+                        event("request_limit", chapter_no=n)
+                        finish_store(store, args)
+                        print("\n[额度限制] 达到请求上限，已保存进度（manifest.json / CSV）。下次重跑会自动续传剩余回目。")
+                        return
+                    else:
+                        print(f"\n[警告] 第 {n} 回失败：{msg}（已保存进度，继续下一回）")
+                        # 继续尝试后续回目；如需严格终止，可改为 raise
+                        continue
 
-        print(f"\n[完成] 已抓取：{len(fetched_set)} 回；段落累计 {man.get('para_rows',0)} 行，句子累计 {man.get('sent_rows',0)} 行。")
-        print(f"段落CSV：{para_path}\n句子CSV：{sent_path}\n清单：{man_path}")
+            print(f"\n[完成] 已抓取：{len(fetched_set)} 回；段落累计 {store.para_rows} 行，句子累计 {store.sent_rows} 行。")
+            if RESPONSE_CACHE is not None:
+                print(RESPONSE_CACHE.stats())
+                root.set(cache_hits=RESPONSE_CACHE.hits, cache_misses=RESPONSE_CACHE.misses)
+            print(store.describe())
+            finish_store(store, args)
 
-    except KeyboardInterrupt:
-        save_manifest(man_path, man)
-        print("\n[中断] 手动终止。已保存进度。")
+        except KeyboardInterrupt:
+            finish_store(store, args)
+            print("\n[中断] 手动终止。已保存进度（manifest.json / CSV）。")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+人物别名多模式匹配器（Aho-Corasick 自动机）
+- 从 OPTIMIZED_CHARACTER_WHITELIST.csv 读取 character_name + variant_1..variant_5
+- 所有别名一次性编译成自动机，每个句子只需线性扫描一遍
+- 最长匹配优先（leftmost-longest）：姜子牙 不会再额外触发 子牙；
+  若白名单里同时有 崇侯虎 与 侯虎，则 崇侯虎 内部的 侯虎 不再单独命中
+- 每个命中直接解析为规范人名（character_name）
+用法示例：
+  from fengshen_alias_matcher import load_alias_table, AliasMatcher
+  matcher = AliasMatcher(load_alias_table("out/OPTIMIZED_CHARACTER_WHITELIST.csv"))
+  matcher.find_canonical("姜子牙與黃飛虎同行")  # {'姜子牙', '黃飛虎'}
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+VARIANT_COLUMNS = [f"variant_{i}" for i in range(1, 6)]
+
+
+def load_alias_table(whitelist_path: str, encoding: str = "utf-8", sep: str = ",") -> Dict[str, str]:
+    """读取白名单 CSV，返回 {别名: 规范人名}；第一列为规范人名，本身也算一个别名。"""
+    import pandas as pd
+
+    df = pd.read_csv(whitelist_path, sep=sep, encoding=encoding)
+    return alias_table_from_df(df)
+
+
+def alias_table_from_df(df) -> Dict[str, str]:
+    """从白名单 DataFrame 构造 {别名: 规范人名}；同一别名先出现者优先（白名单按频次降序）。"""
+    alias_to_name: Dict[str, str] = {}
+    variant_cols = [c for c in VARIANT_COLUMNS if c in df.columns]
+    for _, row in df.iterrows():
+        name = row.iloc[0]
+        if not isinstance(name, str) or not name.strip():
+            continue
+        name = name.strip()
+        alias_to_name.setdefault(name, name)
+        for col in variant_cols:
+            alias = row[col]
+            if isinstance(alias, str) and alias.strip():
+                alias_to_name.setdefault(alias.strip(), name)
+    return alias_to_name
+
+
+class AliasMatcher:
+    """编译一次、反复使用的别名自动机。"""
+
+    TABLES = ("_goto", "_fail", "_out", "_dict_link", "_pattern_at")
+
+    def __init__(self, alias_to_name: Dict[str, str]):
+        self.alias_to_name = dict(alias_to_name)
+        # goto 表：每个状态一个 dict；out 存以该状态结尾的最长模式长度（0 表示无）
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[int] = [0]          # 本状态自身对应模式的长度
+        self._dict_link: List[int] = [0]    # 沿 fail 链最近的“有输出”状态
+        self._pattern_at: List[str] = [""]
+        for alias in self.alias_to_name:
+            self._add(alias)
+        self._build()
+
+    def state(self) -> Dict[str, object]:
+        """编译结果的普通数据（dict / list），可直接 pickle，加载时不依赖本类的模块路径。"""
+        return {"alias_to_name": self.alias_to_name, **{name: getattr(self, name) for name in self.TABLES}}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, object]) -> "AliasMatcher":
+        """由 state() 的结果还原，不重新编译。"""
+        m = cls.__new__(cls)
+        m.alias_to_name = state["alias_to_name"]
+        for name in cls.TABLES:
+            setattr(m, name, state[name])
+        return m
+
+    def _add(self, pattern: str):
+        s = 0
+        for ch in pattern:
+            nxt = self._goto[s].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[s][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(0)
+                self._dict_link.append(0)
+                self._pattern_at.append("")
+            s = nxt
+        self._out[s] = len(pattern)
+        self._pattern_at[s] = pattern
+
+    def _build(self):
+        # BFS 计算失败指针与输出链
+        queue = deque()
+        for ch, s in self._goto[0].items():
+            self._fail[s] = 0
+            queue.append(s)
+        while queue:
+            r = queue.popleft()
+            for ch, s in self._goto[r].items():
+                queue.append(s)
+                f = self._fail[r]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[s] = self._goto[f].get(ch, 0)
+                fs = self._fail[s]
+                self._dict_link[s] = fs if self._out[fs] else self._dict_link[fs]
+
+    def iter_all_matches(self, text: str) -> Iterable[Tuple[int, int, str]]:
+        """产出所有（可重叠的）命中 (start, end, alias)。"""
+        goto, fail, out, link, pat = self._goto, self._fail, self._out, self._dict_link, self._pattern_at
+        s = 0
+        for i, ch in enumerate(text):
+            while s and ch not in goto[s]:
+                s = fail[s]
+            s = goto[s].get(ch, 0)
+            t = s if out[s] else link[s]
+            while t:
+                yield i + 1 - out[t], i + 1, pat[t]
+                t = link[t]
+
+    def find_matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """最长匹配优先、互不重叠的命中列表 [(start, end, 规范人名)]。"""
+        if not isinstance(text, str) or not text:
+            return []
+        # 每个起点只保留最长的一个
+        longest_at: Dict[int, Tuple[int, str]] = {}
+        for start, end, alias in self.iter_all_matches(text):
+            prev = longest_at.get(start)
+            if prev is None or end > prev[0]:
+                longest_at[start] = (end, alias)
+        result = []
+        covered = 0
+        for start in sorted(longest_at):
+            end, alias = longest_at[start]
+            if start < covered:
+                continue
+            result.append((start, end, self.alias_to_name[alias]))
+            covered = end
+        return result
+
+    def find_canonical(self, text: str) -> Set[str]:
+        """句中出现的规范人名集合。"""
+        return {name for _, _, name in self.find_matches(text)}
+
+
+def naive_canonical(text: str, alias_to_name: Dict[str, str]) -> Set[str]:
+    """参考实现：逐个别名做子串判断（旧写法），用于对照检查。"""
+    if not isinstance(text, str):
+        return set()
+    return {name for alias, name in alias_to_name.items() if alias in text}
+
+
+def compare_with_naive(sentences: Iterable[str], matcher: AliasMatcher) -> List[Tuple[str, Set[str], Set[str]]]:
+    """返回自动机结果与参考实现不一致的句子 [(句子, 自动机, 参考)]，便于回归检查。"""
+    diffs = []
+    for sentence in sentences:
+        fast = matcher.find_canonical(sentence)
+        ref = naive_canonical(sentence, matcher.alias_to_name)
+        if fast != ref:
+            diffs.append((sentence, fast, ref))
+    return diffs
+
+
+if __name__ == "__main__":
+    # 固定样例自检：长名优先、别名归并
+    table = {"姜子牙": "姜子牙", "子牙": "姜子牙", "崇侯虎": "崇侯虎", "侯虎": "侯虎", "黃飛虎": "黃飛虎"}
+    m = AliasMatcher(table)
+    samples = {
+        "姜子牙與黃飛虎同行": {"姜子牙", "黃飛虎"},
+        "子牙曰：北伯侯崇侯虎來也": {"姜子牙", "崇侯虎"},
+        "侯虎大怒": {"侯虎"},
+        "無人": set(),
+    }
+    for text, expected in samples.items():
+        got = m.find_canonical(text)
+        print(f"{'OK ' if got == expected else 'ERR'} {text} -> {sorted(got)}")
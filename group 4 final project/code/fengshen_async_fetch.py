@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+"""
+CText 并发抓取器（asyncio + 令牌桶限流）
+- 所有 worker 共享一个令牌桶：稳态不超过 --rate 次/秒，允许 --burst 次突发
+- 共享 requests.Session（keep-alive 连接池），不再每次新建连接
+- 遇到 ERR_REQUEST_LIMIT：令牌桶速率减半并指数退避重试（AIMD），成功后缓慢恢复
+- 章节可乱序完成，但按请求顺序依次交给 on_chapter 落盘（CSV + manifest 顺序不变）；
+  额度耗尽提前停止时，空缺之后已完成的回目也照样落盘
+- 直接调用 CText HTTP API 的 readlink / gettext（/ gettextinfo）接口，与 ctext 库相同地附带 if=语言、remap、apikey；
+  api_base 可指向本地桩服务（fengshen_ctext_stub_server.py）离线测试
+- 可选 ResponseCache：URN 与原始章节内容命中缓存时不占令牌、不发请求（键与顺序模式共用）
+"""
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from fengshen_response_cache import MISS, CacheMiss, ResponseCache
+
+API_BASE = "https://api.ctext.org"
+
+
+class RequestLimitError(RuntimeError):
+    """CText 返回 ERR_REQUEST_LIMIT。"""
+
+
+def is_limit_error(msg: str) -> bool:
+    return "ERR_REQUEST_LIMIT" in msg or "达到请求限制" in msg
+
+
+class TokenBucket:
+    """asyncio 令牌桶；penalize/reward 实现自适应速率（乘性减、加性增）。"""
+
+    def __init__(self, rate: float, burst: int = 1, min_rate: Optional[float] = None):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = min_rate if min_rate is not None else self.max_rate / 16
+        self.capacity = max(1, int(burst))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def penalize(self):
+        self._refill()
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = min(self.tokens, 0.0)
+
+    def reward(self):
+        self._refill()
+        self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+
+class CTextClient:
+    """基于 Session 的 CText API 客户端（同步调用，由 asyncio.to_thread 并发执行）。"""
+
+    def __init__(self, api_base: str = API_BASE, remap: str = "", pool_size: int = 8, timeout: float = 15,
+                 language: str = "zh", apikey: str = ""):
+        self.api_base = api_base.rstrip("/")
+        self.remap = remap
+        self.language = language
+        self.apikey = apikey
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.calls = 0
+
+    def call(self, function: str, **params) -> Any:
+        # 与 ctext 库的 setapikey / setlanguage / setremap 一致
+        for key, value in (("apikey", self.apikey), ("if", self.language), ("remap", self.remap)):
+            if value:
+                params.setdefault(key, value)
+        self.calls += 1
+        r = self.session.get(f"{self.api_base}/{function}", params=params, timeout=self.timeout)
+        r.raise_for_status()
+        data = r.json() if "application/json" in r.headers.get("content-type", "") else json.loads(r.text)
+        if isinstance(data, dict) and "error" in data:
+            err = data["error"]
+            code = err.get("code", "") if isinstance(err, dict) else str(err)
+            desc = err.get("description", "") if isinstance(err, dict) else ""
+            if is_limit_error(code):
+                raise RequestLimitError(f"{code}: {desc}")
+            raise RuntimeError(f"{function} 出错：{code} {desc}")
+        return data
+
+    def close(self):
+        self.session.close()
+
+
+def parse_urn(res: Any) -> str:
+    """readlink 结果 -> URN，与 FengShenYanYi_txt.resolve_urn 的兼容逻辑一致。"""
+    if isinstance(res, dict):
+        urn = res.get("urn") or res.get("textRef") or res.get("link")
+        if not isinstance(urn, str):
+            urn = next((v for v in res.values() if isinstance(v, str) and v.startswith("ctp:")), None)
+        if not urn:
+            raise ValueError(f"readlink 返回无 URN: {res}")
+        return urn
+    return str(res)
+
+
+class AsyncChapterFetcher:
+    """并发抓取若干回目，按顺序回调落盘。"""
+
+    def __init__(self, client: CTextClient, ch_url: str, concurrency: int = 4,
+                 rate: float = 2.0, burst: int = 2, retries: int = 1, limit_retries: int = 4,
+                 backoff: float = 2.0, cache: Optional[ResponseCache] = None, language: str = "zh"):
+        self.client = client
+        self.cache = cache
+        self.language = language
+        self.ch_url = ch_url
+        self.concurrency = max(1, concurrency)
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.limit_retries = limit_retries
+        self.backoff = backoff
+        self.bucket: Optional[TokenBucket] = None
+        self.limit_hits = 0
+        self.consecutive_limits = 0  # 所有 worker 共享：连续限流次数，任一成功即清零
+
+    async def _api(self, function: str, **params) -> Any:
+        # 限流错误：速率减半 + 指数退避；连续限流超过 limit_retries 次视为额度耗尽，全体停止
+        while True:
+            if self.consecutive_limits > self.limit_retries:
+                raise RequestLimitError("ERR_REQUEST_LIMIT: 连续限流，判定额度耗尽")
+            await self.bucket.acquire()
+            try:
+                data = await asyncio.to_thread(self.client.call, function, **params)
+                self.consecutive_limits = 0
+                self.bucket.reward()
+                return data
+            except RequestLimitError:
+                self.limit_hits += 1
+                self.consecutive_limits += 1
+                self.bucket.penalize()
+                if self.consecutive_limits > self.limit_retries:
+                    raise
+                await asyncio.sleep(self.backoff * (2 ** (self.consecutive_limits - 1)))
+
+    async def _cached(self, kind: str, ref: str, fetch) -> Any:
+        """键 (kind, ref, language, remap) 与 FengShenYanYi_txt.cache_key 一致。"""
+        if self.cache is None:
+            return await fetch()
+        parts = (kind, ref, self.language, self.client.remap)
+        value = self.cache.lookup(parts)
+        if value is not MISS:
+            return value
+        value = await fetch()
+        self.cache.put(parts, value)
+        return value
+
+    async def _resolve(self, url: str) -> str:
+        return parse_urn(await self._api("readlink", url=url))
+
+    async def _paragraphs(self, urn: str, data: Dict[str, Any]) -> List[str]:
+        """gettext 结果的段落；没有 fulltext 时逐个子节展开（同 ctext.gettextasstring）。"""
+        paragraphs = list(data.get("fulltext") or [])
+        for sub in data.get("subsections") or []:
+            paragraphs.extend(await self._paragraphs(sub, await self._api("gettext", urn=sub)))
+        return paragraphs
+
+    async def _payload(self, n: int, urn: str) -> Dict[str, Any]:
+        """原始章节内容 {'title','paragraphs'}（未清洗）：gettext 取段落，结果不带标题时再查 gettextinfo。"""
+        data = await self._api("gettext", urn=urn)
+        title = data.get("title")
+        if not title:
+            try:
+                title = (await self._api("gettextinfo", urn=urn)).get("title")
+            except RequestLimitError:
+                raise
+            except Exception:
+                title = None
+        return {"title": title or f"第{n}回", "paragraphs": await self._paragraphs(urn, data)}
+
+    async def fetch_chapter(self, n: int) -> Dict[str, Any]:
+        """返回 {'chapter_no','chapter_title','urn','paragraphs','source_url'}"""
+        url = self.ch_url.format(n=n)
+        last_err = None
+        for attempt in range(self.retries + 1):
+            try:
+                urn = await self._cached("readlink", url, lambda: self._resolve(url))
+                payload = await self._cached("chapter", urn, lambda: self._payload(n, urn))
+                title = payload["title"]
+                paragraphs = [p.strip() for p in payload["paragraphs"] if p and str(p).strip()]
+                if not paragraphs:
+                    raise ValueError("空章节或未取到段落")
+                return {
+                    "chapter_no": n,
+                    "chapter_title": title,
+                    "urn": urn,
+                    "paragraphs": paragraphs,
+                    "source_url": url,
+                }
+            except (RequestLimitError, CacheMiss):
+                raise
+            except Exception as e:
+                last_err = e
+                await asyncio.sleep(self.backoff * (attempt + 1))
+        raise RuntimeError(f"抓取第 {n} 回失败：{last_err}")
+
+    async def run(self, chapters: List[int], on_chapter: Callable[[Dict[str, Any]], None],
+                  on_error: Callable[[int, Exception], None]) -> bool:
+        """抓取 chapters；按顺序调用 on_chapter。遇到额度耗尽返回 False：此时已完成的回目
+        （包括排在未完成回目之后的）也按请求顺序交给回调落盘，未完成的留待续传。"""
+        self.bucket = TokenBucket(self.rate, self.burst)
+        queue: asyncio.Queue = asyncio.Queue()
+        for pos, n in enumerate(chapters):
+            queue.put_nowait((pos, n))
+        results: Dict[int, Any] = {}
+        next_pos = 0
+        stop = asyncio.Event()
+
+        def flush():
+            # 只把连续完成的前缀交给回调，保证落盘顺序
+            nonlocal next_pos
+            while next_pos in results:
+                n, res = results.pop(next_pos)
+                if isinstance(res, Exception):
+                    on_error(n, res)
+                else:
+                    on_chapter(res)
+                next_pos += 1
+
+        async def worker():
+            while not stop.is_set():
+                try:
+                    pos, n = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    res: Any = await self.fetch_chapter(n)
+                except RequestLimitError:
+                    stop.set()
+                    return
+                except Exception as e:
+                    res = e
+                results[pos] = (n, res)
+                flush()
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        flush()
+        # 提前停止时前缀中有空缺：其后已完成的回目同样落盘（存储与 manifest 支持乱序回目）
+        for pos in sorted(results):
+            n, res = results.pop(pos)
+            if isinstance(res, Exception):
+                on_error(n, res)
+            else:
+                on_chapter(res)
+        return not stop.is_set()
+
+
+def fetch_chapters_concurrently(chapters: List[int], ch_url: str, on_chapter, on_error,
+                                api_base: str = API_BASE, remap: str = "", concurrency: int = 4,
+                                rate: float = 2.0, burst: int = 2, cache: Optional[ResponseCache] = None,
+                                language: str = "zh", apikey: str = "") -> Dict[str, Any]:
+    """同步入口：返回 {'completed': bool, 'api_calls', 'limit_hits', 'elapsed'}。"""
+    client = CTextClient(api_base=api_base, remap=remap, pool_size=concurrency, language=language, apikey=apikey)
+    fetcher = AsyncChapterFetcher(client, ch_url, concurrency=concurrency, rate=rate, burst=burst,
+                                  cache=cache, language=language)
+    start = time.time()
+    try:
+        completed = asyncio.run(fetcher.run(chapters, on_chapter, on_error))
+    finally:
+        client.close()
+    return {
+        "completed": completed,
+        "api_calls": client.calls,
+        "limit_hits": fetcher.limit_hits,
+        "elapsed": time.time() - start,
+    }
@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+"""
+性能基准：可缩放的合成语料 + 逐阶段计时 + JSON 基线对比
+- 合成语料与 fengshen_paragraphs.csv / fengshen_sentences.csv 同一格式（复用抓取脚本的行构造函数），
+  规模为原书的 1× / 10× / 100×（原书 100 回、约 1,560 段、59 万字）
+- 文本由参考语料（默认 ../data/fengshen_paragraphs.csv）的分句随机重组而成，段长、每回段数也取自参考语料；
+  人名密度（每千字出现次数，白名单全部别名）可调：低于原书时删去部分人名，高于原书时补插；
+  另可额外插入地名，以观察匹配类阶段的伸缩
+- 逐阶段计时：分词、人物发现、人物共现、OpenCC 繁简转换、情感打分、地点计数（jieba / 地名索引）；
+  每个阶段在全新的临时目录里运行，缓存一律是冷的；缺少可选依赖的阶段记为 skipped
+- 结果追加到 out/fengshen_benchmark.json；与上一次相同配置（规模、人名密度、进程数）的记录逐阶段对比，
+  变慢超过 --tolerance 即标记为回退，--fail-on-regression 时以退出码 1 结束
+用法示例：
+  python fengshen_benchmark.py --scales 1,10 --workers 4
+  python fengshen_benchmark.py --scales 1 --stages cooccurrence,places --name-density 20
+  python fengshen_benchmark.py --scales 1 --baseline baseline.json --fail-on-regression
+  python fengshen_benchmark.py generate --scales 100 --corpus-dir /tmp/fengshen_x100
+"""
+import argparse, contextlib, csv, json, os, platform, re, shutil, subprocess, tempfile, time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REFERENCE = os.path.join(CODE_DIR, "..", "data", "fengshen_paragraphs.csv")
+DEFAULT_WHITELIST = os.path.join(CODE_DIR, "..", "data", "OPTIMIZED_CHARACTER_WHITELIST.csv")
+DEFAULT_RESULTS = os.path.join("out", "fengshen_benchmark.json")
+DEFAULT_CORPUS_DIR = os.path.join("out", "benchmark_corpus")
+NOVEL_CHAPTERS = 100
+
+CLAUSE_PAT = re.compile(r"[^，。！？；：、\n]+[，。！？；：、]?")
+
+# 没有参考语料时使用的字表（常见文言用字）与段落形态
+FALLBACK_CHARS = "之不而人曰道子其王天有一大來此我者為見與將也了上下兵去何乃今日中出無可軍聽"
+FALLBACK_PARA_LENGTHS = (40, 120, 280, 540, 900, 1500)
+FALLBACK_PARAS_PER_CHAPTER = (12, 15, 16, 18)
+
+
+class CorpusProfile(NamedTuple):
+    clauses: List[str]           # 参考语料的分句（以逗号、句号等切开）
+    stripped: List[str]          # 去掉人名后的同一分句
+    has_name: np.ndarray         # 分句是否含人名
+    clause_lengths: np.ndarray
+    name_density: float          # 参考语料的人名密度（每千字）
+    para_lengths: np.ndarray     # 参考段长
+    paras_per_chapter: np.ndarray
+
+
+def corpus_profile(reference_csv: Optional[str] = DEFAULT_REFERENCE, names: Sequence[str] = (),
+                   seed: int = 0) -> CorpusProfile:
+    """以参考语料的分句为素材：随机重组分句即可得到用词、句长与原书相近的新文本
+    （逐字随机生成的文本几乎全是未登录词，jieba 会退化到 HMM，分词耗时与真实文本相差数十倍）。"""
+    from fengshen_alias_matcher import AliasMatcher
+
+    clauses, lengths, per_chapter = [], [], Counter()
+    if reference_csv and os.path.exists(reference_csv):
+        with open(reference_csv, "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                text = row["text"] or ""
+                clauses += CLAUSE_PAT.findall(text)
+                lengths.append(len(text))
+                per_chapter[row["chapter_no"]] += 1
+    else:
+        rng = np.random.default_rng(seed)
+        pool = list(FALLBACK_CHARS)
+        clauses = ["".join(rng.choice(pool, size=int(rng.integers(3, 9)))) + "，。"[i % 2] for i in range(5000)]
+        lengths, per_chapter = list(FALLBACK_PARA_LENGTHS), Counter(dict(enumerate(FALLBACK_PARAS_PER_CHAPTER)))
+    matcher = AliasMatcher({n: n for n in names}) if names else None
+    stripped, has_name, hits = [], [], 0
+    for c in clauses:
+        found = matcher.find_matches(c) if matcher else []
+        hits += len(found)
+        has_name.append(bool(found))
+        if found:
+            pieces, last = [], 0
+            for start, end, _ in found:
+                pieces.append(c[last:start])
+                last = end
+            c = "".join(pieces) + c[last:]
+        stripped.append(c)
+    total = sum(len(c) for c in clauses) or 1
+    return CorpusProfile(clauses, stripped, np.array(has_name), np.array([len(c) for c in clauses]),
+                         hits * 1000.0 / total, np.array(lengths), np.array(list(per_chapter.values())))
+
+
+def load_names(whitelist_csv: str = DEFAULT_WHITELIST) -> List[str]:
+    """白名单中的全部称呼（主名 + 别名），按出场频次排序。"""
+    from fengshen_alias_matcher import load_alias_table
+
+    return list(load_alias_table(whitelist_csv, encoding="utf-8-sig")) if os.path.exists(whitelist_csv) else []
+
+
+def generate_chapter(rng: np.random.Generator, profile: CorpusProfile, names: Sequence[str], places: Sequence[str],
+                     name_density: Optional[float], place_density: float) -> List[str]:
+    """生成一回的段落列表：按参考段长抽取分句拼接；人名密度低于原书时按比例删去分句中的人名，
+    高于原书时在分句前补插人名（主角多、配角少）；place_density 为额外插入的地名密度。"""
+    n_paras = int(rng.choice(profile.paras_per_chapter))
+    lengths = rng.choice(profile.para_lengths, size=n_paras)
+    natural = profile.name_density
+    name_density = natural if name_density is None else name_density
+    keep_p = min(name_density / natural, 1.0) if natural else 1.0
+    extra_names = max(name_density - natural, 0.0) if names else 0.0
+    name_p = 1.0 / np.arange(1, len(names) + 1) if names else None
+    if name_p is not None:
+        name_p /= name_p.sum()
+    mean_clause = float(profile.clause_lengths.mean())
+    paras = []
+    for length in lengths.tolist():
+        idx = rng.integers(0, len(profile.clauses), size=max(1, int(length / mean_clause * 1.5) + 2))
+        upto = int(np.searchsorted(np.cumsum(profile.clause_lengths[idx]), length)) + 1
+        idx = idx[:upto]
+        strip = profile.has_name[idx] & (rng.random(len(idx)) >= keep_p)
+        pieces = [profile.stripped[i] if s else profile.clauses[i] for i, s in zip(idx.tolist(), strip.tolist())]
+        for words, density, weights in ((names, extra_names, name_p), (places, place_density, None)):
+            if not words or density <= 0:
+                continue
+            k = int(rng.binomial(length, min(density / 1000.0, 1.0)))
+            at = rng.integers(0, len(pieces), size=k)
+            chosen = rng.choice(len(words), size=k, p=weights)
+            for a, w in zip(at.tolist(), chosen.tolist()):
+                pieces[a] = words[w] + pieces[a]
+        paras.append("".join(pieces))
+    return paras
+
+
+def generate_corpus(corpus_dir: str, scale: float, name_density: Optional[float] = None, place_density: float = 0.0,
+                    seed: int = 0, reference_csv: Optional[str] = DEFAULT_REFERENCE,
+                    whitelist_csv: str = DEFAULT_WHITELIST, verbose: bool = True) -> Dict[str, object]:
+    """写出 corpus_dir/out/ 下的段落、句子、全文 CSV（与抓取 / 流水线产物同格式）；参数相同时直接复用。"""
+    from FengShenYanYi_txt import to_paragraph_rows, to_sentence_rows
+    from fengshen_chapter_store import append_csv, write_json_atomic
+    from fengshen_pipeline import Stage, build_fulltext
+    from fengshen_place_analysis import create_fengshen_place_dict
+
+    outdir = os.path.join(corpus_dir, "out")
+    spec = {"scale": scale, "name_density": name_density, "place_density": place_density, "seed": seed,
+            "reference": os.path.abspath(reference_csv) if reference_csv and os.path.exists(reference_csv) else None}
+    spec_path = os.path.join(corpus_dir, "corpus.json")
+    if os.path.exists(spec_path):
+        with open(spec_path, "r", encoding="utf-8") as f:
+            info = json.load(f)
+        if info.get("spec") == spec:
+            return info
+    shutil.rmtree(outdir, ignore_errors=True)
+    os.makedirs(outdir)
+    names = load_names(whitelist_csv)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        places, dict_path = create_fengshen_place_dict(os.path.join(corpus_dir, "fengshen_place_dict.txt"))
+    profile = corpus_profile(reference_csv, names, seed)
+    rng = np.random.default_rng(seed)
+    n_chapters = max(1, int(round(NOVEL_CHAPTERS * scale)))
+    para_csv, sent_csv = os.path.join(outdir, "fengshen_paragraphs.csv"), os.path.join(outdir, "fengshen_sentences.csv")
+    stats = Counter()
+    start = time.perf_counter()
+    for n in range(1, n_chapters + 1):
+        paras = generate_chapter(rng, profile, names, places, name_density, place_density)
+        item = {"chapter_no": n, "chapter_title": f"第{n}回", "paragraphs": paras,
+                "source_url": f"synthetic://fengshen/{n}", "urn": f"synthetic:fengshen/{n}"}
+        para_rows, sent_rows = to_paragraph_rows(item), to_sentence_rows(item)
+        append_csv(para_csv, para_rows)
+        append_csv(sent_csv, sent_rows)
+        stats.update(paragraphs=len(para_rows), sentences=len(sent_rows), chars=sum(len(p) for p in paras))
+        if verbose and (n % 500 == 0 or n == n_chapters):
+            print(f"  生成 {n}/{n_chapters} 回，{stats['chars']:,} 字")
+    build_fulltext(corpus_dir, Stage("fulltext", ["out/fengshen_paragraphs.csv"], ["out/fengshen_fulltext.csv"]))
+    shutil.copyfile(whitelist_csv, os.path.join(outdir, "OPTIMIZED_CHARACTER_WHITELIST.csv"))
+    info = {"spec": spec, "chapters": n_chapters, **stats, "place_dict": dict_path,
+            "reference_name_density": round(profile.name_density, 2),
+            "generate_seconds": round(time.perf_counter() - start, 2)}
+    write_json_atomic(spec_path, info)
+    return info
+
+
+# ---- 各阶段 ----
+class BenchContext:
+    """一份语料及预先读入内存的列（计时不含 CSV 读取）。"""
+
+    def __init__(self, corpus_dir: str, workers: int = 1):
+        self.corpus_dir = os.path.abspath(corpus_dir)
+        self.out = os.path.join(self.corpus_dir, "out")
+        self.workers = workers
+        self.place_dict = os.path.join(self.corpus_dir, "fengshen_place_dict.txt")
+        self.fulltext = os.path.join(self.out, "fengshen_fulltext.csv")
+        self.whitelist = os.path.join(self.out, "OPTIMIZED_CHARACTER_WHITELIST.csv")
+        self.paragraphs, self.para_groups = self._read("fengshen_paragraphs.csv")
+        self.sentences, self.sent_groups = self._read("fengshen_sentences.csv")
+        self.para_chars = sum(len(t) for t in self.paragraphs)
+
+    def _read(self, name: str):
+        texts, groups = [], []
+        with open(os.path.join(self.out, name), "r", encoding="utf-8-sig", newline="") as f:
+            for row in csv.DictReader(f):
+                texts.append(row["text"])
+                groups.append(int(row["chapter_no"]))
+        return texts, groups
+
+
+def bench_segment(ctx: BenchContext) -> int:
+    from fengshen_segmentation import segment_texts
+
+    segment_texts(ctx.paragraphs, workers=ctx.workers, groups=ctx.para_groups, verbose=False)
+    return len(ctx.paragraphs)
+
+
+def bench_discover(ctx: BenchContext) -> int:
+    """阶段二的完整工作量：分词（冷缓存）+ 统计 nr 人名。"""
+    from fengshen_segmentation import segment_texts
+
+    names = Counter()
+    for words in segment_texts(ctx.paragraphs, workers=ctx.workers, groups=ctx.para_groups, verbose=False):
+        names.update(w for w, flag in words if flag == "nr" and len(w) > 1)
+    return len(ctx.paragraphs)
+
+
+def bench_cooccurrence(ctx: BenchContext) -> int:
+    from fengshen_alias_matcher import AliasMatcher, load_alias_table
+    from fengshen_cooccurrence import CooccurrenceTensor
+
+    matcher = AliasMatcher(load_alias_table(ctx.whitelist, encoding="utf-8-sig"))
+    CooccurrenceTensor.from_sentences(ctx.sent_groups, ctx.sentences, matcher)
+    return len(ctx.sentences)
+
+
+def bench_opencc(ctx: BenchContext) -> int:
+    from fengshen_normalized_text import normalize_views
+
+    normalize_views(ctx.sentences, groups=ctx.sent_groups, verbose=False)
+    return len(ctx.sentences)
+
+
+def bench_sentiment(ctx: BenchContext) -> int:
+    from fengshen_sentiment import score_texts
+
+    score_texts(ctx.sentences, workers=ctx.workers, store_path=None, verbose=False)
+    return len(ctx.sentences)
+
+
+def bench_places(ctx: BenchContext) -> int:
+    from fengshen_place_analysis import count_places_streaming, create_fengshen_place_dict
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        place_list, dict_path = create_fengshen_place_dict(ctx.place_dict)
+        count_places_streaming(ctx.fulltext, place_list, dict_path, workers=ctx.workers)
+    return len(set(ctx.para_groups))
+
+
+def bench_places_gazetteer(ctx: BenchContext) -> int:
+    from fengshen_gazetteer import count_by_chapter, load_gazetteer
+    from fengshen_place_analysis import iter_chapter_texts
+
+    gaz = load_gazetteer(ctx.place_dict, cache_path=None)
+    count_by_chapter(gaz, iter_chapter_texts(ctx.fulltext, clean=False))
+    return len(set(ctx.para_groups))
+
+
+# 阶段名 -> (函数, 计量单位, 该单位对应的字数取自哪一列)
+STAGES: Dict[str, tuple] = {
+    "segment": (bench_segment, "段", "paragraphs"),
+    "discover": (bench_discover, "段", "paragraphs"),
+    "cooccurrence": (bench_cooccurrence, "句", "sentences"),
+    "opencc": (bench_opencc, "句", "sentences"),
+    "sentiment": (bench_sentiment, "句", "sentences"),
+    "places": (bench_places, "回", "paragraphs"),
+    "places_gazetteer": (bench_places_gazetteer, "回", "paragraphs"),
+}
+
+
+@contextlib.contextmanager
+def fresh_workdir():
+    """在空的临时目录中运行（各模块默认的 out/*.sqlite 缓存都是冷的），结束后删除。"""
+    prev = os.getcwd()
+    tmp = tempfile.mkdtemp(prefix="fengshen_bench_")
+    os.chdir(tmp)
+    try:
+        yield tmp
+    finally:
+        os.chdir(prev)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def time_stage(name: str, ctx: BenchContext, repeat: int = 1) -> Dict[str, object]:
+    func, unit, _ = STAGES[name]
+    best = None
+    try:
+        for _ in range(max(repeat, 1)):
+            with fresh_workdir(), open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+                start = time.perf_counter()
+                items = func(ctx)
+                elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    except ImportError as e:
+        return {"status": "skipped", "reason": f"缺少依赖：{e.name or e}"}
+    return {"status": "ok", "seconds": round(best, 4), "items": items, "unit": unit,
+            "items_per_sec": round(items / best, 1) if best else None,
+            "chars_per_sec": round(ctx.para_chars / best) if best else None}
+
+
+# ---- 结果与对比 ----
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=CODE_DIR, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def load_results(path: str) -> Dict[str, list]:
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"runs": []}
+
+
+def same_config(a: dict, b: dict) -> bool:
+    keys = ("scale", "name_density", "place_density", "seed")
+    return all(a["corpus"]["spec"].get(k) == b["corpus"]["spec"].get(k) for k in keys) and a["workers"] == b["workers"]
+
+
+def compare(run: dict, baseline_runs: Sequence[dict], tolerance: float = 0.25) -> List[Dict[str, object]]:
+    """与最近一次同配置记录逐阶段对比：ratio = 本次耗时 / 基线耗时。"""
+    base = next((r for r in reversed(baseline_runs) if same_config(r, run)), None)
+    rows = []
+    for name, res in run["stages"].items():
+        prev = base["stages"].get(name) if base else None
+        if res.get("status") != "ok" or not prev or prev.get("status") != "ok":
+            rows.append({"stage": name, "seconds": res.get("seconds"), "baseline": None, "ratio": None, "regression": False})
+            continue
+        ratio = res["seconds"] / prev["seconds"] if prev["seconds"] else None
+        rows.append({"stage": name, "seconds": res["seconds"], "baseline": prev["seconds"],
+                     "ratio": round(ratio, 3) if ratio else None,
+                     "regression": bool(ratio and ratio > 1 + tolerance), "baseline_commit": base.get("commit")})
+    return rows
+
+
+def print_report(run: dict, rows: List[Dict[str, object]]):
+    c = run["corpus"]
+    print(f"\n规模 {c['spec']['scale']:g}×（{c['chapters']} 回，{c['paragraphs']:,} 段，{c['sentences']:,} 句，"
+          f"{c['chars']:,} 字），人名密度 {c['spec']['name_density'] or c['reference_name_density']}/千字，"
+          f"进程数 {run['workers']}")
+    print(f"{'阶段':<18}{'耗时(s)':>10}{'吞吐':>16}{'基线(s)':>10}{'比值':>8}")
+    for row in rows:
+        res = run["stages"][row["stage"]]
+        if res["status"] != "ok":
+            print(f"{row['stage']:<18}{'—':>10}  {res['reason']}")
+            continue
+        rate = f"{res['chars_per_sec']:,} 字/s"
+        base = f"{row['baseline']:.3f}" if row["baseline"] else "—"
+        ratio = f"{row['ratio']:.2f}" if row["ratio"] else "—"
+        flag = "  ⚠️ 回退" if row["regression"] else ""
+        print(f"{row['stage']:<18}{res['seconds']:>10.3f}{rate:>16}{base:>10}{ratio:>8}{flag}")
+
+
+def run_benchmarks(scales: Sequence[float], stages: Sequence[str], workers: int = 1,
+                   name_density: Optional[float] = None, place_density: float = 0.0, seed: int = 0, repeat: int = 1, corpus_root: str = DEFAULT_CORPUS_DIR,
+                   reference_csv: Optional[str] = DEFAULT_REFERENCE, results_path: str = DEFAULT_RESULTS,
+                   baseline_path: Optional[str] = None, tolerance: float = 0.25) -> List[Dict[str, object]]:
+    """逐规模生成语料、计时、对比并把本次记录追加到 results_path；返回所有对比行（含 scale 字段）。"""
+    history = load_results(results_path)
+    baseline_runs = load_results(baseline_path)["runs"] if baseline_path else history["runs"]
+    all_rows = []
+    for scale in scales:
+        density = "ref" if name_density is None else f"{name_density:g}"
+        corpus_dir = os.path.join(corpus_root, f"x{scale:g}_d{density}_p{place_density:g}_s{seed}")
+        print(f"📚 准备 {scale:g}× 合成语料：{corpus_dir}")
+        corpus = generate_corpus(corpus_dir, scale, name_density, place_density, seed, reference_csv)
+        ctx = BenchContext(corpus_dir, workers)
+        run = {"time": datetime.now().isoformat(timespec="seconds"), "commit": git_commit(),
+               "python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(),
+               "workers": workers, "repeat": repeat, "corpus": corpus, "stages": {}}
+        for name in stages:
+            print(f"  ⏱️  {name} ...", end="", flush=True)
+            run["stages"][name] = time_stage(name, ctx, repeat)
+            res = run["stages"][name]
+            print(f" {res['seconds']:.3f}s" if res["status"] == "ok" else f" 跳过（{res['reason']}）")
+        rows = compare(run, baseline_runs, tolerance)
+        print_report(run, rows)
+        history["runs"].append(run)
+        all_rows += [{**r, "scale": scale} for r in rows]
+    if results_path:
+        from fengshen_chapter_store import write_json_atomic
+
+        d = os.path.dirname(results_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        write_json_atomic(results_path, history)
+        print(f"\n💾 结果已追加到 {results_path}（共 {len(history['runs'])} 条记录）")
+    return all_rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="性能基准：合成语料 + 逐阶段计时 + 基线对比")
+    ap.add_argument("action", nargs="?", choices=["run", "generate"], default="run",
+                    help="run=生成语料并计时（默认）；generate=只生成语料")
+    ap.add_argument("--scales", type=str, default="1", help="语料规模（原书的倍数），逗号分隔，如 1,10,100")
+    ap.add_argument("--stages", type=str, default="all", help=f"逗号分隔；可选：{', '.join(STAGES)}")
+    ap.add_argument("--workers", type=int, default=1, help=f"分词 / 情感打分进程数；本机 {os.cpu_count()} 核")
+    ap.add_argument("--name-density", type=float, default=None, help="人名密度（每千字出现次数）；缺省与参考语料相同")
+    ap.add_argument("--place-density", type=float, default=0.0, help="额外插入的地名密度（每千字出现次数）")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=1, help="每个阶段重复次数，取最快一次")
+    ap.add_argument("--reference", type=str, default=DEFAULT_REFERENCE, help="提供字频 / 段长的参考段落 CSV")
+    ap.add_argument("--corpus-dir", type=str, default=DEFAULT_CORPUS_DIR, help="合成语料目录（按参数分子目录，可复用）")
+    ap.add_argument("--results", type=str, default=DEFAULT_RESULTS, help="结果 JSON（每次运行追加一条记录）")
+    ap.add_argument("--baseline", type=str, default="", help="对比用的基线 JSON（缺省为 --results 中的历史记录）")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="比基线慢超过该比例即视为回退")
+    ap.add_argument("--fail-on-regression", action="store_true", help="出现回退时以退出码 1 结束")
+    args = ap.parse_args()
+
+    scales = [float(s) for s in args.scales.split(",") if s.strip()]
+    if args.action == "generate":
+        for scale in scales:
+            d = args.corpus_dir if len(scales) == 1 else os.path.join(args.corpus_dir, f"x{scale:g}")
+            info = generate_corpus(d, scale, args.name_density, args.place_density, args.seed, args.reference)
+            print(f"✅ {d}: {info['chapters']} 回，{info['paragraphs']:,} 段，{info['sentences']:,} 句，{info['chars']:,} 字")
+        return
+    stages = list(STAGES) if args.stages == "all" else [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        ap.error(f"未知阶段：{', '.join(unknown)}")
+    rows = run_benchmarks(scales, stages, args.workers, args.name_density, args.place_density, args.seed,
+                          args.repeat, args.corpus_dir, args.reference, args.results, args.baseline or None,
+                          args.tolerance)
+    regressions = [r for r in rows if r["regression"]]
+    if regressions:
+        print("⚠️ 性能回退：" + "，".join(f"{r['stage']}@{r['scale']:g}× ×{r['ratio']:.2f}" for r in regressions))
+        if args.fail_on_regression:
+            raise SystemExit(1)
+
+
+# 分词 / 情感打分使用进程池，Windows 上以 spawn 方式启动，必须有 main 保护
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+书目登记表（多部小说按“分片”处理）
+- data/books.json 登记每部书：slug（CText 路径名）、显示名、回目范围、人物白名单、地名词典（路径相对登记表）
+- 每部书是一个分片：<根目录>/books/<slug>/ 下有自己的 out/，各分析脚本在分片目录里照常运行，互不干扰
+- 白名单在分片准备时复制到 out/OPTIMIZED_CHARACTER_WHITELIST.csv；没有白名单 / 地名词典的书跳过网络 / 地点阶段
+- merge_shards：各分片结果按 book 列纵向合并到 <根目录>/out/library/，另出跨书词频合计与书目概况
+用法示例：
+  python fengshen_books.py list
+  python fengshen_books.py merge --root library_run --books fengshen-yanyi xiyouji
+  python fengshen_pipeline.py --workdir library_run --books all --shards 2   # 流水线按分片并行
+"""
+import argparse, csv, json, os, shutil
+from collections import Counter, defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from fengshen_chapter_store import write_json_atomic
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_REGISTRY = os.path.join(CODE_DIR, "..", "data", "books.json")
+DEFAULT_BOOK = "fengshen-yanyi"
+SHARDS_DIR = "books"
+LIBRARY_DIR = os.path.join("out", "library")
+WHITELIST = os.path.join("out", "OPTIMIZED_CHARACTER_WHITELIST.csv")
+
+# 分片内的结果文件 -> 合并后的文件名（纵向合并，首列加 book）
+MERGED_OUTPUTS = [
+    ("out/fengshen_word_frequency.csv", "library_word_frequency.csv"),
+    ("out/fengshen_place_statistics.csv", "library_place_statistics.csv"),
+    ("out/potential_characters_freq.csv", "library_potential_characters.csv"),
+    ("fengshen_edges.csv", "library_edges.csv"),
+    ("out/fengshen_graph_metrics.csv", "library_graph_metrics.csv"),
+]
+
+
+class Book(NamedTuple):
+    slug: str
+    name: str
+    first: int
+    last: int
+    whitelist: Optional[str] = None      # 绝对路径；None 表示还没有人物白名单
+    gazetteer: Optional[str] = None      # jieba 词典格式的地名表
+    url: str = "https://ctext.org/{slug}/{n}/zh"
+
+    @property
+    def ch_url(self) -> str:
+        return self.url.replace("{slug}", self.slug)
+
+    def chapters(self) -> List[int]:
+        return list(range(self.first, self.last + 1))
+
+
+def load_registry(path: str = DEFAULT_REGISTRY) -> Dict[str, Book]:
+    """读取登记表，按登记顺序返回 {slug: Book}。"""
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)["books"]
+    base = os.path.dirname(os.path.abspath(path))
+    resolve = lambda p: os.path.normpath(os.path.join(base, p)) if p else None
+    books: Dict[str, Book] = {}
+    for e in entries:
+        first, last = e.get("chapters", [1, 100])
+        books[e["slug"]] = Book(e["slug"], e.get("name") or e["slug"], int(first), int(last),
+                                resolve(e.get("whitelist")), resolve(e.get("gazetteer")),
+                                e.get("url") or Book._field_defaults["url"])
+    return books
+
+
+def get_book(slug: str, path: str = DEFAULT_REGISTRY) -> Book:
+    books = load_registry(path)
+    if slug not in books:
+        raise ValueError(f"书目登记表中没有 '{slug}'（已登记：{', '.join(books)}）")
+    return books[slug]
+
+
+def select_books(slugs: Sequence[str], path: str = DEFAULT_REGISTRY) -> List[Book]:
+    """slugs 为空或含 'all' 时返回全部登记的书。"""
+    books = load_registry(path)
+    if not slugs or "all" in slugs:
+        return list(books.values())
+    unknown = [s for s in slugs if s not in books]
+    if unknown:
+        raise ValueError(f"书目登记表中没有：{', '.join(unknown)}（已登记：{', '.join(books)}）")
+    return [books[s] for s in slugs]
+
+
+def shard_dir(root: str, slug: str) -> str:
+    return os.path.join(root, SHARDS_DIR, slug)
+
+
+def prepare_shard(book: Book, root: str) -> str:
+    """建立分片目录并放入该书的人物白名单（内容未变时不重写，保持阶段指纹）。"""
+    shard = shard_dir(root, book.slug)
+    os.makedirs(os.path.join(shard, "out"), exist_ok=True)
+    if book.whitelist:
+        target = os.path.join(shard, WHITELIST)
+        if not os.path.exists(target) or not _same_file(book.whitelist, target):
+            shutil.copyfile(book.whitelist, target + ".tmp")
+            os.replace(target + ".tmp", target)
+    return shard
+
+
+def _same_file(a: str, b: str) -> bool:
+    if os.path.getsize(a) != os.path.getsize(b):
+        return False
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        return fa.read() == fb.read()
+
+
+# ---- 跨书合并 ----
+def _read_rows(path: str):
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        return header, list(reader)
+
+
+def _write_rows(path: str, header: List[str], rows):
+    with open(path + ".tmp", "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(header)
+        w.writerows(rows)
+    os.replace(path + ".tmp", path)
+
+
+def shard_summary(book: Book, shard: str) -> Dict:
+    """分片概况：已抓取回数、段落 / 句子行数、字数。"""
+    summary = {"book": book.name, "slug": book.slug, "chapters": 0, "paragraphs": 0, "sentences": 0, "chars": 0}
+    para_path = os.path.join(shard, "out", "fengshen_paragraphs.csv")
+    if os.path.exists(para_path):
+        with open(para_path, "r", encoding="utf-8-sig", newline="") as f:
+            chapters = set()
+            for row in csv.DictReader(f):
+                chapters.add(row["chapter_no"])
+                summary["paragraphs"] += 1
+                summary["chars"] += len(row["text"])
+        summary["chapters"] = len(chapters)
+    sent_path = os.path.join(shard, "out", "fengshen_sentences.csv")
+    if os.path.exists(sent_path):
+        with open(sent_path, "r", encoding="utf-8-sig", newline="") as f:
+            summary["sentences"] = max(sum(1 for _ in f) - 1, 0)
+    return summary
+
+
+def merge_shards(root: str, books: Sequence[Book], verbose: bool = True) -> List[str]:
+    """把各分片的结果按 book 列合并到 <root>/out/library/；缺少某个结果的分片跳过。返回写出的文件。"""
+    out_dir = os.path.join(root, LIBRARY_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for rel, merged_name in MERGED_OUTPUTS:
+        header, rows = None, []
+        for book in books:
+            path = os.path.join(shard_dir(root, book.slug), rel)
+            if not os.path.exists(path):
+                continue
+            h, body = _read_rows(path)
+            if h is None:
+                continue
+            if header is None:
+                header = h
+            elif h != header:
+                raise ValueError(f"{path} 的表头与其他分片不一致：{h} != {header}")
+            rows.extend([book.name, *r] for r in body)
+        if header is None:
+            continue
+        path = os.path.join(out_dir, merged_name)
+        _write_rows(path, ["book", *header], rows)
+        written.append(path)
+
+    # 跨书词频合计：总频次 + 出现在几部书里
+    totals, spread = Counter(), defaultdict(set)
+    freq_path = os.path.join(out_dir, "library_word_frequency.csv")
+    if freq_path in written:
+        _, rows = _read_rows(freq_path)
+        for book, word, freq in rows:
+            totals[word] += int(freq)
+            spread[word].add(book)
+        path = os.path.join(out_dir, "library_word_totals.csv")
+        _write_rows(path, ["Word", "Frequency", "Books"],
+                    ([w, n, len(spread[w])] for w, n in totals.most_common()))
+        written.append(path)
+
+    summaries = [shard_summary(b, shard_dir(root, b.slug)) for b in books]
+    path = os.path.join(out_dir, "library_books.csv")
+    _write_rows(path, list(summaries[0]) if summaries else ["book"], ([*s.values()] for s in summaries))
+    written.append(path)
+    write_json_atomic(os.path.join(out_dir, "library.json"), {"books": summaries})
+    if verbose:
+        for s in summaries:
+            print(f"📚 {s['book']}（{s['slug']}）：{s['chapters']} 回，{s['paragraphs']:,} 段，"
+                  f"{s['sentences']:,} 句，{s['chars']:,} 字")
+        print(f"💾 跨书合并结果已保存至: {out_dir}（{len(written)} 个文件）")
+    return written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="书目登记表：列出登记的书 / 合并各分片结果")
+    ap.add_argument("action", choices=["list", "merge"])
+    ap.add_argument("--registry", type=str, default=DEFAULT_REGISTRY, help="书目登记表（JSON）")
+    ap.add_argument("--root", type=str, default=".", help="分片根目录（其下 books/<slug>/）")
+    ap.add_argument("--books", nargs="*", default=[], help="要合并的书（slug）；默认全部")
+    args = ap.parse_args()
+
+    if args.action == "list":
+        for b in load_registry(args.registry).values():
+            extras = [label for label, p in (("白名单", b.whitelist), ("地名词典", b.gazetteer)) if p]
+            print(f"{b.slug:<16} {b.name:<6} 第 {b.first}–{b.last} 回  {b.ch_url}  {'、'.join(extras) or '-'}")
+        return
+    try:
+        books = select_books(args.books, args.registry)
+    except ValueError as e:
+        ap.error(str(e))
+    merge_shards(args.root, books)
+
+
+if __name__ == "__main__":
+    main()
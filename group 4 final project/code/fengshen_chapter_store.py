@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+抓取结果存储后端（可插拔）
+- csv   ：原有布局，fengshen_paragraphs.csv / fengshen_sentences.csv + manifest.json（manifest 改为原子替换写入）
+- sqlite：单个 fengshen_corpus.sqlite；每回的段落行、句子行与 manifest 记录在同一事务中提交，
+          崩溃后不会出现重复行或孤儿行；executemany 批量插入；主键即 (chapter_no, para_index, sentence_index) 索引
+- sqlite 可随时导出为原 CSV 布局，下游分析脚本无需改动
+用法示例：
+  python fengshen_chapter_store.py export --outdir ./out            # sqlite -> CSV
+  python fengshen_chapter_store.py import --outdir ./out            # 旧 CSV -> sqlite（迁移）
+"""
+import argparse, csv, json, os, sqlite3, time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Set
+
+COLUMNS = ["book", "chapter_no", "chapter_title", "para_index", "sentence_index", "source_url", "urn", "text"]
+PARA_CSV = "fengshen_paragraphs.csv"
+SENT_CSV = "fengshen_sentences.csv"
+MANIFEST = "manifest.json"
+SQLITE_DB = "fengshen_corpus.sqlite"
+
+
+def write_json_atomic(path: str, obj: Any):
+    """先写临时文件再 os.replace，避免写到一半留下损坏的 JSON。"""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def append_csv(path: str, rows: List[Dict[str, Any]]):
+    file_exists = os.path.exists(path)
+    with open(path, "a" if file_exists else "w", encoding="utf-8-sig" if not file_exists else "utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=COLUMNS, lineterminator="\n")
+        if not file_exists:
+            w.writeheader()
+        w.writerows(rows)
+
+
+def load_manifest(mpath: str) -> Dict[str, Any]:
+    if os.path.exists(mpath):
+        with open(mpath, "r", encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except Exception:
+                pass
+    return {"fetched": [], "para_rows": 0, "sent_rows": 0}
+
+
+class CsvChapterStore:
+    """原有 CSV + manifest.json 布局。"""
+
+    kind = "csv"
+
+    def __init__(self, outdir: str):
+        self.para_path = os.path.join(outdir, PARA_CSV)
+        self.sent_path = os.path.join(outdir, SENT_CSV)
+        self.man_path = os.path.join(outdir, MANIFEST)
+        self.man = load_manifest(self.man_path)
+        self.fetched: Set[int] = set(self.man.get("fetched", []))  # 兼容历史旧格式
+
+    @property
+    def para_rows(self) -> int:
+        return int(self.man.get("para_rows", 0))
+
+    @property
+    def sent_rows(self) -> int:
+        return int(self.man.get("sent_rows", 0))
+
+    def write_chapter(self, chapter_no: int, para_rows: List[Dict[str, Any]], sent_rows: List[Dict[str, Any]]):
+        append_csv(self.para_path, para_rows)
+        append_csv(self.sent_path, sent_rows)
+        # --- 更新 manifest（注意：list<->set 合法化） ---
+        self.fetched.add(chapter_no)
+        self.man["fetched"] = sorted(self.fetched)
+        self.man["para_rows"] = self.para_rows + len(para_rows)
+        self.man["sent_rows"] = self.sent_rows + len(sent_rows)
+        self.checkpoint()
+
+    def drop_chapters(self, chapters: Iterable[int]):
+        """从 CSV 与 manifest 中移除指定回目（重建前调用）。"""
+        drop = set(chapters)
+        counts = {}
+        for path in (self.para_path, self.sent_path):
+            kept = []
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                    kept = [r for r in csv.DictReader(f) if int(r["chapter_no"]) not in drop]
+                tmp = path + ".tmp"
+                with open(tmp, "w", encoding="utf-8-sig", newline="") as f:
+                    w = csv.DictWriter(f, fieldnames=COLUMNS, lineterminator="\n")
+                    w.writeheader()
+                    w.writerows(kept)
+                os.replace(tmp, path)
+            counts[path] = len(kept)
+        self.fetched -= drop
+        self.man["fetched"] = sorted(self.fetched)
+        self.man["para_rows"] = counts[self.para_path]
+        self.man["sent_rows"] = counts[self.sent_path]
+        self.checkpoint()
+
+    def checkpoint(self):
+        write_json_atomic(self.man_path, self.man)
+
+    def close(self):
+        self.checkpoint()
+
+    def describe(self) -> str:
+        return f"段落CSV：{self.para_path}\n句子CSV：{self.sent_path}\n清单：{self.man_path}"
+
+
+class SQLiteChapterStore:
+    """SQLite 事务存储：一回 = 一个事务。"""
+
+    kind = "sqlite"
+
+    def __init__(self, outdir: str, db_name: str = SQLITE_DB):
+        self.outdir = outdir
+        self.db_path = os.path.join(outdir, db_name)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self.fetched: Set[int] = {r[0] for r in self.conn.execute("SELECT chapter_no FROM chapters")}
+
+    def _create_schema(self):
+        cols = """book TEXT, chapter_no INTEGER NOT NULL, chapter_title TEXT,
+                  para_index INTEGER NOT NULL, sentence_index INTEGER NOT NULL,
+                  source_url TEXT, urn TEXT, text TEXT,
+                  PRIMARY KEY (chapter_no, para_index, sentence_index)"""
+        with self.conn:
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS paragraphs ({cols})")
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS sentences ({cols})")
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS chapters (
+                chapter_no INTEGER PRIMARY KEY, chapter_title TEXT, urn TEXT, source_url TEXT,
+                para_rows INTEGER, sent_rows INTEGER, fetched_at REAL)""")
+
+    def _totals(self):
+        row = self.conn.execute("SELECT COALESCE(SUM(para_rows),0), COALESCE(SUM(sent_rows),0) FROM chapters").fetchone()
+        return int(row[0]), int(row[1])
+
+    @property
+    def para_rows(self) -> int:
+        return self._totals()[0]
+
+    @property
+    def sent_rows(self) -> int:
+        return self._totals()[1]
+
+    def write_chapters(self, batch: Iterable[tuple]):
+        """批量写入 [(chapter_no, para_rows, sent_rows), ...]，整批一个事务。"""
+        placeholders = ",".join("?" * len(COLUMNS))
+        batch = list(batch)
+        with self.conn:
+            for chapter_no, para_rows, sent_rows in batch:
+                # 重写同一回时先清掉旧行，保证幂等
+                for table in ("paragraphs", "sentences"):
+                    self.conn.execute(f"DELETE FROM {table} WHERE chapter_no = ?", (chapter_no,))
+                self.conn.executemany(f"INSERT INTO paragraphs VALUES ({placeholders})",
+                                      ([r[c] for c in COLUMNS] for r in para_rows))
+                self.conn.executemany(f"INSERT INTO sentences VALUES ({placeholders})",
+                                      ([r[c] for c in COLUMNS] for r in sent_rows))
+                head = para_rows[0] if para_rows else {}
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO chapters VALUES (?,?,?,?,?,?,?)",
+                    (chapter_no, head.get("chapter_title"), head.get("urn"), head.get("source_url"),
+                     len(para_rows), len(sent_rows), time.time()),
+                )
+        self.fetched.update(chapter_no for chapter_no, _, _ in batch)
+
+    def write_chapter(self, chapter_no: int, para_rows: List[Dict[str, Any]], sent_rows: List[Dict[str, Any]]):
+        self.write_chapters([(chapter_no, para_rows, sent_rows)])
+
+    def drop_chapters(self, chapters: Iterable[int]):
+        drop = sorted(set(chapters))
+        with self.conn:
+            for table in ("paragraphs", "sentences", "chapters"):
+                self.conn.executemany(f"DELETE FROM {table} WHERE chapter_no = ?", ((n,) for n in drop))
+        self.fetched.difference_update(drop)
+
+    def checkpoint(self):
+        # 每回已独立提交，无需额外落盘
+        pass
+
+    def export_csv(self, outdir: str = "", chunk_size: int = 5000) -> List[str]:
+        """按 (chapter_no, para_index, sentence_index) 顺序导出原 CSV 布局，返回写出的文件路径。"""
+        outdir = outdir or self.outdir
+        written = []
+        for table, name in (("paragraphs", PARA_CSV), ("sentences", SENT_CSV)):
+            path = os.path.join(outdir, name)
+            cur = self.conn.execute(
+                f"SELECT {','.join(COLUMNS)} FROM {table} ORDER BY chapter_no, para_index, sentence_index")
+            with open(path, "w", encoding="utf-8-sig", newline="") as f:
+                w = csv.writer(f, lineterminator="\n")
+                w.writerow(COLUMNS)
+                while True:
+                    rows = cur.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    w.writerows(rows)
+            written.append(path)
+        p, s = self._totals()
+        write_json_atomic(os.path.join(outdir, MANIFEST),
+                          {"fetched": sorted(self.fetched), "para_rows": p, "sent_rows": s})
+        return written
+
+    def import_csv(self, outdir: str = "") -> int:
+        """把旧 CSV 布局导入数据库（按回分组，一回一个事务），返回导入的回数。"""
+        outdir = outdir or self.outdir
+        grouped: Dict[int, Dict[str, list]] = defaultdict(lambda: {"para": [], "sent": []})
+        for key, name in (("para", PARA_CSV), ("sent", SENT_CSV)):
+            path = os.path.join(outdir, name)
+            if not os.path.exists(path):
+                continue
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                for row in csv.DictReader(f):
+                    grouped[int(row["chapter_no"])][key].append(row)
+        # 旧 CSV 可能因中断而重复追加：按主键去重，后写者覆盖
+        for n in sorted(grouped):
+            dedup = {}
+            for kind in ("para", "sent"):
+                rows = {(r["para_index"], r["sentence_index"]): r for r in grouped[n][kind]}
+                dedup[kind] = list(rows.values())
+            self.write_chapter(n, dedup["para"], dedup["sent"])
+        return len(grouped)
+
+    def close(self):
+        self.conn.close()
+
+    def describe(self) -> str:
+        return f"SQLite：{self.db_path}"
+
+
+STORES = {"csv": CsvChapterStore, "sqlite": SQLiteChapterStore}
+
+
+def open_store(kind: str, outdir: str):
+    if kind not in STORES:
+        raise ValueError(f"未知存储后端：{kind}（可选：{', '.join(STORES)}）")
+    return STORES[kind](outdir)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="抓取结果 SQLite 存储：导出 / 导入 CSV")
+    ap.add_argument("action", choices=["export", "import"], help="export=sqlite->CSV，import=CSV->sqlite")
+    ap.add_argument("--outdir", type=str, default="./out", help="数据目录（sqlite 与 CSV 所在目录）")
+    args = ap.parse_args()
+
+    store = SQLiteChapterStore(args.outdir)
+    try:
+        if args.action == "export":
+            for path in store.export_csv():
+                print(f"已导出：{path}")
+        else:
+            n = store.import_csv()
+            print(f"已导入 {n} 回 -> {store.db_path}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
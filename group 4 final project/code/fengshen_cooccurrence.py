@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+"""
+逐回人物共现张量（稀疏矩阵栈）
+- 每一回一张 n×n 上三角稀疏矩阵（SciPy CSR），行列下标为人物 id（按人名排序，id 小者在前，
+  与 fengshen_edges.csv 中 Source < Target 的方向一致）
+- 预先计算前缀和 P[k] = 前 k 回之和，任意回目区间 [a, b] 的网络 = P[b] - P[a-1]，毫秒级完成
+- 落盘为 out/fengshen_cooccurrence.npz（COO 三元组 + 回目号 + 人名），可反复查询而不必重新扫描句子
+- 导出动态 GEXF（时间 = 回目），Gephi 时间轴 / 网页可以播放网络随回目的演变
+- 共现统一由稀疏关联矩阵计算：一次扫描得到 句子 × 人物 的 0/1 矩阵 X，共现 = XᵀX 的上三角；
+  段落 / 滑动 k 句窗口先用 0/1 归属矩阵把句子并成单元（G·X 再二值化），同样一次乘法得到，不必重新扫描语料。
+  X 落盘为 out/fengshen_incidence.npz，之后比较不同窗口大小只需读它
+- 情感并入网络：逐句分数 s 经同一个 X 汇总，人物 = Xᵀs，关系 = Xᵀ·diag(s)·X（连同计数、平方和），
+  得到每个人物 / 每条关系所在句子的情感均值、方差、句数与带符号权重 Σ(2s-1)，不再遍历文本
+用法示例：
+  from fengshen_cooccurrence import CooccurrenceTensor
+  t = CooccurrenceTensor.load("out/fengshen_cooccurrence.npz")
+  t.edges(1, 40)          # 截至第 40 回的人物关系（DataFrame: Source, Target, Weight）
+  t.edges(50, 60)         # 只看第 50–60 回
+  python fengshen_cooccurrence.py query --start 50 --end 60
+  python fengshen_cooccurrence.py gexf -o fengshen_dynamic.gexf --mode cumulative
+  python fengshen_cooccurrence.py granularity --granularity sentence paragraph window3 window5 window10
+"""
+import argparse, bisect, itertools, os, re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+from scipy import sparse
+
+DEFAULT_PATH = os.path.join("out", "fengshen_cooccurrence.npz")
+DEFAULT_INCIDENCE = os.path.join("out", "fengshen_incidence.npz")
+DEFAULT_GRANULARITIES = ["sentence", "paragraph", "window3"]
+
+
+def parse_granularity(spec: str) -> Tuple[str, int]:
+    """'sentence' / 'paragraph' / 'window<k>'（k 句滑动窗口）-> (类型, k)。"""
+    if spec in ("sentence", "paragraph"):
+        return spec, 1
+    m = re.fullmatch(r"window(\d+)", spec)
+    if not m or int(m.group(1)) < 1:
+        raise ValueError(f"未知共现粒度：{spec}（可选：sentence, paragraph, window<k>）")
+    return "window", int(m.group(1))
+
+
+def _binary(m: sparse.spmatrix) -> sparse.csr_matrix:
+    m = m.tocsr()
+    m.data[:] = 1
+    return m
+
+
+class Incidence:
+    """句子 × 人物 的 0/1 关联矩阵（行顺序即原文顺序），附每句所在的回目与段落编号。"""
+
+    def __init__(self, names: Sequence[str], chapter_nos: Sequence[int], matrix: sparse.spmatrix,
+                 para_ids: Optional[Sequence[int]] = None):
+        self.names = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.chapter_nos = np.asarray(chapter_nos, dtype=np.int64)
+        self.para_ids = None if para_ids is None else np.asarray(para_ids, dtype=np.int64)
+        self.matrix = _binary(matrix).astype(np.int64)
+
+    @classmethod
+    def from_texts(cls, chapter_nos: Iterable, texts: Iterable, matcher,
+                   para_nos: Optional[Iterable] = None) -> "Incidence":
+        """逐句做一次别名匹配；para_nos 为各句在本回中的段落号（有了才能按段落统计）。"""
+        names = sorted(set(matcher.alias_to_name.values()))
+        index = {name: i for i, name in enumerate(names)}
+        chapter_nos = np.asarray(list(chapter_nos), dtype=np.int64)
+        rows, cols = [], []
+        for r, text in enumerate(texts):
+            if not isinstance(text, str) or not text:
+                continue
+            for name in matcher.find_canonical(text):
+                rows.append(r)
+                cols.append(index[name])
+        x = sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(chapter_nos), len(names)))
+        para_ids = None
+        if para_nos is not None:
+            # 段落 = (回目, 段落号)，编号为连续整数
+            keys = np.stack([chapter_nos, np.asarray(list(para_nos), dtype=np.int64)], axis=1)
+            para_ids = np.unique(keys, axis=0, return_inverse=True)[1].ravel()
+        return cls(names, chapter_nos, x, para_ids)
+
+    def _chapter_runs(self) -> List[Tuple[int, int]]:
+        """同一回连续的行区间 [(起, 止)]。"""
+        n = len(self.chapter_nos)
+        cuts = np.flatnonzero(np.diff(self.chapter_nos)) + 1
+        bounds = np.concatenate(([0], cuts, [n])) if n else np.zeros(1, dtype=np.int64)
+        return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+    def grouping(self, spec: str) -> Optional[sparse.csr_matrix]:
+        """单元 × 句子 的 0/1 归属矩阵（sentence 粒度返回 None，即单元就是句子）。
+        窗口在每回内按 1 句步长滑动，不跨回；不足 k 句的回整体算一个窗口。"""
+        kind, k = parse_granularity(spec)
+        n = len(self.chapter_nos)
+        if kind == "sentence" or (kind == "window" and k == 1):
+            return None
+        if kind == "paragraph":
+            if self.para_ids is None:
+                raise ValueError("没有段落编号，无法按段落统计共现")
+            return sparse.csr_matrix((np.ones(n, dtype=np.int64), (self.para_ids, np.arange(n))),
+                                     shape=(int(self.para_ids.max()) + 1 if n else 0, n))
+        starts, lengths = [], []
+        for lo, hi in self._chapter_runs():
+            count = max(hi - lo - k + 1, 1)
+            starts.append(np.arange(lo, lo + count))
+            lengths.append(np.full(count, min(k, hi - lo)))
+        starts, lengths = np.concatenate(starts), np.concatenate(lengths)
+        rows = np.repeat(np.arange(len(starts)), lengths)
+        cols = np.repeat(starts, lengths) + (np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths))
+        return sparse.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)), shape=(len(starts), n))
+
+    def units(self, spec: str) -> sparse.csr_matrix:
+        """单元 × 人物 的 0/1 矩阵：人物在单元内任意一句出现即为 1。"""
+        g = self.grouping(spec)
+        return self.matrix if g is None else _binary(g @ self.matrix)
+
+    def cooccurrence(self, spec: str = "sentence") -> sparse.csr_matrix:
+        """全书共现（上三角，(i, j) 为两人同在的单元数）。"""
+        u = self.units(spec)
+        return sparse.triu(u.T @ u, k=1).tocsr()
+
+    def edges(self, spec: str = "sentence"):
+        """某粒度的边表（与 fengshen_edges.csv 同列名）。"""
+        import pandas as pd
+
+        m = self.cooccurrence(spec).tocoo()
+        order = np.lexsort((m.col, m.row))
+        return pd.DataFrame({
+            "Source": [self.names[i] for i in m.row[order]],
+            "Target": [self.names[j] for j in m.col[order]],
+            "Weight": m.data[order].astype(int),
+        }, columns=["Source", "Target", "Weight"])
+
+    # ---- 情感 ----
+    def _sentiment_moments(self, scores: Sequence[float]) -> List[np.ndarray]:
+        """逐句权重：有分数的句数、分数和、平方和、带符号和 Σ(2s-1)；NaN（未打分）的句子不计入。"""
+        s = np.asarray(scores, dtype=np.float64)
+        if len(s) != self.matrix.shape[0]:
+            raise ValueError(f"情感分数 {len(s)} 个，与句子数 {self.matrix.shape[0]} 不一致")
+        valid = ~np.isnan(s)
+        s = np.where(valid, s, 0.0)
+        return [valid.astype(np.float64), s, s ** 2, np.where(valid, 2 * s - 1, 0.0)]
+
+    @staticmethod
+    def _summarize(count, total, squares, signed) -> Dict[str, np.ndarray]:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.where(count > 0, total / count, np.nan)
+            var = np.where(count > 0, np.maximum(squares / count - mean ** 2, 0.0), np.nan)
+        return {"mean": mean, "var": var, "count": count.astype(np.int64), "signed": signed}
+
+    def node_sentiment(self, scores: Sequence[float]) -> Dict[str, np.ndarray]:
+        """每个人物（按 names 顺序）出场句子的情感均值 / 方差 / 句数 / 带符号和。"""
+        x = self.matrix.astype(np.float64)
+        return self._summarize(*(x.T @ w for w in self._sentiment_moments(scores)))
+
+    def edge_sentiment(self, scores: Sequence[float], sources: Sequence[str], targets: Sequence[str]) -> Dict[str, np.ndarray]:
+        """给定的关系（人名对，顺序不限）所在共现句的情感统计：每项一次 Xᵀ·diag(w)·X，再按下标整体取值。"""
+        x = self.matrix.astype(np.float64)
+        i = np.array([self.index[a] for a in sources], dtype=np.int64)
+        j = np.array([self.index[b] for b in targets], dtype=np.int64)
+        cols = []
+        for w in self._sentiment_moments(scores):
+            m = (x.T @ sparse.diags(w) @ x).tocsr()
+            cols.append(np.asarray(m[i, j]).ravel() if len(i) else np.zeros(0))
+        return self._summarize(*cols)
+
+    def tensor(self) -> "CooccurrenceTensor":
+        """句子粒度的逐回张量：每回一次 X_cᵀX_c。"""
+        chapters, matrices = [], []
+        order = np.argsort(self.chapter_nos, kind="stable")
+        sorted_chapters = self.chapter_nos[order]
+        for chapter in np.unique(sorted_chapters).tolist():
+            lo, hi = np.searchsorted(sorted_chapters, [chapter, chapter + 1])
+            x = self.matrix[order[lo:hi]]
+            m = sparse.triu(x.T @ x, k=1).tocsr()
+            if m.nnz:
+                chapters.append(chapter)
+                matrices.append(m)
+        return CooccurrenceTensor(self.names, chapters, matrices)
+
+    # ---- 持久化 ----
+    def save(self, path: str = DEFAULT_INCIDENCE):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        coo = self.matrix.tocoo()
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, names=np.array(self.names, dtype=str), chapter_nos=self.chapter_nos.astype(np.int32),
+                            para_ids=(self.para_ids if self.para_ids is not None else np.empty(0)).astype(np.int32),
+                            has_para=np.array(self.para_ids is not None), row=coo.row.astype(np.int32),
+                            col=coo.col.astype(np.int32))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INCIDENCE) -> "Incidence":
+        z = np.load(path)
+        names, chapter_nos = z["names"].tolist(), z["chapter_nos"]
+        x = sparse.csr_matrix((np.ones(len(z["row"]), dtype=np.int64), (z["row"], z["col"])),
+                              shape=(len(chapter_nos), len(names)))
+        return cls(names, chapter_nos, x, z["para_ids"] if bool(z["has_para"]) else None)
+
+
+class CooccurrenceTensor:
+    """chapters[k] 回的共现矩阵为 matrices[k]；prefix[k] 为前 k 回之和（prefix[0] 为零矩阵）。"""
+
+    def __init__(self, names: Sequence[str], chapters: Sequence[int], matrices: Sequence[sparse.csr_matrix]):
+        self.names = list(names)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        self.chapters = [int(c) for c in chapters]
+        self.matrices = [m.tocsr() for m in matrices]
+        n = len(self.names)
+        acc = sparse.csr_matrix((n, n), dtype=np.int64)
+        self.prefix = [acc]
+        for m in self.matrices:
+            acc = acc + m
+            self.prefix.append(acc)
+
+    # ---- 构建 ----
+    @classmethod
+    def from_sentences(cls, chapter_nos: Iterable, sentences: Iterable, matcher) -> "CooccurrenceTensor":
+        """逐句做别名匹配（matcher.find_canonical），同句出现的人物两两计数一次（即逐回 XᵀX）。"""
+        return Incidence.from_texts(chapter_nos, sentences, matcher).tensor()
+
+    # ---- 查询 ----
+    def range_matrix(self, start: Optional[int] = None, end: Optional[int] = None) -> sparse.csr_matrix:
+        """第 start–end 回（含两端）的共现矩阵；缺省为全书。"""
+        lo = 0 if start is None else bisect.bisect_left(self.chapters, start)
+        hi = len(self.chapters) if end is None else bisect.bisect_right(self.chapters, end)
+        if hi <= lo:
+            return self.prefix[0]
+        return self.prefix[hi] - self.prefix[lo]
+
+    def as_of(self, chapter: int) -> sparse.csr_matrix:
+        """截至某回的累计网络。"""
+        return self.range_matrix(None, chapter)
+
+    def edges(self, start: Optional[int] = None, end: Optional[int] = None):
+        """区间网络的边表（与 fengshen_edges.csv 同列名）。"""
+        import pandas as pd
+
+        m = self.range_matrix(start, end).tocoo()
+        keep = m.data > 0
+        return pd.DataFrame({
+            "Source": [self.names[i] for i in m.row[keep]],
+            "Target": [self.names[j] for j in m.col[keep]],
+            "Weight": m.data[keep].astype(int),
+        }, columns=["Source", "Target", "Weight"])
+
+    def first_appearance(self) -> Dict[str, int]:
+        """每个人物首次出现在共现关系中的回目。"""
+        first: Dict[str, int] = {}
+        for chapter, m in zip(self.chapters, self.matrices):
+            coo = m.tocoo()
+            for i in itertools.chain(coo.row, coo.col):
+                first.setdefault(self.names[i], chapter)
+        return first
+
+    # ---- 持久化 ----
+    def save(self, path: str = DEFAULT_PATH):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        k, rows, cols, data = [], [], [], []
+        for idx, m in enumerate(self.matrices):
+            coo = m.tocoo()
+            k.append(np.full(coo.nnz, idx, dtype=np.int32))
+            rows.append(coo.row.astype(np.int32))
+            cols.append(coo.col.astype(np.int32))
+            data.append(coo.data.astype(np.int64))
+        cat = lambda parts, dt: np.concatenate(parts) if parts else np.empty(0, dtype=dt)
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, names=np.array(self.names, dtype=str), chapters=np.array(self.chapters, dtype=np.int32),
+                            k=cat(k, np.int32), row=cat(rows, np.int32), col=cat(cols, np.int32), data=cat(data, np.int64))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "CooccurrenceTensor":
+        with np.load(path) as z:
+            # 每个数组只解压一次；按回目编号排序后逐回切片（save 写出时已有序，稳定排序几乎不花时间）
+            names, chapters = z["names"].tolist(), z["chapters"].tolist()
+            k, row, col, data = z["k"], z["row"], z["col"], z["data"]
+        order = np.argsort(k, kind="stable")
+        k, row, col, data = k[order], row[order], col[order], data[order]
+        bounds = np.searchsorted(k, np.arange(len(chapters) + 1), "left")
+        n = len(names)
+        matrices = [sparse.coo_matrix((data[a:b], (row[a:b], col[a:b])), shape=(n, n)).tocsr()
+                    for a, b in zip(bounds[:-1], bounds[1:])]
+        return cls(names, chapters, matrices)
+
+    # ---- 导出 ----
+    def write_gexf(self, path: str, mode: str = "cumulative"):
+        """动态 GEXF（timeformat=double，时间 = 回目）。
+        cumulative：边权为截至该回的累计次数，区间 [本回, 该边权下次变化的回)；
+        chapter   ：边权为该回内的次数，区间 [本回, 本回 + 1)。"""
+        if mode not in ("cumulative", "chapter"):
+            raise ValueError(f"未知模式：{mode}（可选：cumulative, chapter）")
+        last = (self.chapters[-1] + 1) if self.chapters else 1
+        first = self.first_appearance()
+        spells: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = {}
+        running: Dict[Tuple[int, int], int] = {}
+        for chapter, m in zip(self.chapters, self.matrices):
+            coo = m.tocoo()
+            for i, j, w in zip(coo.row.tolist(), coo.col.tolist(), coo.data.tolist()):
+                if mode == "chapter":
+                    spells.setdefault((i, j), []).append((chapter, chapter + 1, w))
+                    continue
+                # 只在边权变化时新开区间，并把上一段截止到本回
+                items = spells.setdefault((i, j), [])
+                if items:
+                    s, _, prev = items[-1]
+                    items[-1] = (s, chapter, prev)
+                running[(i, j)] = running.get((i, j), 0) + w
+                items.append((chapter, last, running[(i, j)]))
+        lines = [
+            '<?xml version="1.0" encoding="UTF-8"?>',
+            '<gexf xmlns="http://gexf.net/1.3" version="1.3">',
+            '  <graph mode="dynamic" defaultedgetype="undirected" timeformat="double">',
+            '    <attributes class="edge" mode="dynamic">',
+            '      <attribute id="weight" title="Weight" type="float"/>',
+            '    </attributes>',
+            '    <nodes>',
+        ]
+        for name in self.names:
+            if name in first:
+                lines.append(f'      <node id={quoteattr(name)} label={quoteattr(name)} start="{first[name]}"/>')
+        lines.append('    </nodes>')
+        lines.append('    <edges>')
+        for eid, ((i, j), items) in enumerate(sorted(spells.items())):
+            start = items[0][0]
+            total = items[-1][2] if mode == "cumulative" else sum(w for _, _, w in items)
+            lines.append(f'      <edge id="{eid}" source={quoteattr(self.names[i])} target={quoteattr(self.names[j])} '
+                         f'start="{start}" weight="{total}">')
+            lines.append('        <attvalues>')
+            for s, e, w in items:
+                lines.append(f'          <attvalue for="weight" value="{w}" start="{s}" endopen="{e}"/>')
+            lines.append('        </attvalues>')
+            if mode == "chapter":
+                lines.append('        <spells>')
+                for s, e, _ in items:
+                    lines.append(f'          <spell start="{s}" endopen="{e}"/>')
+                lines.append('        </spells>')
+            lines.append('      </edge>')
+        lines += ['    </edges>', '  </graph>', '</gexf>']
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def write_granularity_edges(incidence: Incidence, specs: Sequence[str], out_dir: str = "out",
+                            top: int = 20, verbose: bool = True) -> List[str]:
+    """每个粒度写一张边表 <out_dir>/fengshen_edges_<粒度>.csv；并打印与第一个粒度相比前 top 条关系的重合度。"""
+    import time
+
+    for spec in specs:
+        parse_granularity(spec)  # 先校验全部参数
+    os.makedirs(out_dir or ".", exist_ok=True)
+    written, base = [], None
+    for spec in specs:
+        start = time.perf_counter()
+        edges = incidence.edges(spec)
+        elapsed = time.perf_counter() - start
+        path = os.path.join(out_dir, f"fengshen_edges_{spec}.csv")
+        edges.to_csv(path + ".tmp", index=False, encoding="utf-8-sig")
+        os.replace(path + ".tmp", path)
+        written.append(path)
+        if not verbose:
+            continue
+        ranked = edges.sort_values("Weight", ascending=False, kind="stable").head(top)
+        pairs = set(zip(ranked["Source"], ranked["Target"]))
+        overlap = "" if base is None else f"，前 {top} 条与 {specs[0]} 重合 {len(pairs & base)}"
+        base = pairs if base is None else base
+        print(f"  {spec:<10} {len(edges):>6,} 条关系，总权重 {int(edges['Weight'].sum()):>8,}"
+              f"（{elapsed * 1000:.0f} ms）{overlap}  -> {path}")
+    return written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="逐回人物共现张量：区间查询 / 导出动态 GEXF / 多粒度共现边表")
+    ap.add_argument("action", choices=["query", "gexf", "granularity"],
+                    help="query=打印区间网络；gexf=导出动态 GEXF；granularity=由关联矩阵导出各粒度边表并对比")
+    ap.add_argument("--tensor", type=str, default=DEFAULT_PATH, help="张量文件（由人物网络阶段生成）")
+    ap.add_argument("--incidence", type=str, default=DEFAULT_INCIDENCE, help="句子 × 人物关联矩阵（由人物网络阶段生成）")
+    ap.add_argument("--granularity", nargs="+", default=DEFAULT_GRANULARITIES,
+                    help="共现粒度：sentence / paragraph / window<k>（k 句滑动窗口）")
+    ap.add_argument("--outdir", type=str, default="out", help="granularity 边表输出目录（fengshen_edges_<粒度>.csv）")
+    ap.add_argument("--start", type=int, default=None, help="起始回（含）")
+    ap.add_argument("--end", type=int, default=None, help="结束回（含）")
+    ap.add_argument("--top", type=int, default=20, help="query 打印前 N 条关系")
+    ap.add_argument("-o", "--output", type=str, default="fengshen_dynamic.gexf")
+    ap.add_argument("--mode", choices=["cumulative", "chapter"], default="cumulative")
+    args = ap.parse_args()
+
+    import time
+    if args.action == "granularity":
+        start = time.perf_counter()
+        incidence = Incidence.load(args.incidence)
+        print(f"已加载关联矩阵：{incidence.matrix.shape[0]:,} 句 × {len(incidence.names)} 人"
+              f"（{time.perf_counter() - start:.3f}s）")
+        try:
+            write_granularity_edges(incidence, args.granularity, args.outdir, top=args.top)
+        except ValueError as e:
+            ap.error(str(e))
+        return
+    start = time.perf_counter()
+    tensor = CooccurrenceTensor.load(args.tensor)
+    print(f"已加载 {len(tensor.names)} 个人物、{len(tensor.chapters)} 回（{time.perf_counter() - start:.3f}s）")
+    if args.action == "query":
+        start = time.perf_counter()
+        tensor.range_matrix(args.start, args.end)
+        elapsed = (time.perf_counter() - start) * 1000
+        edges = tensor.edges(args.start, args.end)
+        span = f"第 {args.start or tensor.chapters[0]}–{args.end or tensor.chapters[-1]} 回"
+        print(f"{span}：{len(edges)} 条关系（查询 {elapsed:.1f} ms）")
+        print(edges.sort_values("Weight", ascending=False).head(args.top).to_string(index=False))
+    else:
+        tensor.write_gexf(args.output, args.mode)
+        print(f"已导出动态 GEXF：{args.output}")
+
+
+if __name__ == "__main__":
+    main()
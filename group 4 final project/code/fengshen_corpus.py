@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+"""
+紧凑语料层：全书一块连续文本缓冲 + 整数偏移数组，所有脚本共用的读取接口
+- 由段落 CSV 一次性编译到 out/fengshen_corpus/<指纹>/，之后内存映射加载，多个进程共享同一份页缓存：
+    text.bin         全部段落正文（UTF-8）首尾相接
+    para_bounds.npy  每段在缓冲中的起止边界（int64，n+1 行：字节位置、字符位置）
+    para_keys.npy    每段 chapter_no, para_index, 元数据编号（int32；按回目、段落排序）
+    sent_spans.npy   每句在全书中的字符起止（int64）——句子是段落文本上的切片，不再单独存一份文本
+    sent_keys.npy    每句所在段落行号、sentence_index（int32，按回连续编号，与抓取器一致）
+    meta.json        元数据去重表 [book, chapter_title, source_url, urn]、各级条数、来源路径
+- 编译结果放在 out/ 下：输入 CSV 本身在 out/ 里时就在它旁边，否则在当前目录的 out/fengshen_corpus/
+  （不会写进 data/ 等受版本管理的目录）；也可用 cache_dir 指定
+- 段落 CSV（及旁边的句子 CSV）内容变化时按新指纹重新编译（写临时目录再改名，并行的阶段不会读到半成品）；
+  同一来源只保留最新的 KEEP_VERSIONS 个版本，正在被其他进程加载的上一版不会被删掉
+- fengshen_sentences.csv 因此变成可选：句子按抓取器同一规则（。！？!?；; 之后断开）由段落派生；
+  句子 CSV 存在时编译时逐句核对，内容与派生结果不一致则 read_table 改读该文件本身
+- read_table(path)：标准文件名（fengshen_paragraphs.csv / fengshen_sentences.csv）走紧凑语料，
+  元数据列是 pandas Categorical；其他路径照常 pd.read_csv
+用法示例：
+  from fengshen_corpus import load_corpus, read_table
+  corpus = load_corpus("out/fengshen_paragraphs.csv")
+  corpus.sentence(0); corpus.chapter_text(1)
+  df_sent = read_table("out/fengshen_sentences.csv", columns=["chapter_no", "text"])
+  python fengshen_corpus.py build --input out/fengshen_paragraphs.csv
+  python fengshen_corpus.py compare --input out/fengshen_paragraphs.csv   # 与 pd.read_csv 比较内存与耗时
+"""
+import argparse, csv, hashlib, json, os, re, shutil, time, uuid
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+DEFAULT_PARAGRAPHS = os.path.join("out", "fengshen_paragraphs.csv")
+CORPUS_DIR = "fengshen_corpus"
+FORMAT_VERSION = 2
+KEEP_VERSIONS = 2  # 同一来源保留的版本数：新版本 + 其他进程可能仍在加载的上一版
+LEVELS = {"fengshen_paragraphs.csv": "paragraphs", "fengshen_sentences.csv": "sentences"}
+META_COLUMNS = ["book", "chapter_title", "source_url", "urn"]
+COLUMNS = ["book", "chapter_no", "chapter_title", "para_index", "sentence_index", "source_url", "urn", "text"]
+
+# 与抓取器（FengShenYanYi_txt.split_sentences）相同的断句规则
+SPLIT_PAT = re.compile(r"(?<=[。！？!?；;])")
+
+
+def split_spans(text: str) -> List[tuple]:
+    """按断句规则切分，返回去掉首尾空白后的 (起, 止) 字符位置；空句丢弃。"""
+    spans, pos = [], 0
+    for piece in SPLIT_PAT.split(text):
+        start, end = pos, pos + len(piece)
+        pos = end
+        stripped = piece.strip()
+        if stripped:
+            lead = len(piece) - len(piece.lstrip())
+            spans.append((start + lead, start + lead + len(stripped)))
+    return spans
+
+
+def sentences_path(paragraphs_csv: str) -> str:
+    return os.path.join(os.path.dirname(paragraphs_csv), "fengshen_sentences.csv")
+
+
+def source_digest(path: str) -> str:
+    """段落 CSV 与旁边的句子 CSV（存在时）的内容指纹。"""
+    h = hashlib.sha256(f"v{FORMAT_VERSION}\0".encode("utf-8"))
+    for p in (path, sentences_path(path)):
+        if not os.path.exists(p):
+            continue
+        h.update(f"\0{os.path.basename(p)}\0".encode("utf-8"))
+        with open(p, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    return h.hexdigest()[:16]
+
+
+def default_cache_dir(paragraphs_csv: str) -> str:
+    """输入在 out/ 目录里时放在它旁边，否则放到当前目录的 out/ 下。"""
+    parent = os.path.dirname(os.path.abspath(paragraphs_csv))
+    if os.path.basename(parent) == "out":
+        return os.path.join(os.path.dirname(paragraphs_csv), CORPUS_DIR)
+    return os.path.join("out", CORPUS_DIR)
+
+
+def check_sentences(sentences_csv: str, derived: List[tuple]) -> Optional[bool]:
+    """句子 CSV 的 (chapter_no, sentence_index, text) 是否与由段落派生的一致；文件不存在返回 None。"""
+    if not os.path.exists(sentences_csv):
+        return None
+    try:
+        with open(sentences_csv, "r", encoding="utf-8-sig", newline="") as f:
+            rows = [(int(r["chapter_no"]), int(r["sentence_index"]), r.get("text") or "") for r in csv.DictReader(f)]
+    except (KeyError, TypeError, ValueError):
+        return False  # 列不全或无法解析：交给 pd.read_csv 按原样读取
+    return sorted(rows) == sorted(derived)
+
+
+# ---- 编译 ----
+def build_corpus(paragraphs_csv: str, target: str):
+    """把段落 CSV 编译到 target 目录（先写临时目录再改名）。"""
+    rows = []
+    with open(paragraphs_csv, "r", encoding="utf-8-sig", newline="") as f:
+        for r in csv.DictReader(f):
+            rows.append((int(r["chapter_no"]), int(r["para_index"]), r.get("text") or "",
+                         tuple(r.get(c) or "" for c in META_COLUMNS)))
+    rows.sort(key=lambda r: (r[0], r[1]))
+
+    meta_ids: Dict[tuple, int] = {}
+    para_keys = np.zeros((len(rows), 3), dtype=np.int32)
+    para_bounds = np.zeros((len(rows) + 1, 2), dtype=np.int64)
+    sent_spans, sent_keys, derived = [], [], []
+    chunks, pos, chars, chapter, sidx = [], 0, 0, None, 0
+    for i, (chapter_no, para_index, text, meta) in enumerate(rows):
+        para_keys[i] = (chapter_no, para_index, meta_ids.setdefault(meta, len(meta_ids)))
+        if chapter_no != chapter:
+            chapter, sidx = chapter_no, 0
+        for start, end in split_spans(text):
+            sidx += 1
+            sent_spans.append((chars + start, chars + end))
+            sent_keys.append((i, sidx))
+            derived.append((chapter_no, sidx, text[start:end]))
+        data = text.encode("utf-8")
+        chunks.append(data)
+        pos += len(data)
+        chars += len(text)
+        para_bounds[i + 1] = (pos, chars)
+    sentences_match = check_sentences(sentences_path(paragraphs_csv), derived)
+
+    tmp = f"{target}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(tmp)
+    with open(os.path.join(tmp, "text.bin"), "wb") as f:
+        f.writelines(chunks)
+    np.save(os.path.join(tmp, "para_bounds.npy"), para_bounds)
+    np.save(os.path.join(tmp, "para_keys.npy"), para_keys)
+    np.save(os.path.join(tmp, "sent_spans.npy"), np.array(sent_spans, dtype=np.int64).reshape(-1, 2))
+    np.save(os.path.join(tmp, "sent_keys.npy"), np.array(sent_keys, dtype=np.int32).reshape(-1, 2))
+    meta = {"version": FORMAT_VERSION, "source": os.path.abspath(paragraphs_csv), "digest": os.path.basename(target),
+            "meta": [list(m) for m in sorted(meta_ids, key=meta_ids.get)],
+            "paragraphs": len(rows), "sentences": len(sent_spans), "bytes": pos, "chars": chars,
+            "sentences_match": sentences_match}
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    try:
+        os.rename(tmp, target)
+    except OSError:  # 另一个进程已编译好同一版本
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+class Corpus:
+    """只读语料（内存映射）。段落按 (chapter_no, para_index) 排序。"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        text_path = os.path.join(path, "text.bin")
+        self.buf = (np.memmap(text_path, dtype=np.uint8, mode="r") if os.path.getsize(text_path)
+                    else np.zeros(0, dtype=np.uint8))  # 空文件无法映射
+        for name in ("para_bounds", "para_keys", "sent_spans", "sent_keys"):
+            setattr(self, name, np.load(os.path.join(path, name + ".npy"), mmap_mode="r"))
+        self.chapters = np.unique(self.para_keys[:, 0])
+
+    @property
+    def n_paragraphs(self) -> int:
+        return len(self.para_keys)
+
+    @property
+    def n_sentences(self) -> int:
+        return len(self.sent_keys)
+
+    def paragraph_bytes(self, i: int) -> memoryview:
+        """第 i 段的 UTF-8 字节（映射缓冲上的视图，不复制）。"""
+        return memoryview(self.buf[self.para_bounds[i, 0]:self.para_bounds[i + 1, 0]])
+
+    def paragraph(self, i: int) -> str:
+        return self.paragraph_bytes(i).tobytes().decode("utf-8")
+
+    def sentence(self, i: int) -> str:
+        p = int(self.sent_keys[i, 0])
+        base = int(self.para_bounds[p, 1])
+        start, end = self.sent_spans[i]
+        return self.paragraph(p)[start - base:end - base]
+
+    def full_text(self) -> str:
+        """全书正文（段落首尾相接）；字符位置与 para_bounds / sent_spans 一致。"""
+        return self.buf.tobytes().decode("utf-8")
+
+    def texts(self, level: str = "paragraphs") -> List[str]:
+        # 整块解码一次再按字符位置切片，比逐条解码快得多
+        full = self.full_text()
+        bounds = np.asarray(self.para_bounds[:, 1]).tolist()
+        if level == "paragraphs":
+            return [full[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+        return [full[a:b] for a, b in self.sent_spans.tolist()]
+
+    def chapter_nos(self, level: str = "paragraphs") -> np.ndarray:
+        if level == "paragraphs":
+            return np.asarray(self.para_keys[:, 0])
+        return np.asarray(self.para_keys[:, 0])[self.sent_keys[:, 0]]
+
+    def paragraph_range(self, chapter_no: int) -> range:
+        keys = np.asarray(self.para_keys[:, 0])
+        return range(int(np.searchsorted(keys, chapter_no, "left")), int(np.searchsorted(keys, chapter_no, "right")))
+
+    def chapter_text(self, chapter_no: int, sep: str = "\n") -> str:
+        return sep.join(self.paragraph(i) for i in self.paragraph_range(chapter_no))
+
+    def iter_chapters(self, sep: str = "\n") -> Iterator[tuple]:
+        """逐回产出 (chapter_no, 全文)。"""
+        for n in self.chapters.tolist():
+            yield n, self.chapter_text(n, sep)
+
+    def frame(self, level: str = "paragraphs", columns: Optional[Sequence[str]] = None):
+        """与原 CSV 同列的 DataFrame；元数据列为 Categorical（各行共享同一份字符串）。"""
+        import pandas as pd
+
+        columns = list(columns or COLUMNS)
+        para_rows = np.arange(self.n_paragraphs) if level == "paragraphs" else np.asarray(self.sent_keys[:, 0])
+        keys = np.asarray(self.para_keys)[para_rows]
+        data = {}
+        for col in columns:
+            if col in META_COLUMNS:
+                k = META_COLUMNS.index(col)
+                categories = [m[k] for m in self.meta["meta"]]
+                # 去重表里同一字符串可能出现多次（如同一书名），先映射到唯一类别
+                unique = list(dict.fromkeys(categories))
+                remap = np.array([unique.index(c) for c in categories], dtype=np.int32)
+                data[col] = pd.Categorical.from_codes(remap[keys[:, 2]] if len(remap) else keys[:, 2], unique)
+            elif col == "chapter_no":
+                data[col] = keys[:, 0]
+            elif col == "para_index":
+                data[col] = keys[:, 1]
+            elif col == "sentence_index":
+                data[col] = (np.zeros(len(keys), dtype=np.int32) if level == "paragraphs"
+                             else np.asarray(self.sent_keys[:, 1]))
+            elif col == "text":
+                data[col] = self.texts(level)
+            else:
+                raise KeyError(f"未知列：{col}")
+        return pd.DataFrame(data, columns=columns)
+
+    def nbytes(self) -> int:
+        return int(self.buf.nbytes + sum(getattr(self, n).nbytes
+                                         for n in ("para_bounds", "para_keys", "sent_spans", "sent_keys")))
+
+
+def prune_versions(root: str, source: str, current: str, keep: int = KEEP_VERSIONS):
+    """同一来源（source）的旧版本只保留最新的 keep 个（含 current）；其他来源的版本不动。"""
+    versions = []
+    for name in os.listdir(root):
+        meta_path = os.path.join(root, name, "meta.json")
+        if name == current or ".tmp-" in name or not os.path.exists(meta_path):
+            continue
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                if json.load(f).get("source") != source:
+                    continue
+        except (OSError, ValueError):
+            continue
+        versions.append((os.path.getmtime(meta_path), name))
+    for _, name in sorted(versions, reverse=True)[keep - 1:]:
+        shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+
+def load_corpus(paragraphs_csv: str = DEFAULT_PARAGRAPHS, verbose: bool = False,
+                cache_dir: Optional[str] = None) -> Corpus:
+    """加载（必要时先编译）与段落 CSV 当前内容对应的紧凑语料。"""
+    root = cache_dir or default_cache_dir(paragraphs_csv)
+    digest = source_digest(paragraphs_csv)
+    target = os.path.join(root, digest)
+    if not os.path.exists(os.path.join(target, "meta.json")):
+        os.makedirs(root, exist_ok=True)
+        start = time.perf_counter()
+        build_corpus(paragraphs_csv, target)
+        # 清理同一来源的更旧版本；上一版保留，其他进程可能正在加载它
+        prune_versions(root, os.path.abspath(paragraphs_csv), digest)
+        if verbose:
+            print(f"🗜️  已编译紧凑语料：{target}（{time.perf_counter() - start:.2f}s）")
+    return Corpus(target)
+
+
+def read_table(path: str, columns: Optional[Sequence[str]] = None):
+    """读取段落 / 句子表。标准文件名走紧凑语料（句子表不存在也可以），其他文件照常 pd.read_csv。"""
+    level = LEVELS.get(os.path.basename(path))
+    paragraphs_csv = os.path.join(os.path.dirname(path), "fengshen_paragraphs.csv")
+    corpus = load_corpus(paragraphs_csv) if level is not None and os.path.exists(paragraphs_csv) else None
+    # 句子 CSV 与段落派生的句子不一致（另行编辑过）时以该文件为准
+    if corpus is None or (level == "sentences" and corpus.meta.get("sentences_match") is False):
+        import pandas as pd
+        return pd.read_csv(path, usecols=list(columns) if columns else None)
+    return corpus.frame(level, columns)
+
+
+def compare(paragraphs_csv: str):
+    """与 pd.read_csv 比较加载耗时与内存（DataFrame 深度内存 vs 映射文件大小）。"""
+    import pandas as pd
+
+    sentences_csv = os.path.join(os.path.dirname(paragraphs_csv), "fengshen_sentences.csv")
+    load_corpus(paragraphs_csv)  # 编译不计入加载时间
+    start = time.perf_counter()
+    corpus = load_corpus(paragraphs_csv)
+    n_sent = corpus.n_sentences
+    t_corpus = time.perf_counter() - start
+    print(f"紧凑语料：{corpus.n_paragraphs:,} 段 / {n_sent:,} 句，映射 {corpus.nbytes() / 2 ** 20:.2f} MB，"
+          f"加载 {t_corpus * 1000:.1f} ms")
+    for level, path in (("paragraphs", paragraphs_csv), ("sentences", sentences_csv)):
+        if not os.path.exists(path):
+            continue
+        start = time.perf_counter()
+        df = pd.read_csv(path)
+        t_csv = time.perf_counter() - start
+        start = time.perf_counter()
+        view = corpus.frame(level)
+        t_frame = time.perf_counter() - start
+        mem_csv = df.memory_usage(deep=True).sum() / 2 ** 20
+        mem_frame = view.memory_usage(deep=True).sum() / 2 ** 20
+        same = len(df) == len(view) and df["text"].fillna("").astype(str).tolist() == view["text"].tolist()
+        print(f"  {level:<10} pd.read_csv {t_csv * 1000:8.1f} ms {mem_csv:8.2f} MB | "
+              f"frame() {t_frame * 1000:8.1f} ms {mem_frame:8.2f} MB | 文本一致: {'是' if same else '否'}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="紧凑语料层：编译 / 与 CSV 对比")
+    ap.add_argument("action", choices=["build", "compare"])
+    ap.add_argument("--input", type=str, default=DEFAULT_PARAGRAPHS, help="段落 CSV")
+    args = ap.parse_args()
+
+    if args.action == "build":
+        corpus = load_corpus(args.input, verbose=True)
+        print(f"{corpus.path}：{len(corpus.chapters)} 回，{corpus.n_paragraphs:,} 段，{corpus.n_sentences:,} 句，"
+              f"{corpus.meta['bytes'] / 2 ** 20:.2f} MB 正文")
+    else:
+        compare(args.input)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""
+本地 CText API 桩服务（离线测试并发抓取与限流处理）
+- 只实现真实 CText API 中抓取器用到的接口：/readlink、/gettext（title + fulltext 段落）、/gettextinfo
+- 章节内容来自已有的 fengshen_paragraphs.csv；没有则生成占位段落
+- 可模拟网络延迟、每秒请求上限与总额度，超限时返回 ERR_REQUEST_LIMIT
+- /stats 返回累计请求数、限流次数
+用法示例：
+  python fengshen_ctext_stub_server.py --paragraphs ../data/fengshen_paragraphs.csv --port 8765 --rps 5 --latency 0.2
+  python FengShenYanYi_txt.py --chapters 1-20 --outdir ./out_stub --concurrency 8 --rate 5 --api-base http://127.0.0.1:8765
+"""
+import argparse, csv, json, re, threading, time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+from urllib.parse import parse_qs, urlparse
+
+URL_PAT = re.compile(r"/([\w-]+)/(\d+)")
+
+
+def load_chapters(paragraphs_csv: str) -> Dict[int, Dict[str, object]]:
+    chapters: Dict[int, Dict[str, object]] = defaultdict(lambda: {"title": "", "fulltext": []})
+    with open(paragraphs_csv, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            ch = chapters[int(row["chapter_no"])]
+            ch["title"] = row.get("chapter_title") or ch["title"]
+            ch["fulltext"].append(row["text"])
+    return dict(chapters)
+
+
+def synthetic_chapters(n: int = 100) -> Dict[int, Dict[str, object]]:
+    return {
+        i: {"title": f"第{i}回", "fulltext": [f"第{i}回第{j}段。子牙曰：善。" for j in range(1, 21)]}
+        for i in range(1, n + 1)
+    }
+
+
+class StubState:
+    def __init__(self, chapters, book_slug: str, rps: float, quota: int, latency: float):
+        self.chapters = chapters
+        self.book_slug = book_slug
+        self.rps = rps
+        self.quota = quota
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.window: deque = deque()
+        self.requests = 0
+        self.limited = 0
+
+    def admit(self) -> bool:
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            while self.window and now - self.window[0] > 1.0:
+                self.window.popleft()
+            over_rate = self.rps > 0 and len(self.window) >= self.rps
+            over_quota = self.quota > 0 and self.requests > self.quota
+            if over_rate or over_quota:
+                self.limited += 1
+                return False
+            self.window.append(now)
+            return True
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # 支持 keep-alive
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def _send(self, payload, status: int = 200):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _chapter(self, urn: str):
+            m = re.match(rf"ctp:{re.escape(state.book_slug)}/(\d+)$", urn or "")
+            return state.chapters.get(int(m.group(1))) if m else None
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            q = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            func = parsed.path.strip("/")
+            if func == "stats":
+                return self._send({"requests": state.requests, "limited": state.limited})
+            if state.latency:
+                time.sleep(state.latency)
+            if not state.admit():
+                return self._send({"error": {"code": "ERR_REQUEST_LIMIT", "description": "stub request limit"}})
+            if func == "readlink":
+                m = URL_PAT.search(urlparse(q.get("url", "")).path)
+                if not m:
+                    return self._send({"error": {"code": "ERR_INVALID_URL", "description": q.get("url", "")}})
+                return self._send({"urn": f"ctp:{m.group(1)}/{m.group(2)}"})
+            if func in ("gettext", "gettextinfo"):
+                ch = self._chapter(q.get("urn", ""))
+                if ch is None:
+                    return self._send({"error": {"code": "ERR_INVALID_URN", "description": q.get("urn", "")}})
+                return self._send(ch if func == "gettext" else {"title": ch["title"]})
+            self._send({"error": {"code": "ERR_UNKNOWN_FUNCTION", "description": func}}, status=404)
+
+    return Handler
+
+
+def serve(chapters, host: str = "127.0.0.1", port: int = 8765, book_slug: str = "fengshen-yanyi",
+          rps: float = 0, quota: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    """创建（未启动）桩服务，调用方自行 serve_forever()/shutdown()。"""
+    state = StubState(chapters, book_slug, rps, quota, latency)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.state = state
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser(description="本地 CText API 桩服务")
+    ap.add_argument("--paragraphs", type=str, default="", help="段落 CSV；留空则生成占位章节")
+    ap.add_argument("--host", type=str, default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--book-slug", type=str, default="fengshen-yanyi")
+    ap.add_argument("--rps", type=float, default=0, help="每秒请求上限；0=不限")
+    ap.add_argument("--quota", type=int, default=0, help="总请求额度；0=不限")
+    ap.add_argument("--latency", type=float, default=0.2, help="每次请求模拟延迟（秒）")
+    args = ap.parse_args()
+
+    chapters = load_chapters(args.paragraphs) if args.paragraphs else synthetic_chapters()
+    server = serve(chapters, args.host, args.port, args.book_slug, args.rps, args.quota, args.latency)
+    print(f"桩服务已启动：http://{args.host}:{args.port} （{len(chapters)} 回，rps={args.rps}，quota={args.quota}）")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n[统计] 请求 {server.state.requests} 次，限流 {server.state.limited} 次")
+
+
+if __name__ == "__main__":
+    main()
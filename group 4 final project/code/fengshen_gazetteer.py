@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+地名词典（gazetteer）编译索引
+- 从 fengshen_place_dict.txt（jieba 用户词典格式：词 词频 词性）读取地名，编译成 Aho-Corasick 自动机
+  （复用 fengshen_alias_matcher.AliasMatcher），最长匹配优先；直接在原文上计数，不需要 jieba 全文分词
+- 编译结果缓存到 out/fengshen_gazetteer.pkl，以词典文件的 sha256 校验；词典不变就不再重建
+- 上下级关系：若某地名 = 另一个地名 + 方位/建筑后缀（城、城外、城門、之濱、大營……），
+  则后者是它的上级：西岐城外 -> 西岐城 -> 西岐；计数可逐级汇总到上级
+用法示例：
+  from fengshen_gazetteer import load_gazetteer
+  gaz = load_gazetteer("fengshen_place_dict.txt")
+  gaz.count("兵至西岐城外")                       # Counter({'西岐城外': 1})
+  gaz.rollup(gaz.count("兵至西岐城外"))           # {'西岐城外': 1, '西岐城': 1, '西岐': 1}
+  python fengshen_gazetteer.py fengshen_fulltext.csv --dict fengshen_place_dict.txt
+"""
+import argparse, hashlib, os, pickle
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fengshen_alias_matcher import AliasMatcher
+
+DEFAULT_CACHE = os.path.join("out", "fengshen_gazetteer.pkl")
+CACHE_VERSION = 2
+
+# 方位 / 建筑类后缀：地名去掉这些后缀后若仍是词典中的地名，即视为其下级
+LOCATIVE_SUFFIXES = (
+    "城", "城外", "城內", "城門", "門", "外", "內", "之內", "之上", "之濱", "之畔",
+    "頂", "腳", "東", "洞", "大營", "渡口", "皇宮", "王府",
+)
+
+
+def read_place_dict(dict_path: str) -> List[str]:
+    """读取 jieba 用户词典格式的地名表（每行第一列），保持顺序、去重。"""
+    places: Dict[str, None] = {}
+    with open(dict_path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if parts:
+                places.setdefault(parts[0], None)
+    return list(places)
+
+
+def build_hierarchy(places: Iterable[str], suffixes: Iterable[str] = LOCATIVE_SUFFIXES) -> Dict[str, Optional[str]]:
+    """{地名: 上级地名或 None}；上级取“去掉后缀后仍在词典中”的最长前缀。"""
+    place_set = set(places)
+    suffixes = sorted(set(suffixes), key=len)  # 后缀越短，前缀越长
+    parent: Dict[str, Optional[str]] = {}
+    for place in place_set:
+        parent[place] = None
+        for suffix in suffixes:
+            if len(place) > len(suffix) and place.endswith(suffix) and place[:-len(suffix)] in place_set:
+                parent[place] = place[:-len(suffix)]
+                break
+    return parent
+
+
+class Gazetteer:
+    """编译好的地名索引：自动机 + 上下级关系。"""
+
+    def __init__(self, places: List[str], fingerprint: str = "", matcher: Optional[AliasMatcher] = None,
+                 parent: Optional[Dict[str, Optional[str]]] = None):
+        self.places = list(places)
+        self.fingerprint = fingerprint
+        self.matcher = matcher or AliasMatcher({p: p for p in self.places})
+        self.parent = parent if parent is not None else build_hierarchy(self.places)
+
+    def ancestors(self, place: str) -> List[str]:
+        """由近到远的上级链：西岐城外 -> [西岐城, 西岐]"""
+        chain = []
+        p = self.parent.get(place)
+        while p is not None and p not in chain:
+            chain.append(p)
+            p = self.parent.get(p)
+        return chain
+
+    def root(self, place: str) -> str:
+        chain = self.ancestors(place)
+        return chain[-1] if chain else place
+
+    def count(self, text: str) -> Counter:
+        """原文直接计数（最长匹配优先，互不重叠）。"""
+        return Counter(place for _, _, place in self.matcher.find_matches(text))
+
+    def rollup(self, counts: Dict[str, int]) -> Counter:
+        """汇总计数：每个地名 = 自身 + 全部下级；西岐城外 的命中同时计入 西岐城、西岐。"""
+        total = Counter()
+        for place, n in counts.items():
+            total[place] += n
+            for p in self.ancestors(place):
+                total[p] += n
+        return total
+
+    def to_roots(self, counts: Dict[str, int]) -> Counter:
+        """把计数全部归并到最上级地名（不重复计数）。"""
+        total = Counter()
+        for place, n in counts.items():
+            total[self.root(place)] += n
+        return total
+
+
+def dict_fingerprint(dict_path: str) -> str:
+    with open(dict_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def load_gazetteer(dict_path: str, cache_path: Optional[str] = DEFAULT_CACHE, verbose: bool = False) -> Gazetteer:
+    """读取缓存的编译索引；词典内容变化（指纹不符）时重新编译并覆盖缓存。"""
+    fp = f"{CACHE_VERSION}:{dict_fingerprint(dict_path)}"
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                state = pickle.load(f)
+            if state.get("fingerprint") == fp:
+                if verbose:
+                    print(f"📦 使用已编译的地名索引: {cache_path}")
+                return Gazetteer(state["places"], fp, AliasMatcher.from_state(state["matcher"]), state["parent"])
+        except Exception:
+            pass
+    gaz = Gazetteer(read_place_dict(dict_path), fingerprint=fp)
+    if cache_path:
+        d = os.path.dirname(cache_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        tmp = cache_path + ".tmp"
+        # 只存普通数据（dict / list，自动机也以 AliasMatcher.state() 的形式保存），不依赖类的模块路径
+        state = {"places": gaz.places, "fingerprint": fp, "matcher": gaz.matcher.state(), "parent": gaz.parent}
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_path)
+    if verbose:
+        linked = sum(1 for p in gaz.parent.values() if p)
+        print(f"🛠️  已编译地名索引: {len(gaz.places)} 个地名，其中 {linked} 个有上级 -> {cache_path}")
+    return gaz
+
+
+def count_by_chapter(gaz: Gazetteer, chapters: Iterable[Tuple[object, str]]) -> Tuple[Dict[object, Counter], Counter]:
+    """[(chapter_no, 原文)] -> ({chapter_no: Counter}, 全书 Counter)；逐回处理，可直接接生成器。"""
+    per_chapter: Dict[object, Counter] = {}
+    total = Counter()
+    for chapter_no, text in chapters:
+        c = gaz.count(text if isinstance(text, str) else "")
+        per_chapter[chapter_no] = c
+        total.update(c)
+    return per_chapter, total
+
+
+def chapter_table(gaz: Gazetteer, per_chapter: Dict[object, Counter]):
+    """逐回明细表：回目、地名、上级、直接次数、含下级次数。"""
+    import pandas as pd
+
+    rows = []
+    for chapter_no, counts in per_chapter.items():
+        rolled = gaz.rollup(counts)
+        for place in sorted(rolled, key=lambda p: (-rolled[p], p)):
+            rows.append({
+                "chapter_no": chapter_no,
+                "place": place,
+                "parent": gaz.parent.get(place) or "",
+                "count": counts.get(place, 0),
+                "rollup_count": rolled[place],
+            })
+    return pd.DataFrame(rows, columns=["chapter_no", "place", "parent", "count", "rollup_count"])
+
+
+def main():
+    ap = argparse.ArgumentParser(description="地名词典编译索引：逐回 / 全书地名计数")
+    ap.add_argument("input_file", help="输入CSV文件路径（包含full_text列）")
+    ap.add_argument("--dict", type=str, default="fengshen_place_dict.txt", help="地名词典（jieba 用户词典格式）")
+    ap.add_argument("--cache", type=str, default=DEFAULT_CACHE, help="编译索引缓存路径")
+    ap.add_argument("-o", "--output", type=str, default="fengshen_place_by_chapter.csv", help="逐回明细输出路径")
+    args = ap.parse_args()
+
+    import pandas as pd
+    gaz = load_gazetteer(args.dict, args.cache, verbose=True)
+    df = pd.read_csv(args.input_file)
+    per_chapter, total = count_by_chapter(gaz, zip(df.get("chapter_no", df.index), df["full_text"]))
+    chapter_table(gaz, per_chapter).to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"💾 逐回明细已保存至: {args.output}")
+    for place, n in gaz.to_roots(total).most_common(10):
+        print(f"  {place}: {n:,} 次（含下级）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+结构化运行指标（JSON Lines）
+- span("名称")：可嵌套的阶段计时；结束时写出一行 JSON：耗时、计数器、吞吐（每秒）、属性、峰值内存、状态
+- s.count("sentences", n) / count("api_calls")：累加到当前阶段，结束时自动换算成 sentences_per_s 等
+- 峰值内存：rss_peak_mb 取进程最高常驻内存（resource，Windows 上没有）；开启 tracemalloc 后另记
+  本阶段 Python 分配峰值 mem_peak_mb（嵌套阶段的峰值会计入上层）；tracemalloc 会拖慢 2~3 倍，默认关闭
+- 可选 cProfile：为指定层级的阶段各写一个 .prof（默认第 1 层，即脚本根阶段之下的各阶段）
+- 未配置输出文件时所有调用都是空操作；配置来自 configure() 或环境变量
+  FENGSHEN_METRICS（jsonl 路径）、FENGSHEN_TRACEMALLOC=1、FENGSHEN_PROFILE_DIR，子进程（如流水线各阶段）自动继承
+用法示例：
+  from fengshen_metrics import add_metrics_args, configure_from_args, span
+  with span("network.cooccurrence", sentences=len(df)) as s:
+      ...
+      s.count("sentences", len(df)); s.set(edges=len(edges))
+  python FengShenYanYi_Sentiment_Network_Data_Prep.py --metrics out/logs/metrics.jsonl --trace-memory
+  python fengshen_metrics.py out/logs/metrics.jsonl          # 按阶段汇总
+"""
+import argparse, cProfile, json, os, socket, sys, threading, time, tracemalloc, uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_lock = threading.Lock()
+_local = threading.local()
+_config = {
+    "path": os.environ.get("FENGSHEN_METRICS") or None,
+    "tracemalloc": os.environ.get("FENGSHEN_TRACEMALLOC", "") not in ("", "0"),
+    "profile_dir": os.environ.get("FENGSHEN_PROFILE_DIR") or None,
+    "profile_depth": 1,
+    # 同一次流水线运行的各阶段共用 run_id，便于把子进程的记录归到一起
+    "run_id": os.environ.get("FENGSHEN_RUN_ID") or uuid.uuid4().hex[:12],
+}
+
+
+def configure(path: Optional[str] = None, trace_memory: Optional[bool] = None, profile_dir: Optional[str] = None,
+              profile_depth: Optional[int] = None, export_env: bool = False):
+    """设置输出位置与可选项；export_env=True 时写入环境变量，由之后启动的子进程继承。"""
+    if path is not None:
+        _config["path"] = path or None
+    if trace_memory is not None:
+        _config["tracemalloc"] = trace_memory
+    if profile_dir is not None:
+        _config["profile_dir"] = profile_dir or None
+    if profile_depth is not None:
+        _config["profile_depth"] = profile_depth
+    if _config["tracemalloc"] and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if export_env:
+        absolute = lambda p: os.path.abspath(p) if p else None  # 子进程的工作目录可能不同
+        env = {"FENGSHEN_METRICS": absolute(_config["path"]), "FENGSHEN_PROFILE_DIR": absolute(_config["profile_dir"]),
+               "FENGSHEN_TRACEMALLOC": "1" if _config["tracemalloc"] else None, "FENGSHEN_RUN_ID": _config["run_id"]}
+        for key, value in env.items():
+            if value:
+                os.environ[key] = value
+            else:
+                os.environ.pop(key, None)
+
+
+def enabled() -> bool:
+    return bool(_config["path"])
+
+
+def add_metrics_args(parser: argparse.ArgumentParser):
+    """给脚本的命令行加上 --metrics / --trace-memory / --profile-dir。"""
+    parser.add_argument("--metrics", type=str, default=None,
+                        help="运行指标 JSON Lines 输出路径（也可用环境变量 FENGSHEN_METRICS）")
+    parser.add_argument("--trace-memory", action="store_true", help="用 tracemalloc 记录各阶段 Python 内存峰值（较慢）")
+    parser.add_argument("--profile-dir", type=str, default=None, help="为各阶段写出 cProfile 结果（.prof）的目录")
+
+
+def configure_from_args(args):
+    configure(path=args.metrics, trace_memory=args.trace_memory or None, profile_dir=args.profile_dir)
+
+
+def _rss_peak_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)  # macOS 以字节计，Linux 以 KB 计
+
+
+def _stack() -> List["Span"]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def emit(record: Dict):
+    """追加一行 JSON（各进程以追加方式写同一文件，单行写入不会交错）。"""
+    path = _config["path"]
+    if not path:
+        return
+    line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+    with _lock:
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def _base(kind: str, name: str) -> Dict:
+    return {"ts": datetime.now().isoformat(timespec="milliseconds"), "kind": kind, "name": name,
+            "run_id": _config["run_id"], "pid": os.getpid(), "host": socket.gethostname(),
+            "script": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None}
+
+
+class Span:
+    """一个计时阶段；用作上下文管理器。"""
+
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = dict(attrs)
+        self.counters: Dict[str, float] = defaultdict(float)
+        self.parent: Optional[Span] = None
+        self.mem_peak = 0
+        self.profiler: Optional[cProfile.Profile] = None
+
+    @property
+    def path(self) -> str:
+        return f"{self.parent.path}/{self.name}" if self.parent else self.name
+
+    @property
+    def depth(self) -> int:
+        return self.parent.depth + 1 if self.parent else 0
+
+    def count(self, key: str, n: float = 1):
+        self.counters[key] += n
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        stack = _stack()
+        self.parent = stack[-1] if stack else None
+        stack.append(self)
+        if not enabled():
+            return self
+        if tracemalloc.is_tracing():
+            if self.parent is not None:
+                self.parent.mem_peak = max(self.parent.mem_peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        if _config["profile_dir"] and self.depth == _config["profile_depth"]:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:  # 已有其他分析器在运行
+                self.profiler = None
+        self.start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stack = _stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+        if not enabled():
+            return False
+        seconds = time.perf_counter() - self.start
+        record = _base("span", self.name)
+        record.update({"path": self.path, "depth": self.depth, "seconds": round(seconds, 4),
+                       "cpu_seconds": round(time.process_time() - self.cpu_start, 4),
+                       "status": "error" if exc_type else "ok"})
+        if exc_type:
+            record["error"] = f"{exc_type.__name__}: {exc}"
+        if self.counters:
+            record["counters"] = {k: (int(v) if float(v).is_integer() else v) for k, v in self.counters.items()}
+            record["rates"] = {f"{k}_per_s": round(v / seconds, 2) for k, v in self.counters.items() if seconds > 0}
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if tracemalloc.is_tracing():
+            self.mem_peak = max(self.mem_peak, tracemalloc.get_traced_memory()[1])
+            record["mem_peak_mb"] = round(self.mem_peak / 2 ** 20, 1)
+            if self.parent is not None:
+                self.parent.mem_peak = max(self.parent.mem_peak, self.mem_peak)
+            tracemalloc.reset_peak()
+        record["rss_peak_mb"] = _rss_peak_mb()
+        if self.profiler is not None:
+            self.profiler.disable()
+            os.makedirs(_config["profile_dir"], exist_ok=True)
+            prof = os.path.join(_config["profile_dir"], f"{self.path.replace('/', '.')}.{os.getpid()}.prof")
+            self.profiler.dump_stats(prof)
+            record["profile"] = prof
+        emit(record)
+        return False
+
+
+def span(name: str, **attrs) -> Span:
+    return Span(name, **attrs)
+
+
+def current() -> Optional[Span]:
+    stack = _stack()
+    return stack[-1] if stack else None
+
+
+def count(key: str, n: float = 1):
+    """累加到当前阶段（没有阶段时忽略）。"""
+    s = current()
+    if s is not None:
+        s.count(key, n)
+
+
+def event(name: str, **fields):
+    """一次性事件（如重试、限流），带上所在阶段路径。"""
+    if not enabled():
+        return
+    record = _base("event", name)
+    s = current()
+    record["path"] = s.path if s else None
+    record.update(fields)
+    emit(record)
+
+
+# ---- 汇总 ----
+def summarize(path: str, run_id: Optional[str] = None) -> List[Dict]:
+    """按阶段路径汇总：次数、总耗时、最大耗时、计数器合计、最高内存。"""
+    rows: Dict[str, Dict] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            rec = json.loads(line)
+            if rec.get("kind") != "span" or (run_id and rec.get("run_id") != run_id):
+                continue
+            row = rows.setdefault(rec["path"], {"path": rec["path"], "runs": 0, "seconds": 0.0, "max_seconds": 0.0,
+                                                "counters": defaultdict(float), "rss_peak_mb": 0, "mem_peak_mb": 0})
+            row["runs"] += 1
+            row["seconds"] += rec["seconds"]
+            row["max_seconds"] = max(row["max_seconds"], rec["seconds"])
+            for k, v in rec.get("counters", {}).items():
+                row["counters"][k] += v
+            row["rss_peak_mb"] = max(row["rss_peak_mb"], rec.get("rss_peak_mb") or 0)
+            row["mem_peak_mb"] = max(row["mem_peak_mb"], rec.get("mem_peak_mb") or 0)
+    return sorted(rows.values(), key=lambda r: -r["seconds"])
+
+
+def main():
+    ap = argparse.ArgumentParser(description="运行指标汇总（读取 JSON Lines）")
+    ap.add_argument("path", help="指标文件（jsonl）")
+    ap.add_argument("--run", type=str, default=None, help="只看某个 run_id")
+    args = ap.parse_args()
+
+    rows = summarize(args.path, args.run)
+    print(f"{'阶段':<48}{'次数':>5}{'总耗时(s)':>11}{'最高RSS(MB)':>12}  计数（每秒）")
+    for r in rows:
+        rates = "，".join(f"{k} {v:,.0f}（{v / r['seconds']:,.0f}/s）" if r["seconds"] else f"{k} {v:,.0f}"
+                         for k, v in r["counters"].items())
+        print(f"{r['path']:<48}{r['runs']:>5}{r['seconds']:>11.2f}{r['rss_peak_mb']:>12.1f}  {rates}")
+
+
+if __name__ == "__main__":
+    main()
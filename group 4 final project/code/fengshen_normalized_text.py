@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+规范化文本层：繁体 -> 简体（OpenCC）结果按段落/句子持久化
+- 以 sha256(原文) 为键，存放在 out/fengshen_normalized.sqlite；按“转换器指纹”（OpenCC 版本 + 配置）分组
+- 按回目成批转换：一回的所有文本用分隔符拼成一串，只调用一次 convert，再切回逐条结果
+- 每条记录附带字符偏移表：normalized[i] 对应 original[offsets[i]]；t2s 绝大多数是逐字替换，
+  长度不变时偏移表为恒等映射，不落盘（存 NULL）
+- 任何脚本都可以直接取原文或简体视图，不必再逐行 cc.convert
+用法示例：
+  from fengshen_normalized_text import normalize_texts, load_corpus_view
+  df_sent['text_simplified'] = normalize_texts(df_sent['text'], groups=df_sent['chapter_no'])
+  df = load_corpus_view("sentences")          # 同时带 text / text_simplified 两列
+  python fengshen_normalized_text.py warm --input out/fengshen_sentences.csv
+  python fengshen_normalized_text.py show --input out/fengshen_paragraphs.csv --chapter 1
+"""
+import argparse, hashlib, os, sqlite3
+from array import array
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_STORE = os.path.join("out", "fengshen_normalized.sqlite")
+DEFAULT_CONFIG = "t2s"
+SEP = "\x1e"  # ASCII 记录分隔符：OpenCC 原样保留，正文中不会出现
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def converter_fingerprint(config: str = DEFAULT_CONFIG) -> str:
+    """OpenCC 实现与版本 + 转换配置；升级 OpenCC 或换配置后自动重新转换。"""
+    from importlib import metadata
+    version = "unknown"
+    for dist in ("opencc", "opencc-python-reimplemented", "OpenCC"):
+        try:
+            version = f"{dist}=={metadata.version(dist)}"
+            break
+        except metadata.PackageNotFoundError:
+            continue
+    return hashlib.sha256(f"{version}\0{config}".encode("utf-8")).hexdigest()[:16]
+
+
+def offset_map(original: str, normalized: str) -> Optional[array]:
+    """normalized 每个字符 -> original 中的下标；长度相同（逐字转换）时返回 None 表示恒等映射。"""
+    if len(original) == len(normalized):
+        return None
+    offsets = array("i")
+    for tag, i1, i2, j1, j2 in SequenceMatcher(None, original, normalized, autojunk=False).get_opcodes():
+        if tag == "insert":
+            offsets.extend([i1] * (j2 - j1))
+        elif tag != "delete":
+            # equal / replace：按比例对齐（replace 两侧等长时即逐字对应）
+            span = i2 - i1
+            offsets.extend(i1 + (k * span) // (j2 - j1) for k in range(j2 - j1))
+    return offsets
+
+
+class NormalizedText(NamedTuple):
+    """一条文本的两种视图及偏移表。"""
+    original: str
+    normalized: str
+    offsets: Optional[array] = None
+
+    def to_original(self, start: int, end: int) -> Tuple[int, int]:
+        """把简体视图中的 [start, end) 换算为原文中的区间。"""
+        if self.offsets is None:
+            return start, end
+        if start >= end:
+            pos = self.offsets[start] if start < len(self.offsets) else len(self.original)
+            return pos, pos
+        return self.offsets[start], self.offsets[end - 1] + 1
+
+    def original_span(self, start: int, end: int) -> str:
+        s, e = self.to_original(start, end)
+        return self.original[s:e]
+
+
+def bulk_convert(converter, texts: Sequence[str]) -> List[str]:
+    """一次 convert 转换一批文本；若文本本身含分隔符则逐条转换。"""
+    if not texts:
+        return []
+    out = converter.convert(SEP.join(texts)).split(SEP)
+    if len(out) != len(texts):
+        out = [converter.convert(t) for t in texts]
+    return out
+
+
+class NormalizedStore:
+    """SQLite 持久化：normalized(conv_fp, text_hash) -> 简体文本 + 偏移表（int32 数组，恒等时为 NULL）"""
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        # 流水线中情感与网络阶段可能同时写入：等待锁而不是立即报错，WAL 让读写互不阻塞
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS normalized (
+                conv_fp TEXT NOT NULL, text_hash TEXT NOT NULL, normalized TEXT NOT NULL, offsets BLOB,
+                PRIMARY KEY (conv_fp, text_hash)) WITHOUT ROWID""")
+
+    def get_many(self, conv_fp: str, hashes: Iterable[str]) -> Dict[str, Tuple[str, Optional[bytes]]]:
+        found = {}
+        hashes = list(set(hashes))
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            q = (f"SELECT text_hash, normalized, offsets FROM normalized "
+                 f"WHERE conv_fp = ? AND text_hash IN ({','.join('?' * len(chunk))})")
+            for h, text, offsets in self.conn.execute(q, [conv_fp, *chunk]):
+                found[h] = (text, offsets)
+        return found
+
+    def put_many(self, conv_fp: str, items: Iterable[Tuple[str, str, Optional[array]]]):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO normalized VALUES (?,?,?,?)",
+                ((conv_fp, h, text, offsets.tobytes() if offsets is not None else None)
+                 for h, text, offsets in items),
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def _decode_offsets(blob: Optional[bytes]) -> Optional[array]:
+    if blob is None:
+        return None
+    offsets = array("i")
+    offsets.frombytes(blob)
+    return offsets
+
+
+def normalize_views(texts: Iterable, groups: Optional[Iterable] = None, config: str = DEFAULT_CONFIG,
+                    store_path: Optional[str] = DEFAULT_STORE, verbose: bool = True) -> List[NormalizedText]:
+    """逐条返回 NormalizedText；已转换过的直接读库，新文本按回目（groups）成批转换。非字符串视为空文本。"""
+    from opencc import OpenCC
+
+    texts = [t if isinstance(t, str) else "" for t in texts]
+    groups = list(groups) if groups is not None else [0] * len(texts)
+    fp = converter_fingerprint(config)
+    hashes = [text_hash(t) for t in texts]
+    store = NormalizedStore(store_path) if store_path else None
+    try:
+        cached = store.get_many(fp, hashes) if store else {}
+        missing: Dict = {}
+        seen = set(cached)
+        for h, t, g in zip(hashes, texts, groups):
+            if h not in seen:
+                seen.add(h)
+                missing.setdefault(g, {})[h] = t
+        n_missing = sum(len(v) for v in missing.values())
+        if verbose:
+            print(f"繁简缓存：共 {len(texts)} 条，需新转换 {n_missing} 条（{len(missing)} 回，转换器指纹 {fp}）")
+        if missing:
+            cc = OpenCC(config)
+            fresh = []
+            for by_hash in missing.values():
+                originals = list(by_hash.values())
+                for h, original, normalized in zip(by_hash, originals, bulk_convert(cc, originals)):
+                    fresh.append((h, normalized, offset_map(original, normalized)))
+            if store:
+                store.put_many(fp, fresh)
+            cached.update((h, (text, offsets.tobytes() if offsets is not None else None))
+                          for h, text, offsets in fresh)
+    finally:
+        if store:
+            store.close()
+    return [NormalizedText(t, cached[h][0], _decode_offsets(cached[h][1])) for h, t in zip(hashes, texts)]
+
+
+def normalize_texts(texts: Iterable, groups: Optional[Iterable] = None, config: str = DEFAULT_CONFIG,
+                    store_path: Optional[str] = DEFAULT_STORE, verbose: bool = True) -> List[str]:
+    """只要简体文本时的简便写法。"""
+    return [v.normalized for v in normalize_views(texts, groups, config, store_path, verbose)]
+
+
+def normalize_alias_table(alias_to_name: Dict[str, str], config: str = DEFAULT_CONFIG) -> Dict[str, str]:
+    """把 {别名: 规范人名} 的别名统一转成简体，便于在简体视图上匹配；规范人名保持原样。"""
+    from opencc import OpenCC
+
+    aliases = list(alias_to_name)
+    table: Dict[str, str] = {}
+    for alias, simplified in zip(aliases, bulk_convert(OpenCC(config), aliases)):
+        table.setdefault(simplified, alias_to_name[alias])
+    return table
+
+
+def load_corpus_view(level: str = "sentences", outdir: str = "out", store_path: Optional[str] = DEFAULT_STORE,
+                     verbose: bool = False):
+    """读取 fengshen_{level}.csv（经紧凑语料层），附加 text_simplified 列（来自缓存层）。"""
+    from fengshen_corpus import read_table
+
+    df = read_table(os.path.join(outdir, f"fengshen_{level}.csv"))
+    groups = df["chapter_no"] if "chapter_no" in df.columns else None
+    df["text_simplified"] = normalize_texts(df["text"], groups=groups, store_path=store_path, verbose=verbose)
+    return df
+
+
+def main():
+    ap = argparse.ArgumentParser(description="规范化文本层：预热缓存 / 查看原文与简体对照")
+    ap.add_argument("action", choices=["warm", "show"], help="warm=转换并写入缓存；show=打印某回的对照")
+    ap.add_argument("--input", type=str, default=os.path.join("out", "fengshen_sentences.csv"))
+    ap.add_argument("--store", type=str, default=DEFAULT_STORE, help="缓存数据库路径")
+    ap.add_argument("--chapter", type=int, default=1, help="show 时查看的回目")
+    args = ap.parse_args()
+
+    from fengshen_corpus import read_table
+    df = read_table(args.input)
+    if args.action == "show":
+        df = df[df["chapter_no"] == args.chapter]
+    views = normalize_views(df["text"], groups=df["chapter_no"], store_path=args.store)
+    if args.action == "warm":
+        changed = sum(1 for v in views if v.offsets is not None)
+        print(f"已缓存 {len(views)} 条；其中 {changed} 条长度有变化，已保存偏移表。")
+        return
+    for v in views:
+        print(f"原文：{v.original}\n简体：{v.normalized}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+# -*- coding: utf-8 -*-
+"""
+增量流水线（DAG）编排
+- 每个阶段声明输入、输出与所用脚本；依赖关系由“谁产出了我的输入”自动推出
+- 指纹 = 输入文件内容 + 脚本及其导入的本地模块内容 + 命令参数 的 sha256；与上次成功运行记录（out/pipeline_state.json）一致
+  且输出都在时跳过；上游重跑但产物内容没变，下游同样跳过
+- 互不依赖的阶段并行执行（--jobs），每个阶段的输出写入 out/logs/<阶段>.log，最后打印逐阶段耗时
+- 只改人物白名单时，只会重跑 network、graph、web 以及轻量的 candidates（新词候选对照白名单）；
+  分词、情感、新词统计（后缀数组）等不受影响
+- --books：多部书按分片处理（书目见 data/books.json），每部书在 <workdir>/books/<slug>/ 下独立增量构建，
+  分片之间并行（--shards），结束后各书结果按 book 列合并到 <workdir>/out/library/
+- --metrics 时各阶段（含子进程里的细分阶段）的耗时 / 计数 / 峰值内存写入同一个 JSON Lines 文件，共用 run_id
+阶段：
+  fetch（抓取，已有产物时不重跑）-> fulltext / segment -> tokens / discover / newwords / sentiment / network / places / wordfreq
+  -> candidates / graph（社区 / 中心性 / 布局）-> web
+用法示例：
+  python fengshen_pipeline.py                      # 增量构建全部阶段
+  python fengshen_pipeline.py --jobs 4 --workers 2 # 4 个阶段并行，分词 / 打分各 2 进程
+  python fengshen_pipeline.py --dry-run            # 只显示哪些阶段需要重跑及原因
+  python fengshen_pipeline.py --only network web --force network
+  python fengshen_pipeline.py --metrics out/logs/metrics.jsonl && python fengshen_metrics.py out/logs/metrics.jsonl
+  python fengshen_pipeline.py --workdir library_run --books all --shards 2 --jobs 2
+"""
+import argparse, ast, csv, hashlib, json, os, subprocess, sys, time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+from fengshen_books import DEFAULT_REGISTRY, Book, merge_shards, prepare_shard, select_books
+from fengshen_cooccurrence import DEFAULT_GRANULARITIES
+from fengshen_metrics import add_metrics_args, configure, span
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WEB_DIR = os.path.join(CODE_DIR, "..", "fengshen dh web")
+MAGIC_CSV = os.path.join(CODE_DIR, "..", "data", "fengshen_magic.csv")
+STATE_FILE = "pipeline_state.json"
+
+
+class Stage(NamedTuple):
+    name: str
+    inputs: List[str]                    # 相对 workdir
+    outputs: List[str]
+    command: Optional[List[str]] = None  # 以 python 运行的脚本及参数（脚本名相对 code 目录）
+    func: Optional[Callable] = None      # 或者：进程内函数 func(workdir, stage)
+    source: bool = False                 # 源头阶段（如网络抓取）：只在产物缺失或 --force 时运行
+    description: str = ""
+    after: List[str] = []                # 仅排序的依赖：共享缓存先由上游预热，但不计入指纹
+
+    def code_files(self) -> List[str]:
+        """入口脚本及其（递归）导入的本地模块：改了 fengshen_segmentation 等共享模块，下游同样重跑。"""
+        script = os.path.join(CODE_DIR, self.command[0]) if self.command else os.path.abspath(__file__)
+        return local_imports(script)
+
+
+_LOCAL_IMPORTS: Dict[str, List[str]] = {}
+
+
+def local_imports(script: str) -> List[str]:
+    """script 本身 + 它直接或间接 import 的 code 目录下模块（按 AST 解析，不执行导入），结果有序且去重。"""
+    if script in _LOCAL_IMPORTS:
+        return _LOCAL_IMPORTS[script]
+    seen, stack = [], [script]
+    while stack:
+        path = stack.pop()
+        if path in seen or not os.path.exists(path):
+            continue
+        seen.append(path)
+        with open(path, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            stack.extend(os.path.join(CODE_DIR, name.split(".")[0] + ".py") for name in names)
+    _LOCAL_IMPORTS[script] = [seen[0]] + sorted(seen[1:])
+    return _LOCAL_IMPORTS[script]
+
+
+# ---- 进程内阶段 ----
+def build_fulltext(workdir: str, stage: Stage):
+    """段落 CSV -> 每回一行的全文 CSV（chapter_no, full_text），供词频与地点分析使用。"""
+    from fengshen_corpus import load_corpus
+    corpus = load_corpus(os.path.join(workdir, stage.inputs[0]))
+    path = os.path.join(workdir, stage.outputs[0])
+    with open(path + ".tmp", "w", encoding="utf-8-sig", newline="") as f:
+        w = csv.writer(f, lineterminator="\n")
+        w.writerow(["chapter_no", "full_text"])
+        w.writerows(corpus.iter_chapters())
+    os.replace(path + ".tmp", path)
+
+
+def build_stages(web_dir: str = DEFAULT_WEB_DIR, workers: int = 1, fetch_args: Sequence[str] = (),
+                 book: Optional[Book] = None, registry: str = DEFAULT_REGISTRY) -> List[Stage]:
+    """book 为 None 时是原来的单书布局（含网站导出）；否则是该书分片的阶段：
+    没有白名单就不建网络，没有地名词典就不做地点统计，网站导出只属于封神演义站点。"""
+    w = ["--workers", str(workers)]
+    paragraphs, sentences = "out/fengshen_paragraphs.csv", "out/fengshen_sentences.csv"
+    fulltext, whitelist = "out/fengshen_fulltext.csv", "out/OPTIMIZED_CHARACTER_WHITELIST.csv"
+    if book is not None:
+        fetch_args = ["--book", book.slug, "--registry", os.path.abspath(registry), *fetch_args]
+    place_args = ["--place-dict", book.gazetteer] if book is not None and book.gazetteer else []
+    stages = [
+        Stage("fetch", [], [paragraphs, sentences],
+              ["FengShenYanYi_txt.py", "--outdir", "out", *fetch_args], source=True, description="抓取 CText 原文"),
+        Stage("fulltext", [paragraphs], [fulltext], func=build_fulltext, description="合并每回全文"),
+        Stage("segment", [paragraphs], ["out/fengshen_segments.sqlite"],
+              ["fengshen_segmentation.py", "warm", "--input", paragraphs, "--workers", str(workers)],
+              description="预热共享分词层"),
+        Stage("tokens", [paragraphs], ["out/fengshen_tokens/manifest.json"],
+              ["fengshen_token_corpus.py", "build", "--input", paragraphs, *w],
+              description="词编号语料（内存映射）", after=["segment"]),
+        Stage("discover", [paragraphs], ["out/potential_characters_freq.csv"],
+              ["Character_Discovery.py", *w], description="自动人物发现", after=["tokens"]),
+        # 后缀数组统计与白名单无关：白名单只进入下面的 candidates，改白名单不必重算
+        Stage("newwords", [paragraphs], ["out/fengshen_word_scores.csv"],
+              ["fengshen_word_discovery.py", "--input", paragraphs, "--no-whitelist",
+               "-o", "out/fengshen_word_scores.csv"], description="无监督新词发现（得分表）"),
+        Stage("candidates", [paragraphs, "out/fengshen_word_scores.csv", whitelist], ["out/fengshen_word_candidates.csv"],
+              ["fengshen_word_discovery.py", "--input", paragraphs, "--scores", "out/fengshen_word_scores.csv",
+               "--whitelist", whitelist, "-o", "out/fengshen_word_candidates.csv"],
+              description="新词候选对照白名单（人物候选）"),
+        Stage("sentiment", [paragraphs], ["sentiment_per_chapter.png"],
+              ["FengShenYanYi_Sentiment_Network_Data_Prep.py", "--part", "sentiment", *w], description="情感分析"),
+        Stage("network", [paragraphs, whitelist], ["fengshen_nodes.csv", "fengshen_edges.csv",
+                                                    "out/fengshen_cooccurrence.npz", "fengshen_dynamic.gexf",
+                                                    "out/fengshen_incidence.npz"]
+              + [f"out/fengshen_edges_{g}.csv" for g in DEFAULT_GRANULARITIES],
+              ["FengShenYanYi_Sentiment_Network_Data_Prep.py", "--part", "network"], description="人物共现网络",
+              after=["sentiment"]),  # 复用情感阶段缓存的逐句分数
+        Stage("index", [paragraphs, sentences], ["out/fengshen_index/manifest.json"],
+              ["fengshen_search_index.py", "update", "--outdir", "out"], description="全文检索索引（增量）"),
+        Stage("places", [fulltext, *place_args[1:]], ["out/fengshen_place_statistics.csv", "fengshen_place_dict.txt"],
+              ["fengshen_place_analysis.py", fulltext, "-o", "out/fengshen_place_statistics.csv", *place_args, *w],
+              description="地点频率"),
+        Stage("gazetteer", [fulltext, "fengshen_place_dict.txt"], ["out/fengshen_place_by_chapter.csv"],
+              ["fengshen_gazetteer.py", fulltext, "--dict", "fengshen_place_dict.txt",
+               "-o", "out/fengshen_place_by_chapter.csv"], description="逐回地点明细"),
+        Stage("wordfreq", [fulltext, paragraphs],
+              ["out/fengshen_analysis_report.txt", "out/fengshen_word_frequency.csv"],
+              ["FengShenYanYi_analysis.py", "--input", fulltext, "--tokens", paragraphs,
+               "--report", "out/fengshen_analysis_report.txt", "--freq-csv", "out/fengshen_word_frequency.csv", *w],
+              description="词频统计"),  # 用 jieba.cut 方式的词编号语料（自行编译，不依赖 tokens 阶段的词性标注版）
+        Stage("graph", ["fengshen_nodes.csv", "fengshen_edges.csv"], ["out/fengshen_graph_metrics.csv"],
+              ["fengshen_graph_analytics.py", "--nodes", "fengshen_nodes.csv", "--edges", "fengshen_edges.csv",
+               "-o", "out/fengshen_graph_metrics.csv"], description="人物网络社区 / 中心性 / 布局"),
+        Stage("web", ["fengshen_nodes.csv", "fengshen_edges.csv", "out/fengshen_cooccurrence.npz",
+                      "out/fengshen_graph_metrics.csv", MAGIC_CSV, os.path.join(web_dir, "data", "timeline.json")],
+              [os.path.join(web_dir, "js", f)
+               for f in ("nodes_data.js", "links_data.js", "magic-weapons-data.js", "timeline-data.js")]
+              + [os.path.join(web_dir, "data", "network", "meta.json")],
+              ["fengshen_web_export.py", "--nodes", "fengshen_nodes.csv", "--tensor", "out/fengshen_cooccurrence.npz",
+               "--edges", "fengshen_edges.csv", "--graph", "out/fengshen_graph_metrics.csv",
+               "--magic", MAGIC_CSV, "--web-dir", web_dir],
+              description="导出网站数据"),
+    ]
+    if book is None:
+        return stages
+    skipped = {"web"} | (set() if book.whitelist else {"network", "graph"}) | (set() if book.gazetteer else {"places", "gazetteer"})
+    return [s for s in stages if s.name not in skipped]
+
+
+# ---- 指纹与状态 ----
+def file_digest(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def stage_fingerprint(stage: Stage, workdir: str) -> str:
+    h = hashlib.sha256(json.dumps([stage.command, stage.func.__name__ if stage.func else None]).encode("utf-8"))
+    for path in stage.code_files() + [os.path.join(workdir, p) for p in stage.inputs]:
+        h.update(f"\0{os.path.basename(path)}\0{file_digest(path)}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def load_state(workdir: str) -> Dict[str, dict]:
+    path = os.path.join(workdir, "out", STATE_FILE)
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                return json.load(f)
+            except Exception:
+                pass
+    return {}
+
+
+def save_state(workdir: str, state: Dict[str, dict]):
+    from fengshen_chapter_store import write_json_atomic
+    os.makedirs(os.path.join(workdir, "out"), exist_ok=True)
+    write_json_atomic(os.path.join(workdir, "out", STATE_FILE), state)
+
+
+def why_rebuild(stage: Stage, workdir: str, state: Dict[str, dict], forced: bool) -> Optional[str]:
+    """需要重跑时返回原因，否则返回 None。"""
+    if forced:
+        return "强制重跑"
+    missing = [p for p in stage.outputs if not os.path.exists(os.path.join(workdir, p))]
+    if missing:
+        return f"缺少输出 {missing[0]}"
+    if stage.source:
+        return None
+    prev = state.get(stage.name)
+    if not prev:
+        return "无运行记录"
+    if prev.get("fingerprint") != stage_fingerprint(stage, workdir):
+        return "输入或脚本有变化"
+    return None
+
+
+def run_stage(stage: Stage, workdir: str, log_dir: str, label: str = "") -> float:
+    start = time.perf_counter()
+    with span(f"pipeline.{stage.name}", **({"book": label} if label else {})):
+        if stage.func is not None:
+            stage.func(workdir, stage)
+        else:
+            log_path = os.path.join(log_dir, f"{stage.name}.log")
+            with open(log_path, "w", encoding="utf-8") as log:
+                proc = subprocess.run([sys.executable, os.path.join(CODE_DIR, stage.command[0]), *stage.command[1:]],
+                                      cwd=workdir, stdout=log, stderr=subprocess.STDOUT,
+                                      env={**os.environ, "PYTHONIOENCODING": "utf-8"})
+            if proc.returncode != 0:
+                raise RuntimeError(f"退出码 {proc.returncode}，详见 {log_path}")
+    return time.perf_counter() - start
+
+
+def upstream_of(stages: List[Stage]) -> Dict[str, List[str]]:
+    producer = {os.path.normpath(p): s.name for s in stages for p in s.outputs}
+    return {s.name: sorted(({producer[os.path.normpath(p)] for p in s.inputs if os.path.normpath(p) in producer}
+                            | set(s.after)) - {s.name})
+            for s in stages}
+
+
+def run_pipeline(stages: List[Stage], workdir: str = ".", jobs: int = 2, only: Sequence[str] = (),
+                 force: Sequence[str] = (), dry_run: bool = False, label: str = "") -> Dict[str, dict]:
+    """按依赖顺序增量运行；返回 {阶段: {status, seconds, reason}}。label 为分片名，加在进度输出前。"""
+    prefix = f"[{label}] " if label else ""
+    deps = upstream_of(stages)
+    by_name = {s.name: s for s in stages}
+    selected = set(only) if only else set(by_name)
+    state = load_state(workdir)
+    log_dir = os.path.join(workdir, "out", "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    report: Dict[str, dict] = {}
+    pending = [s.name for s in stages if s.name in selected]
+    running = {}
+
+    def settle(name: str):
+        """阶段的上游都已结束（或不在本次选择中）时才能决定它的去向。"""
+        return all(d in report or d not in selected for d in deps[name])
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        while pending or running:
+            # 反复扫描：跳过的阶段会立刻让下游变为可决定
+            ready = [n for n in pending if settle(n)]
+            while ready:
+                name = ready.pop(0)
+                pending.remove(name)
+                stage = by_name[name]
+                if any(report.get(d, {}).get("status") in ("失败", "未运行") for d in deps[name]):
+                    report[name] = {"status": "未运行", "seconds": 0.0, "reason": "上游失败"}
+                else:
+                    reason = why_rebuild(stage, workdir, state, name in force)
+                    if reason is None and dry_run and any(
+                            report.get(d, {}).get("status") == "待重跑" for d in deps[name]):
+                        reason = "上游待重跑"  # 演练时假定上游重跑会改变产物
+                    if reason is None:
+                        report[name] = {"status": "跳过", "seconds": 0.0, "reason": "最新"}
+                    elif dry_run:
+                        report[name] = {"status": "待重跑", "seconds": 0.0, "reason": reason}
+                    else:
+                        print(f"{prefix}▶ {name:<10} {stage.description}（{reason}）")
+                        running[pool.submit(run_stage, stage, workdir, log_dir, label)] = (name, reason)
+                        continue
+                ready = [n for n in pending if settle(n)]
+            if not running:
+                if pending:  # 依赖无法满足（不应出现）
+                    for name in pending:
+                        report[name] = {"status": "未运行", "seconds": 0.0, "reason": "依赖未满足"}
+                    pending.clear()
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                name, reason = running.pop(fut)
+                stage = by_name[name]
+                try:
+                    seconds = fut.result()
+                    state[name] = {"fingerprint": stage_fingerprint(stage, workdir), "finished_at": time.time(),
+                                   "outputs": {p: file_digest(os.path.join(workdir, p)) for p in stage.outputs}}
+                    save_state(workdir, state)
+                    report[name] = {"status": "完成", "seconds": seconds, "reason": reason}
+                    print(f"{prefix}✔ {name:<10} {seconds:.2f}s")
+                except Exception as e:
+                    report[name] = {"status": "失败", "seconds": 0.0, "reason": str(e)}
+                    print(f"{prefix}✘ {name:<10} {e}")
+    return {s.name: report[s.name] for s in stages if s.name in report}
+
+
+def run_library(books: Sequence[Book], root: str = ".", shards: int = 2, jobs: int = 2, workers: int = 1,
+                fetch_args: Sequence[str] = (), registry: str = DEFAULT_REGISTRY, only: Sequence[str] = (),
+                force: Sequence[str] = (), dry_run: bool = False) -> Dict[str, Dict[str, dict]]:
+    """每部书一个分片，分片之间并行（每个分片内部再按 jobs 并行阶段）；全部结束后合并跨书结果。"""
+    def run_shard(book: Book) -> Dict[str, dict]:
+        shard = prepare_shard(book, root)
+        stages = build_stages(workers=workers, fetch_args=fetch_args, book=book, registry=registry)
+        return run_pipeline(stages, shard, jobs, only, force, dry_run, label=book.slug)
+
+    with ThreadPoolExecutor(max_workers=max(1, shards)) as pool:
+        futures = {book.slug: pool.submit(run_shard, book) for book in books}
+        reports = {slug: fut.result() for slug, fut in futures.items()}
+    if not dry_run:
+        with span("pipeline.merge", books=len(books)):
+            merge_shards(root, books)
+    return reports
+
+
+def print_summary(report: Dict[str, dict], total: float):
+    print("\n阶段        状态    耗时(s)  说明")
+    for name, r in report.items():
+        print(f"{name:<10}  {r['status']:<4}  {r['seconds']:>8.2f}  {r['reason']}")
+    print(f"总耗时 {total:.2f}s")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="封神演义分析流水线：增量构建（只重跑上游有变化的阶段）")
+    ap.add_argument("--workdir", type=str, default=".", help="工作目录（其下的 out/ 存放数据）")
+    ap.add_argument("--web-dir", type=str, default=DEFAULT_WEB_DIR, help="网站根目录")
+    ap.add_argument("--jobs", type=int, default=2, help="同时运行的阶段数")
+    ap.add_argument("--workers", type=int, default=1, help="分词 / 情感打分等阶段内部的进程数")
+    ap.add_argument("--only", nargs="*", default=[], help="只考虑这些阶段")
+    ap.add_argument("--force", nargs="*", default=[], help="强制重跑这些阶段")
+    ap.add_argument("--fetch-args", type=str, default="", help="传给 FengShenYanYi_txt.py 的额外参数，如 \"--chapters 1-10\"")
+    ap.add_argument("--dry-run", action="store_true", help="只显示需要重跑的阶段")
+    ap.add_argument("--list", action="store_true", help="列出阶段及依赖")
+    ap.add_argument("--books", nargs="*", default=None,
+                    help="按书分片处理这些书（slug，见 data/books.json；'all'=全部）；不给则为原单书布局")
+    ap.add_argument("--shards", type=int, default=2, help="同时处理的分片（书）数")
+    ap.add_argument("--registry", type=str, default=DEFAULT_REGISTRY, help="书目登记表（JSON）")
+    add_metrics_args(ap)
+    args = ap.parse_args()
+    # 写入环境变量，各阶段子进程自动继承（不进入阶段指纹，开关指标不会触发重跑）
+    configure(path=args.metrics, trace_memory=args.trace_memory or None, profile_dir=args.profile_dir,
+              export_env=True)
+
+    stages = build_stages(os.path.abspath(args.web_dir), args.workers, args.fetch_args.split())
+    unknown = set(args.only + args.force) - {s.name for s in stages}
+    if unknown:
+        ap.error(f"未知阶段：{', '.join(sorted(unknown))}")
+    books = None
+    if args.books is not None:
+        try:
+            books = select_books(args.books, args.registry)
+        except ValueError as e:
+            ap.error(str(e))
+    if args.list:
+        for book in books or [None]:
+            if book is not None:
+                print(f"\n[{book.slug}] {book.name}")
+            book_stages = stages if book is None else build_stages(book=book, registry=args.registry)
+            deps = upstream_of(book_stages)
+            for s in book_stages:
+                print(f"{s.name:<10} <- {', '.join(deps[s.name]) or '-':<24} {s.description}")
+        return
+    start = time.perf_counter()
+    if books is None:
+        reports = {"": run_pipeline(stages, args.workdir, args.jobs, args.only, args.force, args.dry_run)}
+    else:
+        reports = run_library(books, args.workdir, args.shards, args.jobs, args.workers, args.fetch_args.split(),
+                              args.registry, args.only, args.force, args.dry_run)
+    for slug, report in reports.items():
+        if slug:
+            print(f"\n[{slug}]", end="")
+        print_summary(report, time.perf_counter() - start)
+    if any(r["status"] == "失败" for report in reports.values() for r in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
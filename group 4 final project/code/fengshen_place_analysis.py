@@ -6,14 +6,18 @@
 """
 
 import pandas as pd
-import jieba
 import re
 from collections import Counter
 import argparse
+import os
 
-def create_fengshen_place_dict(dict_path='fengshen_place_dict.txt'):
+from fengshen_gazetteer import chapter_table, count_by_chapter, load_gazetteer
+from fengshen_metrics import add_metrics_args, configure_from_args, count, span
+from fengshen_segmentation import Segmenter, segment_texts
+
+def create_fengshen_place_dict(dict_path='fengshen_place_dict.txt', source=None):
     """
-    创建封神演义地点自定义词典（繁体中文）
+    创建封神演义地点自定义词典（繁体中文）；source 为其他书的地名词典（jieba 词典格式）时以其内容为准
     """
     # 封神演义中常见的地点（繁体中文）
     fengshen_places = [
@@ -42,11 +46,22 @@ def create_fengshen_place_dict(dict_path='fengshen_place_dict.txt'):
         "九間殿內 90 nr", "女娲宮內 150 nr", "靈台之上 120 nr"
     ]
     
-    # 写入词典文件
-    with open(dict_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(fengshen_places))
+    if source:
+        with open(source, 'r', encoding='utf-8-sig') as f:
+            fengshen_places = [line.strip() for line in f if line.strip()]
     
-    print(f"✅ 成功创建封神演义地点自定义词典: {dict_path}")
+    # 写入词典文件（内容未变时不重写，保持词典指纹与编译索引缓存有效）
+    content = '\n'.join(fengshen_places)
+    existing = None
+    if os.path.exists(dict_path):
+        with open(dict_path, 'r', encoding='utf-8') as f:
+            existing = f.read()
+    if existing != content:
+        with open(dict_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        print(f"✅ 成功创建封神演义地点自定义词典: {dict_path}")
+    else:
+        print(f"✅ 地点自定义词典已是最新: {dict_path}")
     print(f"📚 共包含 {len(fengshen_places)} 个地点词汇")
     
     # 返回地点列表
@@ -72,52 +87,85 @@ def load_fengshen_data(file_path):
         print(f"❌ 读取文件时出错: {e}")
         raise
 
-def merge_all_text(df, text_column='full_text'):
+def clean_text(text):
     """
-    合并所有章节的文本内容
-    """
-    all_text = ''
-    for idx, row in df.iterrows():
-        all_text += str(row[text_column]) + '\n'
-    
-    print(f"📝 成功合并所有文本")
-    print(f"📏 文本总长度: {len(all_text):,} 字符")
-    print(f"📚 覆盖章节数: {len(df)} 回")
-    
-    return all_text
-
-def preprocess_text(text):
-    """
-    文本预处理：去除标点符号、特殊字符等
+    去除标点符号、特殊字符，只保留中文字符（不打印）
     """
     # 保留中文字符，去除其他字符
     pattern = re.compile(r'[^一-鿿]')
     cleaned_text = pattern.sub('', text)
     
     # 去除多余的空格
-    cleaned_text = re.sub(r'\s+', '', cleaned_text)
-    
-    print(f"🧹 文本预处理完成")
-    print(f"📊 预处理前: {len(text):,} 字符")
-    print(f"📊 预处理后: {len(cleaned_text):,} 字符")
-    
-    return cleaned_text
+    return re.sub(r'\s+', '', cleaned_text)
 
-def segment_and_extract_places(text, place_list, jieba_instance):
+def iter_chapter_texts(file_path, text_column='full_text', chunksize=20, clean=True):
     """
-    对文本进行分词并筛选出地点词汇
+    流式读取CSV：每次只读 chunksize 回，逐回产出 (chapter_no, 去标点后的文本)；clean=False 时产出原文
     """
-    print(f"🔍 开始分词和地点提取...")
-    
-    # 分词（精确模式）
-    words = jieba_instance.lcut(text, cut_all=False)
-    print(f"✂️  总分词数: {len(words):,}")
+    row_no = 0
+    for chunk in pd.read_csv(file_path, chunksize=chunksize):
+        if text_column not in chunk.columns:
+            raise ValueError(f"CSV文件中缺少'{text_column}'列，请检查文件格式")
+        numbers = chunk['chapter_no'] if 'chapter_no' in chunk.columns else range(row_no, row_no + len(chunk))
+        for chapter_no, text in zip(numbers, chunk[text_column]):
+            yield chapter_no, clean_text(str(text)) if clean else str(text)
+        row_no += len(chunk)
+
+def iter_batches(items, size):
+    """
+    把生成器按 size 个一组切分，不会一次性读完
+    """
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def count_places_streaming(input_csv_path, place_list, dict_path, chunksize=20, workers=1):
+    """
+    流式统计：分块读取 -> 逐回清洗 -> 共享分词层（jieba.cut 方式） -> 增量累加地点计数
+    内存占用只与 chunksize 有关，与全书篇幅无关；结果与批量路径一致
+    """
+    place_set = set(place_list)
+    place_counter = Counter()
+    total_chars = total_words = chapters = 0
+    # 词典指纹、缓存库和分词器在各批之间共用；地点筛选不需要词性，用 jieba.cut（比词性标注快两个数量级）
+    segmenter = Segmenter(user_dicts=[dict_path], workers=workers, mode='cut')
+    try:
+        for batch in iter_batches(iter_chapter_texts(input_csv_path, chunksize=chunksize), chunksize):
+            numbers = [n for n, _ in batch]
+            texts = [t for _, t in batch]
+            segments = segmenter.segment(texts, groups=numbers, verbose=False)
+            for words in segments:
+                total_words += len(words)
+                place_counter.update(word for word, _ in words if word in place_set)
+            chapters += len(batch)
+            total_chars += sum(len(t) for t in texts)
+            count("chapters", len(batch))
+            count("chars", sum(len(t) for t in texts))
+            count("tokens", sum(len(words) for words in segments))
+            print(f"🌊 已处理 {chapters} 回，{total_chars:,} 字符")
+    finally:
+        segmenter.close()
+    print(f"✂️  总分词数: {total_words:,}")
+    print(f"📍 提取出的地点词汇总数: {sum(place_counter.values()):,}")
+    print(f"🗺️  识别出的不同地点数量: {len(place_counter)}")
+    return place_counter
+
+def extract_places_from_segments(segments, place_list):
+    """
+    从共享分词层的结果中筛选地点词汇
+    """
+    place_set = set(place_list)
+    total_words = sum(len(words) for words in segments)
+    print(f"✂️  总分词数: {total_words:,}")
     
-    # 筛选出地点词汇
-    place_words = [word for word in words if word in place_list]
+    place_words = [word for words in segments for word, _ in words if word in place_set]
     print(f"📍 提取出的地点词汇总数: {len(place_words):,}")
     
-    # 去重查看有多少个不同的地点被识别
     unique_places = list(set(place_words))
     print(f"🗺️  识别出的不同地点数量: {len(unique_places)}")
     
@@ -129,6 +177,12 @@ def count_and_sort_places(place_words):
     """
     # 统计词频
     place_counter = Counter(place_words)
+    return sort_place_counter(place_counter), place_counter
+
+def sort_place_counter(place_counter):
+    """
+    按频率降序排序（批量与流式路径共用）
+    """
     print(f"📈 地点词频统计完成，共统计 {len(place_counter)} 个地点")
     
     # 按频率降序排序
@@ -138,7 +192,7 @@ def count_and_sort_places(place_words):
     for i, (place, count) in enumerate(sorted_places[:10], 1):
         print(f"  {i:2d}. {place}: {count:,} 次")
     
-    return sorted_places, place_counter
+    return sorted_places
 
 def create_place_statistics_table(sorted_places, total_places_count, output_path='fengshen_place_statistics.csv'):
     """
@@ -191,7 +245,24 @@ def create_place_statistics_table(sorted_places, total_places_count, output_path
     
     return df_statistics
 
-def main(input_csv_path, output_csv_path='fengshen_place_statistics.csv'):
+def count_places_gazetteer(input_csv_path, dict_path, by_chapter_path='fengshen_place_by_chapter.csv', chunksize=20):
+    """
+    编译地名索引直接在原文上计数（不做 jieba 分词），流式逐回处理；
+    逐回明细（含上级地名与汇总次数）写入 by_chapter_path
+    """
+    gazetteer = load_gazetteer(dict_path, verbose=True)
+    with span("match") as s:
+        per_chapter, place_counter = count_by_chapter(
+            gazetteer, iter_chapter_texts(input_csv_path, chunksize=chunksize, clean=False))
+        s.count("chapters", len(per_chapter))
+        s.count("places", sum(place_counter.values()))
+    chapter_table(gazetteer, per_chapter).to_csv(by_chapter_path, index=False, encoding='utf-8-sig')
+    print(f"📍 提取出的地点词汇总数: {sum(place_counter.values()):,}（{len(per_chapter)} 回）")
+    print(f"💾 逐回地点明细已保存至: {by_chapter_path}")
+    return gazetteer, place_counter
+
+def main(input_csv_path, output_csv_path='fengshen_place_statistics.csv', workers=1, stream=False, chunksize=20,
+         method='jieba', rollup=False, by_chapter_path='fengshen_place_by_chapter.csv', place_dict=None):
     """
     主函数：执行完整的地点统计分析流程
     """
@@ -201,23 +272,47 @@ def main(input_csv_path, output_csv_path='fengshen_place_statistics.csv'):
     
     try:
         # 1. 创建自定义词典
-        place_list, dict_path = create_fengshen_place_dict()
+        place_list, dict_path = create_fengshen_place_dict(source=place_dict)
+        
+        if method == 'gazetteer':
+            # 编译索引模式：原文直接匹配，可按上下级汇总（西岐城外 -> 西岐）
+            gazetteer, place_counter = count_places_gazetteer(input_csv_path, dict_path, by_chapter_path, chunksize)
+            if rollup:
+                place_counter = gazetteer.to_roots(place_counter)
+            sorted_places = sort_place_counter(place_counter)
+            df_statistics = create_place_statistics_table(sorted_places, sum(place_counter.values()), output_csv_path)
+            print("\n" + "=" * 60)
+            print("        分析完成！所有结果已保存        ")
+            print("=" * 60)
+            return df_statistics
         
-        # 2. 初始化jieba并加载词典
-        jieba.load_userdict(dict_path)
-        print(f"✅ 成功加载自定义词典到jieba")
+        if stream:
+            # 流式模式：分块读取、逐回累加，内存占用恒定
+            place_counter = count_places_streaming(input_csv_path, place_list, dict_path, chunksize, workers)
+            sorted_places = sort_place_counter(place_counter)
+            df_statistics = create_place_statistics_table(sorted_places, sum(place_counter.values()), output_csv_path)
+            print("\n" + "=" * 60)
+            print("        分析完成！所有结果已保存        ")
+            print("=" * 60)
+            return df_statistics
         
-        # 3. 加载CSV数据
+        # 2. 加载CSV数据
         df = load_fengshen_data(input_csv_path)
         
-        # 4. 合并文本
-        all_text = merge_all_text(df)
+        # 3. 逐回文本预处理（去标点），作为分词单元
+        chapter_texts = [clean_text(str(t)) for t in df['full_text']]
+        print(f"🧹 文本预处理完成，共 {len(chapter_texts)} 回，{sum(len(t) for t in chapter_texts):,} 字符")
         
-        # 5. 文本预处理
-        cleaned_text = preprocess_text(all_text)
+        # 4-5. 共享分词层（带地点词典，jieba.cut 方式，不做词性标注）：只对新章节或词典变化后分词
+        with span("segment", workers=workers) as s:
+            segments = segment_texts(chapter_texts, user_dicts=[dict_path], workers=workers,
+                                     groups=list(df.get('chapter_no', range(len(chapter_texts)))), mode='cut')
+            s.count("chapters", len(chapter_texts))
+            s.count("chars", sum(len(t) for t in chapter_texts))
+            s.count("tokens", sum(len(words) for words in segments))
         
-        # 6. 分词和地点提取
-        place_words, unique_places = segment_and_extract_places(cleaned_text, place_list, jieba)
+        # 6. 地点提取
+        place_words, unique_places = extract_places_from_segments(segments, place_list)
         
         # 7. 词频统计和排序
         sorted_places, place_counter = count_and_sort_places(place_words)
@@ -242,8 +337,22 @@ if __name__ == "__main__":
     parser.add_argument('input_file', help='输入CSV文件路径（包含full_text列）')
     parser.add_argument('-o', '--output', default='fengshen_place_statistics.csv', 
                         help='输出统计表格路径（默认：fengshen_place_statistics.csv）')
+    parser.add_argument('--workers', type=int, default=1, help='分词进程数（按回目并行，结果与单进程一致）')
+    parser.add_argument('--stream', action='store_true', help='流式模式：分块读取CSV，内存占用不随全书篇幅增长')
+    parser.add_argument('--chunksize', type=int, default=20, help='流式模式每次读取的回数（默认：20）')
+    parser.add_argument('--method', choices=['jieba', 'gazetteer'], default='jieba',
+                        help='jieba=分词后筛选（默认）；gazetteer=编译地名索引直接匹配原文')
+    parser.add_argument('--rollup', action='store_true', help='gazetteer 模式下把下级地名计数归并到最上级（西岐城外 -> 西岐）')
+    parser.add_argument('--by-chapter', default='fengshen_place_by_chapter.csv',
+                        help='gazetteer 模式逐回明细输出路径（默认：fengshen_place_by_chapter.csv）')
+    parser.add_argument('--place-dict', default=None,
+                        help='使用给定的地名词典（jieba 词典格式，如其他书的地名表）代替内置的封神演义地名')
+    add_metrics_args(parser)
     
     args = parser.parse_args()
+    configure_from_args(args)
     
     # 执行主函数
-    main(args.input_file, args.output)
+    with span("places", method=args.method, stream=args.stream, workers=args.workers):
+        main(args.input_file, args.output, args.workers, args.stream, args.chunksize,
+             args.method, args.rollup, args.by_chapter, args.place_dict)
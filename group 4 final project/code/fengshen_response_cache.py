@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+CText 响应磁盘缓存（内容寻址）
+- 键 = (接口, URL/URN, language, remap) 的 sha256；每个条目一个 JSON 文件，分两级目录存放
+- TTL 过期自动失效；总大小超过上限时按最近使用时间淘汰（总大小增量维护，只在超限时扫描目录，
+  一次淘汰到上限的 90%，写满缓存不再是 O(n²)）
+- offline 模式：缓存未命中直接报 CacheMiss，不访问网络、不消耗额度
+- lookup / put 是带命中统计的查找与写回，供异步抓取等自行取数的调用方使用；get_or_fetch 即二者组合
+用法示例：
+  cache = ResponseCache("./out/ctext_cache", ttl_days=30, max_mb=200)
+  urn = cache.get_or_fetch(("readlink", url, "zh", "gb"), lambda: readlink(url))
+  value = cache.lookup(parts)
+  if value is MISS:
+      value = await fetch(); cache.put(parts, value)
+"""
+import hashlib, json, os, time
+from typing import Any, Callable, Optional, Sequence
+
+MISS = object()  # lookup 未命中时的返回值（缓存的值本身可以是 None）
+
+
+class CacheMiss(RuntimeError):
+    """offline 模式下缓存未命中。"""
+
+
+class ResponseCache:
+    def __init__(self, root: str, ttl_days: float = 0, max_mb: float = 0, offline: bool = False):
+        self.root = root
+        self.ttl = ttl_days * 86400
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._size: Optional[int] = None  # 缓存总字节数；首次写入时扫描一次，之后增量维护
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def make_key(parts: Sequence[Any]) -> str:
+        raw = json.dumps(list(parts), ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest + ".json")
+
+    def get(self, parts: Sequence[Any], default: Any = None) -> Any:
+        path = self._path(self.make_key(parts))
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return default
+        if self.ttl and time.time() - st.st_mtime > self.ttl:
+            os.remove(path)
+            return default
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception:
+            return default
+        os.utime(path, (time.time(), st.st_mtime))  # atime 记录最近使用，mtime 保留写入时间供 TTL 判断
+        return entry["value"]
+
+    def put(self, parts: Sequence[Any], value: Any):
+        path = self._path(self.make_key(parts))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": list(parts), "stored_at": time.time(), "value": value}, f, ensure_ascii=False)
+        if not self.max_bytes:
+            os.replace(tmp, path)
+            return
+        if self._size is None:
+            self._size = sum(st.st_size for _, st in self._entries())
+        old = os.path.getsize(path) if os.path.exists(path) else 0
+        new = os.path.getsize(tmp)
+        os.replace(tmp, path)
+        self._size += new - old
+        if self._size > self.max_bytes:
+            self.evict(int(self.max_bytes * 0.9))
+
+    def lookup(self, parts: Sequence[Any]) -> Any:
+        """查缓存并计入命中 / 未命中；未命中返回 MISS，offline 模式下直接报 CacheMiss。"""
+        value = self.get(parts, MISS)
+        if value is not MISS:
+            self.hits += 1
+            return value
+        self.misses += 1
+        if self.offline:
+            raise CacheMiss(f"offline 模式缓存未命中：{list(parts)}")
+        return MISS
+
+    def get_or_fetch(self, parts: Sequence[Any], fetch: Callable[[], Any]) -> Any:
+        value = self.lookup(parts)
+        if value is not MISS:
+            return value
+        value = fetch()
+        self.put(parts, value)
+        return value
+
+    def _entries(self):
+        for sub in os.listdir(self.root):
+            d = os.path.join(self.root, sub)
+            if not os.path.isdir(d):
+                continue
+            for name in os.listdir(d):
+                if name.endswith(".json"):
+                    p = os.path.join(d, name)
+                    st = os.stat(p)
+                    yield p, st
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """删除过期条目，再按最近使用时间淘汰到 max_bytes 以下；返回删除数。"""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        now = time.time()
+        removed = 0
+        live = []
+        for p, st in self._entries():
+            if self.ttl and now - st.st_mtime > self.ttl:
+                os.remove(p)
+                removed += 1
+            else:
+                live.append((max(st.st_atime, st.st_mtime), st.st_size, p))
+        total = sum(size for _, size, _ in live)
+        if limit:
+            for _, size, p in sorted(live):
+                if total <= limit:
+                    break
+                os.remove(p)
+                total -= size
+                removed += 1
+        self._size = total
+        return removed
+
+    def stats(self) -> str:
+        return f"缓存命中 {self.hits} 次，未命中 {self.misses} 次（{self.root}）"
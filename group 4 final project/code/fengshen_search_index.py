@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+"""
+全文检索：汉字二元组（bigram）倒排索引 + KWIC 上下文
+- 段落、句子两级各建一份索引，存放在 out/fengshen_index/<级别>/seg_XXXX/ 下，全部是 .npy，查询时内存映射加载：
+    chars.npy    语料逐字码位（uint32），文本之间以 0 分隔，二元组不会跨段落
+    docs.npy     每条文本：chapter_no, para_index, sentence_index, 起始位置, 长度
+    keys.npy     排好序的二元组键（前字码位 << 21 | 后字码位）
+    offsets.npy  每个键在 postings 中的起止
+    postings.npy 二元组出现位置（升序），位置 -> 文本靠 docs 起始位置二分得到
+- 短语查询：取短语中最稀有的二元组做候选，再逐字核对；多词邻近查询（N 字以内）；KWIC 上下文片段
+- 增量更新：按回目计算内容指纹，只把新增 / 变化的回目写成新分段；旧分段中被替换的回目自动失效；
+  分段过多时自动合并（compact）
+用法示例：
+  from fengshen_search_index import SearchIndex
+  idx = SearchIndex("out/fengshen_index")
+  idx.update_from_csv("out")                         # 抓取新增回目后再次运行，只索引新内容
+  idx.near(["哪吒", "李靖"], window=20)               # 两人 20 字以内同现的段落
+  for hit, left, kw, right in idx.kwic("哪吒", width=12, limit=5): print(left, f"【{kw}】", right)
+  python fengshen_search_index.py update --outdir out
+  python fengshen_search_index.py near 哪吒 李靖 --window 20
+  python fengshen_search_index.py kwic 哪吒 --width 12 --limit 20
+"""
+import argparse, csv, hashlib, json, os, shutil, time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_ROOT = os.path.join("out", "fengshen_index")
+LEVELS = {"paragraphs": "fengshen_paragraphs.csv", "sentences": "fengshen_sentences.csv"}
+MANIFEST = "manifest.json"
+MAX_SEGMENTS = 8
+
+
+class Hit(NamedTuple):
+    chapter_no: int
+    para_index: int
+    sentence_index: int
+    offset: int   # 在该段落 / 句子中的字符位置
+    length: int   # 命中跨度（邻近查询时覆盖全部关键词）
+
+
+def bigram_keys(codes: np.ndarray) -> np.ndarray:
+    return (codes[:-1].astype(np.int64) << 21) | codes[1:].astype(np.int64)
+
+
+def encode(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+class Segment:
+    """一个只读分段（内存映射）。"""
+
+    FILES = ("chars", "docs", "keys", "offsets", "postings")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        for f in self.FILES:
+            setattr(self, f, np.load(os.path.join(path, f + ".npy"), mmap_mode="r"))
+        self.starts = np.asarray(self.docs[:, 3])
+        self.live = np.ones(len(self.docs), dtype=bool)
+
+    @staticmethod
+    def build(path: str, rows: Sequence[Tuple[int, int, int, str]]):
+        """rows: [(chapter_no, para_index, sentence_index, text)] -> 写出一个分段目录。"""
+        texts = [t if isinstance(t, str) else "" for *_, t in rows]
+        lengths = np.array([len(t) for t in texts], dtype=np.int64)
+        starts = np.concatenate([[0], np.cumsum(lengths + 1)[:-1]]).astype(np.int64)
+        chars = encode("\0".join(texts) + "\0") if texts else np.zeros(1, dtype=np.uint32)
+        docs = np.column_stack([np.array([r[:3] for r in rows], dtype=np.int64).reshape(-1, 3),
+                                starts, lengths]) if rows else np.zeros((0, 5), dtype=np.int64)
+        keys_all = bigram_keys(chars)
+        valid = np.flatnonzero((chars[:-1] != 0) & (chars[1:] != 0))
+        order = np.argsort(keys_all[valid], kind="stable")  # 同一键内位置保持升序
+        sorted_keys = keys_all[valid][order]
+        keys, first = np.unique(sorted_keys, return_index=True)
+        offsets = np.append(first, len(sorted_keys)).astype(np.int64)
+        tmp = path + ".tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for name, arr in (("chars", chars), ("docs", docs), ("keys", keys),
+                          ("offsets", offsets), ("postings", valid[order].astype(np.int64))):
+            np.save(os.path.join(tmp, name + ".npy"), arr)
+        os.replace(tmp, path)
+
+    def postings_for(self, key: int) -> np.ndarray:
+        i = int(np.searchsorted(self.keys, key))
+        if i >= len(self.keys) or self.keys[i] != key:
+            return np.empty(0, dtype=np.int64)
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def phrase_positions(self, phrase: str) -> np.ndarray:
+        """短语在本分段 chars 中的全部起始位置（升序，只含有效文本）。"""
+        codes = encode(phrase)
+        if len(codes) == 0:
+            return np.empty(0, dtype=np.int64)
+        if len(codes) == 1:
+            cand = np.flatnonzero(self.chars == codes[0])
+        else:
+            keys = bigram_keys(codes)
+            lists = [self.postings_for(int(k)) for k in keys]
+            rarest = min(range(len(lists)), key=lambda i: len(lists[i]))
+            cand = np.asarray(lists[rarest]) - rarest
+            for j, code in enumerate(codes):
+                if j in (rarest, rarest + 1) or len(cand) == 0:
+                    continue
+                cand = cand[self.chars[cand + j] == code]
+        if len(cand) and not self.live.all():
+            cand = cand[self.live[self.doc_of(cand)]]
+        return cand
+
+    def doc_of(self, positions: np.ndarray) -> np.ndarray:
+        return np.searchsorted(self.starts, positions, side="right") - 1
+
+    def text(self, start: int, end: int) -> str:
+        return np.asarray(self.chars[start:end]).tobytes().decode("utf-32-le")
+
+    def hits(self, positions: np.ndarray, lengths) -> List[Hit]:
+        """一批位置 -> Hit 列表（整批换算，不逐个二分）。"""
+        meta = np.asarray(self.docs[self.doc_of(positions)])
+        offsets = np.asarray(positions) - meta[:, 3]
+        lengths = np.broadcast_to(lengths, offsets.shape)
+        return [Hit(*row) for row in zip(meta[:, 0].tolist(), meta[:, 1].tolist(), meta[:, 2].tolist(),
+                                         offsets.tolist(), lengths.tolist())]
+
+    def live_rows(self) -> List[Tuple[int, int, int, str]]:
+        rows = []
+        for d in np.flatnonzero(self.live):
+            ch, para, sent, start, n = (int(x) for x in self.docs[d])
+            rows.append((ch, para, sent, self.text(start, start + n)))
+        return rows
+
+
+def chapter_digest(rows: Iterable[Tuple[int, int, int, str]]) -> str:
+    h = hashlib.sha256()
+    for r in rows:
+        h.update(json.dumps(r, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def read_rows_by_chapter(csv_path: str) -> Dict[int, List[Tuple[int, int, int, str]]]:
+    grouped: Dict[int, List[Tuple[int, int, int, str]]] = {}
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        for r in csv.DictReader(f):
+            n = int(r["chapter_no"])
+            grouped.setdefault(n, []).append((n, int(r["para_index"]), int(r["sentence_index"]), r["text"] or ""))
+    for rows in grouped.values():
+        rows.sort(key=lambda r: (r[1], r[2]))
+    return grouped
+
+
+class SearchIndex:
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self.man_path = os.path.join(root, MANIFEST)
+        self.manifest = {"next_id": 0, "levels": {}}
+        if os.path.exists(self.man_path):
+            with open(self.man_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        self._segments: Dict[str, List[Segment]] = {}
+
+    # ---- 分段管理 ----
+    def _level(self, level: str) -> dict:
+        if level not in LEVELS:
+            raise ValueError(f"未知级别：{level}（可选：{', '.join(LEVELS)}）")
+        return self.manifest["levels"].setdefault(level, {"segments": [], "chapters": {}})
+
+    def segments(self, level: str) -> List[Segment]:
+        if level not in self._segments:
+            info = self._level(level)
+            segs = []
+            for name in info["segments"]:
+                seg = Segment(os.path.join(self.root, level, name))
+                owner = info["chapters"]
+                # 某回已被更新的分段接管时，旧分段中该回的文本失效
+                seg.live = np.array([owner.get(str(int(c)), [None])[0] == name for c in seg.docs[:, 0]], dtype=bool)
+                segs.append(seg)
+            self._segments[level] = segs
+        return self._segments[level]
+
+    def _save_manifest(self):
+        from fengshen_chapter_store import write_json_atomic
+        os.makedirs(self.root, exist_ok=True)
+        write_json_atomic(self.man_path, self.manifest)
+
+    def update(self, level: str, by_chapter: Dict[int, List[Tuple[int, int, int, str]]]) -> List[int]:
+        """把新增 / 内容变化的回目写成一个新分段；返回本次索引的回目。"""
+        info = self._level(level)
+        changed = {}
+        for n, rows in by_chapter.items():
+            digest = chapter_digest(rows)
+            if info["chapters"].get(str(n), [None, None])[1] != digest:
+                changed[n] = (rows, digest)
+        if not changed:
+            return []
+        name = f"seg_{self.manifest['next_id']:04d}"
+        self.manifest["next_id"] += 1
+        os.makedirs(os.path.join(self.root, level), exist_ok=True)
+        Segment.build(os.path.join(self.root, level, name),
+                      [r for n in sorted(changed) for r in changed[n][0]])
+        info["segments"].append(name)
+        for n, (_, digest) in changed.items():
+            info["chapters"][str(n)] = [name, digest]
+        self._drop_dead_segments(level)
+        self._save_manifest()
+        self._segments.pop(level, None)
+        if len(info["segments"]) > MAX_SEGMENTS:
+            self.compact(level)
+        return sorted(changed)
+
+    def _drop_dead_segments(self, level: str):
+        info = self._level(level)
+        owners = {seg for seg, _ in info["chapters"].values()}
+        for name in [s for s in info["segments"] if s not in owners]:
+            info["segments"].remove(name)
+            shutil.rmtree(os.path.join(self.root, level, name), ignore_errors=True)
+
+    def compact(self, level: str):
+        """把某级别的全部分段合并为一个（只保留有效文本）。"""
+        rows = [r for seg in self.segments(level) for r in seg.live_rows()]
+        info = self._level(level)
+        rows.sort(key=lambda r: r[:3])
+        name = f"seg_{self.manifest['next_id']:04d}"
+        self.manifest["next_id"] += 1
+        Segment.build(os.path.join(self.root, level, name), rows)
+        for n in info["chapters"]:
+            info["chapters"][n][0] = name
+        info["segments"].append(name)
+        self._segments.pop(level, None)
+        self._drop_dead_segments(level)
+        self._save_manifest()
+
+    def update_from_csv(self, outdir: str = "out", levels: Sequence[str] = tuple(LEVELS)) -> Dict[str, List[int]]:
+        done = {}
+        for level in levels:
+            path = os.path.join(outdir, LEVELS[level])
+            if os.path.exists(path):
+                done[level] = self.update(level, read_rows_by_chapter(path))
+        return done
+
+    # ---- 查询 ----
+    def phrase(self, phrase: str, level: str = "paragraphs", limit: Optional[int] = None) -> List[Hit]:
+        hits = []
+        for seg in self.segments(level):
+            hits += seg.hits(seg.phrase_positions(phrase), len(phrase))
+        hits.sort()
+        return hits[:limit] if limit else hits
+
+    def near(self, terms: Sequence[str], window: int = 20, level: str = "paragraphs",
+             limit: Optional[int] = None) -> List[Hit]:
+        """所有关键词都出现、且彼此相距不超过 window 字的位置（以第一个词的每次出现为锚点）。"""
+        hits = []
+        for seg in self.segments(level):
+            lists = [seg.phrase_positions(t) for t in terms]
+            if any(len(p) == 0 for p in lists):
+                continue
+            anchors, rest = lists[0], list(zip(terms[1:], lists[1:]))
+            anchor_docs = seg.doc_of(anchors)
+            spans = []
+            for a, doc in zip(anchors.tolist(), anchor_docs.tolist()):
+                lo_span, hi_span = a, a + len(terms[0])
+                ok = True
+                for term, pos in rest:
+                    lo = np.searchsorted(pos, a - window - len(term) + 1)
+                    hi = np.searchsorted(pos, a + len(terms[0]) + window, side="right")
+                    cand = pos[lo:hi]
+                    cand = cand[seg.doc_of(cand) == doc] if len(cand) else cand
+                    if len(cand) == 0:
+                        ok = False
+                        break
+                    best = int(cand[np.argmin(np.abs(cand - a))])
+                    lo_span, hi_span = min(lo_span, best), max(hi_span, best + len(term))
+                if ok:
+                    spans.append((lo_span, hi_span - lo_span))
+            if spans:
+                starts, lengths = (np.array(x, dtype=np.int64) for x in zip(*spans))
+                hits += seg.hits(starts, lengths)
+        hits = sorted(set(hits))
+        return hits[:limit] if limit else hits
+
+    def context(self, hit: Hit, width: int = 10, level: str = "paragraphs") -> Tuple[str, str, str]:
+        """命中位置的 (左文, 关键词, 右文)，不跨出所在段落 / 句子。"""
+        for seg in self.segments(level):
+            key = (seg.docs[:, 0] == hit.chapter_no) & (seg.docs[:, 1] == hit.para_index) & \
+                  (seg.docs[:, 2] == hit.sentence_index) & seg.live
+            idx = np.flatnonzero(key)
+            if len(idx):
+                _, _, _, start, n = (int(x) for x in seg.docs[idx[0]])
+                a, b = start + hit.offset, start + hit.offset + hit.length
+                return (seg.text(max(start, a - width), a), seg.text(a, b), seg.text(b, min(start + n, b + width)))
+        return "", "", ""
+
+    def kwic(self, term: str, width: int = 10, level: str = "paragraphs",
+             limit: Optional[int] = None) -> List[Tuple[Hit, str, str, str]]:
+        """关键词居中的上下文列表 [(命中, 左文, 关键词, 右文)]。"""
+        out = []
+        for seg in self.segments(level):
+            positions = seg.phrase_positions(term)
+            meta = np.asarray(seg.docs[seg.doc_of(positions)])
+            doc_ends = (meta[:, 3] + meta[:, 4]).tolist() if len(meta) else []
+            for h, pos, doc_end in zip(seg.hits(positions, len(term)), positions.tolist(), doc_ends):
+                end = pos + len(term)
+                out.append((h, seg.text(max(pos - h.offset, pos - width), pos), term,
+                            seg.text(end, min(doc_end, end + width))))
+        out.sort(key=lambda x: x[0])
+        return out[:limit] if limit else out
+
+    def stats(self) -> Dict[str, dict]:
+        res = {}
+        for level, info in self.manifest["levels"].items():
+            segs = self.segments(level)
+            res[level] = {"segments": len(segs), "chapters": len(info["chapters"]),
+                          "texts": int(sum(s.live.sum() for s in segs)),
+                          "bigrams": int(sum(len(s.postings) for s in segs))}
+        return res
+
+
+def main():
+    ap = argparse.ArgumentParser(description="二元组倒排索引：增量建索引 / 短语 / 邻近 / KWIC 检索")
+    ap.add_argument("action", choices=["update", "compact", "phrase", "near", "kwic", "stats"])
+    ap.add_argument("terms", nargs="*", help="检索词")
+    ap.add_argument("--outdir", type=str, default="out", help="段落 / 句子 CSV 所在目录")
+    ap.add_argument("--index", type=str, default=DEFAULT_ROOT, help="索引目录")
+    ap.add_argument("--level", choices=list(LEVELS), default="paragraphs")
+    ap.add_argument("--window", type=int, default=20, help="near：关键词之间最多相隔的字数")
+    ap.add_argument("--width", type=int, default=12, help="kwic：左右上下文字数")
+    ap.add_argument("--limit", type=int, default=20)
+    args = ap.parse_args()
+
+    idx = SearchIndex(args.index)
+    if args.action == "update":
+        start = time.perf_counter()
+        for level, chapters in idx.update_from_csv(args.outdir).items():
+            print(f"{level}: 新索引 {len(chapters)} 回" + (f"（{chapters[0]}–{chapters[-1]}）" if chapters else ""))
+        print(f"耗时 {time.perf_counter() - start:.2f}s")
+        return
+    if args.action == "compact":
+        for level in list(idx.manifest["levels"]):
+            idx.compact(level)
+    if args.action in ("compact", "stats"):
+        print(json.dumps(idx.stats(), ensure_ascii=False, indent=2))
+        return
+    if not args.terms:
+        ap.error("请提供检索词")
+    idx.segments(args.level)  # 先映射分段，计时只算查询本身
+    start = time.perf_counter()
+    if args.action == "phrase":
+        hits = idx.phrase(args.terms[0], args.level)
+    elif args.action == "near":
+        hits = idx.near(args.terms, args.window, args.level)
+    else:
+        rows = idx.kwic(args.terms[0], args.width, args.level)
+        hits = [r[0] for r in rows]
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"共 {len(hits)} 处（{elapsed:.2f} ms）")
+    if args.action == "kwic":
+        for h, left, kw, right in rows[:args.limit]:
+            print(f"第{h.chapter_no:>3}回 段{h.para_index:>3}  {left:>{args.width}}【{kw}】{right}")
+    else:
+        for h in hits[:args.limit]:
+            left, kw, right = idx.context(h, args.width, args.level)
+            print(f"第{h.chapter_no:>3}回 段{h.para_index:>3} 句{h.sentence_index:>2}  {left}【{kw}】{right}")
+
+
+if __name__ == "__main__":
+    main()
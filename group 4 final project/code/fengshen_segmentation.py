@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+共享分词层：Jieba 分词 + 词性标注结果按段落持久化
+- 每个段落以 sha256(text) 为键，结果按“词典指纹”（jieba 版本 + 主词典 + 用户词典内容 + 分词方式）分组存放
+- 分词方式 mode："pos" = jieba.posseg 词性标注（默认，人物发现等用）；"cut" = jieba.cut 精确模式，
+  词性记为空串（词频、地点统计用：与原先 jieba.cut 的结果逐词一致，且快得多）
+- 同一语料、同一词典只分一次；改了段落或词典，只重分受影响的部分
+- Character_Discovery / FengShenYanYi_analysis / fengshen_place_analysis 均从这里读取
+- workers > 1 时按回目分块交给进程池，每个进程只初始化一次 jieba；结果与单进程逐字一致
+- 逐批调用（流式处理）用 Segmenter：词典指纹、缓存库连接、分词器 / 进程池在各批之间复用
+用法示例：
+  from fengshen_segmentation import segment_texts
+  tokens = segment_texts(df['text'])                                      # [[(词, 词性), ...], ...]
+  tokens = segment_texts(texts, user_dicts=['fengshen_place_dict.txt'])   # 带用户词典的另一份结果
+  tokens = segment_texts(df['text'], groups=df['chapter_no'], workers=4)  # 按回目并行
+  tokens = segment_texts(df['text'], mode='cut')                          # 不标词性：[(词, ''), ...]
+  seg = Segmenter(user_dicts=['fengshen_place_dict.txt'])                 # 多批复用
+  for batch in batches: tokens = seg.segment(batch)
+  seg.close()
+  # 并行加速比测试（不读写缓存，并校验与单进程结果一致）
+  python fengshen_segmentation.py bench --input out/fengshen_paragraphs.csv --workers 1,2,4
+"""
+import argparse, hashlib, json, logging, os, sqlite3, time
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import jieba
+import jieba.posseg as pseg
+from tqdm import tqdm
+
+DEFAULT_STORE = os.path.join("out", "fengshen_segments.sqlite")
+
+Token = Tuple[str, str]
+MODES = ("pos", "cut")
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# 指纹缓存：键是各词典文件的 (路径, 大小, 修改时间)，文件没动就不再读取、哈希约 5 MB 的主词典
+_FINGERPRINTS: Dict[tuple, str] = {}
+
+
+def _file_stamp(path: str) -> tuple:
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def dict_fingerprint(user_dicts: Sequence[str] = (), main_dict: Optional[str] = None, mode: str = "pos") -> str:
+    """jieba 版本 + 主词典 + 用户词典内容 + 分词方式的指纹；任一变化都会生成新的分组。
+    （"pos" 不计入，与加入分词方式之前的指纹相同，已有缓存继续有效）"""
+    if mode not in MODES:
+        raise ValueError(f"未知的分词方式: {mode}（可选 {', '.join(MODES)}）")
+    main_path = main_dict or jieba.dt.dictionary or os.path.join(os.path.dirname(jieba.__file__), "dict.txt")
+    try:
+        key = (jieba.__version__, mode, bool(main_dict), _file_stamp(main_path), *map(_file_stamp, user_dicts))
+    except OSError:
+        key = None  # 主词典不在普通文件里（如打包成 zip）时不缓存
+    if key in _FINGERPRINTS:
+        return _FINGERPRINTS[key]
+    h = hashlib.sha256(jieba.__version__.encode("utf-8"))
+    if main_dict:
+        with open(main_dict, "rb") as f:
+            h.update(f.read())
+    else:
+        with jieba.get_dict_file() as f:
+            h.update(f.read())
+    for path in user_dicts:
+        h.update(b"\0user\0")
+        with open(path, "rb") as f:
+            h.update(f.read())
+    if mode != "pos":
+        h.update(f"\0mode\0{mode}".encode("utf-8"))
+    fp = h.hexdigest()[:16]
+    if key is not None:
+        _FINGERPRINTS[key] = fp
+    return fp
+
+
+def make_tokenizer(user_dicts: Sequence[str] = (), main_dict: Optional[str] = None, mode: str = "pos"):
+    """独立的 jieba 实例，不污染全局 jieba.dt；mode="pos" 时包一层词性标注。"""
+    tok = jieba.Tokenizer(main_dict) if main_dict else jieba.Tokenizer()
+    for path in user_dicts:
+        tok.load_userdict(path)
+    return pseg.POSTokenizer(tok) if mode == "pos" else tok
+
+
+def cut_text(tokenizer, text: str) -> List[Token]:
+    if isinstance(tokenizer, pseg.POSTokenizer):
+        return [(w, f) for w, f in tokenizer.cut(text)]
+    return [(w, "") for w in tokenizer.cut(text)]
+
+
+# ---- 进程池：每个 worker 初始化一次分词器 ----
+_WORKER_TOKENIZER = None
+
+
+def _init_worker(user_dicts: Sequence[str], main_dict: Optional[str], mode: str = "pos"):
+    global _WORKER_TOKENIZER
+    jieba.setLogLevel(logging.WARNING)
+    _WORKER_TOKENIZER = make_tokenizer(user_dicts, main_dict, mode)
+    getattr(_WORKER_TOKENIZER, "tokenizer", _WORKER_TOKENIZER).initialize()
+
+
+def _cut_chunk(chunk: List[Tuple[str, str]]) -> List[Tuple[str, List[Token]]]:
+    return [(h, cut_text(_WORKER_TOKENIZER, t)) for h, t in chunk]
+
+
+def make_chunks(items: List[Tuple[str, str]], groups: Optional[List] = None,
+                chunk_chars: int = 20000) -> List[List[Tuple[str, str]]]:
+    """按回目（groups）分块；没有回目信息时按字数切块。"""
+    if groups is not None:
+        by_group: Dict = {}
+        for item, g in zip(items, groups):
+            by_group.setdefault(g, []).append(item)
+        return list(by_group.values())
+    chunks: List[List[Tuple[str, str]]] = []
+    cur, size = [], 0
+    for item in items:
+        cur.append(item)
+        size += len(item[1])
+        if size >= chunk_chars:
+            chunks.append(cur)
+            cur, size = [], 0
+    if cur:
+        chunks.append(cur)
+    return chunks
+
+
+def make_pool(workers: int, user_dicts: Sequence[str] = (), main_dict: Optional[str] = None, mode: str = "pos") -> Pool:
+    return Pool(workers, initializer=_init_worker, initargs=(list(user_dicts), main_dict, mode))
+
+
+def cut_many(items: List[Tuple[str, str]], user_dicts: Sequence[str] = (), main_dict: Optional[str] = None,
+             workers: int = 1, groups: Optional[List] = None, verbose: bool = True,
+             tokenizer=None, pool: Optional[Pool] = None, mode: str = "pos") -> List[Tuple[str, List[Token]]]:
+    """[(hash, text)] -> [(hash, tokens)]，顺序不变；workers > 1 时用进程池。
+    可传入已建好的 tokenizer / pool 复用（须与 user_dicts、main_dict、mode 对应）。"""
+    if workers <= 1 or len(items) < 2:
+        tokenizer = tokenizer or make_tokenizer(user_dicts, main_dict, mode)
+        return [(h, cut_text(tokenizer, t)) for h, t in tqdm(items, desc="分词", disable=not verbose)]
+    chunks = make_chunks(items, groups)
+    out: List[Tuple[str, List[Token]]] = []
+    own = pool is None
+    if own:
+        pool = make_pool(workers, user_dicts, main_dict, mode)
+    try:
+        for part in tqdm(pool.imap(_cut_chunk, chunks), total=len(chunks),
+                         desc=f"分词 (x{workers})", disable=not verbose):
+            out.extend(part)
+    finally:
+        if own:
+            pool.terminate()
+    return out
+
+
+class SegmentStore:
+    """SQLite 持久化：segments(dict_fp, text_hash) -> JSON [[词, 词性], ...]"""
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self.path = path
+        # 流水线中多个阶段可能同时写入，等待锁而不是立即报错
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS segments (
+                dict_fp TEXT NOT NULL, text_hash TEXT NOT NULL, tokens TEXT NOT NULL,
+                PRIMARY KEY (dict_fp, text_hash)) WITHOUT ROWID""")
+
+    def get_many(self, dict_fp: str, hashes: Iterable[str]) -> dict:
+        found = {}
+        hashes = list(set(hashes))
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            q = f"SELECT text_hash, tokens FROM segments WHERE dict_fp = ? AND text_hash IN ({','.join('?' * len(chunk))})"
+            for h, tokens in self.conn.execute(q, [dict_fp, *chunk]):
+                found[h] = [tuple(t) for t in json.loads(tokens)]
+        return found
+
+    def put_many(self, dict_fp: str, items: Iterable[Tuple[str, List[Token]]]):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO segments VALUES (?,?,?)",
+                ((dict_fp, h, json.dumps(tokens, ensure_ascii=False, separators=(",", ":"))) for h, tokens in items),
+            )
+
+    def close(self):
+        self.conn.close()
+
+
+def split_units(texts: Iterable) -> List[str]:
+    """把整回文本按换行拆成段落单元，便于与段落级结果共用缓存。"""
+    units = []
+    for t in texts:
+        if isinstance(t, str):
+            units.extend(line for line in t.split("\n") if line.strip())
+    return units
+
+
+class Segmenter:
+    """同一词典下的多次分词：指纹只算一次，缓存库只开一次，分词器 / 进程池首次需要时建好后复用。"""
+
+    def __init__(self, user_dicts: Sequence[str] = (), store_path: str = DEFAULT_STORE,
+                 main_dict: Optional[str] = None, workers: int = 1, mode: str = "pos"):
+        self.user_dicts = list(user_dicts)
+        self.main_dict = main_dict
+        self.workers = workers
+        self.mode = mode
+        self.fp = dict_fingerprint(self.user_dicts, main_dict, mode)
+        self.store = SegmentStore(store_path)
+        self._tokenizer = None
+        self._pool: Optional[Pool] = None
+
+    def _cut(self, items: List[Tuple[str, str]], groups: Optional[List], verbose: bool) -> List[Tuple[str, List[Token]]]:
+        if self.workers <= 1 or len(items) < 2:
+            if self._tokenizer is None:
+                self._tokenizer = make_tokenizer(self.user_dicts, self.main_dict, self.mode)
+        elif self._pool is None:
+            self._pool = make_pool(self.workers, self.user_dicts, self.main_dict, self.mode)
+        return cut_many(items, self.user_dicts, self.main_dict, workers=self.workers, groups=groups,
+                        verbose=verbose, tokenizer=self._tokenizer, pool=self._pool, mode=self.mode)
+
+    def segment(self, texts: Iterable, groups: Optional[Iterable] = None, verbose: bool = True) -> List[List[Token]]:
+        """按段落返回 [(词, 词性), ...]；已分过的直接读库，只对新段落 / 新词典分词。非字符串视为空段落。"""
+        texts = [t if isinstance(t, str) else "" for t in texts]
+        groups = list(groups) if groups is not None else None
+        hashes = [text_hash(t) for t in texts]
+        cached = self.store.get_many(self.fp, hashes)
+        missing, missing_groups = {}, []
+        for i, (h, t) in enumerate(zip(hashes, texts)):
+            if h not in cached and h not in missing:
+                missing[h] = t
+                if groups is not None:
+                    missing_groups.append(groups[i])
+        if verbose:
+            print(f"分词缓存：共 {len(texts)} 段，命中 {len(texts) - sum(1 for h in hashes if h in missing)} 段，"
+                  f"需新分词 {len(missing)} 段（词典指纹 {self.fp}）")
+        if missing:
+            fresh = self._cut(list(missing.items()), missing_groups if groups is not None else None, verbose)
+            self.store.put_many(self.fp, fresh)
+            cached.update(fresh)
+        return [cached[h] for h in hashes]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool = None
+        self.store.close()
+
+
+def segment_texts(texts: Iterable, user_dicts: Sequence[str] = (), store_path: str = DEFAULT_STORE,
+                  main_dict: Optional[str] = None, verbose: bool = True, workers: int = 1,
+                  groups: Optional[Iterable] = None, mode: str = "pos") -> List[List[Token]]:
+    """一次性分词（见 Segmenter.segment）。workers > 1 时并行分词；groups（如 chapter_no 列）与 texts 等长，用于按回目分块。"""
+    segmenter = Segmenter(user_dicts, store_path, main_dict, workers, mode)
+    try:
+        return segmenter.segment(texts, groups, verbose)
+    finally:
+        segmenter.close()
+
+
+def benchmark(texts: List[str], groups: Optional[List], worker_counts: Sequence[int],
+              user_dicts: Sequence[str] = (), mode: str = "pos") -> List[Dict]:
+    """不经缓存，分别用不同进程数分词，返回耗时、加速比，并校验与单进程结果一致。"""
+    items = [(text_hash(t), t) for t in texts]
+    results, baseline, base_time = [], None, None
+    for w in sorted(set([1, *worker_counts])):
+        start = time.perf_counter()
+        out = cut_many(items, user_dicts, workers=w, groups=groups, verbose=False, mode=mode)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline, base_time = out, elapsed
+        results.append({
+            "workers": w,
+            "seconds": round(elapsed, 2),
+            "speedup": round(base_time / elapsed, 2) if elapsed else None,
+            "efficiency": round(base_time / elapsed / w, 2) if elapsed else None,
+            "identical": out == baseline,
+        })
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser(description="共享分词层：预热缓存 / 并行加速比测试")
+    ap.add_argument("action", choices=["warm", "bench"], help="warm=分词并写入缓存；bench=加速比测试")
+    ap.add_argument("--input", type=str, default=os.path.join("out", "fengshen_paragraphs.csv"), help="段落 CSV（text, chapter_no 列）")
+    ap.add_argument("--workers", type=str, default=str(os.cpu_count() or 1), help="进程数；bench 可用逗号分隔多个，如 1,2,4")
+    ap.add_argument("--user-dict", action="append", default=[], help="用户词典，可多次指定")
+    ap.add_argument("--store", type=str, default=DEFAULT_STORE, help="缓存数据库路径")
+    ap.add_argument("--limit-chapters", type=int, default=0, help="只取前 N 回（快速测试）")
+    ap.add_argument("--mode", choices=MODES, default="pos", help="分词方式：pos=词性标注（默认）；cut=jieba.cut 精确模式")
+    args = ap.parse_args()
+
+    from fengshen_corpus import read_table
+    df = read_table(args.input)
+    if args.limit_chapters:
+        df = df[df["chapter_no"] <= args.limit_chapters]
+    texts = [t if isinstance(t, str) else "" for t in df["text"]]
+    groups = df["chapter_no"].tolist() if "chapter_no" in df.columns else None
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+
+    if args.action == "warm":
+        segment_texts(texts, user_dicts=args.user_dict, store_path=args.store, workers=worker_counts[0], groups=groups,
+                      mode=args.mode)
+        return
+    cores = os.cpu_count() or 1
+    print(f"语料：{len(texts)} 段，{sum(map(len, texts)):,} 字；CPU 核数：{cores}")
+    for r in benchmark(texts, groups, worker_counts, args.user_dict, args.mode):
+        print(f"  workers={r['workers']:>2}  耗时 {r['seconds']:>8.2f}s  加速比 {r['speedup']:.2f}x  "
+              f"并行效率 {r['efficiency']:.0%}  结果一致: {'是' if r['identical'] else '否'}"
+              + ("  (超过核数)" if r["workers"] > cores else ""))
+
+
+if __name__ == "__main__":
+    main()
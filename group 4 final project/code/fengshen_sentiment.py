@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""
+SnowNLP 情感分数批量计算引擎
+- 预编译：把 SnowNLP 自带的朴素贝叶斯情感模型转成 NumPy 对数概率差数组，
+  一批句子的分数 = sigmoid(先验 + Σ 词的 log P(w|pos) - log P(w|neg))，用 bincount 一次算完
+  （与 SnowNLP(text).sentiments 数学上等价，误差在浮点精度以内，可用 verify 子命令核对）
+- 记忆化：按句子 sha256 去重，小说里大量程式化句子只算一次
+- 断点续跑：每算完一块就写入 SQLite（out/fengshen_sentiment.sqlite），中断后重跑只算剩余部分
+- 并行：workers > 1 时分块交给进程池，每个进程只编译一次模型
+- cached_scores：只读缓存、不打分（人物网络阶段复用情感阶段已算好的分数）
+用法示例：
+  from fengshen_sentiment import score_texts
+  df_sent['sentiment'] = score_texts(df_sent['text_simplified'], workers=4)
+  python fengshen_sentiment.py verify --input out/fengshen_sentences.csv --sample 500
+"""
+import argparse, hashlib, importlib.util, os, sqlite3, time
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from tqdm import tqdm
+
+DEFAULT_STORE = os.path.join("out", "fengshen_sentiment.sqlite")
+NEUTRAL = 0.5
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def model_fingerprint() -> str:
+    """SnowNLP 情感模型文件的指纹；换模型（重新训练）后旧分数自动失效。"""
+    # 直接定位模型文件，不 import snownlp.sentiment（导入会加载整个模型，较慢）
+    pkg_dir = os.path.dirname(importlib.util.find_spec("snownlp").origin)
+    h = hashlib.sha256()
+    with open(os.path.join(pkg_dir, "sentiment", "sentiment.marshal.3"), "rb") as f:
+        h.update(f.read())
+    return h.hexdigest()[:16]
+
+
+def tokenize(text: str) -> List[str]:
+    """与 SnowNLP 情感分类一致的预处理：seg.seg + 去停用词。"""
+    from snownlp import sentiment
+    return sentiment.classifier.handle(text)
+
+
+def reference_score(text) -> float:
+    """原始写法（逐句构造 SnowNLP 对象），用于核对。"""
+    from snownlp import SnowNLP
+    try:
+        if not isinstance(text, str) or not text.strip():
+            return NEUTRAL
+        return SnowNLP(text).sentiments
+    except Exception:
+        return NEUTRAL
+
+
+class CompiledSentimentModel:
+    """SnowNLP Bayes 模型的向量化版本（仅支持 neg/pos 两类）。"""
+
+    def __init__(self, bayes=None):
+        if bayes is None:
+            from snownlp import sentiment
+            bayes = sentiment.classifier.classifier
+        pos, neg = bayes.d["pos"], bayes.d["neg"]
+        vocab = set(pos.d) | set(neg.d)
+        self.vocab: Dict[str, int] = {w: i for i, w in enumerate(sorted(vocab))}
+        n = len(self.vocab)
+        # 每个词的 log P(w|pos) - log P(w|neg)；最后一格为词表外（AddOneProb 对未见词计 none/total）
+        delta = np.empty(n + 1, dtype=np.float64)
+        for w, i in self.vocab.items():
+            fp = pos.d.get(w, pos.none) / pos.total
+            fn = neg.d.get(w, neg.none) / neg.total
+            delta[i] = np.log(fp) - np.log(fn)
+        delta[n] = np.log(pos.none / pos.total) - np.log(neg.none / neg.total)
+        self.delta = delta
+        self.oov = n
+        self.prior = np.log(pos.getsum()) - np.log(neg.getsum())
+
+    def encode(self, words: Sequence[str]) -> List[int]:
+        get, oov = self.vocab.get, self.oov
+        return [get(w, oov) for w in words]
+
+    def score_ids(self, id_lists: Sequence[Sequence[int]]) -> np.ndarray:
+        """一批句子（已编码）-> P(pos)；单次 bincount 完成求和。"""
+        lengths = np.fromiter((len(x) for x in id_lists), dtype=np.int64, count=len(id_lists))
+        if lengths.sum():
+            ids = np.fromiter((i for x in id_lists for i in x), dtype=np.int64, count=int(lengths.sum()))
+            owner = np.repeat(np.arange(len(id_lists)), lengths)
+            logit = self.prior + np.bincount(owner, weights=self.delta[ids], minlength=len(id_lists))
+        else:
+            logit = np.full(len(id_lists), self.prior)
+        with np.errstate(over="ignore"):
+            return 1.0 / (1.0 + np.exp(-logit))
+
+    def score_texts(self, texts: Sequence[str]) -> np.ndarray:
+        id_lists, neutral = [], []
+        for i, t in enumerate(texts):
+            try:
+                if not isinstance(t, str) or not t.strip():
+                    raise ValueError
+                id_lists.append(self.encode(tokenize(t)))
+            except Exception:
+                id_lists.append([])
+                neutral.append(i)
+        scores = self.score_ids(id_lists)
+        scores[neutral] = NEUTRAL
+        return scores
+
+
+class ScoreStore:
+    """SQLite：scores(model_fp, text_hash) -> score；兼作记忆化表与断点。"""
+
+    def __init__(self, path: str = DEFAULT_STORE):
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        # 流水线中情感与网络阶段可能同时写入：等待锁而不是立即报错，WAL 让读写互不阻塞
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute("""CREATE TABLE IF NOT EXISTS scores (
+                model_fp TEXT NOT NULL, text_hash TEXT NOT NULL, score REAL NOT NULL,
+                PRIMARY KEY (model_fp, text_hash)) WITHOUT ROWID""")
+
+    def get_many(self, model_fp: str, hashes: Iterable[str]) -> Dict[str, float]:
+        found = {}
+        hashes = list(set(hashes))
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            q = f"SELECT text_hash, score FROM scores WHERE model_fp = ? AND text_hash IN ({','.join('?' * len(chunk))})"
+            found.update(self.conn.execute(q, [model_fp, *chunk]))
+        return found
+
+    def put_many(self, model_fp: str, items: Iterable[Tuple[str, float]]):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO scores VALUES (?,?,?)",
+                                  ((model_fp, h, float(s)) for h, s in items))
+
+    def close(self):
+        self.conn.close()
+
+
+# ---- 进程池：每个 worker 编译一次模型 ----
+_WORKER_MODEL: Optional[CompiledSentimentModel] = None
+
+
+def _init_worker():
+    global _WORKER_MODEL
+    _WORKER_MODEL = CompiledSentimentModel()
+
+
+def _score_chunk(chunk: List[Tuple[str, str]]) -> List[Tuple[str, float]]:
+    hashes = [h for h, _ in chunk]
+    scores = _WORKER_MODEL.score_texts([t for _, t in chunk])
+    return list(zip(hashes, scores.tolist()))
+
+
+def score_texts(texts: Iterable, workers: int = 1, chunk_size: int = 2000,
+                store_path: Optional[str] = DEFAULT_STORE, verbose: bool = True) -> np.ndarray:
+    """逐句情感分数（与 texts 等长）。已算过的句子从 store 读取；store_path=None 时不落盘。"""
+    texts = list(texts)
+    keys = [text_hash(t) if isinstance(t, str) else "" for t in texts]
+    fp = model_fingerprint()
+    store = ScoreStore(store_path) if store_path else None
+    try:
+        known: Dict[str, float] = {"": NEUTRAL}
+        if store:
+            known.update(store.get_many(fp, (k for k in keys if k)))
+        todo: Dict[str, str] = {}
+        for k, t in zip(keys, texts):
+            if k not in known and k not in todo:
+                todo[k] = t
+        if verbose:
+            print(f"情感分数：共 {len(texts)} 句，去重后 {len(set(keys))} 句，"
+                  f"已有 {len(set(keys)) - len(todo)} 句，需计算 {len(todo)} 句")
+        items = list(todo.items())
+        chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+        if chunks:
+            if workers > 1:
+                pool = Pool(workers, initializer=_init_worker)
+                results = pool.imap_unordered(_score_chunk, chunks)
+            else:
+                pool = None
+                _init_worker()
+                results = map(_score_chunk, chunks)
+            try:
+                for part in tqdm(results, total=len(chunks), desc="情感打分", disable=not verbose):
+                    if store:
+                        store.put_many(fp, part)  # 每块即时落盘，可断点续跑
+                    known.update(part)
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+    finally:
+        if store:
+            store.close()
+    return np.array([known[k] for k in keys], dtype=np.float64)
+
+
+def cached_scores(texts: Iterable, store_path: str = DEFAULT_STORE) -> np.ndarray:
+    """逐句读取已缓存的情感分数，不做任何打分；还没有分数的句子为 NaN（缓存不存在时全为 NaN）。"""
+    texts = list(texts)
+    keys = [text_hash(t) if isinstance(t, str) else "" for t in texts]
+    known: Dict[str, float] = {"": NEUTRAL}
+    if os.path.exists(store_path):
+        store = ScoreStore(store_path)
+        try:
+            known.update(store.get_many(model_fingerprint(), (k for k in keys if k)))
+        finally:
+            store.close()
+    return np.array([known.get(k, np.nan) for k in keys], dtype=np.float64)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="SnowNLP 批量情感打分：核对 / 预计算")
+    ap.add_argument("action", choices=["verify", "score"], help="verify=与逐句 SnowNLP 核对；score=预计算并写入缓存")
+    ap.add_argument("--input", type=str, default=os.path.join("out", "fengshen_sentences.csv"))
+    ap.add_argument("--column", type=str, default="text", help="文本列（繁体会先转简体）")
+    ap.add_argument("--sample", type=int, default=300, help="verify 抽样句数")
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+
+    from fengshen_corpus import read_table
+    from fengshen_normalized_text import normalize_texts
+    df = read_table(args.input)
+    if args.action == "verify":
+        texts = normalize_texts(df[args.column].sample(min(args.sample, len(df)), random_state=0), verbose=False)
+        start = time.time()
+        ref = np.array([reference_score(t) for t in texts])
+        t_ref = time.time() - start
+        start = time.time()
+        fast = CompiledSentimentModel().score_texts(texts)
+        t_fast = time.time() - start
+        print(f"{len(texts)} 句：逐句 SnowNLP {t_ref:.2f}s，预编译模型 {t_fast:.2f}s；"
+              f"最大绝对误差 {np.abs(ref - fast).max():.2e}")
+    else:
+        texts = normalize_texts(df[args.column], groups=df.get("chapter_no"))
+        score_texts(texts, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+词编号语料：分词结果编码为整数数组（内存映射），各种计数不再逐词处理字符串
+- 由紧凑语料层的段落 + 共享分词层的结果一次性编译到 fengshen_tokens/<语料指纹>-<词典指纹>/
+  （与紧凑语料的缓存目录同在一个 out/ 下）：
+    tokens.npy          全书的词编号（uint32），段落首尾相接
+    pos.npy             与 tokens 平行的词性编号（uint8）
+    para_offsets.npy    每段在 tokens 中的起止（int64，n+1 个）
+    sent_bounds.npy     每句的 [起, 止) 词位置（int64；句子之间的空白不属于任何句子）
+    chapter_nos.npy / chapter_offsets.npy   回目号与每回的起止词位置
+    vocab.json          词表（编号 -> 词）、词性表、来源指纹
+  build 另写 out/fengshen_tokens/manifest.json 记录最近一次编译的版本（流水线 tokens 阶段的产物）
+- 词编号按全书频次降序、同频按首次出现排列：0 号是最常见的词，words[:k] 就是前 k 名
+- 全书 / 逐回词频是 np.bincount；白名单、地名词典查询是“编号集合”上的布尔查表；
+  多个进程映射同一份文件，共享页缓存，不各自复制
+- mode 与共享分词层相同："pos"（默认，带词性）或 "cut"（jieba.cut，词频统计用），不同方式各有一份
+- 段落、词典任一变化都会按新指纹重编（写临时目录再改名）；所依赖的紧凑语料版本被清理后，对应的旧版本随之清理
+用法示例：
+  from fengshen_token_corpus import load_token_corpus
+  tc = load_token_corpus("out/fengshen_paragraphs.csv", workers=4)
+  tc.frequencies()                     # 全书词频（按词编号）
+  tc.chapter_frequencies()             # 回目 × 词表 稀疏矩阵
+  tc.most_common(tc.token_mask(pos=["nr"]), 20)
+  tc.count_words(["姜子牙", "西岐"])
+  python fengshen_token_corpus.py build --input out/fengshen_paragraphs.csv --workers 4
+  python fengshen_token_corpus.py top --pos nr --top 30
+  python fengshen_token_corpus.py bench                    # 与逐词 Counter 比较结果与耗时
+"""
+import argparse, json, os, shutil, time, uuid
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fengshen_chapter_store import write_json_atomic
+from fengshen_corpus import DEFAULT_PARAGRAPHS, Corpus, load_corpus
+from fengshen_segmentation import DEFAULT_STORE, MODES, dict_fingerprint, segment_texts
+
+TOKENS_DIR = "fengshen_tokens"
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+ARRAYS = ("tokens", "pos", "para_offsets", "sent_bounds", "chapter_nos", "chapter_offsets")
+
+WordCount = Tuple[str, int]
+
+
+# ---- 编译 ----
+def encode_segments(segments: List[List[tuple]]):
+    """[[(词, 词性), ...], ...] -> (词编号, 词性编号, 段落偏移, 词表, 词性表)；词编号按频次降序、同频按首次出现。"""
+    first_ids: Dict[str, int] = {}
+    pos_ids: Dict[str, int] = {}
+    n = sum(len(words) for words in segments)
+    tokens = np.empty(n, dtype=np.int64)
+    pos = np.empty(n, dtype=np.int64)
+    offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+    k = 0
+    for i, words in enumerate(segments):
+        for word, flag in words:
+            tokens[k] = first_ids.setdefault(word, len(first_ids))
+            pos[k] = pos_ids.setdefault(flag, len(pos_ids))
+            k += 1
+        offsets[i + 1] = k
+    if len(pos_ids) > 256:
+        raise ValueError(f"词性标记有 {len(pos_ids)} 种，超出 uint8 的范围")
+    # 按首次出现编号时，稳定排序 (-频次) 即得“频次降序、同频按首次出现”
+    order = np.argsort(-np.bincount(tokens, minlength=len(first_ids)), kind="stable")
+    remap = np.empty(len(order), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    words = list(first_ids)
+    return (remap[tokens].astype(np.uint32), pos.astype(np.uint8), offsets,
+            [words[i] for i in order.tolist()], list(pos_ids))
+
+
+def build_token_corpus(corpus: Corpus, target: str, user_dicts: Sequence[str] = (), workers: int = 1,
+                       store_path: str = DEFAULT_STORE, verbose: bool = True, mode: str = "pos"):
+    """分词（走共享分词层缓存）并写出 target 目录（先写临时目录再改名）。"""
+    texts = corpus.texts("paragraphs")
+    segments = segment_texts(texts, user_dicts=user_dicts, store_path=store_path, verbose=verbose,
+                             workers=workers, groups=corpus.chapter_nos().tolist(), mode=mode)
+    tokens, pos, para_offsets, words, pos_tags = encode_segments(segments)
+
+    # 分词结果首尾相接即原段落，段落首尾相接即全书：词长累加就是每个词在全书中的起始字符位置，
+    # 句子的字符边界由此换算成词位置
+    lengths = np.fromiter((len(w) for w in words), dtype=np.int64, count=len(words))[tokens]
+    if int(lengths.sum()) != int(corpus.meta["chars"]):
+        raise ValueError("分词结果与段落原文长度不一致，无法对齐句子边界")
+    starts = np.cumsum(lengths) - lengths
+    spans = np.asarray(corpus.sent_spans)
+    sent_bounds = np.searchsorted(starts, spans.ravel(), "left").reshape(-1, 2).astype(np.int64)
+
+    chapter_keys = np.asarray(corpus.para_keys[:, 0])
+    chapters = corpus.chapters.astype(np.int32)
+    first_para = np.searchsorted(chapter_keys, chapters, "left")
+    chapter_offsets = np.concatenate((para_offsets[first_para], [len(tokens)])).astype(np.int64)
+
+    tmp = f"{target}.tmp-{uuid.uuid4().hex[:8]}"
+    os.makedirs(tmp)
+    arrays = {"tokens": tokens, "pos": pos, "para_offsets": para_offsets, "sent_bounds": sent_bounds,
+              "chapter_nos": chapters, "chapter_offsets": chapter_offsets}
+    for name in ARRAYS:
+        np.save(os.path.join(tmp, name + ".npy"), arrays[name])
+    meta = {"version": FORMAT_VERSION, "corpus": corpus.meta["digest"], "dict": dict_fingerprint(user_dicts, mode=mode),
+            "mode": mode,
+            "user_dicts": [os.path.abspath(p) for p in user_dicts], "tokens": int(len(tokens)),
+            "words": words, "pos": pos_tags}
+    with open(os.path.join(tmp, "vocab.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    try:
+        os.rename(tmp, target)
+    except OSError:  # 另一个进程已编译好同一版本
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+class TokenCorpus:
+    """只读词编号语料（内存映射）。"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "vocab.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.words: List[str] = self.meta["words"]
+        self.pos_tags: List[str] = self.meta["pos"]
+        self.word_ids = {w: i for i, w in enumerate(self.words)}
+        mmap_mode = "r" if self.meta["tokens"] else None  # 空语料的数组无法映射
+        for name in ARRAYS:
+            setattr(self, name, np.load(os.path.join(path, name + ".npy"), mmap_mode=mmap_mode))
+
+    @property
+    def n_tokens(self) -> int:
+        return len(self.tokens)
+
+    @property
+    def vocab_size(self) -> int:
+        return len(self.words)
+
+    # ---- 编号与查表 ----
+    def ids(self, words: Sequence[str]) -> np.ndarray:
+        """词 -> 编号；不在词表中的词略去。"""
+        return np.array([self.word_ids[w] for w in words if w in self.word_ids], dtype=np.int64)
+
+    def vocab_mask(self, words: Optional[Sequence[str]] = None,
+                   predicate: Optional[Callable[[str], bool]] = None) -> np.ndarray:
+        """词表上的布尔数组：在 words 中（编号集合）且满足 predicate 的词为 True。"""
+        mask = np.ones(self.vocab_size, dtype=bool)
+        if words is not None:
+            mask[:] = False
+            mask[self.ids(words)] = True
+        if predicate is not None:
+            mask &= np.fromiter((bool(predicate(w)) for w in self.words), dtype=bool, count=self.vocab_size)
+        return mask
+
+    def token_mask(self, words: Optional[Sequence[str]] = None, pos: Optional[Sequence[str]] = None,
+                   vocab: Optional[np.ndarray] = None) -> np.ndarray:
+        """全书词位置上的布尔数组：词在 words 中、vocab 查表为 True、词性属于 pos（给出的条件同时满足）。"""
+        mask = np.ones(self.n_tokens, dtype=bool)
+        if words is not None:
+            mask &= self.vocab_mask(words)[self.tokens]
+        if vocab is not None:
+            mask &= vocab[self.tokens]
+        if pos is not None:
+            table = np.zeros(256, dtype=bool)
+            table[[self.pos_tags.index(p) for p in pos if p in self.pos_tags]] = True
+            mask &= table[self.pos]
+        return mask
+
+    # ---- 计数 ----
+    def frequencies(self, chapter_no: Optional[int] = None, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """按词编号的词频（np.bincount）；chapter_no 限定某一回，mask 限定词位置。"""
+        tokens, sel = self.tokens, mask
+        if chapter_no is not None:
+            lo, hi = self.chapter_range(chapter_no)
+            tokens, sel = tokens[lo:hi], (mask[lo:hi] if mask is not None else None)
+        if sel is not None:
+            tokens = tokens[sel]
+        return np.bincount(tokens, minlength=self.vocab_size)
+
+    def chapter_frequencies(self, mask: Optional[np.ndarray] = None):
+        """回目 × 词表的稀疏词频矩阵（行顺序同 chapter_nos）。"""
+        from scipy import sparse
+
+        rows = np.repeat(np.arange(len(self.chapter_nos)), np.diff(self.chapter_offsets))
+        cols = np.asarray(self.tokens)
+        if mask is not None:
+            rows, cols = rows[mask], cols[mask]
+        counts = sparse.coo_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)),
+                                   shape=(len(self.chapter_nos), self.vocab_size))
+        return counts.tocsr()
+
+    def most_common(self, mask: Optional[np.ndarray] = None, k: Optional[int] = None) -> List[WordCount]:
+        """与 Counter(选中的词).most_common(k) 逐字一致：频次降序，同频按在选中词流中首次出现的先后。"""
+        if mask is None:  # 词编号本身就是这个顺序
+            freq = self.frequencies()[:k]
+            return list(zip(self.words[:len(freq)], freq.tolist()))
+        tokens = self.tokens[mask]
+        ids, first = np.unique(tokens, return_index=True)
+        counts = np.bincount(tokens, minlength=self.vocab_size)[ids]
+        order = np.lexsort((first, -counts))[:k]
+        return [(self.words[i], int(c)) for i, c in zip(ids[order].tolist(), counts[order].tolist())]
+
+    def count_words(self, words: Sequence[str], by_chapter: bool = False):
+        """给定词（白名单、地名表）的频次：{词: 次数}；by_chapter 时为 {回目号: {词: 次数}}（只含出现的词）。"""
+        ids = self.ids(words)
+        if not by_chapter:
+            freq = self.frequencies()
+            return {self.words[i]: int(freq[i]) for i in ids.tolist()}
+        matrix = self.chapter_frequencies(self.token_mask(vocab=self.vocab_mask(words)))
+        out = {}
+        for row, chapter_no in enumerate(self.chapter_nos.tolist()):
+            r = matrix.getrow(row)
+            out[chapter_no] = {self.words[i]: int(c) for i, c in zip(r.indices.tolist(), r.data.tolist())}
+        return out
+
+    # ---- 定位 ----
+    def chapter_range(self, chapter_no: int) -> Tuple[int, int]:
+        i = int(np.searchsorted(self.chapter_nos, chapter_no))
+        if i >= len(self.chapter_nos) or self.chapter_nos[i] != chapter_no:
+            raise KeyError(f"没有第 {chapter_no} 回")
+        return int(self.chapter_offsets[i]), int(self.chapter_offsets[i + 1])
+
+    def paragraph_words(self, i: int) -> List[str]:
+        lo, hi = self.para_offsets[i], self.para_offsets[i + 1]
+        return [self.words[t] for t in self.tokens[lo:hi].tolist()]
+
+    def sentence_words(self, i: int) -> List[str]:
+        lo, hi = self.sent_bounds[i]
+        return [self.words[t] for t in self.tokens[lo:hi].tolist()]
+
+    def nbytes(self) -> int:
+        return int(sum(getattr(self, n).nbytes for n in ARRAYS))
+
+
+def load_token_corpus(paragraphs_csv: str = DEFAULT_PARAGRAPHS, user_dicts: Sequence[str] = (), workers: int = 1,
+                      store_path: str = DEFAULT_STORE, verbose: bool = False, mode: str = "pos") -> TokenCorpus:
+    """加载（必要时先分词编译）与段落 CSV、词典当前内容、分词方式对应的词编号语料。"""
+    corpus = load_corpus(paragraphs_csv, verbose=verbose)
+    corpus_root = os.path.dirname(os.path.normpath(corpus.path))
+    root = os.path.join(os.path.dirname(corpus_root), TOKENS_DIR)
+    digest = corpus.meta["digest"]
+    name = f"{digest}-{dict_fingerprint(user_dicts, mode=mode)}"
+    target = os.path.join(root, name)
+    if not os.path.exists(os.path.join(target, "vocab.json")):
+        os.makedirs(root, exist_ok=True)
+        start = time.perf_counter()
+        build_token_corpus(corpus, target, user_dicts, workers, store_path, verbose, mode)
+        # 清理所依赖的语料版本已被清理的旧版本（不同词典 / 分词方式的版本各自保留；其他进程可能仍在用的上一版语料还在）
+        for old in os.listdir(root):
+            if ".tmp-" in old or not os.path.isdir(os.path.join(root, old)):
+                continue
+            if not os.path.isdir(os.path.join(corpus_root, old.split("-")[0])):
+                shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+        if verbose:
+            print(f"🔢 已编译词编号语料：{target}（{time.perf_counter() - start:.2f}s）")
+    return TokenCorpus(target)
+
+
+def bench(tc: TokenCorpus, segments: List[List[tuple]]):
+    """逐词 Counter 与编号数组计数的对比（结果须一致）。"""
+    rows = []
+    start = time.perf_counter()
+    expected = Counter(w for words in segments for w, _ in words).most_common()
+    t_counter = time.perf_counter() - start
+    start = time.perf_counter()
+    got = tc.most_common()
+    rows.append(("全书词频", t_counter, time.perf_counter() - start, got == expected))
+
+    start = time.perf_counter()
+    expected = Counter(w for words in segments for w, f in words if f == "nr" and len(w) > 1).most_common()
+    t_counter = time.perf_counter() - start
+    start = time.perf_counter()
+    got = tc.most_common(tc.token_mask(pos=["nr"], vocab=tc.vocab_mask(predicate=lambda w: len(w) > 1)))
+    rows.append(("人名（nr）", t_counter, time.perf_counter() - start, got == expected))
+
+    sample = tc.words[:: max(tc.vocab_size // 500, 1)]
+    sample_set = set(sample)
+    start = time.perf_counter()
+    expected = Counter(w for words in segments for w, _ in words if w in sample_set)
+    t_counter = time.perf_counter() - start
+    start = time.perf_counter()
+    got = tc.count_words(sample)
+    rows.append((f"词表查询（{len(sample)} 词）", t_counter, time.perf_counter() - start,
+                 {w: c for w, c in got.items() if c} == dict(expected)))
+    for label, t_old, t_new, same in rows:
+        print(f"  {label:<14} Counter {t_old * 1000:8.1f} ms | bincount {t_new * 1000:7.1f} ms | "
+              f"结果一致: {'是' if same else '否'}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="词编号语料：编译 / 查看高频词 / 与逐词 Counter 对比")
+    ap.add_argument("action", choices=["build", "top", "bench"])
+    ap.add_argument("--input", type=str, default=DEFAULT_PARAGRAPHS, help="段落 CSV")
+    ap.add_argument("--user-dict", action="append", default=[], help="jieba 用户词典（如地名表），可多次指定")
+    ap.add_argument("--workers", type=int, default=1, help="需要分词时的进程数")
+    ap.add_argument("--store", type=str, default=DEFAULT_STORE, help="共享分词层数据库")
+    ap.add_argument("--pos", nargs="*", default=None, help="top：只统计这些词性（如 nr ns）")
+    ap.add_argument("--top", type=int, default=30, help="top：显示前 N 个")
+    ap.add_argument("--mode", choices=MODES, default="pos", help="分词方式：pos=词性标注（默认）；cut=jieba.cut 精确模式")
+    args = ap.parse_args()
+
+    tc = load_token_corpus(args.input, args.user_dict, args.workers, args.store, verbose=True, mode=args.mode)
+    print(f"{tc.path}：{len(tc.chapter_nos)} 回，{len(tc.para_offsets) - 1:,} 段，{len(tc.sent_bounds):,} 句，"
+          f"{tc.n_tokens:,} 词（词表 {tc.vocab_size:,}，词性 {len(tc.pos_tags)} 种），映射 {tc.nbytes() / 2 ** 20:.2f} MB")
+    if args.action == "build":
+        # 清单供流水线判断产物是否最新（目录名带指纹，本身不适合作阶段输出）
+        write_json_atomic(os.path.join(os.path.dirname(tc.path), MANIFEST),
+                          {"path": os.path.basename(tc.path), "corpus": tc.meta["corpus"], "dict": tc.meta["dict"],
+                           "tokens": tc.n_tokens, "vocabulary": tc.vocab_size})
+    elif args.action == "top":
+        mask = tc.token_mask(pos=args.pos) if args.pos else None
+        print("、".join(f"{w}({c})" for w, c in tc.most_common(mask, args.top)))
+    elif args.action == "bench":
+        corpus = load_corpus(args.input)
+        segments = segment_texts(corpus.texts("paragraphs"), user_dicts=args.user_dict, store_path=args.store,
+                                 verbose=False, workers=args.workers, mode=args.mode)
+        bench(tc, segments)
+
+
+if __name__ == "__main__":
+    main()
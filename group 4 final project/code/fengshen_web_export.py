@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+网站数据导出（紧凑列式 + 按回分块 + 预压缩）
+- js/nodes_data.js       ：人名只出现一次（names 数组），nodesData 在浏览器端展开
+- js/links_data.js       ：全书关系，列式整数下标 {s:[...], t:[...], w:[...]}，不再每条重复人名字符串
+- js/magic-weapons-data.js：法宝表（data/fengshen_magic.csv），使用者 / 阵营用下标引用去重后的列表
+- js/timeline-data.js    ：data/timeline.json 的脚本版；页面以 file:// 打开、fetch 不可用时地图时间轴用它
+- data/network/meta.json 与 data/network/ch/<回>.json：逐回关系分块，页面选择回目区间时才按需加载
+  （没有逐回张量时可用 --edges 指定 Gephi 边表，只导出全书关系）
+- 边表带有人物网络阶段写入的情感列时，全书关系另带 sw（带符号权重）与 sm（共现句情感均值）两列
+- --graph 指定图分析结果（fengshen_graph_analytics.py）时，nodes_data.js 带上社区、PageRank 与预先算好的布局坐标，
+  页面不再现场跑力导向模拟
+- 每个文件同时写出 .gz / .br 预压缩副本（.br 需要 brotli 包，未安装时跳过）；内容未变的文件不重写
+用法示例：
+  python fengshen_web_export.py --nodes fengshen_nodes.csv --tensor out/fengshen_cooccurrence.npz \\
+      --magic "../data/fengshen_magic.csv" --web-dir "../fengshen dh web" --graph out/fengshen_graph_metrics.csv
+"""
+import argparse, csv, gzip, json, os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from fengshen_cooccurrence import CooccurrenceTensor
+from fengshen_graph_analytics import read_metrics
+
+try:
+    import brotli
+except ImportError:  # 可选依赖
+    brotli = None
+
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_WEB_DIR = os.path.join(CODE_DIR, "..", "fengshen dh web")
+DEFAULT_MAGIC = os.path.join(CODE_DIR, "..", "data", "fengshen_magic.csv")
+MAGIC_COLUMNS = ["法宝名称", "使用者", "所属阵营", "百科简短介绍（来源：百度百科）"]
+
+
+def dumps(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_if_changed(path: str, text: str, compress: bool = True) -> bool:
+    """内容变化时才写入（连同 .gz / .br 副本）；返回是否写入。
+    主文件没变时，缺失或比主文件旧的副本（如首次导出后才装上 brotli）仍会补写。"""
+    data = text.encode("utf-8")
+    codecs = [(".gz", lambda d: gzip.compress(d, 9, mtime=0))] if compress else []
+    if compress and brotli is not None:
+        codecs.append((".br", lambda d: brotli.compress(d, quality=11)))
+    variants = []
+    unchanged = False
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            unchanged = f.read() == data
+    if not unchanged:
+        variants.append((path, data))
+    main_mtime = os.path.getmtime(path) if unchanged else None
+    for suffix, encode in codecs:
+        p = path + suffix
+        if unchanged and os.path.exists(p) and os.path.getmtime(p) >= main_mtime:
+            continue
+        variants.append((p, encode(data)))
+    if not variants:
+        return False
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    for p, payload in variants:
+        with open(p + ".tmp", "wb") as f:
+            f.write(payload)
+        os.replace(p + ".tmp", p)
+    return True
+
+
+def columnar_links(matrix, remap: Sequence[int]) -> Dict[str, List[int]]:
+    """稀疏矩阵 -> {s, t, w}（下标为节点表中的位置）。"""
+    coo = matrix.tocoo()
+    keep = coo.data > 0
+    return {"s": [remap[i] for i in coo.row[keep].tolist()],
+            "t": [remap[j] for j in coo.col[keep].tolist()],
+            "w": coo.data[keep].astype(int).tolist()}
+
+
+def read_node_names(nodes_csv: str) -> List[str]:
+    with open(nodes_csv, "r", encoding="utf-8-sig", newline="") as f:
+        return [r["Id"] for r in csv.DictReader(f)]
+
+
+def read_edges(edges_csv: str, pos: Dict[str, int]) -> Dict[str, List[int]]:
+    """Gephi 边表 -> {s, t, w}；边表中有而节点表中没有的人物补进 pos。"""
+    links: Dict[str, List[int]] = {"s": [], "t": [], "w": []}
+    with open(edges_csv, "r", encoding="utf-8-sig", newline="") as f:
+        for r in csv.DictReader(f):
+            for key, name in (("s", r["Source"]), ("t", r["Target"])):
+                links[key].append(pos.setdefault(name, len(pos)))
+            links["w"].append(int(r["Weight"]))
+    return links
+
+
+def read_edge_sentiment(edges_csv: str) -> Dict[Tuple[str, str], Tuple[float, Optional[float]]]:
+    """{(人名, 人名)（排序后）: (带符号权重, 情感均值)}；边表没有情感列时返回空表。"""
+    sentiment = {}
+    with open(edges_csv, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        if "SignedWeight" not in (reader.fieldnames or []):
+            return {}
+        for r in reader:
+            key = tuple(sorted((r["Source"], r["Target"])))
+            sentiment[key] = (float(r["SignedWeight"] or 0), float(r["Sentiment"]) if r.get("Sentiment") else None)
+    return sentiment
+
+
+def add_sentiment(links: Dict[str, list], names: Sequence[str],
+                  sentiment: Dict[Tuple[str, str], Tuple[float, Optional[float]]]) -> Dict[str, list]:
+    if sentiment:
+        pairs = [sentiment.get(tuple(sorted((names[s], names[t]))), (0.0, None)) for s, t in zip(links["s"], links["t"])]
+        links["sw"] = [p[0] for p in pairs]
+        links["sm"] = [p[1] for p in pairs]
+    return links
+
+
+def export_network(nodes_csv: str, tensor_path: Optional[str], web_dir: str, edges_csv: Optional[str] = None,
+                   graph_csv: Optional[str] = None) -> List[str]:
+    graph = read_metrics(graph_csv) if graph_csv and os.path.exists(graph_csv) else None
+    sentiment = read_edge_sentiment(edges_csv) if edges_csv and os.path.exists(edges_csv) else {}
+    names = read_node_names(nodes_csv)
+    pos = {name: i for i, name in enumerate(names)}
+    if not tensor_path or not os.path.exists(tensor_path):
+        if not edges_csv:
+            raise FileNotFoundError(f"找不到逐回共现张量：{tensor_path}（可用 --edges 指定边表）")
+        total = read_edges(edges_csv, pos)
+        names = list(pos)
+        return _write_network(web_dir, names, add_sentiment(total, names, sentiment), [], [], [None] * len(names), graph)
+    tensor = CooccurrenceTensor.load(tensor_path)
+    for name in tensor.names:  # 张量里有而节点表里没有的人物补在末尾
+        if name not in pos:
+            pos[name] = len(names)
+            names.append(name)
+    remap = [pos[name] for name in tensor.names]
+    first = tensor.first_appearance()
+    total = add_sentiment(columnar_links(tensor.range_matrix(), remap), names, sentiment)
+    return _write_network(web_dir, names, total, tensor.chapters,
+                          [columnar_links(m, remap) for m in tensor.matrices], [first.get(n) for n in names], graph)
+
+
+def _write_network(web_dir: str, names: List[str], total: Dict[str, list], chapters: List[int],
+                   per_chapter: List[Dict[str, List[int]]], first: List[Optional[int]],
+                   graph: Optional[Dict[str, dict]] = None) -> List[str]:
+    written = []
+    js = os.path.join(web_dir, "js")
+    nodes_js = "const fengshenNames = " + dumps(names) + ";\n"
+    if graph:
+        # 列式：社区 / PageRank / 布局坐标；图分析里没有的人物为 null，页面照旧归入 group 1
+        get = lambda key: [graph[n][key] if n in graph else None for n in names]
+        nodes_js += ("var nodesData = (g => fengshenNames.map((n, i) => g.community[i] === null ? {id: n, name: n, group: 1} : "
+                     "{id: n, name: n, group: g.community[i] + 1, community: g.community[i], pagerank: g.pagerank[i], "
+                     "lx: g.x[i], ly: g.y[i]}))("
+                     + dumps({"community": get("community"), "pagerank": get("pagerank"), "x": get("x"), "y": get("y")})
+                     + ");\n")
+    else:
+        nodes_js += "var nodesData = fengshenNames.map(n => ({id: n, name: n, group: 1}));\n"
+    signed = ", signed: c.sw[i], sentiment: c.sm[i]" if "sw" in total else ""
+    links_js = ("var linksData = (c => c.s.map((s, i) => "
+                "({source: fengshenNames[s], target: fengshenNames[c.t[i]], value: c.w[i]" + signed + "})))("
+                + dumps(total) + ");\n")
+    meta = {"chapters": chapters, "first": first}
+    outputs = [(os.path.join(js, "nodes_data.js"), nodes_js),
+               (os.path.join(js, "links_data.js"), links_js),
+               (os.path.join(web_dir, "data", "network", "meta.json"), dumps(meta))]
+    for chapter, links in zip(chapters, per_chapter):
+        outputs.append((os.path.join(web_dir, "data", "network", "ch", f"{chapter}.json"), dumps(links)))
+    for path, text in outputs:
+        if write_if_changed(path, text):
+            written.append(path)
+    return written
+
+
+def export_magic(magic_csv: str, web_dir: str) -> List[str]:
+    with open(magic_csv, "r", encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+    users: Dict[str, int] = {}
+    camps: Dict[str, int] = {}
+    compact = {
+        "users": users, "camps": camps,
+        "name": [r[MAGIC_COLUMNS[0]] for r in rows],
+        "user": [users.setdefault(r[MAGIC_COLUMNS[1]], len(users)) for r in rows],
+        "camp": [camps.setdefault(r[MAGIC_COLUMNS[2]], len(camps)) for r in rows],
+        "desc": [r[MAGIC_COLUMNS[3]] for r in rows],
+    }
+    compact["users"], compact["camps"] = list(users), list(camps)
+    k = [dumps(c) for c in MAGIC_COLUMNS]
+    js = ("const allTreasuresData = (c => c.name.map((n, i) => "
+          f"({{{k[0]}: n, {k[1]}: c.users[c.user[i]], {k[2]}: c.camps[c.camp[i]], {k[3]}: c.desc[i]}})))("
+          + dumps(compact) + ");\n")
+    path = os.path.join(web_dir, "js", "magic-weapons-data.js")
+    return [path] if write_if_changed(path, js) else []
+
+
+def export_timeline(web_dir: str) -> List[str]:
+    src = os.path.join(web_dir, "data", "timeline.json")
+    if not os.path.exists(src):
+        return []
+    with open(src, "r", encoding="utf-8") as f:
+        events = json.load(f)
+    path = os.path.join(web_dir, "js", "timeline-data.js")
+    return [path] if write_if_changed(path, "const timelineEventsData = " + dumps(events) + ";\n") else []
+
+
+def export_all(nodes_csv: str, tensor_path: Optional[str], web_dir: str = DEFAULT_WEB_DIR,
+               magic_csv: Optional[str] = DEFAULT_MAGIC, edges_csv: Optional[str] = None,
+               graph_csv: Optional[str] = None) -> List[str]:
+    written = export_network(nodes_csv, tensor_path, web_dir, edges_csv, graph_csv)
+    if magic_csv and os.path.exists(magic_csv):
+        written += export_magic(magic_csv, web_dir)
+    written += export_timeline(web_dir)
+    return written
+
+
+def main():
+    ap = argparse.ArgumentParser(description="导出网站数据：紧凑列式 JSON、按回分块、预压缩")
+    ap.add_argument("--nodes", type=str, default="fengshen_nodes.csv", help="人物节点 CSV（Id 列）")
+    ap.add_argument("--tensor", type=str, default=os.path.join("out", "fengshen_cooccurrence.npz"), help="逐回共现张量")
+    ap.add_argument("--edges", type=str, default="",
+                    help="Gephi 边表：带情感列时导出带符号权重；没有逐回张量时用它导出全书关系")
+    ap.add_argument("--magic", type=str, default=DEFAULT_MAGIC, help="法宝 CSV")
+    ap.add_argument("--web-dir", type=str, default=DEFAULT_WEB_DIR, help="网站根目录")
+    ap.add_argument("--graph", type=str, default="", help="图分析结果 CSV（社区 / PageRank / 布局坐标），不存在则不带")
+    args = ap.parse_args()
+
+    written = export_all(args.nodes, args.tensor, args.web_dir, args.magic, args.edges or None, args.graph or None)
+    print(f"已更新 {len(written)} 个文件" + ("" if brotli else "（未安装 brotli，跳过 .br）"))
+    for path in written:
+        size = os.path.getsize(path)
+        gz = os.path.getsize(path + ".gz") if os.path.exists(path + ".gz") else 0
+        print(f"  {os.path.relpath(path, args.web_dir)}  {size:,} B（gzip {gz:,} B）")
+
+
+if __name__ == "__main__":
+    main()
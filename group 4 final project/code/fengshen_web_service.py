@@ -0,0 +1,368 @@
+# -*- coding: utf-8 -*-
+"""
+本地查询服务（asyncio，仅用标准库 + 项目已有的 numpy / scipy）
+- 启动时一次性加载流水线产物：逐回共现张量、逐回地点明细、法宝表、事件时间轴、图分析结果（社区 / PageRank / 布局坐标）
+- 网页按需请求数据切片，不必预先加载全部静态 JS：
+    /api/network?center=哪吒&start=10&end=20&min_weight=2&depth=1&top=50   人物自我网络（回目区间、最小权重）
+    /api/chapters                                                        回目列表与人物首次出现回
+    /api/places?start=1&end=30&top=20&rollup=1                           区间地点排行
+    /api/places?place=西岐                                                某地逐回出现次数
+    /api/weapons?camp=截教&user=&q=                                       法宝（按阵营 / 使用者 / 关键词）
+    /api/weapons/camps                                                   各阵营法宝数
+    /api/timeline?start=1&end=50&location=朝歌                            事件时间轴
+    /api/health                                                          数据来源与缓存命中情况
+- 查询结果进 LRU 缓存（同一参数只计算一次），带 ETag；浏览器带 If-None-Match 再次请求时返回 304
+- 其余路径作为网站静态文件提供（优先返回 .br / .gz 预压缩副本），页面与接口同源
+用法示例：
+  python fengshen_web_service.py --workdir . --port 8000
+  浏览器打开 http://127.0.0.1:8000/relationship-network.html
+"""
+import argparse, asyncio, csv, functools, gzip, hashlib, json, mimetypes, os
+from email.utils import formatdate
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from fengshen_web_export import DEFAULT_MAGIC, DEFAULT_WEB_DIR, MAGIC_COLUMNS
+
+MAIN_CAMPS = ("阐教", "截教", "人教", "妖族")
+KEEP_ALIVE_TIMEOUT = 15  # 空闲连接保留秒数
+STATUS_TEXT = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+class QueryError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _int(params: Dict[str, str], key: str, default: Optional[int] = None) -> Optional[int]:
+    value = params.get(key, "")
+    if value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise QueryError(400, f"参数 {key} 应为整数：{value}")
+
+
+def _in_range(chapter: int, start: Optional[int], end: Optional[int]) -> bool:
+    return (start is None or chapter >= start) and (end is None or chapter <= end)
+
+
+def read_csv_rows(path: str) -> List[Dict[str, str]]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class ServiceData:
+    """流水线产物（只读）及各查询的实现；缺失的数据源对应接口返回 404。"""
+
+    def __init__(self, tensor_path: str, places_csv: str, place_stats_csv: str, magic_csv: str, timeline_json: str,
+                 graph_csv: str = ""):
+        self.sources: Dict[str, Optional[str]] = {}
+        self.tensor = None
+        if os.path.exists(tensor_path):
+            from fengshen_cooccurrence import CooccurrenceTensor
+            self.tensor = CooccurrenceTensor.load(tensor_path)
+            self.first = self.tensor.first_appearance()
+        self.places: Dict[int, List[Tuple[str, str, int, int]]] = {}
+        if os.path.exists(places_csv):
+            for r in read_csv_rows(places_csv):
+                self.places.setdefault(int(r["chapter_no"]), []).append(
+                    (r["place"], r["parent"], int(r["count"]), int(r["rollup_count"])))
+        self.place_totals = {}
+        if os.path.exists(place_stats_csv):
+            self.place_totals = {r["地点名称"]: int(r["出现次数"]) for r in read_csv_rows(place_stats_csv)}
+        self.weapons = read_csv_rows(magic_csv) if os.path.exists(magic_csv) else []
+        self.timeline = []
+        if os.path.exists(timeline_json):
+            with open(timeline_json, "r", encoding="utf-8") as f:
+                self.timeline = json.load(f)
+        self.graph: Dict[str, dict] = {}
+        if graph_csv and os.path.exists(graph_csv):
+            from fengshen_graph_analytics import read_metrics
+            self.graph = read_metrics(graph_csv)
+        for key, path, ok in (("tensor", tensor_path, self.tensor is not None), ("places", places_csv, self.places),
+                              ("place_stats", place_stats_csv, self.place_totals),
+                              ("weapons", magic_csv, self.weapons), ("timeline", timeline_json, self.timeline),
+                              ("graph", graph_csv, self.graph)):
+            self.sources[key] = os.path.abspath(path) if ok else None
+
+    # ---- 人物网络 ----
+    def network(self, params: Dict[str, str]) -> dict:
+        if self.tensor is None:
+            raise QueryError(404, "没有逐回共现张量（先运行人物网络阶段）")
+        from scipy import sparse
+
+        start, end = _int(params, "start"), _int(params, "end")
+        min_weight, depth, top = _int(params, "min_weight", 1), _int(params, "depth", 1), _int(params, "top")
+        center = params.get("center", "")
+        m = self.tensor.range_matrix(start, end)
+        sym = (m + m.T).tocsr()
+        if min_weight > 1:
+            sym.data[sym.data < min_weight] = 0
+            sym.eliminate_zeros()
+        if center:
+            if center not in self.tensor.index:
+                raise QueryError(404, f"未知人物：{center}")
+            keep = {self.tensor.index[center]}
+            frontier = set(keep)
+            for _ in range(max(depth, 1)):
+                frontier = set(sym[sorted(frontier)].indices.tolist()) - keep if frontier else set()
+                keep |= frontier
+            ids = sorted(keep)
+        else:
+            ids = sorted(set(sym.indices.tolist()))
+        sub = sparse.triu(sym[ids][:, ids], k=1).tocoo()
+        links = sorted(zip(sub.data.tolist(), sub.row.tolist(), sub.col.tolist()), key=lambda x: (-x[0], x[1], x[2]))
+        if top:
+            links = links[:top]
+        strength: Dict[int, int] = {}
+        for w, i, j in links:
+            strength[i] = strength.get(i, 0) + w
+            strength[j] = strength.get(j, 0) + w
+        names = [self.tensor.names[i] for i in ids]
+        shown = [k for k in range(len(ids)) if k in strength or names[k] == center]
+        nodes = []
+        for k in shown:
+            node = {"id": names[k], "name": names[k], "group": 2 if names[k] == center else 1,
+                    "strength": strength.get(k, 0), "first": self.first.get(names[k])}
+            g = self.graph.get(names[k])
+            if g:  # 全书图分析的社区 / PageRank / 布局坐标，页面据此直接绘制
+                node.update(community=g["community"], pagerank=g["pagerank"], lx=g["x"], ly=g["y"])
+            nodes.append(node)
+        return {
+            "start": start, "end": end, "center": center or None, "min_weight": min_weight,
+            "nodes": nodes,
+            "links": [{"source": names[i], "target": names[j], "value": int(w)} for w, i, j in links],
+        }
+
+    def chapters(self, params: Dict[str, str]) -> dict:
+        if self.tensor is None:
+            raise QueryError(404, "没有逐回共现张量（先运行人物网络阶段）")
+        return {"chapters": self.tensor.chapters, "first": self.first}
+
+    # ---- 地点 ----
+    def places_query(self, params: Dict[str, str]) -> dict:
+        start, end, top = _int(params, "start"), _int(params, "end"), _int(params, "top")
+        rollup = params.get("rollup", "0") not in ("0", "", "false")
+        place = params.get("place", "")
+        if not self.places:
+            if start is not None or end is not None or place:
+                raise QueryError(404, "没有逐回地点明细（先运行 gazetteer 阶段）")
+            totals = sorted(self.place_totals.items(), key=lambda x: (-x[1], x[0]))
+            return {"start": None, "end": None, "rollup": False,
+                    "places": [{"place": p, "parent": "", "count": n} for p, n in totals[:top]]}
+        col = 3 if rollup else 2
+        if place:
+            chapters, counts, parent = [], [], ""
+            for ch in sorted(self.places):
+                for name, par, *nums in self.places[ch]:
+                    if name == place and _in_range(ch, start, end):
+                        chapters.append(ch)
+                        counts.append(nums[col - 2])
+                        parent = par
+            return {"place": place, "parent": parent, "chapters": chapters, "counts": counts}
+        totals: Dict[str, List] = {}
+        for ch, rows in self.places.items():
+            if not _in_range(ch, start, end):
+                continue
+            for row in rows:
+                entry = totals.setdefault(row[0], [row[1], 0, 0])
+                entry[1] += row[col]
+                entry[2] += 1
+        ranked = sorted(((p, e) for p, e in totals.items() if e[1] > 0), key=lambda x: (-x[1][1], x[0]))
+        if top:
+            ranked = ranked[:top]
+        return {"start": start, "end": end, "rollup": rollup,
+                "places": [{"place": p, "parent": e[0], "count": e[1], "chapters": e[2]} for p, e in ranked]}
+
+    # ---- 法宝 ----
+    def weapons_query(self, params: Dict[str, str]) -> list:
+        name, user, camp_col, desc = MAGIC_COLUMNS
+        camp, holder, q = params.get("camp", ""), params.get("user", ""), params.get("q", "").lower()
+        rows = self.weapons
+        if camp == "其他":  # 与网页筛选一致：不属于四大阵营的都算“其他”
+            rows = [r for r in rows if not any(c in r[camp_col] for c in MAIN_CAMPS)]
+        elif camp and camp != "all":
+            rows = [r for r in rows if camp in r[camp_col]]
+        if holder:
+            rows = [r for r in rows if holder in r[user]]
+        if q:
+            rows = [r for r in rows if any(q in r[c].lower() for c in (name, user, camp_col, desc))]
+        return rows
+
+    def weapon_camps(self, params: Dict[str, str]) -> dict:
+        counts = {c: 0 for c in MAIN_CAMPS + ("其他",)}
+        for r in self.weapons:
+            hit = [c for c in MAIN_CAMPS if c in r[MAGIC_COLUMNS[2]]]
+            for c in hit or ["其他"]:
+                counts[c] += 1
+        return counts
+
+    # ---- 时间轴 ----
+    def timeline_query(self, params: Dict[str, str]) -> list:
+        start, end = _int(params, "start"), _int(params, "end")
+        location, kind = params.get("location", ""), params.get("type", "")
+        return [e for e in self.timeline if _in_range(e["chapter"], start, end)
+                and (not location or location in e.get("locations", []))
+                and (not kind or e.get("type") == kind)]
+
+
+class QueryService:
+    def __init__(self, data: ServiceData, web_dir: str = DEFAULT_WEB_DIR, cache_size: int = 256):
+        self.data = data
+        self.web_dir = os.path.realpath(web_dir)
+        self.routes = {
+            "/api/network": data.network, "/api/chapters": data.chapters, "/api/places": data.places_query,
+            "/api/weapons": data.weapons_query, "/api/weapons/camps": data.weapon_camps,
+            "/api/timeline": data.timeline_query, "/api/health": self.health,
+        }
+        self.render = functools.lru_cache(maxsize=cache_size)(self._render)
+
+    def health(self, params: Dict[str, str]) -> dict:
+        info = self.render.cache_info()
+        return {"sources": self.data.sources, "cache": {"hits": info.hits, "misses": info.misses,
+                                                        "size": info.currsize, "max": info.maxsize}}
+
+    def _render(self, path: str, query: Tuple[Tuple[str, str], ...]) -> Tuple[bytes, bytes, str]:
+        """(正文, gzip 正文, ETag)；参数相同的请求只计算一次。QueryError 不缓存。"""
+        body = json.dumps(self.routes[path](dict(query)), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return body, gzip.compress(body, 6, mtime=0), '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+
+    async def respond(self, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        if method not in ("GET", "HEAD"):
+            return self._json_error(405, f"不支持的方法：{method}")
+        url = urlsplit(target)
+        path = unquote(url.path)
+        if path.startswith("/api/"):
+            if path not in self.routes:
+                return self._json_error(404, f"未知接口：{path}")
+            if path == "/api/health":
+                body = json.dumps(self.health({}), ensure_ascii=False).encode("utf-8")
+                return 200, {"Content-Type": "application/json; charset=utf-8", "Cache-Control": "no-store"}, body
+            try:
+                body, gz, etag = self.render(path, tuple(sorted(parse_qsl(url.query))))
+            except QueryError as e:
+                return self._json_error(e.status, str(e))
+            hdrs = {"Content-Type": "application/json; charset=utf-8", "ETag": etag,
+                    "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+            if etag in headers.get("if-none-match", ""):
+                return 304, hdrs, b""
+            if len(body) > 1024 and "gzip" in headers.get("accept-encoding", ""):
+                hdrs["Content-Encoding"] = "gzip"
+                body = gz
+            return 200, hdrs, body
+        return await asyncio.get_running_loop().run_in_executor(None, self._static, path, headers)
+
+    def _static(self, path: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        full = os.path.realpath(os.path.join(self.web_dir, path.lstrip("/")))
+        if os.path.isdir(full):
+            full = os.path.join(full, "index.html")
+        if not full.startswith(self.web_dir + os.sep) or not os.path.isfile(full):
+            return self._json_error(404, f"找不到文件：{path}")
+        ctype = mimetypes.guess_type(full)[0] or "application/octet-stream"
+        if ctype.startswith("text/") or ctype in ("application/javascript", "application/json"):
+            ctype += "; charset=utf-8"
+        hdrs = {"Content-Type": ctype, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+        serve = full
+        accept = headers.get("accept-encoding", "")
+        for enc, ext in (("br", ".br"), ("gzip", ".gz")):
+            # 预压缩副本与原文件一同写出；比原文件旧说明原文件被手工改过，不再使用
+            if enc in accept and os.path.exists(full + ext) and os.path.getmtime(full + ext) >= os.path.getmtime(full):
+                serve = full + ext
+                hdrs["Content-Encoding"] = enc
+                break
+        st = os.stat(serve)
+        hdrs["ETag"] = f'"{st.st_size:x}-{st.st_mtime_ns:x}"'
+        hdrs["Last-Modified"] = formatdate(st.st_mtime, usegmt=True)
+        if hdrs["ETag"] in headers.get("if-none-match", ""):
+            return 304, hdrs, b""
+        with open(serve, "rb") as f:
+            return 200, hdrs, f.read()
+
+    @staticmethod
+    def _json_error(status: int, message: str) -> Tuple[int, Dict[str, str], bytes]:
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        return status, {"Content-Type": "application/json; charset=utf-8"}, body
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """HTTP/1.1（keep-alive）连接处理：逐个读取请求行与请求头，写回响应。"""
+        try:
+            while True:
+                line = await asyncio.wait_for(reader.readline(), KEEP_ALIVE_TIMEOUT)
+                if not line.strip():
+                    break
+                parts = line.decode("utf-8", "replace").split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                headers: Dict[str, str] = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = h.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                status, hdrs, body = await self.respond(method, target, headers)
+                hdrs["Content-Length"] = str(len(body)) if status != 304 else "0"
+                hdrs["Connection"] = "keep-alive" if keep_alive else "close"
+                head = f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n" + \
+                       "".join(f"{k}: {v}\r\n" for k, v in hdrs.items()) + "\r\n"
+                writer.write(head.encode("utf-8") + (b"" if method == "HEAD" or status == 304 else body))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
+
+
+def load_service(workdir: str = ".", web_dir: str = DEFAULT_WEB_DIR, cache_size: int = 256,
+                 tensor: str = os.path.join("out", "fengshen_cooccurrence.npz"),
+                 places: str = os.path.join("out", "fengshen_place_by_chapter.csv"),
+                 place_stats: str = os.path.join("out", "fengshen_place_statistics.csv"),
+                 magic: str = DEFAULT_MAGIC, timeline: str = "",
+                 graph: str = os.path.join("out", "fengshen_graph_metrics.csv")) -> QueryService:
+    """相对路径以 workdir 为准（与流水线的目录布局一致）。"""
+    at = lambda p: p if os.path.isabs(p) else os.path.join(workdir, p)
+    timeline = timeline or os.path.join(web_dir, "data", "timeline.json")
+    data = ServiceData(at(tensor), at(places), at(place_stats), at(magic), at(timeline), at(graph))
+    return QueryService(data, web_dir, cache_size)
+
+
+async def serve(service: QueryService, host: str = "127.0.0.1", port: int = 8000) -> asyncio.AbstractServer:
+    """创建并开始监听（调用方负责 serve_forever()/close()）。"""
+    return await asyncio.start_server(service.handle, host, port)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="本地查询服务：网页按需获取人物网络 / 地点 / 法宝 / 时间轴切片")
+    ap.add_argument("--workdir", type=str, default=".", help="流水线工作目录（out/ 所在目录）")
+    ap.add_argument("--web-dir", type=str, default=DEFAULT_WEB_DIR, help="网站根目录")
+    ap.add_argument("--host", type=str, default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--cache-size", type=int, default=256, help="查询结果 LRU 缓存条数")
+    ap.add_argument("--magic", type=str, default=DEFAULT_MAGIC, help="法宝 CSV")
+    args = ap.parse_args()
+
+    service = load_service(args.workdir, args.web_dir, args.cache_size, magic=args.magic)
+    for key, path in service.data.sources.items():
+        print(f"  {key:<12} {path or '（未找到，相关接口返回 404）'}")
+
+    async def run():
+        server = await serve(service, args.host, args.port)
+        print(f"服务已启动：http://{args.host}:{args.port}/  （Ctrl+C 退出）")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
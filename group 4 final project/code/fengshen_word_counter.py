@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+流式、可合并的词频计数
+- WordCounter：精确计数（Counter），按块 update，块之间 / 进程之间的部分结果用 merge（+=）合并；
+  前 k 名用有界堆（heapq.nlargest，O(V log k)），同频时按首次出现的先后排列，与一次性 Counter.most_common 逐字一致
+- CountMinSketch：depth × width 的计数表（numpy），每个词按 blake2b 摘要做双重哈希落到每行一格；
+  估计值 = 各行最小值，只会高估，误差上限约 e / width × 总词数（概率 1 - e^-depth）；同尺寸、同种子的表直接相加即合并
+- HeavyHitters：CountMinSketch + 固定容量的候选表（按估计值保留最高的 capacity 个），
+  内存与词表大小无关，适合多部书合并后词表放不进内存的情形；候选表同样可合并
+- 三者接口一致：update(词序列) / update_counts({词: 次数}) / merge / top(k) / items() / total
+用法示例：
+  from fengshen_word_counter import WordCounter, HeavyHitters
+  total = WordCounter()
+  for chunk in chunks:
+      part = WordCounter(); part.update(words_of(chunk)); total.merge(part)
+  total.top(50)
+  hh = HeavyHitters(width=2 ** 20, depth=4, capacity=5000); hh.update(words); hh.top(50)
+"""
+import hashlib, heapq
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+WordCount = Tuple[str, int]
+
+
+class WordCounter:
+    """精确词频；词表按首次出现的顺序保存（决定同频词的先后）。"""
+
+    exact = True
+
+    def __init__(self, counts: Optional[Dict[str, int]] = None):
+        self.counts: Counter = Counter()
+        self.total = 0
+        if counts:
+            self.update_counts(counts)
+
+    def update(self, words: Iterable[str]):
+        self.update_counts(Counter(words))
+
+    def update_counts(self, counts: Dict[str, int]):
+        self.counts.update(counts)
+        self.total += sum(counts.values())
+
+    def merge(self, other: "WordCounter") -> "WordCounter":
+        """并入另一份部分结果（按块顺序合并，同频词的先后与整体一次计数相同）。"""
+        self.update_counts(other.counts)
+        return self
+
+    __iadd__ = merge
+
+    def top(self, k: int) -> List[WordCount]:
+        return heapq.nlargest(k, self.counts.items(), key=lambda item: item[1])
+
+    def items(self) -> List[WordCount]:
+        """全部词频，按次数降序（同频按首次出现顺序）。"""
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def nbytes(self) -> int:
+        """词表的大致内存（键 + 值 + 字典槽位）。"""
+        return sum(48 + 2 * len(w) for w in self.counts) + 28 * len(self.counts) + 16 * len(self.counts)
+
+
+def _hash_pairs(words: List[str], seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """每个词两个 64 位哈希（blake2b 的前后 8 字节），用于双重哈希 h1 + i·h2。"""
+    key = seed.to_bytes(8, "little")
+    digests = b"".join(hashlib.blake2b(w.encode("utf-8"), digest_size=16, key=key).digest() for w in words)
+    pairs = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2) if words else np.zeros((0, 2), dtype=np.uint64)
+    return pairs[:, 0], pairs[:, 1] | np.uint64(1)
+
+
+class CountMinSketch:
+    """Count-Min Sketch；table[i, (h1 + i·h2) mod width] 累加次数。"""
+
+    def __init__(self, width: int = 2 ** 20, depth: int = 4, seed: int = 0):
+        self.width, self.depth, self.seed = int(width), int(depth), int(seed)
+        self.table = np.zeros((self.depth, self.width), dtype=np.int64)
+        self.total = 0
+
+    def _columns(self, words: List[str]) -> np.ndarray:
+        h1, h2 = _hash_pairs(words, self.seed)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        with np.errstate(over="ignore"):  # 64 位回绕即取模
+            return ((h1[None, :] + rows * h2[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def add_counts(self, words: List[str], counts: np.ndarray):
+        if not words:
+            return
+        cols = self._columns(words)
+        for i in range(self.depth):
+            self.table[i] += np.bincount(cols[i], weights=counts, minlength=self.width).astype(np.int64)
+        self.total += int(np.sum(counts))
+
+    def estimate(self, words: List[str]) -> np.ndarray:
+        if not words:
+            return np.zeros(0, dtype=np.int64)
+        cols = self._columns(words)
+        return self.table[np.arange(self.depth)[:, None], cols].min(axis=0)
+
+    def merge(self, other: "CountMinSketch") -> "CountMinSketch":
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("只能合并宽度、深度、种子都相同的 Count-Min Sketch")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def error_bound(self) -> float:
+        """单个估计值的高估上限（以 1 - e^-depth 的概率成立）。"""
+        return np.e / self.width * self.total
+
+    def nbytes(self) -> int:
+        return int(self.table.nbytes)
+
+
+class HeavyHitters:
+    """Count-Min Sketch + 候选表：只保留估计次数最高的 capacity 个词（及其估计值）。"""
+
+    exact = False
+
+    def __init__(self, width: int = 2 ** 20, depth: int = 4, capacity: int = 5000, seed: int = 0):
+        self.sketch = CountMinSketch(width, depth, seed)
+        self.capacity = int(capacity)
+        self.candidates: Dict[str, int] = {}  # 词 -> 估计次数；顺序为进入候选表的先后
+
+    @property
+    def total(self) -> int:
+        return self.sketch.total
+
+    def update(self, words: Iterable[str]):
+        self.update_counts(Counter(words))
+
+    def update_counts(self, counts: Dict[str, int]):
+        """一块一起处理：先把本块计数加进 sketch，再对“旧候选 ∪ 本块词”重新估计并截到 capacity。"""
+        words = list(counts)
+        self.sketch.add_counts(words, np.fromiter(counts.values(), dtype=np.float64, count=len(words)))
+        self._refresh(words)
+
+    def _refresh(self, new_words: List[str]):
+        pool = list(self.candidates) + [w for w in new_words if w not in self.candidates]
+        est = self.sketch.estimate(pool)
+        if len(pool) > self.capacity:
+            # 稳定地取前 capacity 个：同估计值时先进入的优先
+            keep = np.sort(np.argsort(-est, kind="stable")[:self.capacity])
+            pool, est = [pool[i] for i in keep], est[keep]
+        self.candidates = dict(zip(pool, est.tolist()))
+
+    def merge(self, other: "HeavyHitters") -> "HeavyHitters":
+        self.sketch.merge(other.sketch)
+        self._refresh(list(other.candidates))
+        return self
+
+    __iadd__ = merge
+
+    def top(self, k: int) -> List[WordCount]:
+        return heapq.nlargest(k, self.candidates.items(), key=lambda item: item[1])
+
+    def items(self) -> List[WordCount]:
+        return sorted(self.candidates.items(), key=lambda item: item[1], reverse=True)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def nbytes(self) -> int:
+        return self.sketch.nbytes() + sum(48 + 2 * len(w) + 44 for w in self.candidates)
+
+
+def make_counter(mode: str = "exact", width: int = 2 ** 20, depth: int = 4, capacity: int = 5000):
+    if mode == "exact":
+        return WordCounter()
+    if mode == "sketch":
+        return HeavyHitters(width, depth, capacity)
+    raise ValueError(f"未知计数模式：{mode}（可选：exact, sketch）")
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+无监督新词发现（人物候选）：后缀数组 + LCP
+- 语料取自紧凑语料层；标点、空白等非汉字处断开，n-gram 不跨越
+- 后缀数组用前缀倍增排序（numpy），只需排到 max_len+1 字深度（3 轮）；相邻后缀的 LCP 逐位向量化比较
+- 同一 n-gram 的所有出现位置在后缀数组中连续：LCP < n 处分组即得频次；组内再按第 n+1 字分组得右邻字分布
+  （右信息熵）；对反转文本做同样的事得左信息熵；凝固度 = 各种切分下 PMI 的最小值
+- 得分 = log(频次) × 凝固度 × min(左熵, 右熵)；与人物白名单对照标注：已收录 / 含已收录名 / 已收录名片段 / 新候选
+- 整体近线性：排序 O(n log n)，其余都是对 n 个后缀的向量运算；全书约 59 万字数秒内完成，多部书可合并输入
+- 统计与对照可以分开跑：--no-whitelist 只输出得分表；--scores 读入得分表只重做白名单对照（改白名单时不必重算后缀数组）
+用法示例：
+  python fengshen_word_discovery.py --input out/fengshen_paragraphs.csv
+  python fengshen_word_discovery.py --no-whitelist -o out/fengshen_word_scores.csv
+  python fengshen_word_discovery.py --scores out/fengshen_word_scores.csv -o out/fengshen_word_candidates.csv
+  python fengshen_word_discovery.py --input books/xiyouji/out/fengshen_paragraphs.csv \\
+      --input books/fengshen-yanyi/out/fengshen_paragraphs.csv --min-freq 8 --top 3000
+"""
+import argparse, math, os, time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from fengshen_corpus import DEFAULT_PARAGRAPHS, load_corpus
+
+DEFAULT_WHITELIST = os.path.join("out", "OPTIMIZED_CHARACTER_WHITELIST.csv")
+DEFAULT_OUTPUT = os.path.join("out", "fengshen_word_candidates.csv")
+# 首尾是这些虚词 / 常用字的片段几乎不可能是人名（"之姜子牙"、"子牙曰"）
+STOP_EDGE_CHARS = set("之曰了也而其乃於于以與与是不在有一又亦皆便即這这那的此與我你他來来去道說说")
+HAN_RANGES = ((0x3400, 0x9FFF), (0xF900, 0xFAFF), (0x20000, 0x2FFFF))
+
+
+def han_ids(text: str):
+    """文本 -> (稠密字编号数组, 编号->字)；非汉字记为 0（分隔）。"""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    mask = np.zeros(len(codes), dtype=bool)
+    for lo, hi in HAN_RANGES:
+        mask |= (codes >= lo) & (codes <= hi)
+    codes = np.where(mask, codes, 0)
+    alphabet, ids = np.unique(codes, return_inverse=True)
+    if len(alphabet) and alphabet[0] != 0:  # 没有分隔符时也让 0 保留给分隔
+        alphabet, ids = np.concatenate(([0], alphabet)), ids + 1
+    return ids.astype(np.int64), alphabet
+
+
+def suffix_array(ids: np.ndarray, depth: int) -> np.ndarray:
+    """前缀倍增：返回按前 depth 字（向上取到 2 的幂）排好序的后缀起点。"""
+    n = len(ids)
+    rank = ids.copy()
+    sa = np.argsort(rank, kind="stable")
+    k = 1
+    while k < depth and n:
+        nxt = np.zeros(n, dtype=np.int64)
+        nxt[:-k] = rank[k:]
+        key = rank * (int(rank.max()) + 1) + nxt
+        sa = np.argsort(key, kind="stable")
+        sorted_key = key[sa]
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.concatenate(([0], np.cumsum(sorted_key[1:] != sorted_key[:-1])))
+        k *= 2
+    return sa
+
+
+def lcp_array(ids: np.ndarray, sa: np.ndarray, cap: int) -> np.ndarray:
+    """lcp[i] = 第 i 与 i-1 个后缀的公共前缀长（遇分隔符即止，最多 cap）。"""
+    padded = np.concatenate((ids, np.zeros(cap, dtype=ids.dtype)))
+    lcp = np.zeros(len(sa), dtype=np.int8)
+    run = np.ones(max(len(sa) - 1, 0), dtype=bool)
+    for j in range(cap):
+        a, b = padded[sa[1:] + j], padded[sa[:-1] + j]
+        run &= (a == b) & (a != 0)
+        lcp[1:] += run
+    return lcp
+
+
+def ngram_stats(text: str, max_len: int, min_freq: int):
+    """一遍后缀数组统计所有长度 ≤ max_len、频次 ≥ min_freq 的 n-gram。
+    返回 ({词: (频次, 右邻字信息熵)}, 汉字总数)。"""
+    ids, _ = han_ids(text)
+    sa = suffix_array(ids, max_len + 1)
+    lcp = lcp_array(ids, sa, max_len + 1)
+    padded = np.concatenate((ids, np.zeros(max_len + 1, dtype=ids.dtype)))
+    stats: Dict[str, tuple] = {}
+    valid = np.ones(len(sa), dtype=bool)
+    for m in range(1, max_len + 1):
+        valid &= padded[sa + m - 1] != 0
+        group = np.cumsum(lcp < m) - 1                       # 同一 m 字前缀的后缀连续成组
+        freq = np.bincount(group)
+        right = padded[sa + m]
+        # 右邻字分组：前 m+1 字相同者同类；右侧是分隔 / 结尾的每次出现各算一类
+        cls = np.cumsum((lcp < m + 1) | (right == 0)) - 1
+        cls_count = np.bincount(cls)
+        cls_group = np.zeros(len(cls_count), dtype=np.int64)
+        cls_group[cls] = group
+        clogc = np.bincount(cls_group, weights=cls_count * np.log(cls_count), minlength=len(freq))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            entropy = np.log(freq) - clogc / freq
+        first = np.flatnonzero(lcp < m)                     # 每组第一行
+        keep = valid[first] & (freq >= min_freq)
+        for g, row in zip(np.flatnonzero(keep), first[keep]):
+            start = int(sa[row])
+            stats[text[start:start + m]] = (int(freq[g]), float(entropy[g]))
+    return stats, int(np.count_nonzero(ids))
+
+
+def discover(text: str, max_len: int = 5, min_freq: int = 5, min_len: int = 2,
+             stop_chars: Optional[set] = STOP_EDGE_CHARS) -> List[dict]:
+    """返回候选词列表（按得分降序）。"""
+    forward, total = ngram_stats(text, max_len, min_freq)
+    # 左邻字熵 = 反转文本上的右邻字熵
+    backward, _ = ngram_stats(text[::-1], max_len, min_freq)
+    rows = []
+    for word, (freq, right_h) in forward.items():
+        if len(word) < min_len:
+            continue
+        if stop_chars and (word[0] in stop_chars or word[-1] in stop_chars):
+            continue
+        # 子串频次不小于原词频次，必然也在表里
+        cohesion = min(math.log(freq * total / (forward[word[:i]][0] * forward[word[i:]][0]))
+                       for i in range(1, len(word)))
+        left_h = backward[word[::-1]][1]
+        boundary = min(left_h, right_h)
+        score = math.log(freq) * max(cohesion, 0.0) * boundary
+        rows.append({"word": word, "length": len(word), "frequency": freq, "cohesion": round(cohesion, 3),
+                     "left_entropy": round(left_h, 3), "right_entropy": round(right_h, 3), "score": round(score, 3)})
+    rows.sort(key=lambda r: -r["score"])
+    return rows
+
+
+def annotate(rows: List[dict], aliases: Sequence[str]) -> List[dict]:
+    """与白名单（含别名）对照。"""
+    alias_set = {a for a in aliases if len(a) >= 2}
+    substrings = lambda s: {s[i:j] for i in range(len(s)) for j in range(i + 2, len(s) + 1)} - {s}
+    fragments = set().union(*(substrings(a) for a in alias_set)) if alias_set else set()
+    for r in rows:
+        w = r["word"]
+        if w in alias_set:
+            r["whitelist"] = "已收录"
+        elif substrings(w) & alias_set:
+            r["whitelist"] = "含已收录名"
+        elif w in fragments:
+            r["whitelist"] = "已收录名片段"
+        else:
+            r["whitelist"] = "新候选"
+    return rows
+
+
+def load_text(paths: Sequence[str]) -> str:
+    """多部书（多个段落 CSV）的正文；段落之间用换行分隔，n-gram 不跨段。"""
+    parts = []
+    for path in paths:
+        parts.extend(load_corpus(path).texts("paragraphs"))
+    return "\n".join(parts)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="无监督新词发现：后缀数组统计频次 / 凝固度 / 左右信息熵，对照人物白名单")
+    ap.add_argument("--input", action="append", default=[], help="段落 CSV，可多次指定（多部书合并）")
+    ap.add_argument("--whitelist", type=str, default=DEFAULT_WHITELIST, help="人物白名单（不存在则不对照）")
+    ap.add_argument("--no-whitelist", action="store_true", help="只输出得分表，不与白名单对照")
+    ap.add_argument("--scores", type=str, default=None,
+                    help="已算好的得分表（--no-whitelist 的输出）：跳过后缀数组统计，只重做白名单对照")
+    ap.add_argument("-o", "--output", type=str, default=DEFAULT_OUTPUT, help="候选词 CSV")
+    ap.add_argument("--max-len", type=int, default=5, help="最长 n-gram（默认 5）")
+    ap.add_argument("--min-freq", type=int, default=5, help="最低频次（默认 5）")
+    ap.add_argument("--top", type=int, default=2000, help="计算白名单召回率时看前 N 个候选")
+    ap.add_argument("--keep-stop-chars", action="store_true", help="不过滤首尾为虚词 / 常用字的片段")
+    args = ap.parse_args()
+
+    import pandas as pd
+    from fengshen_alias_matcher import load_alias_table
+
+    start = time.perf_counter()
+    text = load_text(args.input or [DEFAULT_PARAGRAPHS])
+    t_load = time.perf_counter() - start
+    if args.scores:
+        df = pd.read_csv(args.scores, encoding="utf-8-sig", dtype={"word": str}, keep_default_na=False)
+        rows = df.drop(columns=["whitelist"], errors="ignore").to_dict("records")
+        print(f"📖 语料 {len(text):,} 字（加载 {t_load:.2f}s）；读入已有得分表 {args.scores}：候选 {len(rows):,} 个")
+    else:
+        start = time.perf_counter()
+        rows = discover(text, args.max_len, args.min_freq, stop_chars=None if args.keep_stop_chars else STOP_EDGE_CHARS)
+        t_discover = time.perf_counter() - start
+        print(f"📖 语料 {len(text):,} 字（加载 {t_load:.2f}s）；候选 {len(rows):,} 个（{t_discover:.2f}s）")
+
+    use_whitelist = not args.no_whitelist and os.path.exists(args.whitelist)
+    aliases = list(load_alias_table(args.whitelist)) if use_whitelist else []
+    if aliases:
+        annotate(rows, aliases)
+        top_words = {r["word"] for r in rows[:args.top]}
+        # 召回率只统计语料中频次够、长度在范围内的白名单名称（否则本方法不可能找到）
+        reachable = [a for a in set(aliases) if 2 <= len(a) <= args.max_len and text.count(a) >= args.min_freq]
+        found = sum(a in top_words for a in reachable)
+        print(f"👥 白名单 {len(set(aliases))} 个名称/别名，其中 {len(reachable)} 个可发现；"
+              f"前 {args.top} 名候选召回 {found}（{found / max(len(reachable), 1):.0%}）")
+        new = [r for r in rows if r["whitelist"] == "新候选"][:20]
+        print("🆕 得分最高的新候选：" + "、".join(f"{r['word']}({r['frequency']})" for r in new))
+
+    out_dir = os.path.dirname(args.output)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    pd.DataFrame(rows).to_csv(args.output, index=False, encoding="utf-8-sig")
+    print(f"💾 候选词已保存至: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1 +1 @@
-const linksData = [{"source":"侯虎","target":"姜桓楚","value":6},{"source":"侯虎","target":"姬昌","value":12},{"source":"侯虎","target":"鄂崇禹","value":12},{"source":"姜桓楚","target":"姬昌","value":8},{"source":"姜桓楚","target":"鄂崇禹","value":16},{"source":"姬昌","target":"鄂崇禹","value":9},{"source":"殷洪","target":"殷郊","value":16},{"source":"尤渾","target":"聞太師","value":1},{"source":"尤渾","target":"費仲","value":34},{"source":"聞太師","target":"費仲","value":2},{"source":"尤渾","target":"蘇護","value":2},{"source":"蘇護","target":"費仲","value":3},{"source":"晁田","target":"魯雄","value":1},{"source":"蘇護","target":"魯雄","value":2},{"source":"侯虎","target":"費仲","value":4},{"source":"侯虎","target":"魯雄","value":2},{"source":"姬昌","target":"蘇護","value":3},{"source":"蘇全忠","target":"蘇護","value":5},{"source":"侯虎","target":"應彪","value":3},{"source":"侯虎","target":"蘇護","value":5},{"source":"侯虎","target":"蘇全忠","value":2},{"source":"姜桓楚","target":"鄭倫","value":1},{"source":"姬昌","target":"鄭倫","value":1},{"source":"鄂崇禹","target":"鄭倫","value":1},{"source":"蘇護","target":"鄭倫","value":8},{"source":"宜生","target":"蘇護","value":3},{"source":"蘇護","target":"黃飛虎","value":6},{"source":"黃貴妃","target":"黃飛虎","value":1},{"source":"姜環","target":"費仲","value":1},{"source":"姜桓楚","target":"費仲","value":3},{"source":"姜桓楚","target":"姜環","value":2},{"source":"姜環","target":"晁田","value":3},{"source":"姜環","target":"晁雷","value":3},{"source":"晁田","target":"晁雷","value":22},{"source":"姜環","target":"殷郊","value":3},{"source":"晁田","target":"黃貴妃","value":2},{"source":"晁雷","target":"黃貴妃","value":2},{"source":"殷郊","target":"黃飛虎","value":6},{"source":"方弼","target":"殷洪","value":1},{"source":"方弼","target":"殷郊","value":1},{"source":"方弼","target":"黃飛虎","value":8},{"source":"方弼","target":"晁田","value":9},{"source":"方弼","target":"晁雷","value":1},{"source":"晁田","target":"黃飛虎","value":9},{"source":"姜桓楚","target":"方弼","value":1},{"source":"姜桓楚","target":"殷洪","value":1},{"source":"姜桓楚","target":"殷郊","value":1},{"source":"殷洪","target":"雷開","value":2},{"source":"黃明","target":"黃飛虎","value":10},{"source":"姜環","target":"殷洪","value":1},{"source":"廣成子","target":"雲霄","value":4},{"source":"姬昌","target":"費仲","value":11},{"source":"費仲","target":"鄂崇禹","value":4},{"source":"南宮适","target":"姬昌","value":1},{"source":"南宮适","target":"宜生","value":10},{"source":"姬昌","target":"宜生","value":1},{"source":"伯邑考","target":"武王","value":1},{"source":"伯邑考","target":"南宮适","value":1},{"source":"伯邑考","target":"周公旦","value":1},{"source":"伯邑考","target":"宜生","value":1},{"source":"南宮适","target":"周公旦","value":3},{"source":"周公旦","target":"宜生","value":2},{"source":"侯虎","target":"尤渾","value":2},{"source":"尤渾","target":"鄂崇禹","value":3},{"source":"姜桓楚","target":"黃飛虎","value":1},{"source":"鄂崇禹","target":"黃飛虎","value":1},{"source":"姬昌","target":"楊任","value":1},{"source":"姜子牙","target":"魯雄","value":1},{"source":"姬昌","target":"晁田","value":2},{"source":"姬昌","target":"黃飛虎","value":2},{"source":"文殊廣法天尊","target":"雲霄","value":5},{"source":"李靖","target":"竇榮","value":2},{"source":"敖光","target":"李靖","value":5},{"source":"普賢真人","target":"李靖","value":1},{"source":"楊任","target":"黃飛虎","value":5},{"source":"姜子牙","target":"楊任","value":1},{"source":"楊任","target":"道德真君","value":4},{"source":"伯邑考","target":"姬昌","value":3},{"source":"宜生","target":"尤渾","value":1},{"source":"宜生","target":"費仲","value":1},{"source":"姬昌","target":"安康","value":1},{"source":"姬昌","target":"尤渾","value":2},{"source":"姬昌","target":"雷開","value":1},{"source":"雷開","target":"雷震子","value":1},{"source":"宜生","target":"賀畢","value":2},{"source":"安康","target":"宜生","value":1},{"source":"宜生","target":"武吉","value":9},{"source":"武吉","target":"賀畢","value":1},{"source":"姬昌","target":"韓榮","value":1},{"source":"聞太師","target":"黃飛虎","value":7},{"source":"聞太師","target":"賀畢","value":1},{"source":"姜子牙","target":"聞太師","value":3},{"source":"姬昌","target":"應彪","value":3},{"source":"侯虎","target":"南宮适","value":2},{"source":"南宮适","target":"應彪","value":2},{"source":"南宮适","target":"姜子牙","value":4},{"source":"武王","target":"韓榮","value":2},{"source":"姬昌","target":"武王","value":1},{"source":"黃天祿","target":"黃明","value":4},{"source":"安康","target":"武王","value":4},{"source":"安康","target":"黃明","value":1},{"source":"武王","target":"黃明","value":2},{"source":"張奎","target":"黃飛虎","value":2},{"source":"張桂芳","target":"聞太師","value":3},{"source":"聞太師","target":"道德真君","value":2},{"source":"道德真君","target":"黃飛虎","value":4},{"source":"張鳳","target":"黃飛虎","value":9},{"source":"陳桐","target":"黃飛虎","value":4},{"source":"陳桐","target":"黃明","value":2},{"source":"黃天祿","target":"黃飛虎","value":3},{"source":"韓榮","target":"黃飛虎","value":2},{"source":"韓榮","target":"黃天祿","value":1},{"source":"韓榮","target":"黃明","value":1},{"source":"武王","target":"黃飛虎","value":3},{"source":"竇榮","target":"魯雄","value":1},{"source":"晁田","target":"聞太師","value":2},{"source":"南宮适","target":"晁雷","value":9},{"source":"晁雷","target":"武王","value":1},{"source":"晁雷","target":"聞太師","value":3},{"source":"晁雷","target":"黃飛虎","value":6},{"source":"武王","target":"聞太師","value":5},{"source":"聞太師","target":"韓榮","value":3},{"source":"張桂芳","target":"黃飛虎","value":6},{"source":"南宮适","target":"張桂芳","value":3},{"source":"武王","target":"許之","value":1},{"source":"張桂芳","target":"武吉","value":2},{"source":"姜子牙","target":"申公豹","value":5},{"source":"王魔","target":"聞太師","value":2},{"source":"姜子牙","target":"張桂芳","value":2},{"source":"姜子牙","target":"王魔","value":3},{"source":"張桂芳","target":"王魔","value":1},{"source":"李興霸","target":"王魔","value":2},{"source":"姜子牙","target":"李興霸","value":1},{"source":"武王","target":"王魔","value":1},{"source":"王魔","target":"黃飛虎","value":1},{"source":"文殊廣法天尊","target":"王魔","value":4},{"source":"王魔","target":"雲霄","value":1},{"source":"黃天祥","target":"黃飛虎","value":3},{"source":"張桂芳","target":"黃天祥","value":1},{"source":"南宮适","target":"黃明","value":2},{"source":"周公旦","target":"張桂芳","value":1},{"source":"周公旦","target":"黃明","value":2},{"source":"張桂芳","target":"黃明","value":1},{"source":"張桂芳","target":"晁田","value":1},{"source":"聞太師","target":"魯雄","value":3},{"source":"張桂芳","target":"魯雄","value":3},{"source":"尤渾","target":"魯雄","value":3},{"source":"費仲","target":"魯雄","value":3},{"source":"南宮适","target":"武吉","value":18},{"source":"南宮适","target":"武王","value":6},{"source":"尤渾","target":"武吉","value":1},{"source":"武吉","target":"費仲","value":1},{"source":"武吉","target":"魯雄","value":1},{"source":"聞太師","target":"鄧九公","value":1},{"source":"楊戩","target":"武王","value":8},{"source":"道德真君","target":"黃天化","value":5},{"source":"黃天化","target":"黃飛虎","value":4},{"source":"楊戩","target":"黃天化","value":11},{"source":"竇榮","target":"聞太師","value":1},{"source":"鄧九公","target":"鄧嬋玉","value":4},{"source":"聞太師","target":"辛環","value":5},{"source":"聞太師","target":"鄧忠","value":8},{"source":"聞太師","target":"靈聖母","value":1},{"source":"楊戩","target":"武吉","value":3},{"source":"楊戩","target":"聞太師","value":8},{"source":"武吉","target":"聞太師","value":2},{"source":"武吉","target":"黃天化","value":2},{"source":"聞太師","target":"黃天化","value":6},{"source":"辛環","target":"黃天化","value":3},{"source":"聞太師","target":"黃明","value":1},{"source":"鄧忠","target":"黃飛虎","value":2},{"source":"南宮适","target":"辛環","value":3},{"source":"聞太師","target":"雷震子","value":3},{"source":"姜子牙","target":"武王","value":14},{"source":"辛環","target":"雷震子","value":3},{"source":"武王","target":"雷震子","value":10},{"source":"楊戩","target":"雷震子","value":19},{"source":"雷震子","target":"黃天化","value":6},{"source":"楊戩","target":"黃龍","value":5},{"source":"廣成子","target":"文殊廣法天尊","value":2},{"source":"廣成子","target":"普賢真人","value":2},{"source":"廣成子","target":"武王","value":5},{"source":"廣成子","target":"玉鼎真人","value":5},{"source":"廣成子","target":"道德真君","value":2},{"source":"廣成子","target":"黃龍","value":1},{"source":"文殊廣法天尊","target":"普賢真人","value":7},{"source":"文殊廣法天尊","target":"武王","value":1},{"source":"文殊廣法天尊","target":"玉鼎真人","value":2},{"source":"文殊廣法天尊","target":"道德真君","value":3},{"source":"文殊廣法天尊","target":"黃龍","value":2},{"source":"普賢真人","target":"武王","value":1},{"source":"普賢真人","target":"玉鼎真人","value":2},{"source":"普賢真人","target":"道德真君","value":3},{"source":"普賢真人","target":"雲霄","value":2},{"source":"普賢真人","target":"黃龍","value":2},{"source":"武王","target":"玉鼎真人","value":4},{"source":"武王","target":"道德真君","value":1},{"source":"武王","target":"雲霄","value":2},{"source":"武王","target":"黃龍","value":4},{"source":"玉鼎真人","target":"道德真君","value":1},{"source":"玉鼎真人","target":"雲霄","value":1},{"source":"玉鼎真人","target":"黃龍","value":7},{"source":"道德真君","target":"雲霄","value":2},{"source":"道德真君","target":"黃龍","value":2},{"source":"雲霄","target":"黃龍","value":2},{"source":"聞太師","target":"黃龍","value":3},{"source":"宜生","target":"晁田","value":10},{"source":"宜生","target":"方弼","value":4},{"source":"晁田","target":"武王","value":1},{"source":"宜生","target":"黃飛虎","value":1},{"source":"聞太師","target":"金光聖母","value":2},{"source":"廣成子","target":"金光聖母","value":6},{"source":"廣成子","target":"聞太師","value":2},{"source":"楊戩","target":"玉鼎真人","value":15},{"source":"姚斌","target":"姜子牙","value":1},{"source":"武吉","target":"武王","value":4},{"source":"張紹","target":"武王","value":1},{"source":"張紹","target":"申公豹","value":1},{"source":"張紹","target":"雲霄","value":1},{"source":"武王","target":"申公豹","value":2},{"source":"申公豹","target":"雲霄","value":1},{"source":"瓊霄","target":"碧霄","value":7},{"source":"碧霄","target":"雲霄","value":4},{"source":"姜子牙","target":"雲霄","value":3},{"source":"楊戩","target":"碧霄","value":2},{"source":"楊戩","target":"瓊霄","value":1},{"source":"聞太師","target":"雲霄","value":4},{"source":"楊戩","target":"雲霄","value":1},{"source":"廣成子","target":"瓊霄","value":1},{"source":"瓊霄","target":"雲霄","value":4},{"source":"南宮适","target":"黃飛虎","value":7},{"source":"武吉","target":"黃飛虎","value":3},{"source":"辛環","target":"鄧忠","value":3},{"source":"楊戩","target":"辛環","value":1},{"source":"申公豹","target":"聞太師","value":1},{"source":"申公豹","target":"鄧九公","value":2},{"source":"鄧九公","target":"黃飛虎","value":13},{"source":"南宮适","target":"太鸞","value":3},{"source":"太鸞","target":"張桂芳","value":1},{"source":"南宮适","target":"鄧九公","value":2},{"source":"太鸞","target":"鄧九公","value":8},{"source":"姜子牙","target":"鄧九公","value":4},{"source":"鄧嬋玉","target":"黃天化","value":1},{"source":"楊戩","target":"鄧嬋玉","value":4},{"source":"武王","target":"鄧九公","value":4},{"source":"姜子牙","target":"楊戩","value":7},{"source":"楊戩","target":"鄧九公","value":2},{"source":"鄧九公","target":"黃天化","value":1},{"source":"姜子牙","target":"黃天化","value":1},{"source":"宜生","target":"鄧九公","value":3},{"source":"太鸞","target":"姜子牙","value":1},{"source":"太鸞","target":"宜生","value":1},{"source":"南宮适","target":"雷震子","value":4},{"source":"武王","target":"賀畢","value":4},{"source":"鄧九公","target":"韓榮","value":1},{"source":"鄭倫","target":"黃飛虎","value":5},{"source":"鄭倫","target":"黃天化","value":6},{"source":"蘇全忠","target":"鄭倫","value":2},{"source":"呂岳","target":"鄭倫","value":8},{"source":"呂岳","target":"姜子牙","value":3},{"source":"姜子牙","target":"鄭倫","value":1},{"source":"呂岳","target":"許之","value":1},{"source":"呂岳","target":"雷震子","value":3},{"source":"呂岳","target":"瓊霄","value":1},{"source":"呂岳","target":"碧霄","value":1},{"source":"呂岳","target":"雲霄","value":1},{"source":"呂岳","target":"黃天化","value":4},{"source":"呂岳","target":"楊戩","value":13},{"source":"楊戩","target":"鄭倫","value":3},{"source":"呂岳","target":"武王","value":3},{"source":"呂岳","target":"玉鼎真人","value":2},{"source":"呂岳","target":"蘇護","value":1},{"source":"楊戩","target":"蘇護","value":1},{"source":"武王","target":"蘇護","value":2},{"source":"玉鼎真人","target":"蘇護","value":1},{"source":"呂岳","target":"黃龍","value":4},{"source":"呂岳","target":"韋護","value":2},{"source":"殷洪","target":"靈聖母","value":1},{"source":"武王","target":"殷洪","value":5},{"source":"殷洪","target":"申公豹","value":7},{"source":"申公豹","target":"蘇護","value":1},{"source":"殷洪","target":"蘇護","value":4},{"source":"殷洪","target":"黃飛虎","value":4},{"source":"殷洪","target":"鄭倫","value":2},{"source":"殷洪","target":"黃天化","value":1},{"source":"姜子牙","target":"殷洪","value":2},{"source":"姜子牙","target":"蘇全忠","value":1},{"source":"殷洪","target":"蘇全忠","value":2},{"source":"楊戩","target":"殷洪","value":5},{"source":"殷洪","target":"鄧嬋玉","value":1},{"source":"殷洪","target":"馬元","value":8},{"source":"鄧嬋玉","target":"馬元","value":1},{"source":"楊戩","target":"馬元","value":6},{"source":"文殊廣法天尊","target":"馬元","value":3},{"source":"姜子牙","target":"馬元","value":2},{"source":"武王","target":"馬元","value":1},{"source":"文殊廣法天尊","target":"殷洪","value":1},{"source":"呂岳","target":"殷洪","value":1},{"source":"呂岳","target":"蘇全忠","value":1},{"source":"南宮适","target":"黃天祥","value":2},{"source":"鄧九公","target":"鄭倫","value":1},{"source":"蘇護","target":"韓榮","value":1},{"source":"張山","target":"洪錦","value":2},{"source":"張山","target":"鄧九公","value":7},{"source":"張山","target":"鄧嬋玉","value":1},{"source":"雷震子","target":"韋護","value":22},{"source":"廣成子","target":"殷郊","value":14},{"source":"姜子牙","target":"殷郊","value":2},{"source":"武王","target":"殷郊","value":4},{"source":"張山","target":"殷郊","value":7},{"source":"張山","target":"馬善","value":1},{"source":"殷郊","target":"馬善","value":7},{"source":"殷郊","target":"黃天化","value":3},{"source":"張山","target":"黃天化","value":2},{"source":"馬善","target":"黃飛虎","value":1},{"source":"楊戩","target":"殷郊","value":6},{"source":"張山","target":"黃飛虎","value":2},{"source":"鄧九公","target":"馬善","value":1},{"source":"南宮适","target":"馬善","value":1},{"source":"韋護","target":"馬善","value":1},{"source":"韋護","target":"黃天化","value":1},{"source":"楊戩","target":"馬善","value":6},{"source":"廣成子","target":"楊戩","value":1},{"source":"廣成子","target":"申公豹","value":3},{"source":"殷郊","target":"申公豹","value":3},{"source":"姜子牙","target":"馬善","value":1},{"source":"廣成子","target":"馬善","value":1},{"source":"申公豹","target":"馬善","value":1},{"source":"張山","target":"楊戩","value":1},{"source":"武王","target":"高明","value":2},{"source":"武王","target":"龍吉","value":1},{"source":"楊戩","target":"龍吉","value":1},{"source":"殷郊","target":"鄧嬋玉","value":1},{"source":"殷郊","target":"黃天祥","value":1},{"source":"殷郊","target":"黃天祿","value":1},{"source":"黃天祥","target":"黃天祿","value":4},{"source":"文殊廣法天尊","target":"殷郊","value":1},{"source":"武吉","target":"殷郊","value":1},{"source":"柏鑑","target":"殷郊","value":1},{"source":"孔宣","target":"洪錦","value":9},{"source":"南宮适","target":"洪錦","value":6},{"source":"洪錦","target":"鄧嬋玉","value":6},{"source":"洪錦","target":"龍吉","value":16},{"source":"鄧嬋玉","target":"龍吉","value":2},{"source":"宜生","target":"武王","value":8},{"source":"周公旦","target":"武王","value":5},{"source":"南宮适","target":"黃天化","value":1},{"source":"周公旦","target":"雷震子","value":1},{"source":"周公旦","target":"黃天祥","value":1},{"source":"周公旦","target":"黃天祿","value":1},{"source":"周公旦","target":"黃飛虎","value":1},{"source":"雷震子","target":"黃天祥","value":1},{"source":"雷震子","target":"黃天祿","value":1},{"source":"雷震子","target":"黃明","value":2},{"source":"雷震子","target":"黃飛虎","value":3},{"source":"黃天祥","target":"黃明","value":2},{"source":"太鸞","target":"晁田","value":1},{"source":"太鸞","target":"晁雷","value":1},{"source":"太鸞","target":"洪錦","value":1},{"source":"太鸞","target":"蘇全忠","value":1},{"source":"太鸞","target":"蘇護","value":1},{"source":"太鸞","target":"鄧嬋玉","value":1},{"source":"太鸞","target":"黃飛虎","value":1},{"source":"太鸞","target":"龍吉","value":1},{"source":"晁田","target":"洪錦","value":1},{"source":"晁田","target":"蘇全忠","value":1},{"source":"晁田","target":"蘇護","value":1},{"source":"晁田","target":"鄧九公","value":1},{"source":"晁田","target":"鄧嬋玉","value":1},{"source":"晁田","target":"龍吉","value":1},{"source":"晁雷","target":"洪錦","value":1},{"source":"晁雷","target":"蘇全忠","value":1},{"source":"晁雷","target":"蘇護","value":1},{"source":"晁雷","target":"鄧九公","value":1},{"source":"晁雷","target":"鄧嬋玉","value":1},{"source":"晁雷","target":"龍吉","value":1},{"source":"洪錦","target":"蘇全忠","value":3},{"source":"洪錦","target":"蘇護","value":1},{"source":"洪錦","target":"鄧九公","value":2},{"source":"洪錦","target":"黃飛虎","value":4},{"source":"蘇全忠","target":"鄧九公","value":1},{"source":"蘇全忠","target":"鄧嬋玉","value":1},{"source":"蘇全忠","target":"黃飛虎","value":1},{"source":"蘇全忠","target":"龍吉","value":1},{"source":"蘇護","target":"鄧九公","value":1},{"source":"蘇護","target":"鄧嬋玉","value":1},{"source":"蘇護","target":"龍吉","value":1},{"source":"鄧九公","target":"龍吉","value":1},{"source":"鄧嬋玉","target":"黃飛虎","value":1},{"source":"黃飛虎","target":"龍吉","value":2},{"source":"南宮适","target":"魏賁","value":3},{"source":"張山","target":"韓榮","value":1},{"source":"姜子牙","target":"韓榮","value":4},{"source":"孔宣","target":"許之","value":1},{"source":"孔宣","target":"黃天化","value":2},{"source":"姜子牙","target":"孔宣","value":1},{"source":"孔宣","target":"雷震子","value":3},{"source":"許之","target":"黃飛虎","value":2},{"source":"孔宣","target":"黃飛虎","value":3},{"source":"南宮适","target":"孔宣","value":1},{"source":"南宮适","target":"楊戩","value":4},{"source":"孔宣","target":"楊戩","value":7},{"source":"孔宣","target":"武吉","value":1},{"source":"楊戩","target":"洪錦","value":1},{"source":"楊戩","target":"黃飛虎","value":1},{"source":"武吉","target":"洪錦","value":1},{"source":"武吉","target":"雷震子","value":2},{"source":"洪錦","target":"雷震子","value":1},{"source":"楊戩","target":"韋護","value":18},{"source":"孔宣","target":"李靖","value":1},{"source":"孔宣","target":"高明","value":1},{"source":"孔宣","target":"鄧嬋玉","value":1},{"source":"孔宣","target":"龍吉","value":1},{"source":"孔宣","target":"武王","value":1},{"source":"孔宣","target":"韋護","value":1},{"source":"孔宣","target":"韓榮","value":1},{"source":"太鸞","target":"黃天祥","value":1},{"source":"太鸞","target":"黃天祿","value":4},{"source":"太鸞","target":"黃明","value":1},{"source":"南宮适","target":"蘇全忠","value":1},{"source":"南宮适","target":"蘇護","value":1},{"source":"洪錦","target":"許之","value":1},{"source":"胡升","target":"胡雷","value":2},{"source":"南宮适","target":"胡雷","value":5},{"source":"洪錦","target":"胡雷","value":5},{"source":"胡雷","target":"龍吉","value":1},{"source":"武王","target":"洪錦","value":1},{"source":"武王","target":"胡升","value":1},{"source":"洪錦","target":"胡升","value":5},{"source":"胡升","target":"靈聖母","value":4},{"source":"洪錦","target":"靈聖母","value":6},{"source":"靈聖母","target":"龍吉","value":5},{"source":"姜子牙","target":"靈聖母","value":3},{"source":"廣成子","target":"靈聖母","value":9},{"source":"廣成子","target":"烏雲仙","value":4},{"source":"申公豹","target":"靈聖母","value":1},{"source":"胡雷","target":"靈聖母","value":1},{"source":"丘引","target":"黃飛虎","value":3},{"source":"丘引","target":"黃天祥","value":16},{"source":"丘引","target":"鄧九公","value":2},{"source":"鄧九公","target":"黃天祥","value":3},{"source":"鄧九公","target":"陳奇","value":3},{"source":"丘引","target":"陳奇","value":5},{"source":"太鸞","target":"陳奇","value":2},{"source":"丘引","target":"太鸞","value":1},{"source":"陳奇","target":"黃天祿","value":1},{"source":"丘引","target":"黃天祿","value":2},{"source":"鄧嬋玉","target":"陳奇","value":3},{"source":"丘引","target":"鄧嬋玉","value":1},{"source":"鄭倫","target":"陳奇","value":5},{"source":"陳奇","target":"黃飛虎","value":1},{"source":"武王","target":"黃天祥","value":1},{"source":"姜子牙","target":"高明","value":3},{"source":"韓榮","target":"高明","value":1},{"source":"韓榮","target":"魏賁","value":2},{"source":"姜子牙","target":"雷震子","value":1},{"source":"李靖","target":"韋護","value":8},{"source":"姜子牙","target":"許之","value":1},{"source":"徐蓋","target":"魏賁","value":1},{"source":"王豹","target":"蘇護","value":2},{"source":"王豹","target":"蘇全忠","value":1},{"source":"武王","target":"王豹","value":1},{"source":"徐蓋","target":"王豹","value":2},{"source":"姜子牙","target":"徐蓋","value":1},{"source":"徐蓋","target":"雷震子","value":2},{"source":"徐蓋","target":"武王","value":1},{"source":"徐芳","target":"徐蓋","value":2},{"source":"徐芳","target":"許之","value":1},{"source":"徐芳","target":"黃飛虎","value":3},{"source":"徐蓋","target":"黃飛虎","value":2},{"source":"徐芳","target":"洪錦","value":3},{"source":"南宮适","target":"徐芳","value":2},{"source":"呂岳","target":"李靖","value":1},{"source":"呂岳","target":"徐芳","value":5},{"source":"李靖","target":"楊戩","value":6},{"source":"李靖","target":"雷震子","value":7},{"source":"南宮适","target":"楊任","value":1},{"source":"楊任","target":"武王","value":3},{"source":"呂岳","target":"楊任","value":7},{"source":"南宮适","target":"徐蓋","value":1},{"source":"徐蓋","target":"洪錦","value":1},{"source":"余化龍","target":"余德","value":5},{"source":"蘇護","target":"許之","value":1},{"source":"余化龍","target":"姜子牙","value":1},{"source":"余化龍","target":"雷震子","value":2},{"source":"余德","target":"姜子牙","value":1},{"source":"余德","target":"楊戩","value":3},{"source":"余德","target":"黃飛虎","value":1},{"source":"余德","target":"李靖","value":1},{"source":"卞吉","target":"歐陽淳","value":12},{"source":"歐陽淳","target":"黃飛虎","value":3},{"source":"卞吉","target":"黃飛虎","value":4},{"source":"南宮适","target":"卞吉","value":5},{"source":"南宮适","target":"歐陽淳","value":2},{"source":"卞吉","target":"雷震子","value":4},{"source":"李靖","target":"歐陽淳","value":2},{"source":"周公旦","target":"歐陽淳","value":1},{"source":"歐陽淳","target":"雷震子","value":2},{"source":"卞吉","target":"黃明","value":1},{"source":"歐陽淳","target":"黃明","value":1},{"source":"鄧昆","target":"黃飛虎","value":5},{"source":"卞吉","target":"鄧昆","value":4},{"source":"歐陽淳","target":"鄧昆","value":1},{"source":"武王","target":"鄧昆","value":2},{"source":"鄧昆","target":"高明","value":1},{"source":"姜子牙","target":"鄧昆","value":1},{"source":"張奎","target":"高蘭英","value":4},{"source":"楊戩","target":"許之","value":1},{"source":"張奎","target":"楊戩","value":16},{"source":"楊戩","target":"高蘭英","value":1},{"source":"武王","target":"高蘭英","value":1},{"source":"張奎","target":"楊任","value":11},{"source":"鄧嬋玉","target":"高蘭英","value":5},{"source":"張奎","target":"鄧嬋玉","value":1},{"source":"吳龍","target":"常昊","value":15},{"source":"吳龍","target":"袁洪","value":11},{"source":"常昊","target":"袁洪","value":11},{"source":"吳龍","target":"雷開","value":3},{"source":"吳龍","target":"魯仁傑","value":3},{"source":"常昊","target":"雷開","value":3},{"source":"常昊","target":"魯仁傑","value":3},{"source":"袁洪","target":"雷開","value":3},{"source":"袁洪","target":"魯仁傑","value":5},{"source":"雷開","target":"魯仁傑","value":3},{"source":"姜子牙","target":"袁洪","value":4},{"source":"姜子牙","target":"魯仁傑","value":2},{"source":"張奎","target":"袁洪","value":3},{"source":"楊任","target":"楊戩","value":6},{"source":"楊任","target":"韋護","value":5},{"source":"姜子牙","target":"張奎","value":1},{"source":"張奎","target":"武王","value":3},{"source":"張奎","target":"雷震子","value":1},{"source":"袁洪","target":"雷震子","value":2},{"source":"張奎","target":"韋護","value":2},{"source":"武王","target":"袁洪","value":2},{"source":"楊戩","target":"袁洪","value":15},{"source":"常昊","target":"楊戩","value":4},{"source":"楊任","target":"袁洪","value":7},{"source":"吳龍","target":"楊任","value":2},{"source":"常昊","target":"楊任","value":2},{"source":"袁洪","target":"高明","value":8},{"source":"李靖","target":"楊任","value":4},{"source":"楊戩","target":"高明","value":4},{"source":"楊任","target":"高明","value":4},{"source":"吳龍","target":"李靖","value":1},{"source":"吳龍","target":"高明","value":2},{"source":"常昊","target":"李靖","value":1},{"source":"常昊","target":"高明","value":2},{"source":"李靖","target":"袁洪","value":2},{"source":"李靖","target":"高明","value":2},{"source":"袁洪","target":"韋護","value":1},{"source":"韋護","target":"高明","value":2},{"source":"楊任","target":"雷震子","value":2},{"source":"南宮适","target":"鄭倫","value":1},{"source":"武吉","target":"鄭倫","value":1},{"source":"武王","target":"鄭倫","value":1},{"source":"雷震子","target":"高明","value":1},{"source":"吳龍","target":"韋護","value":1},{"source":"吳龍","target":"楊戩","value":3},{"source":"袁洪","target":"許之","value":1},{"source":"姜子牙","target":"武吉","value":1},{"source":"南宮适","target":"李靖","value":1},{"source":"南宮适","target":"韋護","value":1},{"source":"李靖","target":"武吉","value":1},{"source":"武吉","target":"韋護","value":1},{"source":"柏鑑","target":"黃天化","value":1},{"source":"柏鑑","target":"聞太師","value":1},{"source":"侯虎","target":"靈聖母","value":1},{"source":"侯虎","target":"黃飛虎","value":1},{"source":"侯虎","target":"龍吉","value":1},{"source":"靈聖母","target":"黃飛虎","value":1},{"source":"楊任","target":"殷郊","value":1},{"source":"柏鑑","target":"王魔","value":1},{"source":"柏鑑","target":"鄭倫","value":1},{"source":"余化龍","target":"柏鑑","value":1},{"source":"柏鑑","target":"瓊霄","value":1},{"source":"柏鑑","target":"碧霄","value":1},{"source":"柏鑑","target":"雲霄","value":1},{"source":"柏鑑","target":"申公豹","value":1},{"source":"李靖","target":"武王","value":7},{"source":"周公旦","target":"姜子牙","value":1},{"source":"周公旦","target":"李靖","value":1},{"source":"姜子牙","target":"李靖","value":1}];
+var linksData = (c => c.s.map((s, i) => ({source: fengshenNames[s], target: fengshenNames[c.t[i]], value: c.w[i]})))({"s":[25,25,25,9,9,11,8,60,60,3,60,16,29,16,25,25,11,33,25,25,25,9,11,41,16,45,16,36,86,9,9,86,86,29,86,29,42,7,37,37,37,37,37,29,9,9,9,8,35,86,18,11,31,90,90,11,61,61,61,61,90,97,25,60,9,41,11,0,11,11,50,6,51,71,27,0,27,61,45,45,11,11,11,98,45,93,45,23,11,3,3,0,11,25,90,90,4,11,79,93,93,4,12,19,3,56,95,68,68,79,20,20,20,4,58,29,90,42,42,42,4,3,19,90,4,19,0,65,0,0,19,91,0,4,65,50,65,32,19,90,97,97,19,19,3,19,60,31,90,90,60,23,23,3,1,56,15,1,58,10,3,3,3,1,1,23,23,3,87,3,72,90,3,0,87,4,1,5,1,18,18,18,18,18,18,50,50,50,50,50,71,71,71,71,71,4,4,4,4,54,54,54,56,56,30,3,45,45,29,45,3,18,18,1,62,23,74,74,74,4,21,85,81,0,1,1,3,1,18,85,90,23,87,1,21,21,10,90,40,90,40,0,28,1,4,0,1,10,0,45,40,40,90,4,10,24,24,33,13,13,0,13,13,13,13,13,13,13,1,13,13,13,1,4,54,13,13,8,4,8,21,8,8,8,8,0,0,8,1,8,8,28,1,50,0,4,50,13,13,90,10,16,44,44,44,5,18,0,4,44,44,7,7,44,64,1,44,10,90,39,39,1,18,18,7,0,18,21,44,4,4,1,7,7,7,32,50,23,80,26,90,22,22,28,45,97,90,97,97,97,97,5,5,5,5,32,40,40,40,40,40,40,40,40,29,29,29,29,29,29,42,42,42,42,42,42,22,22,22,22,33,33,33,33,16,16,16,10,28,2,90,44,0,26,26,0,26,46,26,90,90,26,26,1,1,23,23,22,1,26,26,26,26,26,26,26,40,40,40,90,90,22,57,90,22,78,4,4,22,57,22,53,0,18,18,21,78,48,48,48,10,10,48,40,48,38,48,28,48,24,38,4,0,20,20,0,6,0,63,94,94,4,63,0,63,63,47,47,47,63,47,90,13,13,6,6,90,27,13,90,63,70,16,70,70,89,89,89,89,43,52,43,90,90,43,6,97,52,43,52,75,43,52,4,75,0,12,1,12,1,4,12,28,12,69,69,77,69,69,77,77,17,17,98,0,0,12,27,27,0,12,12,17,12,4,1,77,27,69,77,17,6,1,27,69,69,77,77,6,6,17,39,27,90,23,4,5,69,69,17,0,90,90,6,23,80,80,25,25,25,53,27,80,80,70,80,80,80,80,6,97,97,0],"t":[9,11,41,11,41,41,7,3,31,31,16,31,73,73,31,73,16,16,99,16,33,24,24,24,24,16,2,2,31,31,86,29,42,42,7,36,36,2,8,7,2,29,42,2,37,8,7,98,2,8,30,31,41,11,45,45,4,90,97,45,97,45,60,41,2,2,27,73,29,2,30,58,6,6,2,27,56,11,60,31,93,60,98,5,96,45,23,96,20,2,96,3,99,90,99,0,20,4,35,4,35,35,2,3,56,2,2,2,35,2,2,79,35,2,73,3,42,4,3,2,3,20,2,19,46,23,21,3,19,65,65,65,91,65,2,65,30,2,32,35,19,35,35,29,73,73,73,73,23,4,23,31,73,10,4,15,2,15,3,28,87,72,53,23,3,3,15,15,15,35,2,87,5,4,5,5,5,15,55,50,71,4,54,56,55,71,4,54,56,55,4,54,56,30,55,54,56,30,55,56,30,55,30,55,55,55,29,37,4,2,14,14,3,54,0,4,4,21,30,21,30,81,30,30,81,85,30,30,85,30,2,2,72,87,3,10,2,40,19,10,10,10,15,28,10,1,10,15,15,10,0,45,5,96,20,2,15,24,24,0,24,46,5,85,81,30,15,1,24,4,54,16,16,16,16,55,39,53,8,21,16,16,2,24,15,8,33,33,8,28,88,88,88,88,88,88,8,8,33,32,24,20,22,10,28,39,7,7,7,7,64,64,15,15,2,7,2,64,64,64,15,64,1,21,21,64,64,64,1,34,49,49,28,32,79,79,7,7,7,22,22,28,49,49,4,4,15,5,32,79,2,32,79,35,2,35,29,42,22,33,16,28,2,49,22,33,16,10,28,49,22,33,16,10,28,49,33,16,10,2,10,28,2,49,10,28,49,49,2,49,66,20,20,46,15,26,5,2,2,26,1,1,23,22,2,22,5,5,39,6,34,28,49,4,39,20,32,79,35,33,16,46,78,78,78,49,22,57,57,53,53,49,53,53,83,53,53,2,32,10,32,38,38,38,40,79,79,38,28,38,2,32,34,34,66,5,39,46,66,16,33,94,94,63,5,4,63,46,2,2,22,47,6,47,1,5,27,4,27,63,22,89,46,0,5,0,1,2,6,52,2,2,43,52,5,52,52,5,35,35,2,75,75,75,34,75,76,46,1,76,76,27,76,28,77,17,17,98,59,98,59,98,59,59,17,59,17,1,39,12,4,5,5,39,17,17,1,17,27,27,34,27,34,34,6,34,6,34,17,34,39,34,5,24,24,24,34,39,1,46,23,6,39,23,39,15,3,53,2,49,2,7,65,24,80,85,81,30,21,4,0,6,6],"w":[6,12,12,8,16,9,16,1,34,2,2,3,1,2,4,2,3,5,3,5,2,1,1,1,8,3,6,1,1,3,2,3,3,22,3,2,2,6,1,1,8,9,1,9,1,1,1,2,10,1,4,11,4,1,10,1,1,1,1,1,3,2,2,3,1,1,1,1,2,2,5,2,5,1,5,1,4,3,1,1,1,2,1,1,2,1,9,1,1,7,1,3,3,2,2,4,2,1,4,4,1,2,2,3,2,4,9,4,2,3,2,1,1,3,1,2,9,1,3,6,5,3,6,3,1,2,5,2,2,3,1,2,1,1,1,4,1,3,1,2,1,2,1,1,3,3,3,3,18,6,1,1,1,1,8,5,4,11,1,4,5,8,1,3,8,2,2,6,3,1,2,3,3,14,3,10,19,6,5,2,2,5,5,2,1,7,1,2,3,2,1,2,3,2,2,4,1,2,4,1,1,7,2,2,2,3,10,4,1,1,2,6,2,15,1,4,1,1,1,2,1,7,4,3,2,1,4,1,1,4,7,3,3,1,1,2,13,3,1,2,8,4,1,4,4,7,2,1,1,3,1,1,4,4,1,5,6,2,8,3,1,1,3,1,1,1,4,13,3,3,2,1,1,2,1,4,2,1,5,7,1,4,4,2,1,2,1,2,5,1,8,1,6,3,2,1,1,1,1,2,1,1,2,7,1,22,14,2,4,7,1,7,3,2,1,6,2,1,1,1,1,6,1,3,3,1,1,1,1,2,1,1,1,1,1,4,1,1,1,9,6,6,16,2,8,5,1,1,1,1,1,1,1,2,3,2,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,3,1,2,4,1,1,1,1,1,1,1,1,1,2,3,1,4,1,2,1,3,2,3,1,4,7,1,1,1,1,2,1,18,1,1,1,1,1,1,1,1,4,1,1,1,1,2,5,5,1,1,1,5,4,6,5,3,9,4,1,1,3,16,2,3,3,5,2,1,1,2,3,1,5,1,1,3,1,2,1,8,1,1,2,1,1,2,1,2,1,2,1,3,2,3,2,1,5,6,7,1,3,7,1,1,5,1,1,2,1,3,1,1,12,3,4,5,2,4,2,1,2,1,1,5,4,1,2,1,1,4,1,16,1,1,11,5,1,15,11,11,3,3,3,3,3,5,3,4,2,3,6,5,1,3,1,2,2,2,15,4,7,2,2,8,4,4,4,1,2,1,2,2,2,1,2,2,1,1,1,1,1,3,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,7,1,1,1]});
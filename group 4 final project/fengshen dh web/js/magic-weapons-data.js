@@ -0,0 +1 @@
+const allTreasuresData = (c => c.name.map((n, i) => ({"法宝名称": n, "使用者": c.users[c.user[i]], "所属阵营": c.camps[c.camp[i]], "百科简短介绍（来源：百度百科）": c.desc[i]})))({"users":["女娲","老子（太上老君）","元始天尊","伯邑考","西王母","燃灯道人","通天教主","云中子","广成子","姜尚（姜子牙）","赤精子","太乙真人","普贤真人","度厄真人","准提道人","慈航道人","道德真君","惧留孙","玄都大法师","接引道人","哪吒","黄天化","金咤","木吒","韦护","神农","李靖","崇黑虎","石矶娘娘","陈桐","余化","风林","王魔、杨森","高友乾","李兴霸","龙须虎","邓婵玉","魔礼青","魔礼红","魔礼海","秦天君","姚天君","赵公明","萧升","云霄、碧霄、琼霄（三霄娘娘）","碧霄","菡芝仙","陆压道人","周信","杨文辉","李奇","朱天麟","火灵圣母","龟灵圣母","金灵圣母","殷郊","温良","罗宣","龙吉公主","洪锦","高继能","孔宣","邱引","余元","韩升、韩变","彭遵","法戒","龙安吉","吕岳","余光","余达","余兆","余德","卞吉","高兰英","柏鉴"],"camps":["妖族","人教","阐教","西周阵营","上古神祇阵营","阐教（后入西方教）","截教","阐教（西周阵营）","西方教","西周阵营（原殷商）","西周阵营（崇城）","殷商阵营（截教附属）","殷商阵营","截教（九龙岛四圣）","西周阵营（奇人）","殷商阵营（魔家四将）","截教（十绝阵）","散仙阵营","截教（三霄附属）","截教（瘟部）","西周阵营（天庭下凡）","殷商阵营（孔雀大明王）","截教（瘟部之首）","殷商阵营（吕岳弟子）","殷商阵营（余家将）","封神台（中立）"],"name":["金葫芦","山河社稷图","招妖幡","太极图","风火蒲团","乾坤图","三宝玉如意","宝盒","琉璃瓶","盘古幡","缚妖索","醒酒毡","素色云界旗（聚仙旗）","七宝玲珑塔","太极符印","诛仙剑","戮仙剑","陷仙剑","绝仙剑","诛仙阵图","六魂幡","巨阙剑","通天神火柱","紫金钵盂","照妖鉴","八卦仙衣","番天印","扫霞衣","护脏符印","阴阳镜","紫绶仙衣","九龙神火罩","长虹索","定风珠","乾坤尺","六根清净竹","清净琉璃瓶","仙丹","混元幡","神砂","葫芦（盛神砂）","五火七禽扇","玉虚杏黄旗","捆仙绳","玄都离地焰光旗","青莲宝色旗","乾坤圈","混天绫","风火轮","金砖","火枣","阴阳剑","花篮","莫邪宝剑","钻心钉","遁龙桩","吴钩","降魔杵","柴胡草","乾坤弓、震天箭（三枝）","红葫芦","八卦云光帕（八卦龙须帕）","火龙标","戮魂幡","化血神刀","红珠","开天珠","混元宝珠","劈地珠","发石","五光石","青云剑","白玉金刚镯","混元伞","琵琶","擒仙玄妙索","黑砂","缚龙索","定海珠","落宝金钱","金蛟剪","混元金斗","飞剑","风袋","飞刀","钉头七箭书","钉头七箭","头疼磐","散瘟鞭","发燥钟","昏迷剑","金霞冠","混元锤","日月珠","龙虎如意","四象塔","仙豆","落魂钟","白玉环","照天印","五龙轮","万鸦壶","飞烟剑","雾露乾坤网","四海瓶","二龙剑","神鲸","捆龙索","乾坤针","鲸龙","蜈蜂袋","五色华光","乱心尘","神丹","金光锉","如意乾坤袋","万刃军","菡萏阵","落魄镜","四肢酥","列瘟印","瘟癀伞","梅花镖","撞心杵","杏黄旗","毒痘","幽魂万骨幡","太阳神针","百灵幡"],"user":[0,0,0,1,1,1,1,2,2,2,0,3,4,5,2,6,6,6,6,6,6,7,7,7,7,8,8,8,9,10,10,11,12,13,5,14,15,16,16,16,16,16,9,17,18,19,20,20,20,20,20,20,21,21,21,22,23,24,25,26,27,28,29,30,30,31,32,33,34,35,36,37,37,38,39,40,41,42,42,43,44,44,45,46,47,47,47,48,49,50,51,52,52,53,54,54,55,55,56,57,57,57,57,58,58,58,58,58,58,59,60,61,62,63,63,63,64,65,66,67,68,68,69,70,71,72,73,74,75],"camp":[0,0,0,1,1,1,1,2,2,2,0,3,4,5,2,6,6,6,6,6,6,2,2,2,2,2,2,2,7,2,2,2,2,2,5,8,5,2,2,2,2,2,7,2,1,8,7,7,7,7,7,7,7,7,7,7,7,7,4,9,10,6,11,11,11,12,13,13,13,14,3,15,15,15,15,16,16,6,6,17,6,6,6,18,17,17,17,19,19,19,19,6,6,6,6,6,11,11,12,11,11,11,11,20,20,20,20,20,20,9,12,21,11,6,6,6,12,11,6,12,22,22,23,24,24,24,12,12,25],"desc":["女娲的标志性法宝之一，为金色葫芦状，可盛放宝物，在封神世界中是女娲蕴藏神力的载体，与招妖幡等法宝关联紧密。","上古神器，女娲所持，图中自有天地，能演化山川社稷，具有强大的困缚能力，封神中曾用于擒获梅山七怪之首袁洪。","女娲炼制的法宝，其形大如椽、高四五丈，光分五彩、瑞映千条，具有召唤天下妖族的能力，是妖族权力的象征之一。","道教至高法宝，老子所持，包罗万象，可劈地开天、分清理浊、定地水火风，能演化鸿蒙世界，攻防一体，威力无穷。","老子的道家坐禅之物，看似普通蒲团，实则蕴含风火之力，不仅可助修士静心悟道，还能在战斗中抵御攻击、束缚敌人。","老子的法宝，呈布包裹状，具有“包容天地”之能，可将敌人或万物收入其中，难以挣脱，封神中曾用于收服多宝道人。","白玉打造的如意形法宝，兼具攻击与破法能力，投掷出去可精准攻击敌人天灵盖，击中后能使敌人暂时失去法术能力。","元始天尊的法宝之一，外观为普通宝盒，内里蕴含恐怖力量，能将目标吸入盒中，被吸入者会瞬间化为血水，杀伤力极强。","透明琉璃制成的瓶子，是元始天尊储存灵液的法宝，因能承载具有滋养、疗伤奇效的“三光神水”而闻名封神世界。","上古神器，元始天尊的核心法宝之一，呈布幡状，蕴含盘古开天之力，可破除世间诸多阵法（如“太极阵”），释放的神力能撕裂空间。","女娲专为降妖炼制的绳索类法宝，具有灵性，能自动缠绕目标，封神中曾用于捆绑妲己（狐妖）、胡喜媚（雉鸡精）、王贵人（琵琶精）三妖。","伯邑考所持的特殊毛毯，蕴含温和灵力，人躺卧或接触后，可快速化解体内酒气，使人从醉酒状态清醒，无战斗属性。","西王母的至宝之一，旗面呈素色，异香笼罩，具有驱邪避凶、抵御法宝的能力，封神中可克制广成子的番天印。","燃灯道人的标志性法宝，塔身镶嵌七宝，能将敌人吸入塔内，塔中可燃起烈火焚烧目标，也可直接投掷攻击敌人顶门。","元始天尊炼制的符印类法宝，印有太极纹路，主要用于防御，能形成灵力屏障，有效抵御敌方法术攻击，保护自身或他人。","通天教主“诛仙四剑”之一，被施法加持的古剑，锋利无匹，需配合诛仙阵图布置“诛仙阵”，阵中此剑可斩杀各路仙神。","“诛仙四剑”成员，通天教主所持，剑身蕴含杀戮之气，与其他三剑及阵图配合，可在诛仙阵中形成绝杀领域，专攻敌人要害。","“诛仙四剑”之一，具有“陷阱”特性，在诛仙阵中能布下空间陷阱，使敌人陷入困境，再配合剑身攻击，难以闪避。","“诛仙四剑”的最后一剑，威力极致，在诛仙阵中可释放“绝灭”之力，对仙神级目标造成毁灭性打击，是截教的核心战力法宝。","记载“诛仙阵”布置方法的图谱，需与诛仙四剑配合使用，能演化出覆盖范围极广的诛仙阵，阵内杀机四伏，非四圣联手难以破阵。","通天教主的秘宝，呈六尾幡状，每尾书写一位目标姓名，每日用符印祭拜，待祭拜完成摇动幡旗，可直接取目标性命，针对仙神魂魄。","云中子用老枯松树枝削制而成的剑，虽非金属打造，但蕴含道家清气，能驱散妖气，使用三天后树枝会化为飞灰，专克妖邪。","共八根，高约三丈，按八卦方位排列，每根柱子内藏四十九条火龙，激活后可释放熊熊烈火，能焚烧敌人或破除妖法，封神中用于对付闻仲。","紫金材质的食具类法宝，看似用于盛放食物，实则具有空间束缚能力，在空中可封住敌人退路，限制其移动范围。","云中子的铜镜状法宝，具有“照妖显形”之能，无论妖物如何变化人形，只要被此镜照射，就会显露原形，无法隐藏。","印有八卦图案的道袍，广成子所穿，不仅能防御物理攻击，核心能力是“隐身”，穿上后可隐匿身形，避免被敌人察觉。","广成子的核心攻击法宝，底面刻“番天”二字，为仙印形态，投掷出去专攻敌人头顶，力量巨大，连金仙都难以硬抗，需特定法宝（如素色云界旗）克制。","蕴含仙气的纱衣，广成子所持，具有“拨云见日”之能，可驱散敌人释放的云雾、霞光等遮蔽视线的法术，恢复战场视野。","普通道士符印，姜子牙常用，使用时将符烧灰溶于水中服下，可在体内形成保护层，保护五脏六腑免受法术或毒素伤害。","赤精子的标志性法宝，镜面半边白、半边红，白色一面晃动可致人死亡，红色一面晃动可使人复活（或脱离死境），生死系于一念。","紫色丝带制成的护身法宝，缠绕于肩上，具有“刀枪不入”的防御效果，能抵挡物理兵器（如刀剑）的攻击，保护使用者躯体。","太乙真人的核心法宝，罩内可燃起三昧真火，并有九条火龙盘绕，激活后将敌人罩住，用烈火焚烧，封神中用于炼化石矶娘娘、击杀申公豹。","普贤真人的绳索类法宝，呈长虹般的彩色，具有韧性和灵性，能自动捆绑敌人，一旦缠住便难以挣脱，主要用于束缚目标而非杀伤。","圆珠状法宝，度厄真人所持，核心能力是“停风”，无论敌人释放何种风系法术（如黑风、狂风），此珠一现即可平息风力，破解风攻。","长条状尺子形法宝，燃灯道人用于指挥攻击，可远程操控，精准打击敌人，也能作为近战兵器使用，蕴含乾坤之力，攻击力不俗。","准提道人的仙竹类法宝，取自西方极乐世界的灵竹，具有“净化”与“束缚”双重能力，可捆绑敌人，同时驱散其体内的邪祟之力。","慈航道人的法宝，与元始天尊的琉璃瓶类似，但核心能力是“炼化”，可将人畜吸入瓶中，被吸入者的皮肉会逐渐化为脓水，杀伤力极强。","道德真君炼制的丹药，具有“双目重生”之效，封神中用于治疗被商军法术弄瞎双眼的姜子牙，是恢复类的珍贵灵药。","伞状法宝，道德真君所持，具有“空间转移”和“隐身”双重能力，可带着使用者瞬间移动到其他位置，也能隐匿自身气息。","蕴含仙气的沙土，道德真君所用，主要能力是“借物代形”，可将神砂化作使用者的替身，迷惑敌人，自身则趁机脱身。","普通葫芦，道德真君专门用于盛放“神砂”的容器，虽无特殊能力，但能妥善保存神砂的仙气，避免其灵力流失。","威力极强的扇子类法宝，由“五火”（空中火、石中火、木中火、三昧火、人间火）和“七禽翎”（凤凰、大鹤、孔雀等翎羽）制成，扇出可释放烈火，焚烧万物。","元始天尊赐予姜子牙的法宝，为杏黄色三角小旗，是“先天五方旗”之一，具有强大的防御能力，可抵挡各类法宝攻击，保护自身及周围目标。","惧留孙的标志性法宝，绳索具有极高灵性，无需操控即可自动捆绑敌人，无论是仙还是妖，一旦被缠上都难以挣脱，封神中多次用于擒获敌将。","玄都大法师（老子弟子）所持，按五行奇珍绘制，为“先天五方旗”之一，具有抵御攻击的能力，尤其可克制广成子的番天印。","接引道人的至宝，为“先天五方旗”之一，旗面呈现青莲色泽，白气悬空、金光万道，可释放舍利子光华，能克制番天印，防御效果极强。","太乙真人赐予哪吒的法宝，金色镯子状，可随心意变化大小，既能投掷攻击敌人，力量巨大，又能作为护身法宝，抵挡攻击。","七尺长的红色绫带，哪吒的标志性法宝之一，具有韧性和缠绕力，能自动捆绑敌人，也可挥舞攻击，蕴含水系灵力，可辅助战斗。","双轮状法宝，暗藏风火之势，哪吒踏于脚下作为交通工具，可上天入地、速度极快，同时轮上的风火也能在战斗中灼伤敌人。","纯金打造的砖形法宝，哪吒用于投掷攻击，重量惊人，击中敌人后可造成重创，且百发百中，是哪吒早期常用的攻击手段之一。","太乙真人赐予哪吒的灵枣，食用后可使哪吒化出“三头八臂”之形，提升战斗力，能同时使用多件法宝，是辅助变身的灵药。","两把属性相反（阴、阳）的宝剑，哪吒所持，可同时挥舞攻击，阴阳二气相互配合，能破解敌人的单一属性法术，攻击力均衡。","黄天化的法宝，外观为普通花篮，核心能力是“吸收暗器”，无论敌人投掷何种暗器（如飞镖、石子），都会被花篮自动吸入，无法伤及其身。","与“干将剑”齐名的上古名剑，黄天化所持，剑身光华闪烁，锋利无比，出鞘后可快速斩杀敌人，人头落地，无坚不摧。","长七寸五分的暗器，黄天化所用，放出时华光闪烁、火焰夺目，能精准攻击敌人要害（如心脏），击中后可深入体内，造成致命伤害。","黄澄澄的金柱子，上面镶有三个金圈，金咤所持，能自动将敌人捆在金柱上，用金圈扣牢，无论敌人如何挣扎都无法逃脱，是束缚类法宝。","属于干将莫邪流的雌雄双剑，木吒所持，剑身弯曲如钩，锋利异常，可劈砍可刺杀，适合近战，双剑配合使用时战斗力更强。","蕴含灵力的金属短棒，一头大、一头小，韦护所持，拿在手中轻如灰草，打在人身上却重似泰山，专克魔邪类目标，攻击力极强。","神农发现的药用植物，非战斗法宝，具有治疗“传染之疾”的功效，封神中用于缓解周军士兵感染的瘟疫，是早期的“药材类法宝”。","从轩辕黄帝时期流传的古兵器，弓为乾坤弓，箭为震天箭，力量巨大，无人能轻易拿起，李靖早期为殷商将领时持有，后归周，箭可远程射杀强敌。","崇黑虎所持的红色葫芦，激活后可放出“铁嘴神鹰”，神鹰能辅助战斗，攻击敌人，尤其擅长对付骑兵或小型目标，是召唤类法宝。","一方白帕，上面绣有坎、离、震、兑等八卦符号，蕴含万象之力，石矶娘娘所持，能召唤黄巾力士（ supernatural 奴仆），辅助战斗或搬运。","陈桐所用的暗器飞镖，出手时会产生烟雾，具有“百发百中”的特性，烟雾可遮蔽敌人视线，飞镖则精准攻击目标，造成伤害。","余化所持的旗状法宝，具有“生擒敌人”的能力，幡旗摇动时可释放魂力冲击，削弱敌人意志，再将其生擒，而非直接杀戮。","余化的核心法宝，刀光如电光，锋利异常，被刀划伤后，伤口会迅速恶化，血液化为毒素，顷刻之间即可致人死亡，无解药难以救治。","风林所持的碗口大小红珠，为投掷类法宝，力量巨大，投掷出去可将敌人打落马下（或击倒），主要用于近战辅助，冲击力强。","王魔、杨森共持的圆珠状法宝，投掷攻击型，蕴含“开天”之力，虽不及盘古幡，但其冲击力可击碎普通防御，适合远程打击。","高友乾所持的圆珠法宝，“混元”代表其蕴含混沌之力，投掷出去可攻击敌人，同时能轻微扰乱周围法术环境，影响敌人施法。","李兴霸所持的圆珠法宝，核心能力是“劈地”，投掷到地面可引发震动，裂开地缝，既能攻击地面敌人，也能阻碍其移动。","龙须虎的天赋能力转化的“法宝”，无需实物载体，可从手掌中直接发出石头攻击敌人，石头数量多、速度快，适合群体攻击。","邓婵玉所持的彩色石头，能发出青、黄、赤、白、黑五种奇异光芒，具有“百发百中”的特性，主要攻击敌人头脸部位，造成眩晕或伤害。","魔礼青的宝剑，剑上有“地、水、火、风”四字符印，激活后可释放黑风（含万千戈矛）或烈火，黑风能撕碎敌人肢体，烈火可焚烧目标。","魔礼青所持的玉质金刚镯，虽非太上老君的金刚镯，但其硬度极高，投掷出去可攻击敌人，也能抵挡普通法宝的撞击，防御与攻击兼备。","魔礼红的核心法宝，伞面由明珠（祖母绿、夜明珠等）穿成，上有“装载乾坤”四字，撑开后天昏地暗，可吸收敌人的宝物、兵器，转而为己用。","魔礼海所持的琵琶，琴弦按“地、水、火、风”排列，拨动琴弦可引发风火，风火齐至攻击敌人，琴弦声音还能扰乱敌人心神。","秦天君（秦完）所持的绳状法宝，具有“自动捆绑敌人”的能力，专门针对仙人，绳索蕴含禁制之力，仙人被捆后难以动用仙力挣脱。","姚天君（姚宾）所持的黑色沙土，需配合“落魂阵”使用，在阵中散射出去，沙土带有魂魄攻击效果，能削弱敌人魂魄，使其失去战斗力。","赵公明的绳索类法宝，专门用于“捆绑龙类”或强大目标，具有极强的束缚力，即使是神龙被捆也无法挣脱，也可用于捆绑其他仙神。","共二十四颗，攒成一串，赵公明的核心法宝，能释放五色毫光，使人睁不开眼，趁机发动暗算，后此珠传入释门，化为“二十四诸天”。","萧升所持的有翅金钱，具有“落宝”之能，无论敌人投掷何种法宝，此金钱飞出均可将其打落，使其失去效用，但对肉身攻击无效。","三霄娘娘的核心法宝，由两条蛟龙炼化而成，头并头如剪、尾交尾如股，挥动时可将目标一剪两段，即使是金仙级目标也难以抵挡，威力仅次于诛仙四剑。","三霄娘娘的至宝，具有“生擒+破法”双重能力，能将敌人吸入斗中，同时剥夺敌人的法宝和法力，使敌人失去反抗能力，封神中曾生擒大量阐教仙人。","碧霄所持的宝剑，类似木吒的吴钩剑，可远程操控飞行，精准攻击敌人，无需手持，能自主在空中穿梭，适合远程偷袭。","菡芝仙所持的袋子，打开后可释放黑风，黑风具有腐蚀性，能“削人骨肉”，对肉身目标伤害极大，可大范围攻击敌人。","陆压道人的葫芦所藏法宝，葫芦内有一线毫光，现出七寸长、有眉有目的法宝，释放白光钉住敌人使其昏迷，再念“请宝贝转身”即可斩下敌人首级。","记载“钉头七箭”异术的书稿，使用时需立营、设台、结草人（书敌人姓名），头足各一盏灯，每日三次祭拜，二十一日后可取敌人性命，属诅咒类法宝。","配合钉头七箭书使用的兵器，含一张桑枝弓、三支桃枝箭，按步骤先射敌人左目、再射右目、最后劈心一箭，与书稿配合可远程取命。","周信所持的打击乐器，被施妖法，敲击时会产生特殊声波，使人头部剧痛，无法集中精神战斗，属于“精神干扰类”法宝。","杨文辉所持的长鞭，被施妖法，抽打时会释放瘟疫之气，使人精神混乱、失去理智，无法辨别敌我，只能被动受击。","李奇所持的摇铃，被施妖法，摇动时产生的声音会使人焦躁不安、心率加快，失去冷静判断能力，影响战斗发挥。","朱天麟所持的直剑，被施妖法，剑身散发的气息或攻击到敌人时，能使人陷入昏迷状态，失去意识，无法反抗。","火灵圣母戴在头上的冠冕，激活后可释放三四十丈的金霞，核心能力是“隐身”，金霞笼罩范围内，火灵圣母可隐匿身形，出其不意攻击敌人。","火灵圣母所持的小锤，投掷攻击型法宝，虽体积小但重量惊人，投掷出去可精准打击敌人，冲击力能击碎防御，适合远程偷袭。","龟灵圣母所持的宝珠，蕴含日月灵气，具有“投掷攻击”能力，宝珠释放的日月光华可刺伤敌人眼睛，同时撞击力强，能造成重创。","金灵圣母所持的玉如意，上面刻有龙、虎图案，投掷出去可攻击敌人，同时能召唤龙虎虚影辅助战斗，虚影具有撕咬、撞击能力。","四面六层的宝塔状法宝，金灵圣母所持，投掷出去可攻击敌人，塔身蕴含“四象”（青龙、白虎、朱雀、玄武）之力，能同时释放多种属性攻击。","殷郊所持的灵药类法宝，食用后可使身体发生变化，化出“三头六臂、多生一目”，提升躯体强度和战斗视野，增强战斗力。","殷郊所持的小铃，手摇时会释放魂魄冲击波，使人失魂落魄、重心不稳，无法站立或战斗，属于精神干扰类法宝。","温良所持的白玉镯子，投掷攻击型法宝，具有“百发百中”的特性，镯子飞行速度快，击中敌人后可造成钝器伤害，也能打断敌人施法。","罗宣所持的古印状法宝，体积大、重量重，投掷出去力量巨大，可砸毁建筑或重创敌人，即使是防御法宝也难以完全抵挡其冲击力。","五条神龙交替缠绕而成的轮状法宝，罗宣所持，攻击时不仅轮体可撞击敌人，五条神龙还能自主飞出，分别释放不同属性攻击（如火焰、雷电）。","方口四耳的妖壶，罗宣所持，打开后可释放无数会喷火的乌鸦，乌鸦数量多、火势猛，能大范围焚烧敌人或建筑，是群攻型法宝。","原为一对的宝剑，罗宣所持，攻击时会释放大量烟雾，烟雾可遮蔽敌人视线，同时剑身锋利，可趁乱刺杀敌人，适合偷袭或群战。","龙吉公主所持的湿淋淋网罩，无边无际，带有能扑灭一切火焰的水属性力量，封神中专门用于克制罗宣的火系法宝，可快速灭火并束缚敌人。","龙吉公主的瓷瓶状法宝，具有“吸取宝物”的能力，可将敌人的法宝吸入瓶中暂时封印，使其无法使用，也能储存自身宝物。","两条龙缠绕而成的宝剑，龙吉公主所持，投掷出去可攻击敌人，具有“百发百中”的特性，龙形剑身还能释放龙气，削弱敌人防御。","龙吉公主所控的怪兽，体型如泰山般巨大，浮于海面，主要用途是“渡水”，可承载周军士兵或物资横渡江河，无战斗能力。","龙吉公主的绳索类法宝，专门用于捆绑敌人，尤其对龙类或大型目标效果显著，绳索具有灵性，能自动追踪并缠绕目标。","长三寸五分的细针，龙吉公主所持，刺入敌人身体后可破坏其体内灵力运行，使敌人法力尽失，暂时失去施法能力，属于破法类法宝。","洪锦所控的象鱼象龙的怪兽，主要用途是“渡水”，可载人或物资横渡水域，体型小于龙吉公主的神鲸，但渡水效率较高，无战斗属性。","高继能所持的袋子，打开后可释放大量蜈蜂，蜈蜂带有毒性，能叮咬敌人，造成疼痛和中毒效果，干扰敌人战斗，属于召唤类法宝。","孔宣的天赋神通转化的“法宝”，无需实物载体，可释放青、黄、赤、白、黑五种光华，具有攻击、生擒、落宝三种能力，连准提道人都需费力应对。","邱引所持的碗口大小红珠，释放后可散发出扰乱心神的尘埃，尘埃吸入体内或接触皮肤，会使人精神混乱、判断力下降，无法正常战斗。","余元炼制的丹药，具有“解化血神刀之毒”的特效，是封神中唯一能化解余化化血神刀毒素的宝物，珍贵异常，仅用于解毒。","长一尺三寸的金属锉刀状法宝，余元所持，投掷出去可攻击敌人，剑身散发金光，锋利度高，能切割普通法宝或防御，适合近战或远程攻击。","余元的袋子状法宝，可装人装物，核心能力是“消除仙术”，将敌人吸入袋中后，可暂时消除其仙术能力，使其无法在袋内反抗。","纸做的风车状法宝，韩升、韩变共持，中间有转盘，推转后可释放阴风与飞刀，阴风能干扰敌人，飞刀数量多、速度快，可大范围攻击周军。","并非传统阵法，而是彭遵使用的石子类杂物，投掷出去后可引发雷电攻击，石子蕴含雷系之力，击中敌人或地面会产生雷击，属于范围攻击。","法戒所持的古镜，蕴含神奇力量，核心能力是“吸人魂魄”，镜面照射敌人时，可强行抽取其魂魄，使敌人失去意识，沦为傀儡或死亡。","龙安吉所持的两个圆环，左右翻覆如太极，扣成阴阳连环双锁，圆环晃动时产生叮当声，敌人耳听眼见后会浑身骨懈筋酥、手足无力，无法战斗。","吕岳所持的蛊印，印有瘟神符文，使用时可释放瘟疫毒素，毒素扩散范围广，能使大量士兵感染瘟疫，失去战斗力，属于大范围杀伤法宝。","吕岳的魔伞，可布置“瘟癀阵”，伞面打开后释放浓烈瘟气，阵内瘟气弥漫，进入者会快速感染瘟病，即使是仙人也需耗费仙力抵抗。","余光所持的飞镖，具有“分身”能力，一枝飞镖可幻化为五枝，同时攻击多个目标，精准度高，适合对付群体敌人或干扰敌人。","余达所持的铁制小杵，投掷攻击型法宝，专门攻击敌人心脏部位，冲击力强，击中后可震伤敌人内脏，即使有防御也难以完全抵消伤害。","余兆所持的杏黄色小旗，核心能力是“隐身”，与姜子牙的玉虚杏黄旗不同，此旗仅能隐匿自身身形，无防御能力，适合偷袭。","余德所持的有毒小豆，蕴含瘟疫之力，投掷出去后可生根发芽，释放毒雾，毒雾能感染敌人，使其身体溃烂、失去战斗力，属于瘟疫类法宝。","用人骨穿成的高有数丈的幡旗，白骨上印有朱砂符印，卞吉所持，摇动时可释放幽魂之气，乱人心神，使敌人产生幻觉，无法辨别真实情况。","高兰英所持的四十九根细针，蕴含太阳之力，释放后可发出刺眼光芒，迷住敌人眼睛，使其暂时失明，趁机发动攻击，属于辅助偷袭类法宝。","柏鉴所持的幡旗，专门用于“引导魂魄”，封神大战中战死的将士魂魄，需此幡引导才能进入封神台，等待封神，无战斗属性，是封神台的核心工具。"]});
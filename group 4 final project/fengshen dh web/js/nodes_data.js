@@ -1 +1,2 @@
-const nodesData = [{"id": "姜子牙", "name": "姜子牙", "group": 1},{"id": "楊戩", "name": "楊戩", "group": 1}, {"id": "黃飛虎", "name": "黃飛虎", "group": 1}, {"id": "聞太師", "name": "聞太師", "group": 1}, {"id": "武王", "name": "武王", "group": 1}, {"id": "雷震子", "name": "雷震子", "group": 1}, {"id": "李靖", "name": "李靖", "group": 1}, {"id": "殷郊", "name": "殷郊", "group": 1}, {"id": "殷洪", "name": "殷洪", "group": 1}, {"id": "姜桓楚", "name": "姜桓楚", "group": 1}, {"id": "鄧九公", "name": "鄧九公", "group": 1}, {"id": "姬昌", "name": "姬昌", "group": 1}, {"id": "張奎", "name": "張奎", "group": 1}, {"id": "呂岳", "name": "呂岳", "group": 1}, {"id": "金光聖母", "name": "金光聖母", "group": 1}, {"id": "黃天化", "name": "黃天化", "group": 1}, {"id": "蘇護", "name": "蘇護", "group": 1}, {"id": "袁洪", "name": "袁洪", "group": 1}, {"id": "廣成子", "name": "廣成子", "group": 1}, {"id": "張桂芳", "name": "張桂芳", "group": 1}, {"id": "韓榮", "name": "韓榮", "group": 1}, {"id": "申公豹", "name": "申公豹", "group": 1}, {"id": "洪錦", "name": "洪錦", "group": 1}, {"id": "武吉", "name": "武吉", "group": 1}, {"id": "鄭倫", "name": "鄭倫", "group": 1}, {"id": "侯虎", "name": "侯虎", "group": 1}, {"id": "孔宣", "name": "孔宣", "group": 1}, {"id": "楊任", "name": "楊任", "group": 1}, {"id": "鄧嬋玉", "name": "鄧嬋玉", "group": 1}, {"id": "晁田", "name": "晁田", "group": 1}, {"id": "雲霄", "name": "雲霄", "group": 1}, {"id": "費仲", "name": "費仲", "group": 1}, {"id": "黃天祥", "name": "黃天祥", "group": 1}, {"id": "蘇全忠", "name": "蘇全忠", "group": 1}, {"id": "高明", "name": "高明", "group": 1}, {"id": "黃明", "name": "黃明", "group": 1}, {"id": "黃貴妃", "name": "黃貴妃", "group": 1}, {"id": "方弼", "name": "方弼", "group": 1}, {"id": "陳奇", "name": "陳奇", "group": 1}, {"id": "韋護", "name": "韋護", "group": 1}, {"id": "太鸞", "name": "太鸞", "group": 1}, {"id": "鄂崇禹", "name": "鄂崇禹", "group": 1}, {"id": "晁雷", "name": "晁雷", "group": 1}, {"id": "卞吉", "name": "卞吉", "group": 1}, {"id": "張山", "name": "張山", "group": 1}, {"id": "宜生", "name": "宜生", "group": 1}, {"id": "許之", "name": "許之", "group": 1}, {"id": "徐芳", "name": "徐芳", "group": 1}, {"id": "丘引", "name": "丘引", "group": 1}, {"id": "龍吉", "name": "龍吉", "group": 1}, {"id": "文殊廣法天尊", "name": "文殊廣法天尊", "group": 1}, {"id": "敖光", "name": "敖光", "group": 1}, {"id": "歐陽淳", "name": "歐陽淳", "group": 1}, {"id": "靈聖母", "name": "靈聖母", "group": 1}, {"id": "玉鼎真人", "name": "玉鼎真人", "group": 1}, {"id": "黃龍", "name": "黃龍", "group": 1}, {"id": "道德真君", "name": "道德真君", "group": 1}, {"id": "胡升", "name": "胡升", "group": 1}, {"id": "竇榮", "name": "竇榮", "group": 1}, {"id": "魯仁傑", "name": "魯仁傑", "group": 1}, {"id": "尤渾", "name": "尤渾", "group": 1}, {"id": "伯邑考", "name": "伯邑考", "group": 1}, {"id": "姚斌", "name": "姚斌", "group": 1}, {"id": "徐蓋", "name": "徐蓋", "group": 1}, {"id": "馬善", "name": "馬善", "group": 1}, {"id": "王魔", "name": "王魔", "group": 1}, {"id": "魏賁", "name": "魏賁", "group": 1}, {"id": "姜王后", "name": "姜王后", "group": 1}, {"id": "陳桐", "name": "陳桐", "group": 1}, {"id": "吳龍", "name": "吳龍", "group": 1}, {"id": "余化龍", "name": "余化龍", "group": 1}, {"id": "普賢真人", "name": "普賢真人", "group": 1}, {"id": "鄧忠", "name": "鄧忠", "group": 1}, {"id": "魯雄", "name": "魯雄", "group": 1}, {"id": "張紹", "name": "張紹", "group": 1}, {"id": "鄧昆", "name": "鄧昆", "group": 1}, {"id": "高蘭英", "name": "高蘭英", "group": 1}, {"id": "常昊", "name": "常昊", "group": 1}, {"id": "胡雷", "name": "胡雷", "group": 1}, {"id": "黃天祿", "name": "黃天祿", "group": 1}, {"id": "柏鑑", "name": "柏鑑", "group": 1}, {"id": "碧霄", "name": "碧霄", "group": 1}, {"id": "梅伯", "name": "梅伯", "group": 1}, {"id": "烏雲仙", "name": "烏雲仙", "group": 1}, {"id": "劉乾", "name": "劉乾", "group": 1}, {"id": "瓊霄", "name": "瓊霄", "group": 1}, {"id": "姜環", "name": "姜環", "group": 1}, {"id": "辛環", "name": "辛環", "group": 1}, {"id": "馬元", "name": "馬元", "group": 1}, {"id": "余德", "name": "余德", "group": 1}, {"id": "南宮适", "name": "南宮适", "group": 1}, {"id": "李興霸", "name": "李興霸", "group": 1}, {"id": "鴻鈞", "name": "鴻鈞", "group": 1}, {"id": "安康", "name": "安康", "group": 1}, {"id": "王豹", "name": "王豹", "group": 1}, {"id": "張鳳", "name": "張鳳", "group": 1}, {"id": "賀畢", "name": "賀畢", "group": 1}, {"id": "周公旦", "name": "周公旦", "group": 1}, {"id": "雷開", "name": "雷開", "group": 1}, {"id": "應彪", "name": "應彪", "group": 1}];
+const fengshenNames = ["姜子牙","楊戩","黃飛虎","聞太師","武王","雷震子","李靖","殷郊","殷洪","姜桓楚","鄧九公","姬昌","張奎","呂岳","金光聖母","黃天化","蘇護","袁洪","廣成子","張桂芳","韓榮","申公豹","洪錦","武吉","鄭倫","侯虎","孔宣","楊任","鄧嬋玉","晁田","雲霄","費仲","黃天祥","蘇全忠","高明","黃明","黃貴妃","方弼","陳奇","韋護","太鸞","鄂崇禹","晁雷","卞吉","張山","宜生","許之","徐芳","丘引","龍吉","文殊廣法天尊","敖光","歐陽淳","靈聖母","玉鼎真人","黃龍","道德真君","胡升","竇榮","魯仁傑","尤渾","伯邑考","姚斌","徐蓋","馬善","王魔","魏賁","姜王后","陳桐","吳龍","余化龍","普賢真人","鄧忠","魯雄","張紹","鄧昆","高蘭英","常昊","胡雷","黃天祿","柏鑑","碧霄","梅伯","烏雲仙","劉乾","瓊霄","姜環","辛環","馬元","余德","南宮适","李興霸","鴻鈞","安康","王豹","張鳳","賀畢","周公旦","雷開","應彪"];
+var nodesData = (g => fengshenNames.map((n, i) => g.community[i] === null ? {id: n, name: n, group: 1} : {id: n, name: n, group: g.community[i] + 1, community: g.community[i], pagerank: g.pagerank[i], lx: g.x[i], ly: g.y[i]}))({"community":[3,0,1,3,3,0,0,2,2,4,1,4,0,0,2,0,4,0,2,1,3,2,5,3,4,4,5,0,5,1,2,4,1,4,0,1,1,1,1,0,1,4,1,1,1,3,5,5,1,5,2,0,1,5,0,0,0,5,0,0,4,4,3,5,2,2,3,6,1,0,0,2,3,4,2,1,5,0,5,1,2,2,7,2,8,2,1,3,2,0,3,2,9,3,4,1,3,3,0,4],"pagerank":[0.024616,0.049836,0.046363,0.022817,0.037297,0.025389,0.015113,0.020084,0.01633,0.010227,0.017348,0.01607,0.010782,0.015286,0.003504,0.01486,0.015128,0.017966,0.018239,0.007377,0.006726,0.008681,0.020131,0.01368,0.012192,0.013479,0.009107,0.015504,0.010442,0.017566,0.012397,0.015851,0.010163,0.007263,0.008584,0.009684,0.00264,0.006939,0.006172,0.015033,0.008712,0.011422,0.013981,0.008745,0.006771,0.014684,0.003976,0.005312,0.008772,0.009738,0.009754,0.002721,0.007253,0.009664,0.01042,0.008798,0.008274,0.004459,0.002511,0.00517,0.011771,0.003104,0.001785,0.005139,0.006012,0.006495,0.003068,0.001553,0.002908,0.010569,0.004452,0.00655,0.004582,0.006256,0.00229,0.004751,0.003959,0.010568,0.004832,0.006812,0.004387,0.005996,0.001553,0.002553,0.001553,0.006037,0.004352,0.005621,0.00613,0.004913,0.029603,0.002475,0.001553,0.003085,0.00312,0.00348,0.003267,0.006446,0.005144,0.003275],"x":[18.83,25.2,-18.74,0.79,10.78,25.38,42.24,-5.9,-5.49,-54.73,-30.53,-42.54,32.37,18.19,1.46,7.15,-34.14,50.92,5.01,-13.22,6.24,-0.44,-31.56,-3.23,-17.58,-49.7,-3.56,36.94,-31.97,-42.61,31.51,-44.72,-46.01,-52.56,50.31,-22.52,-65.33,-35.39,-49.75,34.8,-56.25,-53.05,-40.74,9.98,-20.2,-21.24,26.38,-3.71,-52.18,-42.79,25.57,55.25,14.9,-22.67,25.34,28.81,19.79,-37.75,36.79,67.85,-44.07,-24.91,77.11,8.52,5.54,36.02,3.99,85.59,-29.55,63.13,58.42,31.95,0.39,-26.13,46.02,14.87,-5.19,60.56,-39.1,-45.22,27.33,41.1,0.0,3.93,-85.59,40.31,-53.83,10.49,12.1,53.99,-11.91,57.38,-0.0,-4.67,-15.36,-25.51,6.4,-1.09,61.71,-50.68],"y":[6.41,13.67,-7.84,1.83,-3.43,-5.24,-8.77,27.21,20.14,-47.69,6.22,-51.45,15.48,17.67,49.24,14.87,-27.14,7.8,44.48,-31.85,-21.57,37.96,16.01,-22.95,4.17,-48.18,11.6,8.54,29.43,-21.71,49.22,-57.15,1.08,-10.14,0.73,-22.25,-24.53,-19.19,14.37,0.9,0.48,-53.0,-15.66,-29.97,24.26,-30.91,-24.39,-6.98,6.99,21.38,52.38,-15.76,-34.74,36.14,29.53,32.62,36.07,34.1,-42.49,4.99,-60.49,-64.45,-10.41,-42.55,32.73,38.72,-49.63,0.0,-18.47,7.0,27.68,54.51,-7.01,-50.93,59.61,-26.52,35.33,8.18,13.32,-5.48,68.32,61.43,85.59,61.29,0.0,65.78,-19.43,-11.66,30.32,22.97,-20.49,45.77,-85.59,-44.82,-54.34,-8.68,-31.83,-39.07,-0.98,-58.67]});